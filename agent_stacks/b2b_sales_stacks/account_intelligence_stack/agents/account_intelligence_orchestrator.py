@@ -13,12 +13,16 @@ This orchestrator connects to:
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from agents.basic_agent import BasicAgent
+from config import Config
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 
 # Import specialized agents (lazy loading to avoid circular imports)
 # These will be imported dynamically when needed
@@ -70,6 +74,15 @@ class AccountIntelligenceOrchestrator(BasicAgent):
                     "context": {
                         "type": "object",
                         "description": "Additional context (meeting type, message type, etc.)"
+                    },
+                    "execution_mode": {
+                        "type": "string",
+                        "enum": ["parallel", "sequential"],
+                        "description": "How multi-agent operations (account_briefing) call their sub-agents. Defaults to ORCHESTRATOR_PARALLEL."
+                    },
+                    "branch_timeout": {
+                        "type": "number",
+                        "description": "Seconds to wait for each sub-agent branch before returning a partial result. Defaults to ORCHESTRATOR_BRANCH_TIMEOUT."
                     }
                 },
                 "required": ["operation", "account_id"]
@@ -109,6 +122,9 @@ class AccountIntelligenceOrchestrator(BasicAgent):
         self.action_agent = None
         self.deal_tracking_agent = None
 
+        # Shared pool for concurrent sub-agent fan-out (created on first use)
+        self._executor = None
+
     def _get_stakeholder_agent(self):
         if self.stakeholder_agent is None:
             from stakeholder_intelligence_agent import StakeholderIntelligenceAgent
@@ -186,44 +202,128 @@ class AccountIntelligenceOrchestrator(BasicAgent):
     def _account_briefing(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Comprehensive account briefing - calls multiple agents
+
+        The CRM lookup and the stakeholder, competitive and risk agents do not
+        depend on each other, so they run concurrently by default and the
+        briefing returns in roughly the time of the slowest branch.
         """
         account_id = params['account_id']
 
-        # Call Dynamics 365 for CRM data
-        crm_data = self._get_dynamics_365_account(account_id)
-
-        # Call stakeholder agent for buying committee
-        stakeholder_data = self._get_stakeholder_agent().perform(
-            account_id=account_id,
-            operation="analyze_buying_committee"
-        )
-
-        # Call competitive agent for market intelligence
-        competitive_data = self._get_competitive_agent().perform(
-            account_id=account_id,
-            operation="detect_active_threats"
-        )
+        # Instantiate sub-agents up front; the lazy getters are not thread-safe
+        stakeholder_agent = self._get_stakeholder_agent()
+        competitive_agent = self._get_competitive_agent()
+        risk_agent = self._get_risk_agent()
+
+        branches = {
+            # Call Dynamics 365 for CRM data
+            "crm": lambda: self._get_dynamics_365_account(account_id),
+            # Call stakeholder agent for buying committee
+            "stakeholders": lambda: stakeholder_agent.perform(
+                account_id=account_id,
+                operation="analyze_buying_committee"
+            ),
+            # Call competitive agent for market intelligence
+            "competitive": lambda: competitive_agent.perform(
+                account_id=account_id,
+                operation="detect_active_threats"
+            ),
+            # Call risk agent for opportunity assessment
+            "risk": lambda: risk_agent.perform(
+                account_id=account_id,
+                operation="assess_opportunity"
+            )
+        }
 
-        # Call risk agent for opportunity assessment
-        risk_data = self._get_risk_agent().perform(
-            account_id=account_id,
-            operation="assess_opportunity"
-        )
+        results, execution = self._run_branches(branches, params)
 
-        # Synthesize with Azure OpenAI
+        # Synthesize with Azure OpenAI from whichever branches came back
         briefing = self._synthesize_briefing(
-            crm_data, stakeholder_data, competitive_data, risk_data
+            results.get("crm"),
+            results.get("stakeholders") or {},
+            results.get("competitive") or {},
+            results.get("risk") or {}
         )
 
-        return {
-            "status": "success",
+        failed = [name for name, info in execution["branches"].items() if info["status"] != "success"]
+        response = {
+            "status": "partial" if failed else "success",
             "operation": "account_briefing",
             "account_id": account_id,
             "timestamp": datetime.now().isoformat(),
             "data": briefing,
             "sources": ["Dynamics 365", "LinkedIn Sales Navigator", "Azure AI Search", "Microsoft Graph"],
-            "confidence": 0.92
+            "confidence": 0.92 if not failed else round(0.92 * (1 - len(failed) / len(branches)), 2),
+            "execution": execution
         }
+        if failed:
+            response["message"] = f"Briefing built without: {', '.join(failed)}"
+        return response
+
+    def _run_branches(self, branches: Dict[str, Callable[[], Any]], params: Dict[str, Any]):
+        """
+        Run independent sub-agent calls and time each one
+
+        In parallel mode every branch is submitted to the shared pool at once
+        and given the same deadline; a branch that raises, returns an error
+        status, or misses the deadline is reported but does not fail the
+        others. Timed-out branches are abandoned, not cancelled.
+
+        Returns:
+            (results, execution) - results maps branch name to its output
+            (None when it failed); execution holds mode and per-branch timing
+        """
+        mode = params.get('execution_mode') or ('parallel' if Config.ORCHESTRATOR_PARALLEL else 'sequential')
+        timeout = float(params.get('branch_timeout') or Config.ORCHESTRATOR_BRANCH_TIMEOUT)
+
+        results = {}
+        timings = {}
+        started = time.perf_counter()
+
+        def timed(name, fn):
+            branch_start = time.perf_counter()
+            try:
+                output = fn()
+                status = "error" if isinstance(output, dict) and output.get('status') == 'error' else "success"
+                error = output.get('message') if status == "error" else None
+            except Exception as e:
+                output, status, error = None, "error", str(e)
+            info = {"status": status, "duration_ms": round((time.perf_counter() - branch_start) * 1000, 1)}
+            if error:
+                info["error"] = error
+            return (output if status == "success" else None), info
+
+        if mode == 'parallel':
+            executor = self._get_executor()
+            futures = {name: executor.submit(timed, name, fn) for name, fn in branches.items()}
+            deadline = started + timeout
+            for name, future in futures.items():
+                try:
+                    results[name], timings[name] = future.result(timeout=max(deadline - time.perf_counter(), 0))
+                except FutureTimeoutError:
+                    results[name] = None
+                    timings[name] = {
+                        "status": "timeout",
+                        "duration_ms": round(timeout * 1000, 1),
+                        "error": f"No response within {timeout:g}s"
+                    }
+        else:
+            for name, fn in branches.items():
+                results[name], timings[name] = timed(name, fn)
+
+        execution = {
+            "mode": mode,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "branches": timings
+        }
+        return results, execution
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=Config.ORCHESTRATOR_MAX_WORKERS,
+                thread_name_prefix="account-intel"
+            )
+        return self._executor
 
     def _stakeholder_analysis(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -322,10 +422,21 @@ class AccountIntelligenceOrchestrator(BasicAgent):
     def _synthesize_briefing(self, crm_data, stakeholder_data, competitive_data, risk_data) -> Dict[str, Any]:
         """
         Use Azure OpenAI to synthesize all data into coherent briefing
+        Sections whose source branch failed are marked unavailable
         """
         # In production, this would call Azure OpenAI GPT-4
         # For now, return structured synthesis
 
+        if not crm_data:
+            return {
+                "Company Overview": "Unavailable - Dynamics 365 lookup failed",
+                "CRM Status": {
+                    "Risk Level": risk_data.get('data', {}).get('risk_level', 'Moderate')
+                },
+                "Key Stakeholders": stakeholder_data.get('data', {}).get('stakeholder_count', 5),
+                "Competitive Threats": competitive_data.get('data', {}).get('active_threats', 2)
+            }
+
         return {
             "Company Overview": {
                 "Name": crm_data["name"],
@@ -83,11 +83,11 @@ class StakeholderIntelligenceAgent(BasicAgent):
         # Get contacts from Dynamics 365
         contacts = self._get_dynamics_contacts(account_id)
 
-        # Enrich with Graph API data (emails, meetings)
-        enriched_contacts = [self._enrich_contact_with_graph(c) for c in contacts]
+        # Enrich with Graph API data (emails, meetings) - one $batch per 20 lookups
+        enriched_contacts = self._enrich_contacts_with_graph(contacts)
 
-        # Get LinkedIn data
-        linkedin_data = [self._get_linkedin_data(c['email']) for c in enriched_contacts]
+        # Get LinkedIn data - bounded worker pool, one lookup per distinct email
+        linkedin_data = self._get_linkedin_data_batch([c.get('email') for c in enriched_contacts])
 
         # Calculate influence scores
         buying_committee = [
@@ -158,13 +158,7 @@ class StakeholderIntelligenceAgent(BasicAgent):
         """
         email = contact.get('email')
         if not email:
-            contact['graph_data'] = {
-                "email_interactions": 0,
-                "meetings_attended": 0,
-                "last_contact": "Never",
-                "response_time_avg": "Unknown",
-                "email_sentiment": "unknown"
-            }
+            contact['graph_data'] = self._empty_graph_data()
             return contact
 
         # Get email interactions
@@ -179,14 +173,57 @@ class StakeholderIntelligenceAgent(BasicAgent):
         sentiment_response = self.graph_connector.get_email_sentiment(email)
         sentiment_data = sentiment_response.get('data', {})
 
-        contact['graph_data'] = {
+        contact['graph_data'] = self._build_graph_data(email_data, meeting_data, sentiment_data)
+        return contact
+
+    def _enrich_contacts_with_graph(self, contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enrich many contacts with Microsoft Graph data in one batched lookup
+
+        Contacts are deduplicated by email (case-insensitive), so a stakeholder
+        listed twice costs one set of Graph requests.
+        """
+        emails = list(dict.fromkeys(c['email'].lower() for c in contacts if c.get('email')))
+        engagement = {}
+        if emails:
+            response = self.graph_connector.get_contact_engagement_batch(emails, days=90)
+            engagement = response.get('data') or {}
+
+        for contact in contacts:
+            email = contact.get('email')
+            if not email:
+                contact['graph_data'] = self._empty_graph_data()
+                continue
+            lookups = engagement.get(email.lower(), {})
+            contact['graph_data'] = self._build_graph_data(
+                lookups.get('email_interactions') or {},
+                lookups.get('meetings') or {},
+                lookups.get('sentiment') or {}
+            )
+            if lookups.get('partial'):
+                # Graph lookups that failed (throttled, 5xx, ...) are unknown, not zero activity
+                contact['graph_data'].update(partial=True, failed_lookups=lookups.get('failed_lookups', {}))
+        return contacts
+
+    def _empty_graph_data(self) -> Dict[str, Any]:
+        """Graph data for a contact with no email address"""
+        return {
+            "email_interactions": 0,
+            "meetings_attended": 0,
+            "last_contact": "Never",
+            "response_time_avg": "Unknown",
+            "email_sentiment": "unknown"
+        }
+
+    def _build_graph_data(self, email_data: Dict, meeting_data: Dict, sentiment_data: Dict) -> Dict[str, Any]:
+        """Combine Graph email, meeting and sentiment lookups into the contact's graph_data"""
+        return {
             "email_interactions": email_data.get('total_emails', 0),
             "meetings_attended": meeting_data.get('total_meetings', 0),
             "last_contact": email_data.get('last_contact', 'Never'),
             "response_time_avg": f"{email_data.get('average_response_time_hours', 0)} hours" if email_data.get('average_response_time_hours') else "Unknown",
             "email_sentiment": sentiment_data.get('overall_sentiment', 'unknown')
         }
-        return contact
 
     def _get_linkedin_data(self, email: str) -> Dict[str, Any]:
         """
@@ -195,21 +232,45 @@ class StakeholderIntelligenceAgent(BasicAgent):
         """
         # Get profile data
         profile_response = self.linkedin_connector.get_profile(contact_email=email)
-        profile = profile_response.get('data', {})
 
         # Get career history
         career_response = self.linkedin_connector.get_career_history(email)
-        career = career_response.get('data', {})
 
         # Get connections
         connections_response = self.linkedin_connector.get_connections(email)
-        connections = connections_response.get('data', {})
 
         # Get recent activity
         activity_response = self.linkedin_connector.get_recent_activity(email, days=30)
-        activity = activity_response.get('data', {})
 
-        # Build combined LinkedIn data
+        return self._build_linkedin_data(
+            profile_response.get('data', {}),
+            career_response.get('data', {}),
+            connections_response.get('data', {}),
+            activity_response.get('data', {})
+        )
+
+    def _get_linkedin_data_batch(self, emails: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get LinkedIn data for many contacts through the connector's bounded worker pool
+
+        Returns one entry per input email, in order; duplicate emails are looked up once.
+        """
+        unique = list(dict.fromkeys(e.lower() for e in emails if e))
+        bundles = self.linkedin_connector.get_profiles_batch(unique, days=30)
+
+        linkedin_data = []
+        for email in emails:
+            bundle = bundles.get(email.lower(), {}) if email else {}
+            linkedin_data.append(self._build_linkedin_data(
+                (bundle.get('profile') or {}).get('data', {}),
+                (bundle.get('career') or {}).get('data', {}),
+                (bundle.get('connections') or {}).get('data', {}),
+                (bundle.get('activity') or {}).get('data', {})
+            ))
+        return linkedin_data
+
+    def _build_linkedin_data(self, profile: Dict, career: Dict, connections: Dict, activity: Dict) -> Dict[str, Any]:
+        """Build combined LinkedIn data from the four connector lookups"""
         return {
             "linkedin_url": profile.get('linkedin_url', 'Unknown'),
             "connections": profile.get('total_connections', '500+'),
@@ -254,7 +315,10 @@ class StakeholderIntelligenceAgent(BasicAgent):
         influence_score = min(base_score, 100)
 
         # Determine relationship status
-        if contact.get('graph_data', {}).get('email_interactions', 0) == 0:
+        if contact.get('graph_data', {}).get('partial'):
+            relationship = "⚪ UNKNOWN"
+            relationship_color = "gray"
+        elif contact.get('graph_data', {}).get('email_interactions', 0) == 0:
             relationship = "❌ NONE"
             relationship_color = "red"
         elif contact.get('graph_data', {}).get('email_interactions', 0) < 5:
@@ -280,7 +344,9 @@ class StakeholderIntelligenceAgent(BasicAgent):
 
     def _recommend_action(self, contact: Dict, relationship: str) -> str:
         """Recommend next action for this stakeholder"""
-        if "NONE" in relationship:
+        if "UNKNOWN" in relationship:
+            return f"Refresh engagement data for {contact['full_name']} - Graph lookups incomplete"
+        elif "NONE" in relationship:
             return f"URGENT: Establish contact with {contact['full_name']}"
         elif "WEAK" in relationship:
             return f"Re-engage {contact['full_name']} - schedule meeting"
@@ -349,7 +415,9 @@ class StakeholderIntelligenceAgent(BasicAgent):
     def _relationship_health(self, account_id: str) -> Dict[str, Any]:
         """Overall relationship health across all stakeholders"""
         contacts = self._get_dynamics_contacts(account_id)
-        enriched = [self._enrich_contact_with_graph(c) for c in contacts]
+        enriched = self._enrich_contacts_with_graph(contacts)
+        incomplete = sum(1 for c in enriched if c.get('graph_data', {}).get('partial'))
+        enriched = [c for c in enriched if not c.get('graph_data', {}).get('partial')]
 
         total_interactions = sum(c.get('graph_data', {}).get('email_interactions', 0) for c in enriched)
         avg_interactions = total_interactions / len(enriched) if enriched else 0
@@ -358,10 +426,11 @@ class StakeholderIntelligenceAgent(BasicAgent):
             "status": "success",
             "data": {
                 "Overall Health": "🟡 MODERATE" if avg_interactions > 5 else "🔴 POOR",
-                "Total Stakeholders": len(enriched),
+                "Total Stakeholders": len(enriched) + incomplete,
                 "Strong Relationships": sum(1 for c in enriched if c.get('graph_data', {}).get('email_interactions', 0) > 10),
                 "Weak Relationships": sum(1 for c in enriched if c.get('graph_data', {}).get('email_interactions', 0) < 5),
                 "No Contact": sum(1 for c in enriched if c.get('graph_data', {}).get('email_interactions', 0) == 0),
+                "Incomplete Graph Data": incomplete,
                 "Recommendation": "Immediate action required to strengthen relationships"
             }
         }
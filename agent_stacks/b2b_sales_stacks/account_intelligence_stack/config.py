@@ -38,6 +38,21 @@ class Config:
     - AZURE_AI_SEARCH_ENDPOINT: Azure AI Search endpoint
     - AZURE_AI_SEARCH_KEY: Azure AI Search API key
     - LINKEDIN_API_KEY: LinkedIn API key (via Power Platform connector)
+    - ORCHESTRATOR_PARALLEL: 'true' or 'false' - fan out sub-agent calls concurrently (default: true)
+    - ORCHESTRATOR_MAX_WORKERS: Thread pool size for fan-out (default: 8)
+    - ORCHESTRATOR_BRANCH_TIMEOUT: Seconds to wait for each fan-out branch (default: 20)
+    - LINKEDIN_MAX_CONCURRENCY: Concurrent LinkedIn lookups during contact enrichment (default: 4)
+    - CONNECTOR_CACHE_ENABLED: 'true' or 'false' - cache connector responses (default: true)
+    - CONNECTOR_CACHE_BACKEND: 'memory' or 'sqlite' (default: memory)
+    - CONNECTOR_CACHE_PATH: SQLite file for the sqlite backend (default: connector_cache.sqlite3)
+    - CONNECTOR_CACHE_MAX_ENTRIES: LRU bound on cached responses (default: 1024)
+    - AZURE_OPENAI_CACHE_ENABLED: 'true' or 'false' - cache GPT-4o responses by prompt (default: true)
+    - AZURE_OPENAI_CACHE_TTL: Seconds to keep a cached completion (default: 3600)
+    - AZURE_OPENAI_CACHE_MAX_ENTRIES: LRU bound on cached completions (default: 256)
+    - AZURE_OPENAI_BATCHING: 'true' or 'false' - micro-batch concurrent completions (default: true)
+    - AZURE_OPENAI_BATCH_TOKEN_BUDGET: Estimated prompt tokens per batch (default: 16000)
+    - AZURE_OPENAI_BATCH_WINDOW_MS: How long a batch waits for more requests (default: 20)
+    - AZURE_OPENAI_TOKENS_PER_MINUTE: Deployment quota the batcher paces prompts to, 0 for none (default: 0)
     """
 
     # Execution mode
@@ -73,6 +88,13 @@ class Config:
     AZURE_OPENAI_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o')
     AZURE_OPENAI_API_VERSION = os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01')
     AZURE_OPENAI_TEMPERATURE = float(os.getenv('AZURE_OPENAI_TEMPERATURE', '0.7'))
+    AZURE_OPENAI_CACHE_ENABLED = os.getenv('AZURE_OPENAI_CACHE_ENABLED', 'true').lower() == 'true'
+    AZURE_OPENAI_CACHE_TTL = int(os.getenv('AZURE_OPENAI_CACHE_TTL', '3600'))
+    AZURE_OPENAI_CACHE_MAX_ENTRIES = int(os.getenv('AZURE_OPENAI_CACHE_MAX_ENTRIES', '256'))
+    AZURE_OPENAI_BATCHING = os.getenv('AZURE_OPENAI_BATCHING', 'true').lower() == 'true'
+    AZURE_OPENAI_BATCH_TOKEN_BUDGET = int(os.getenv('AZURE_OPENAI_BATCH_TOKEN_BUDGET', '16000'))
+    AZURE_OPENAI_BATCH_WINDOW_MS = float(os.getenv('AZURE_OPENAI_BATCH_WINDOW_MS', '20'))
+    AZURE_OPENAI_TOKENS_PER_MINUTE = int(os.getenv('AZURE_OPENAI_TOKENS_PER_MINUTE', '0'))
 
     # Microsoft Graph API Configuration
     GRAPH_API_CLIENT_ID = os.getenv('GRAPH_API_CLIENT_ID', '')
@@ -88,6 +110,7 @@ class Config:
     # LinkedIn Configuration (via Power Platform connector)
     LINKEDIN_API_KEY = os.getenv('LINKEDIN_API_KEY', '')
     LINKEDIN_CONNECTOR_URL = os.getenv('LINKEDIN_CONNECTOR_URL', '')  # Power Platform connector endpoint
+    LINKEDIN_MAX_CONCURRENCY = int(os.getenv('LINKEDIN_MAX_CONCURRENCY', '4'))
 
     # Power Platform Connector Support
     # When Copilot Studio calls Azure Function, it can pass connector tokens
@@ -96,11 +119,22 @@ class Config:
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
+    # Orchestrator fan-out: run independent sub-agent calls concurrently
+    ORCHESTRATOR_PARALLEL = os.getenv('ORCHESTRATOR_PARALLEL', 'true').lower() == 'true'
+    ORCHESTRATOR_MAX_WORKERS = int(os.getenv('ORCHESTRATOR_MAX_WORKERS', '8'))
+    ORCHESTRATOR_BRANCH_TIMEOUT = float(os.getenv('ORCHESTRATOR_BRANCH_TIMEOUT', '20'))  # seconds
+
     # Cache TTL (seconds)
     CACHE_TTL_ACCOUNT_DATA = int(os.getenv('CACHE_TTL_ACCOUNT_DATA', '900'))  # 15 minutes
     CACHE_TTL_STAKEHOLDER_DATA = int(os.getenv('CACHE_TTL_STAKEHOLDER_DATA', '3600'))  # 1 hour
     CACHE_TTL_COMPETITIVE_DATA = int(os.getenv('CACHE_TTL_COMPETITIVE_DATA', '14400'))  # 4 hours
 
+    # Connector response cache
+    CONNECTOR_CACHE_ENABLED = os.getenv('CONNECTOR_CACHE_ENABLED', 'true').lower() == 'true'
+    CONNECTOR_CACHE_BACKEND = os.getenv('CONNECTOR_CACHE_BACKEND', 'memory').lower()
+    CONNECTOR_CACHE_PATH = os.getenv('CONNECTOR_CACHE_PATH', 'connector_cache.sqlite3')
+    CONNECTOR_CACHE_MAX_ENTRIES = int(os.getenv('CONNECTOR_CACHE_MAX_ENTRIES', '1024'))
+
     @classmethod
     def is_mock_mode(cls) -> bool:
         """Check if running in mock mode"""
@@ -17,9 +17,20 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from connectors.base_connector import BaseConnector
+from connectors.response_cache import ResponseCache, MemoryCacheBackend
+from connectors.prompt_batcher import PromptBatcher, estimate_tokens
 from config import Config
 from typing import Dict, Any, List
 import json
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+SYSTEM_PROMPT = (
+    "You are a B2B sales intelligence analyst. Be specific, cite the data you were given, "
+    "and answer with a single JSON object."
+)
 
 class AzureOpenAIConnector(BaseConnector):
     """
@@ -38,6 +49,8 @@ class AzureOpenAIConnector(BaseConnector):
             'api_version': Config.AZURE_OPENAI_API_VERSION,
             'temperature': Config.AZURE_OPENAI_TEMPERATURE
         }
+        self.prompt_cache = get_prompt_cache()
+        self.batcher = get_prompt_batcher() if Config.AZURE_OPENAI_BATCHING else None
 
     def authenticate(self) -> bool:
         """Authenticate with Azure OpenAI"""
@@ -73,12 +86,13 @@ class AzureOpenAIConnector(BaseConnector):
 
     # ==================== INTELLIGENCE SYNTHESIS METHODS ====================
 
-    def synthesize_account_briefing(self, account_data: Dict[str, Any]) -> Dict[str, Any]:
+    def synthesize_account_briefing(self, account_data: Dict[str, Any], bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Synthesize comprehensive account briefing from multiple data sources
 
         Args:
             account_data: Combined data from CRM, Graph, LinkedIn, etc.
+            bypass_cache: Skip the prompt cache and always call the model
 
         Returns:
             AI-synthesized briefing
@@ -88,15 +102,16 @@ class AzureOpenAIConnector(BaseConnector):
 
         # Production: Call GPT-4o
         prompt = self._build_account_briefing_prompt(account_data)
-        return self._call_gpt4o(prompt, "account_briefing")
+        return self._call_gpt4o(prompt, "account_briefing", bypass_cache)
 
-    def generate_meeting_brief(self, contact_data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_meeting_brief(self, contact_data: Dict[str, Any], context: Dict[str, Any], bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Generate executive meeting preparation brief
 
         Args:
             contact_data: Contact profile and interaction data
             context: Deal context, objectives, etc.
+            bypass_cache: Skip the prompt cache and always call the model
 
         Returns:
             AI-generated meeting brief
@@ -106,9 +121,9 @@ class AzureOpenAIConnector(BaseConnector):
 
         # Production: Call GPT-4o
         prompt = self._build_meeting_brief_prompt(contact_data, context)
-        return self._call_gpt4o(prompt, "meeting_brief")
+        return self._call_gpt4o(prompt, "meeting_brief", bypass_cache)
 
-    def generate_message(self, message_type: str, contact_data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_message(self, message_type: str, contact_data: Dict[str, Any], context: Dict[str, Any], bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Generate AI-powered messages (email, LinkedIn, etc.)
 
@@ -116,6 +131,7 @@ class AzureOpenAIConnector(BaseConnector):
             message_type: 'email', 'linkedin', 'follow_up'
             contact_data: Contact information
             context: Message context and objectives
+            bypass_cache: Skip the prompt cache and always call the model
 
         Returns:
             AI-generated message
@@ -125,15 +141,16 @@ class AzureOpenAIConnector(BaseConnector):
 
         # Production: Call GPT-4o
         prompt = self._build_message_prompt(message_type, contact_data, context)
-        return self._call_gpt4o(prompt, "message_generation")
+        return self._call_gpt4o(prompt, "message_generation", bypass_cache)
 
-    def analyze_competitive_intelligence(self, account_data: Dict[str, Any], competitor_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_competitive_intelligence(self, account_data: Dict[str, Any], competitor_data: List[Dict[str, Any]], bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Analyze competitive landscape and generate battle cards
 
         Args:
             account_data: Account information
             competitor_data: Data about competitors in the deal
+            bypass_cache: Skip the prompt cache and always call the model
 
         Returns:
             AI-analyzed competitive intelligence
@@ -143,14 +160,15 @@ class AzureOpenAIConnector(BaseConnector):
 
         # Production: Call GPT-4o
         prompt = self._build_competitive_analysis_prompt(account_data, competitor_data)
-        return self._call_gpt4o(prompt, "competitive_analysis")
+        return self._call_gpt4o(prompt, "competitive_analysis", bypass_cache)
 
-    def assess_deal_risk(self, deal_data: Dict[str, Any]) -> Dict[str, Any]:
+    def assess_deal_risk(self, deal_data: Dict[str, Any], bypass_cache: bool = False) -> Dict[str, Any]:
         """
         AI-powered deal risk assessment
 
         Args:
             deal_data: Complete deal context
+            bypass_cache: Skip the prompt cache and always call the model
 
         Returns:
             Risk assessment with recommendations
@@ -160,7 +178,7 @@ class AzureOpenAIConnector(BaseConnector):
 
         # Production: Call GPT-4o
         prompt = self._build_risk_assessment_prompt(deal_data)
-        return self._call_gpt4o(prompt, "risk_assessment")
+        return self._call_gpt4o(prompt, "risk_assessment", bypass_cache)
 
     # ==================== MOCK DATA METHODS ====================
 
@@ -498,47 +516,205 @@ Best regards""",
 
     # ==================== PRODUCTION API METHODS ====================
 
-    def _call_gpt4o(self, prompt: str, operation: str) -> Dict[str, Any]:
-        """Call Azure OpenAI GPT-4o API"""
-        # TODO: Implement Azure OpenAI API call
-        # from openai import AzureOpenAI
-        # client = AzureOpenAI(
-        #     api_key=self.openai_config['api_key'],
-        #     api_version=self.openai_config['api_version'],
-        #     azure_endpoint=self.openai_config['endpoint']
-        # )
-        # response = client.chat.completions.create(
-        #     model=self.openai_config['deployment'],
-        #     messages=[{"role": "user", "content": prompt}],
-        #     temperature=self.openai_config['temperature']
-        # )
-        # return self._production_response(response.choices[0].message.content, "Azure OpenAI")
-        pass
+    def _call_gpt4o(self, prompt: str, operation: str, bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        Call Azure OpenAI GPT-4o API
+
+        Responses are cached by content address (normalized prompt, deployment
+        and temperature), so re-running a briefing on unchanged data costs no
+        model call. bypass_cache forces a fresh completion.
+        """
+        prompt = normalize_prompt(prompt)
+        if bypass_cache or not self.prompt_cache.enabled:
+            _count_bypass()
+            return self._complete(prompt)
+
+        key = self._prompt_cache_key(prompt)
+        return self.prompt_cache.get_or_fetch(
+            f"AzureOpenAIConnector.{operation}",
+            key,
+            Config.AZURE_OPENAI_CACHE_TTL,
+            lambda: self._complete(prompt)
+        )
+
+    def _prompt_cache_key(self, prompt: str) -> str:
+        """Content address of a completion: same prompt on the same model settings -> same key"""
+        return ResponseCache.make_key(
+            "AzureOpenAI",
+            (prompt,),
+            {"deployment": self.openai_config['deployment'], "temperature": self.openai_config['temperature']}
+        )
+
+    def _complete(self, prompt: str) -> Dict[str, Any]:
+        """Send one chat completion, through the micro-batcher when enabled"""
+        request = {
+            "url": (f"{self.openai_config['endpoint'].rstrip('/')}/openai/deployments/"
+                    f"{self.openai_config['deployment']}/chat/completions"
+                    f"?api-version={self.openai_config['api_version']}"),
+            "api_key": self.openai_config['api_key'],
+            "body": {
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": self.openai_config['temperature'],
+                "response_format": {"type": "json_object"}
+            }
+        }
+
+        try:
+            if self.batcher:
+                completion = self.batcher.submit(request, estimate_tokens(prompt))
+            else:
+                completion = send_chat_completion(request)
+        except requests.exceptions.RequestException as e:
+            return self._error_response("Azure OpenAI request failed", str(e))
+
+        try:
+            content = completion['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError) as e:
+            return self._error_response("Azure OpenAI returned a malformed completion", repr(e))
+
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = {"content": content}
+
+        response = self._production_response(data, "Azure OpenAI")
+        response['usage'] = completion.get('usage', {})
+        return response
+
+    def _build_prompt(self, task: str, output_keys: List[str], context: Dict[str, Any]) -> str:
+        """Assemble a prompt; context is serialized with sorted keys so equal data gives an equal prompt"""
+        return "\n\n".join([
+            task,
+            "Respond with a JSON object with these keys: " + ", ".join(output_keys) + ".",
+            "Data:",
+            json.dumps(context, indent=2, sort_keys=True, default=str)
+        ])
 
     def _build_account_briefing_prompt(self, account_data: Dict[str, Any]) -> str:
         """Build prompt for account briefing synthesis"""
-        # TODO: Construct comprehensive prompt from account_data
-        pass
+        return self._build_prompt(
+            "Synthesize an executive account briefing from the CRM, Microsoft 365, LinkedIn and "
+            "competitive data below. Lead with what has changed and what puts revenue at risk.",
+            ["executive_summary", "key_insights", "opportunity_assessment", "immediate_priorities", "confidence_score"],
+            {"account_data": account_data}
+        )
 
     def _build_meeting_brief_prompt(self, contact_data: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Build prompt for meeting brief generation"""
-        # TODO: Construct prompt for meeting preparation
-        pass
+        return self._build_prompt(
+            "Prepare a meeting brief for an upcoming conversation with this executive: what they care "
+            "about, what to achieve in the meeting and the questions to ask.",
+            ["contact", "meeting_objective", "talking_points", "discovery_questions"],
+            {"contact": contact_data, "context": context}
+        )
 
     def _build_message_prompt(self, message_type: str, contact_data: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Build prompt for message generation"""
-        # TODO: Construct prompt for message creation
-        pass
+        return self._build_prompt(
+            f"Write a personalized {message_type} message to this contact. Reference something specific "
+            "to them and end with a clear, low-friction ask.",
+            ["message_type", "subject", "body", "tone", "subject_line_alternatives"],
+            {"message_type": message_type, "contact": contact_data, "context": context}
+        )
 
     def _build_competitive_analysis_prompt(self, account_data: Dict[str, Any], competitor_data: List[Dict[str, Any]]) -> str:
         """Build prompt for competitive analysis"""
-        # TODO: Construct prompt for competitive intelligence
-        pass
+        return self._build_prompt(
+            "Analyze the competitors in this deal and produce battle-card guidance: where each one is "
+            "strong, where we win, and how to position against them for this account.",
+            ["primary_competitors", "competitive_positioning", "win_themes"],
+            {"account": account_data, "competitors": competitor_data}
+        )
 
     def _build_risk_assessment_prompt(self, deal_data: Dict[str, Any]) -> str:
         """Build prompt for risk assessment"""
-        # TODO: Construct prompt for risk analysis
-        pass
+        return self._build_prompt(
+            "Assess the risk on this deal. Score overall risk 0-100, separate critical from moderate "
+            "risks, and give the concrete actions for the next 48 hours.",
+            ["overall_risk_score", "risk_level", "win_probability", "critical_risks", "moderate_risks",
+             "action_plan_next_48_hours"],
+            {"deal": deal_data}
+        )
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical prompt text: unified newlines, no trailing spaces, runs of blanks collapsed"""
+    lines = [re.sub(r'[ \t]+', ' ', line).rstrip() for line in prompt.replace('\r\n', '\n').split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+_session = None
+_prompt_cache = None
+_prompt_batcher = None
+_bypassed = 0
+_shared_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _shared_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=16)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def send_chat_completion(request: Dict[str, Any]) -> Dict[str, Any]:
+    """POST one chat completion request over the shared keep-alive session"""
+    response = _get_session().post(
+        request['url'],
+        headers={'api-key': request['api_key'], 'Content-Type': 'application/json'},
+        json=request['body'],
+        timeout=120
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_prompt_cache() -> ResponseCache:
+    """Process-wide GPT-4o response cache, separate from the connector data cache"""
+    global _prompt_cache
+    with _shared_lock:
+        if _prompt_cache is None:
+            _prompt_cache = ResponseCache(
+                MemoryCacheBackend(Config.AZURE_OPENAI_CACHE_MAX_ENTRIES),
+                enabled=Config.AZURE_OPENAI_CACHE_ENABLED
+            )
+        return _prompt_cache
+
+
+def get_prompt_batcher() -> PromptBatcher:
+    """Process-wide micro-batcher shared by every AzureOpenAIConnector"""
+    global _prompt_batcher
+    with _shared_lock:
+        if _prompt_batcher is None:
+            _prompt_batcher = PromptBatcher(
+                send_chat_completion,
+                max_batch_tokens=Config.AZURE_OPENAI_BATCH_TOKEN_BUDGET,
+                window_seconds=Config.AZURE_OPENAI_BATCH_WINDOW_MS / 1000,
+                tokens_per_minute=Config.AZURE_OPENAI_TOKENS_PER_MINUTE or None
+            )
+        return _prompt_batcher
+
+
+def _count_bypass():
+    global _bypassed
+    with _shared_lock:
+        _bypassed += 1
+
+
+def prompt_cache_stats() -> Dict[str, Any]:
+    """Prompt cache hit/miss metrics plus micro-batcher counters for /health"""
+    stats = get_prompt_cache().stats()
+    stats["bypassed"] = _bypassed
+    if _prompt_batcher is not None:
+        stats["batching"] = _prompt_batcher.stats()
+    return stats
 
 
 if __name__ == "__main__":
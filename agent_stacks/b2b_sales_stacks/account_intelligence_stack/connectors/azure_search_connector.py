@@ -29,6 +29,13 @@ class AzureSearchConnector(BaseConnector):
     In MOCK mode: Returns sample competitive intelligence data
     """
 
+    CACHE_TTLS = {
+        'search_competitor': Config.CACHE_TTL_COMPETITIVE_DATA,
+        'search_competitor_reviews': Config.CACHE_TTL_COMPETITIVE_DATA,
+        'search_market_intelligence': Config.CACHE_TTL_COMPETITIVE_DATA,
+        'search_win_loss_analysis': Config.CACHE_TTL_COMPETITIVE_DATA
+    }
+
     def __init__(self, connector_token: str = None):
         super().__init__(connector_token)
         self.search_config = {
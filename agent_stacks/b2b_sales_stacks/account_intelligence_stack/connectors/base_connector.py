@@ -4,11 +4,14 @@ Base connector class for all data source integrations
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import functools
+import hashlib
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from config import Config
+from connectors.response_cache import ResponseCache, get_response_cache
 
 class BaseConnector(ABC):
     """
@@ -20,8 +23,13 @@ class BaseConnector(ABC):
     3. Handle authentication
     4. Handle errors gracefully
     5. Support Power Platform connector tokens
+
+    Subclasses opt methods into the shared response cache by listing them in
+    CACHE_TTLS (method name -> TTL in seconds).
     """
 
+    CACHE_TTLS: Dict[str, int] = {}
+
     def __init__(self, connector_token: str = None):
         """
         Initialize connector
@@ -33,6 +41,25 @@ class BaseConnector(ABC):
         self.mode = Config.MODE
         self.connector_token = connector_token or Config.POWER_PLATFORM_CONNECTOR_TOKEN
         self.is_mock = Config.is_mock_mode()
+        self.cache = get_response_cache()
+
+        for method_name, ttl in self.CACHE_TTLS.items():
+            setattr(self, method_name, self._cached_method(method_name, ttl))
+
+    def _cached_method(self, method_name: str, ttl: int):
+        """Wrap a bound method so its responses go through self.cache"""
+        method = getattr(self, method_name)
+        namespace = f"{type(self).__name__}.{method_name}"
+        # Production responses depend on the caller's permissions, so the token is part of the key
+        token_id = hashlib.sha256((self.connector_token or '').encode('utf-8')).hexdigest()[:16]
+
+        @functools.wraps(method)
+        def cached(*args, **kwargs):
+            mode = "mock" if self.is_mock else f"production:{token_id}"
+            key = ResponseCache.make_key(f"{namespace}:{mode}", args, kwargs)
+            return self.cache.get_or_fetch(namespace, key, ttl, lambda: method(*args, **kwargs))
+
+        return cached
 
     @abstractmethod
     def authenticate(self) -> bool:
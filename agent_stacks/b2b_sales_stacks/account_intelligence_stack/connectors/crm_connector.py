@@ -28,6 +28,13 @@ class CRMConnector(BaseConnector):
     - HubSpot (via REST API)
     """
 
+    CACHE_TTLS = {
+        'get_account': Config.CACHE_TTL_ACCOUNT_DATA,
+        'get_contacts': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_opportunities': Config.CACHE_TTL_ACCOUNT_DATA,
+        'get_activities': Config.CACHE_TTL_ACCOUNT_DATA
+    }
+
     def __init__(self, connector_token: str = None):
         super().__init__(connector_token)
         self.crm_system = Config.CRM_SYSTEM
@@ -15,8 +15,21 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../'
 
 from connectors.base_connector import BaseConnector
 from config import Config
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
+import time
+import requests
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+# Graph rejects JSON $batch envelopes carrying more than 20 requests
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_URL = f"{GRAPH_API_BASE}/$batch"
+# Throttled (429) and 5xx sub-responses are resent in later rounds, this many times at most
+GRAPH_BATCH_MAX_RETRIES = 3
+GRAPH_RETRY_AFTER_DEFAULT = 2   # seconds, when a throttled sub-response carries no Retry-After
+GRAPH_RETRY_AFTER_MAX = 60
 
 class GraphConnector(BaseConnector):
     """
@@ -29,6 +42,15 @@ class GraphConnector(BaseConnector):
     - User profiles (contact info, job titles)
     """
 
+    CACHE_TTLS = {
+        'get_email_interactions': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_email_sentiment': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_meeting_history': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_contact_engagement_batch': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_org_chart': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_user_profile': Config.CACHE_TTL_STAKEHOLDER_DATA
+    }
+
     def __init__(self, connector_token: str = None):
         super().__init__(connector_token)
         self.graph_config = {
@@ -131,6 +153,44 @@ class GraphConnector(BaseConnector):
 
     # ==================== ORG CHART METHODS ====================
 
+    def get_contact_engagement_batch(self, contact_emails: List[str], days: int = 90) -> Dict[str, Any]:
+        """
+        Get email interactions, meeting history and sentiment for many contacts at once
+
+        In production the message and calendar lookups for every contact are
+        packed into Graph JSON $batch envelopes of up to 20 requests each, so
+        a full buying committee costs a handful of round trips instead of
+        three calls per contact. Result pages past the first (@odata.nextLink)
+        and throttled sub-requests are fetched in further $batch rounds.
+        Sentiment comes from Text Analytics per contact; it is not a Graph
+        endpoint and cannot go in the envelope.
+
+        A contact whose lookups still failed is marked "partial", with the
+        failed lookups and their HTTP status, and the failed summaries are
+        None rather than zero activity.
+
+        Args:
+            contact_emails: Contact email addresses (duplicates are looked up once)
+            days: Number of days to look back
+
+        Returns:
+            Mapping of email -> {"email_interactions", "meetings", "sentiment"}
+        """
+        emails = list(dict.fromkeys(e for e in contact_emails if e))
+
+        if self.is_mock:
+            return self._mock_response({
+                email: {
+                    "email_interactions": self._get_mock_email_interactions(email, days),
+                    "meetings": self._get_mock_meeting_history(email, days),
+                    "sentiment": self._get_mock_email_sentiment(email)
+                }
+                for email in emails
+            })
+
+        # Production: Call Graph JSON $batch endpoint
+        return self._get_production_contact_engagement_batch(emails, days)
+
     def get_org_chart(self, contact_email: str) -> Dict[str, Any]:
         """
         Get organizational chart for a contact
@@ -516,6 +576,135 @@ class GraphConnector(BaseConnector):
         # GET /me/calendar/events?$filter=attendees/any(a:a/emailAddress/address eq '{contact_email}')
         pass
 
+    def _get_production_contact_engagement_batch(self, contact_emails: List[str], days: int) -> Dict[str, Any]:
+        """Get email and meeting activity for many contacts via Graph JSON $batch"""
+        try:
+            rows, failed = self._run_graph_batches(self._build_engagement_requests(contact_emails, days))
+        except requests.exceptions.RequestException as e:
+            return self._error_response("Graph $batch request failed", str(e))
+
+        data = {}
+        for index, email in enumerate(contact_emails):
+            errors = {lookup: failed[f"{index}-{lookup}"] for lookup in ("received", "sent", "meetings")
+                      if f"{index}-{lookup}" in failed}
+            mail_failed = "received" in errors or "sent" in errors
+            sentiment_response = self._get_production_email_sentiment(email) or {}
+            data[email] = {
+                "email_interactions": None if mail_failed else _summarize_messages(
+                    email, days, rows.get(f"{index}-received", []), rows.get(f"{index}-sent", [])),
+                "meetings": None if "meetings" in errors else _summarize_events(
+                    email, days, rows.get(f"{index}-meetings", [])),
+                "sentiment": sentiment_response.get('data', sentiment_response)
+            }
+            if errors:
+                data[email].update(partial=True, failed_lookups=errors)
+
+        response = self._production_response(data, "Microsoft Graph")
+        if failed:
+            response['partial'] = True
+        return response
+
+    def _build_engagement_requests(self, contact_emails: List[str], days: int) -> List[Dict[str, Any]]:
+        """Three Graph sub-requests per contact: received mail, sent mail, calendar events"""
+        since = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        sub_requests = []
+        for index, email in enumerate(contact_emails):
+            address = _odata_string(email)
+            sub_requests += [
+                {
+                    "id": f"{index}-received",
+                    "method": "GET",
+                    "url": _graph_url("/me/messages",
+                                      f"from/emailAddress/address eq {address} and receivedDateTime ge {since}",
+                                      select="receivedDateTime", top=999)
+                },
+                {
+                    "id": f"{index}-sent",
+                    "method": "GET",
+                    "url": _graph_url("/me/mailFolders/sentitems/messages",
+                                      f"sentDateTime ge {since} and recipients/any(r:r/emailAddress/address eq {address})",
+                                      select="sentDateTime", top=999)
+                },
+                {
+                    "id": f"{index}-meetings",
+                    "method": "GET",
+                    "url": _graph_url("/me/calendar/events",
+                                      f"start/dateTime ge '{since}' and attendees/any(a:a/emailAddress/address eq {address})",
+                                      select="subject,start", top=999)
+                }
+            ]
+        return sub_requests
+
+    def _run_graph_batches(self, sub_requests: List[Dict[str, Any]]):
+        """
+        Send sub-requests in $batch envelopes of up to 20, following @odata.nextLink
+
+        Pages past the first are requested in further $batch rounds, so a large
+        mailbox is read in full rather than cut off at $top. Sub-requests Graph
+        throttled (429) or failed with a 5xx are resent in the next round, after
+        the longest Retry-After they carried, up to GRAPH_BATCH_MAX_RETRIES times.
+
+        Returns (rows, failed): sub-request id -> every result row, and
+        sub-request id -> HTTP status for lookups that could not be completed.
+        """
+        rows, failed, retries = {}, {}, {}
+        pending = list(sub_requests)
+        while pending:
+            next_round, wait = [], 0
+            for start in range(0, len(pending), GRAPH_BATCH_MAX_REQUESTS):
+                envelope = pending[start:start + GRAPH_BATCH_MAX_REQUESTS]
+                results = self._post_graph_batch(envelope)
+                for request in envelope:
+                    request_id = request["id"]
+                    # A sub-request missing from the response, or without a status, is retried like a 5xx
+                    page = results.get(request_id) or {}
+                    status = page.get("status") or 503
+                    if status == 200:
+                        rows.setdefault(request_id, []).extend(page.get("value", []))
+                        if page.get("next_link"):
+                            next_round.append({"id": request_id, "method": "GET",
+                                               "url": _relative_graph_url(page["next_link"])})
+                    elif (status == 429 or status >= 500) and retries.get(request_id, 0) < GRAPH_BATCH_MAX_RETRIES:
+                        retries[request_id] = retries.get(request_id, 0) + 1
+                        next_round.append(request)
+                        wait = max(wait, page.get("retry_after") or GRAPH_RETRY_AFTER_DEFAULT)
+                    else:
+                        failed[request_id] = status
+            if wait and next_round:
+                time.sleep(min(wait, GRAPH_RETRY_AFTER_MAX))
+            pending = next_round
+        return rows, failed
+
+    def _post_graph_batch(self, sub_requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        POST one $batch envelope
+
+        Returns sub-request id -> {"status", "value": rows, "next_link": url or None,
+        "retry_after": seconds or None} for every sub-response, failed ones included.
+        """
+        response = requests.post(
+            GRAPH_BATCH_URL,
+            headers={
+                'Authorization': f'Bearer {self.connector_token}',
+                'Content-Type': 'application/json'
+            },
+            json={"requests": sub_requests},
+            timeout=30
+        )
+        response.raise_for_status()
+
+        results = {}
+        for item in response.json().get('responses', []):
+            body = item.get('body') or {}
+            headers = {k.lower(): v for k, v in (item.get('headers') or {}).items()}
+            results[item['id']] = {
+                "status": item.get('status'),
+                "value": body.get('value', []) if item.get('status') == 200 else [],
+                "next_link": body.get('@odata.nextLink') if item.get('status') == 200 else None,
+                "retry_after": _retry_after_seconds(headers.get('retry-after'))
+            }
+        return results
+
     def _get_production_org_chart(self, contact_email: str) -> Dict[str, Any]:
         """Get org chart from Graph API"""
         # TODO: Implement Graph API calls
@@ -530,6 +719,59 @@ class GraphConnector(BaseConnector):
         pass
 
 
+def _odata_string(value: str) -> str:
+    """Quote a value as an OData string literal (single quotes doubled)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _graph_url(path: str, filter_expr: str, **options: Any) -> str:
+    """Relative Graph URL with a percent-encoded $filter and further $options (select, top, orderby)"""
+    query = [f"$filter={quote(filter_expr, safe='')}"]
+    query += [f"${name}={quote(str(value), safe=',')}" for name, value in options.items()]
+    return f"{path}?{'&'.join(query)}"
+
+
+def _retry_after_seconds(value) -> Optional[float]:
+    """A Retry-After header in seconds; None when absent or not a number of seconds"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _relative_graph_url(url: str) -> str:
+    """An absolute @odata.nextLink as the version-relative URL $batch sub-requests take"""
+    return url[len(GRAPH_API_BASE):] if url.startswith(GRAPH_API_BASE) else url
+
+
+def _summarize_messages(contact_email: str, days: int, received: List[Dict], sent: List[Dict]) -> Dict[str, Any]:
+    """Reduce raw Graph message rows to the email interaction summary shape"""
+    dates = [m.get('receivedDateTime', '') for m in received] + [m.get('sentDateTime', '') for m in sent]
+    last_contact = max(dates)[:10] if dates else None
+    return {
+        "contact_email": contact_email,
+        "days_analyzed": days,
+        "total_emails": len(received) + len(sent),
+        "sent_by_you": len(sent),
+        "received_from_contact": len(received),
+        "average_response_time_hours": None,
+        "last_contact": last_contact
+    }
+
+
+def _summarize_events(contact_email: str, days: int, events: List[Dict]) -> Dict[str, Any]:
+    """Reduce raw Graph calendar rows to the meeting history summary shape"""
+    return {
+        "contact_email": contact_email,
+        "days_analyzed": days,
+        "total_meetings": len(events),
+        "past_meetings": [
+            {"date": e.get('start', {}).get('dateTime', '')[:10], "subject": e.get('subject', '')}
+            for e in events
+        ]
+    }
+
+
 if __name__ == "__main__":
     # Test the connector in mock mode
     print("Testing Graph Connector in MOCK mode...")
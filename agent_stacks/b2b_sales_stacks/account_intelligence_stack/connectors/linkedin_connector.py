@@ -18,6 +18,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../'
 from connectors.base_connector import BaseConnector
 from config import Config
 from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 class LinkedInConnector(BaseConnector):
@@ -31,6 +32,13 @@ class LinkedInConnector(BaseConnector):
     without requiring separate LinkedIn API credentials.
     """
 
+    CACHE_TTLS = {
+        'get_profile': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_career_history': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_connections': Config.CACHE_TTL_STAKEHOLDER_DATA,
+        'get_recent_activity': Config.CACHE_TTL_STAKEHOLDER_DATA
+    }
+
     def __init__(self, connector_token: str = None):
         super().__init__(connector_token)
         self.linkedin_config = {
@@ -139,6 +147,39 @@ class LinkedInConnector(BaseConnector):
         # Production: Call LinkedIn API via Power Platform
         return self._get_production_recent_activity(contact_email, days)
 
+    def get_profiles_batch(self, contact_emails: List[str], days: int = 30,
+                           max_workers: int = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get profile, career history, connections and recent activity for many contacts
+
+        The Power Platform connector has no bulk endpoint, so lookups run on a
+        bounded worker pool to stay under the connector's rate limits.
+
+        Args:
+            contact_emails: Contact email addresses (duplicates are looked up once)
+            days: Number of days of activity to look back
+            max_workers: Concurrent lookups (default: Config.LINKEDIN_MAX_CONCURRENCY)
+
+        Returns:
+            Mapping of email -> {"profile", "career", "connections", "activity"} responses
+        """
+        emails = list(dict.fromkeys(e for e in contact_emails if e))
+        if not emails:
+            return {}
+
+        workers = min(max_workers or Config.LINKEDIN_MAX_CONCURRENCY, len(emails))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return dict(zip(emails, pool.map(lambda email: self._get_contact_bundle(email, days), emails)))
+
+    def _get_contact_bundle(self, contact_email: str, days: int) -> Dict[str, Any]:
+        """All four LinkedIn lookups for one contact"""
+        return {
+            "profile": self.get_profile(contact_email=contact_email),
+            "career": self.get_career_history(contact_email),
+            "connections": self.get_connections(contact_email),
+            "activity": self.get_recent_activity(contact_email, days)
+        }
+
     # ==================== MOCK DATA METHODS ====================
 
     def _get_mock_profile(self, identifier: str) -> Dict[str, Any]:
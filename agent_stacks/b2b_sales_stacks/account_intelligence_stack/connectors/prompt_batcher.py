@@ -0,0 +1,181 @@
+"""
+Micro-batcher for Azure OpenAI chat completions
+
+Concurrent synthesis requests (e.g. the orchestrator's fan-out branches all
+asking for GPT-4o output at once) are collected for a short window and
+dispatched together, keeping each dispatch under a token budget. Given the
+deployment's tokens-per-minute quota, batches are also held back until the
+trailing minute has room for them, so a burst queues here instead of being
+answered with 429s. Identical prompts within a window share one completion.
+
+Chat completions has no multi-prompt request body, so a batch goes out as
+parallel requests over the connector's pooled HTTP session.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+import copy
+import json
+import threading
+import time
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough GPT token estimate (~4 characters per token) used for budgeting"""
+    return max(1, len(prompt) // 4)
+
+
+class _Pending:
+    def __init__(self, request: Dict[str, Any], tokens: int):
+        self.request = request
+        self.key = json.dumps(request, sort_keys=True, default=str)
+        self.tokens = tokens
+        self.future = Future()
+
+
+def _resolve(waiters: List[_Pending], done: Future):
+    """Hand a finished completion to every prompt waiting on it; duplicates get their own copy"""
+    error = done.exception()
+    if error is not None:
+        for pending in waiters:
+            pending.future.set_exception(error)
+        return
+    result = done.result()
+    first, *duplicates = waiters
+    first.future.set_result(result)
+    for pending in duplicates:
+        pending.future.set_result(copy.deepcopy(result))
+
+
+class PromptBatcher:
+    """
+    Collects prompts for window_seconds and flushes them in token-budgeted batches
+
+    Args:
+        send: Callable taking one chat completion request and returning its response
+        max_batch_tokens: Estimated prompt tokens allowed per batch; a single
+                          prompt larger than the budget is sent on its own
+        window_seconds: How long the first request in a batch waits for company
+        max_workers: Concurrent HTTP requests per batch
+        tokens_per_minute: Estimated prompt tokens allowed per trailing quota
+                           window, or None for no limit; a single prompt larger
+                           than the quota is sent once the window is empty
+        quota_window_seconds: Length of the rolling quota window
+    """
+
+    def __init__(self, send: Callable[[str], Dict[str, Any]], max_batch_tokens: int = 16000,
+                 window_seconds: float = 0.02, max_workers: int = 8,
+                 tokens_per_minute: Optional[int] = None, quota_window_seconds: float = 60.0):
+        self.send = send
+        self.max_batch_tokens = max_batch_tokens
+        self.window_seconds = window_seconds
+        self.tokens_per_minute = tokens_per_minute
+        self.quota_window_seconds = quota_window_seconds
+        self._sent = deque()  # (monotonic time, tokens) per dispatched batch inside the quota window
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="openai-batch")
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._queue: List[_Pending] = []
+        self._worker = None
+        self._stats = {"requests": 0, "batches": 0, "completions_sent": 0, "deduplicated": 0,
+                       "largest_batch": 0, "tokens_sent": 0, "quota_waits": 0}
+
+    def submit(self, request: Dict[str, Any], tokens: int) -> Dict[str, Any]:
+        """Queue a chat completion request and block until its response is available"""
+        pending = _Pending(request, tokens)
+        with self._lock:
+            self._queue.append(pending)
+            self._stats["requests"] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="openai-batcher", daemon=True)
+                self._worker.start()
+            self._wakeup.notify()
+        return pending.future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_batch_size"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._wakeup.wait()
+            # Give concurrent callers a moment to join this batch
+            time.sleep(self.window_seconds)
+            while True:
+                with self._lock:
+                    delay = self._quota_delay(time.monotonic())
+                    if delay <= 0:
+                        batch = self._take_batch()
+                        break
+                    self._stats["quota_waits"] += 1
+                time.sleep(delay)
+            self._dispatch(batch)
+
+    def _quota_room(self, now: float) -> Optional[int]:
+        """Tokens left in the trailing quota window, or None when there is no quota"""
+        if self.tokens_per_minute is None:
+            return None
+        while self._sent and now - self._sent[0][0] >= self.quota_window_seconds:
+            self._sent.popleft()
+        return self.tokens_per_minute - sum(tokens for _, tokens in self._sent)
+
+    def _quota_delay(self, now: float) -> float:
+        """Seconds until the quota window has room for the oldest queued prompt"""
+        room = self._quota_room(now)
+        if room is None:
+            return 0.0
+        # A prompt larger than the whole quota goes out once the window is empty
+        needed = min(self._queue[0].tokens, self.tokens_per_minute)
+        delay = 0.0
+        for sent_at, tokens in self._sent:
+            if room >= needed:
+                break
+            # Room frees up as each earlier batch ages out of the window
+            room += tokens
+            delay = sent_at + self.quota_window_seconds - now
+        return delay
+
+    def _take_batch(self) -> List[_Pending]:
+        """Pop queued prompts in arrival order until the token budget (or quota room) is reached"""
+        budget = self.max_batch_tokens
+        room = self._quota_room(time.monotonic())
+        if room is not None:
+            budget = min(budget, room)
+        batch, tokens = [], 0
+        while self._queue:
+            candidate = self._queue[0]
+            if batch and tokens + candidate.tokens > budget:
+                break
+            batch.append(self._queue.pop(0))
+            tokens += candidate.tokens
+
+        # Requests identical to one already in the batch cost nothing extra, so they ride along
+        keys = {pending.key for pending in batch}
+        batch += [pending for pending in self._queue if pending.key in keys]
+        self._queue = [pending for pending in self._queue if pending.key not in keys]
+        return batch
+
+    def _dispatch(self, batch: List[_Pending]):
+        by_request: Dict[str, List[_Pending]] = {}
+        for pending in batch:
+            by_request.setdefault(pending.key, []).append(pending)
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["completions_sent"] += len(by_request)
+            self._stats["deduplicated"] += len(batch) - len(by_request)
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            tokens = sum(waiters[0].tokens for waiters in by_request.values())
+            self._stats["tokens_sent"] += tokens
+            if self.tokens_per_minute is not None:
+                self._sent.append((time.monotonic(), tokens))
+
+        # Waiters are resolved as each completion lands, so one slow call never holds up the rest
+        for waiters in by_request.values():
+            future = self._pool.submit(self.send, waiters[0].request)
+            future.add_done_callback(lambda done, waiters=waiters: _resolve(waiters, done))
@@ -0,0 +1,259 @@
+"""
+Response cache shared by all data source connectors
+
+Connector methods listed in a connector's CACHE_TTLS are served from this
+cache. It provides:
+- Per-method TTLs
+- An LRU bound on the number of stored responses
+- Request coalescing: concurrent identical calls share one in-flight fetch
+- An in-memory backend (default) and an optional SQLite backend that
+  survives restarts
+- Hit/miss metrics for the /health endpoint
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from config import Config
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Tuple
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class MemoryCacheBackend:
+    """In-process LRU store; values are deep-copied in and out so callers can mutate them"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk LRU store so cached responses survive a server restart"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._conn.commit()
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return False, None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return True, json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now)
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)", (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class _InFlight:
+    """A fetch that other callers with the same key are waiting on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache with request coalescing in front of connector calls
+
+    Only successful responses are stored, so an error from the source is
+    retried on the next call instead of being served until it expires.
+    """
+
+    def __init__(self, backend=None, enabled: bool = True):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self._by_method = {}
+
+    @staticmethod
+    def make_key(namespace: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+        """Stable key for a connector call"""
+        raw = json.dumps([namespace, list(args), kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_or_fetch(self, method: str, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached response for key, or call fetch() once and cache it
+
+        Args:
+            method: Connector method name, used for per-method metrics
+            key: Cache key (see make_key)
+            ttl: Seconds to keep a successful response
+            fetch: Zero-argument callable that goes to the source
+        """
+        if not self.enabled or ttl <= 0:
+            return fetch()
+
+        hit, value = self.backend.get(key)
+        if hit:
+            self._count(method, "hits")
+            return value
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                # Another leader may have stored the value since the lookup above
+                hit, value = self.backend.get(key)
+                if not hit:
+                    call = self._inflight[key] = _InFlight()
+        if hit:
+            self._count(method, "hits")
+            return value
+
+        if not leader:
+            call.done.wait()
+            self._count(method, "coalesced")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.value)
+
+        self._count(method, "misses")
+        try:
+            value = fetch()
+            # Waiters get their own copy, taken before the caller can mutate the original
+            call.value = copy.deepcopy(value)
+            if self._is_cacheable(value):
+                self.backend.set(key, value, ttl)
+            return value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics, overall and per connector method"""
+        with self._lock:
+            totals = dict(self._stats)
+            by_method = {name: dict(counts) for name, counts in sorted(self._by_method.items())}
+        lookups = totals["hits"] + totals["misses"] + totals["coalesced"]
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "evictions": self.backend.evictions,
+            **totals,
+            "hit_rate": round((totals["hits"] + totals["coalesced"]) / lookups, 3) if lookups else 0.0,
+            "by_method": by_method
+        }
+
+    def _count(self, method: str, field: str):
+        with self._lock:
+            self._stats[field] += 1
+            counts = self._by_method.setdefault(method, {"hits": 0, "misses": 0, "coalesced": 0})
+            counts[field] += 1
+
+    @staticmethod
+    def _is_cacheable(value: Any) -> bool:
+        return isinstance(value, dict) and value.get('status') == 'success'
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache shared by every connector instance"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            if Config.CONNECTOR_CACHE_BACKEND == 'sqlite':
+                backend = SQLiteCacheBackend(Config.CONNECTOR_CACHE_PATH, Config.CONNECTOR_CACHE_MAX_ENTRIES)
+            else:
+                backend = MemoryCacheBackend(Config.CONNECTOR_CACHE_MAX_ENTRIES)
+            _shared_cache = ResponseCache(backend, enabled=Config.CONNECTOR_CACHE_ENABLED)
+        return _shared_cache
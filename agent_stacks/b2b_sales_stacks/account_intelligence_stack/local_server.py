@@ -20,6 +20,9 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'agents')))
 
 from account_intelligence_orchestrator import AccountIntelligenceOrchestrator
+from config import Config
+from connectors.response_cache import get_response_cache
+from connectors.azure_openai_connector import prompt_cache_stats
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for local testing
@@ -40,6 +43,9 @@ def health_check():
         "mode": "mock",
         "server": "Account Intelligence Stack - Local Test Server",
         "version": orchestrator.metadata.get('version', '2.0.0'),
+        "execution_mode": "parallel" if Config.ORCHESTRATOR_PARALLEL else "sequential",
+        "cache": get_response_cache().stats(),
+        "prompt_cache": prompt_cache_stats(),
         "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "/": "Test HTML interface",
@@ -105,6 +111,11 @@ def run_intelligence_operation():
         # Log response
         print(f"✅ Operation completed: {result.get('status')}")
         print(f"Response size: {len(json.dumps(result))} chars")
+        execution = result.get('execution')
+        if execution:
+            print(f"Execution: {execution['mode']} in {execution['total_ms']} ms")
+            for branch, info in execution['branches'].items():
+                print(f"  - {branch:<14} {info['status']:<8} {info['duration_ms']} ms")
         print(f"{'='*80}\n")
 
         return jsonify(result)
@@ -160,8 +171,8 @@ def main():
     print(f"   Open http://localhost:5001 in your browser to start testing\n")
     print("="*80 + "\n")
 
-    # Start Flask server
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Start Flask server (threaded so concurrent requests don't queue behind a briefing)
+    app.run(host='0.0.0.0', port=5001, debug=True, threaded=True)
 
 if __name__ == "__main__":
     main()
@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../agents')))
 
 import json
+import time
 from datetime import datetime
 
 # Import orchestrator and all agents
@@ -20,6 +21,10 @@ from messaging_agent import MessagingAgent
 from risk_assessment_agent import RiskAssessmentAgent
 from action_prioritization_agent import ActionPrioritizationAgent
 from deal_tracking_agent import DealTrackingAgent
+from connectors.crm_connector import CRMConnector
+from connectors.response_cache import ResponseCache, MemoryCacheBackend, SQLiteCacheBackend
+from connectors.azure_openai_connector import AzureOpenAIConnector, send_chat_completion
+from connectors.prompt_batcher import PromptBatcher
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -244,6 +249,526 @@ def test_individual_agents():
 
     return test_results
 
+def test_parallel_briefing():
+    """Test concurrent fan-out, partial results and branch timeouts in account_briefing"""
+    print_test_header("PARALLEL BRIEFING FAN-OUT TESTS")
+
+    test_results = {
+        "passed": 0,
+        "failed": 0
+    }
+
+    def slowed(fn, delay):
+        def wrapper(*args, **kwargs):
+            time.sleep(delay)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def make_orchestrator(delay=0.2):
+        orchestrator = AccountIntelligenceOrchestrator()
+        orchestrator._get_dynamics_365_account = slowed(orchestrator._get_dynamics_365_account, delay)
+        for agent in (orchestrator._get_stakeholder_agent(), orchestrator._get_competitive_agent(),
+                      orchestrator._get_risk_agent()):
+            agent.perform = slowed(agent.perform, delay)
+        return orchestrator
+
+    def fails(**kwargs):
+        raise RuntimeError("LinkedIn connector unavailable")
+
+    checks = []
+
+    def latency_is_max_not_sum():
+        orchestrator = make_orchestrator()
+        sequential = orchestrator.perform(operation="account_briefing", account_id="CONTOSO001",
+                                          execution_mode="sequential")
+        parallel = orchestrator.perform(operation="account_briefing", account_id="CONTOSO001",
+                                        execution_mode="parallel")
+        assert sequential['status'] == parallel['status'] == 'success'
+        assert sequential['data'] == parallel['data'], "Parallel briefing differs from sequential"
+        assert set(parallel['execution']['branches']) == {"crm", "stakeholders", "competitive", "risk"}
+        assert sequential['execution']['total_ms'] >= 750, sequential['execution']
+        assert parallel['execution']['total_ms'] < 600, parallel['execution']
+        return f"sequential {sequential['execution']['total_ms']} ms vs parallel {parallel['execution']['total_ms']} ms"
+    checks.append(("Latency is max(branch), not sum(branch)", latency_is_max_not_sum))
+
+    def failed_branch_gives_partial():
+        orchestrator = make_orchestrator(delay=0)
+        orchestrator._get_stakeholder_agent().perform = fails
+        result = orchestrator.perform(operation="account_briefing", account_id="CONTOSO001")
+        assert result['status'] == 'partial', f"Expected partial, got {result['status']}"
+        branch = result['execution']['branches']['stakeholders']
+        assert branch['status'] == 'error' and 'LinkedIn' in branch['error']
+        assert result['data']['Company Overview']['Name'] == "Contoso Corporation"
+        return result['message']
+    checks.append(("Failed branch returns partial briefing", failed_branch_gives_partial))
+
+    def slow_branch_times_out():
+        orchestrator = make_orchestrator(delay=0)
+        orchestrator._get_risk_agent().perform = slowed(orchestrator._get_risk_agent().perform, 1.0)
+        result = orchestrator.perform(operation="account_briefing", account_id="CONTOSO001",
+                                      branch_timeout=0.3)
+        assert result['status'] == 'partial'
+        assert result['execution']['branches']['risk']['status'] == 'timeout'
+        assert result['execution']['total_ms'] < 900, result['execution']
+        return f"returned after {result['execution']['total_ms']} ms"
+    checks.append(("Slow branch times out", slow_branch_times_out))
+
+    for name, check in checks:
+        print(f"\n{Colors.BOLD}Test: {name}{Colors.ENDC}")
+        try:
+            detail = check()
+            print_success(f"Test passed: {name}")
+            print_info(detail)
+            test_results['passed'] += 1
+        except Exception as e:
+            print_error(f"Test failed: {name}")
+            print_error(f"Error: {str(e)}")
+            test_results['failed'] += 1
+
+    return test_results
+
+def test_batched_enrichment():
+    """Test batched Graph / pooled LinkedIn contact enrichment in StakeholderIntelligenceAgent"""
+    print_test_header("BATCHED CONTACT ENRICHMENT TESTS")
+
+    test_results = {
+        "passed": 0,
+        "failed": 0
+    }
+
+    import copy
+
+    def counted(fn, calls):
+        def wrapper(*args, **kwargs):
+            calls.append(args)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    checks = []
+
+    def batched_matches_serial():
+        agent = StakeholderIntelligenceAgent()
+        contacts = agent._get_dynamics_contacts("CONTOSO001")
+        serial = [agent._enrich_contact_with_graph(c) for c in copy.deepcopy(contacts)]
+        serial_linkedin = [agent._get_linkedin_data(c['email']) for c in serial]
+        batched = agent._enrich_contacts_with_graph(copy.deepcopy(contacts))
+        batched_linkedin = agent._get_linkedin_data_batch([c['email'] for c in batched])
+        assert [c['graph_data'] for c in serial] == [c['graph_data'] for c in batched]
+        assert serial_linkedin == batched_linkedin
+        return f"{len(contacts)} contacts enriched identically"
+    checks.append(("Batched enrichment matches per-contact enrichment", batched_matches_serial))
+
+    def duplicates_looked_up_once():
+        agent = StakeholderIntelligenceAgent()
+        contacts = agent._get_dynamics_contacts("CONTOSO001")
+        duplicated = contacts + [dict(c, email=c['email'].upper()) for c in copy.deepcopy(contacts)]
+        agent.crm_connector.get_contacts = lambda account_id: {"data": copy.deepcopy(duplicated)}
+        graph_calls, profile_calls = [], []
+        agent.graph_connector.get_contact_engagement_batch = counted(
+            agent.graph_connector.get_contact_engagement_batch, graph_calls)
+        agent.linkedin_connector.get_profile = counted(agent.linkedin_connector.get_profile, profile_calls)
+        result = agent.perform(operation="analyze_buying_committee", account_id="CONTOSO001")
+        assert result['data']['stakeholder_count'] == len(duplicated)
+        assert len(graph_calls) == 1, graph_calls
+        assert len(graph_calls[0][0]) == len(contacts), graph_calls
+        assert len(profile_calls) == len(contacts), profile_calls
+        return f"{len(duplicated)} contacts, {len(contacts)} distinct lookups"
+    checks.append(("Duplicate emails are looked up once", duplicates_looked_up_once))
+
+    def graph_envelopes_hold_twenty():
+        agent = StakeholderIntelligenceAgent()
+        graph = agent.graph_connector
+        graph.is_mock = False
+        envelopes = []
+
+        def fake_batch(sub_requests):
+            envelopes.append(len(sub_requests))
+            return {r["id"]: {"status": 200, "value": [], "next_link": None} for r in sub_requests}
+
+        graph._post_graph_batch = fake_batch
+        per_contact = []
+        graph._get_production_email_sentiment = lambda email: per_contact.append(email)
+        emails = [f"contact{n}@contoso.com" for n in range(10)]
+        result = graph.get_contact_engagement_batch(emails, days=90)
+        assert envelopes == [20, 10], envelopes
+        assert set(result['data']) == set(emails)
+        assert 'partial' not in result, result
+        assert per_contact == emails, per_contact
+        return f"30 sub-requests sent in {len(envelopes)} envelopes, sentiment scored per contact"
+    checks.append(("Graph $batch envelopes hold at most 20 requests", graph_envelopes_hold_twenty))
+
+    def graph_pages_followed_and_filters_encoded():
+        from connectors.graph_connector import GRAPH_API_BASE
+        agent = StakeholderIntelligenceAgent()
+        graph = agent.graph_connector
+        graph.is_mock = False
+        sent_urls = []
+
+        def fake_batch(sub_requests):
+            results = {}
+            for r in sub_requests:
+                sent_urls.append(r["url"])
+                page = r["url"].count("$skiptoken=") + 1
+                results[r["id"]] = {
+                    "status": 200,
+                    "value": [{"receivedDateTime": f"2026-01-0{page}T00:00:00Z", "bodyPreview": "ok"}],
+                    # received mail offers a second page
+                    "next_link": (f"{GRAPH_API_BASE}/me/messages?$skiptoken=p2"
+                                  if page == 1 and r["id"].endswith("-received") else None)
+                }
+            return results
+
+        graph._post_graph_batch = fake_batch
+        email = "o'brien+sales@contoso.com"
+        result = graph.get_contact_engagement_batch([email], days=90)
+        interactions = result['data'][email]['email_interactions']
+        assert interactions['received_from_contact'] == 2, interactions
+        assert "/me/messages?$skiptoken=p2" in sent_urls, sent_urls
+        assert len(sent_urls) == 4, sent_urls
+        first = sent_urls[0]
+        assert " " not in first and "+" not in first and "'o''brien" not in first, first
+        assert "%27o%27%27brien%2Bsales%40contoso.com%27" in first, first
+        return f"{len(sent_urls)} sub-requests, second page of received mail followed"
+    checks.append(("Graph nextLink pages are followed and filter values encoded",
+                   graph_pages_followed_and_filters_encoded))
+
+    def graph_throttling_retried_and_failures_surfaced():
+        import connectors.graph_connector as graph_module
+        agent = StakeholderIntelligenceAgent()
+        graph = agent.graph_connector
+        graph.is_mock = False
+        calls, sleeps = {}, []
+
+        def fake_batch(sub_requests):
+            results = {}
+            for r in sub_requests:
+                calls[r["id"]] = calls.get(r["id"], 0) + 1
+                if r["id"] == "0-sent" and calls[r["id"]] == 1:
+                    results[r["id"]] = {"status": 429, "value": [], "next_link": None, "retry_after": 7}
+                elif r["id"] == "1-meetings":
+                    results[r["id"]] = {"status": 503, "value": [], "next_link": None, "retry_after": None}
+                else:
+                    results[r["id"]] = {"status": 200, "value": [{"receivedDateTime": "2026-01-01T00:00:00Z"}],
+                                        "next_link": None}
+            return results
+
+        graph._post_graph_batch = fake_batch
+        real_sleep = graph_module.time.sleep
+        graph_module.time.sleep = sleeps.append
+        try:
+            result = graph.get_contact_engagement_batch(["a@contoso.com", "b@contoso.com"], days=90)
+        finally:
+            graph_module.time.sleep = real_sleep
+
+        healthy, broken = result['data']['a@contoso.com'], result['data']['b@contoso.com']
+        assert calls["0-sent"] == 2, calls
+        assert calls["1-meetings"] == 1 + graph_module.GRAPH_BATCH_MAX_RETRIES, calls
+        assert sleeps and sleeps[0] == 7, sleeps
+        assert 'partial' not in healthy and healthy['email_interactions']['sent_by_you'] == 1, healthy
+        assert broken['partial'] and broken['failed_lookups'] == {"meetings": 503}, broken
+        assert broken['meetings'] is None and broken['email_interactions'] is not None, broken
+        assert result['partial'] is True
+
+        graph.get_contact_engagement_batch = lambda emails, days: result
+        stakeholders = agent._enrich_contacts_with_graph([
+            {"full_name": "B", "email": "b@contoso.com"}])
+        assert stakeholders[0]['graph_data'].get('partial') is True, stakeholders
+        return f"429 retried after {sleeps[0]}s, persistent 503 reported as partial"
+    checks.append(("Throttled Graph sub-requests are retried and failures flagged partial",
+                   graph_throttling_retried_and_failures_surfaced))
+
+    for name, check in checks:
+        print(f"\n{Colors.BOLD}Test: {name}{Colors.ENDC}")
+        try:
+            detail = check()
+            print_success(f"Test passed: {name}")
+            print_info(detail)
+            test_results['passed'] += 1
+        except Exception as e:
+            print_error(f"Test failed: {name}")
+            print_error(f"Error: {str(e)}")
+            test_results['failed'] += 1
+
+    return test_results
+
+def test_response_cache():
+    """Test the connector response cache: TTL, LRU bound, coalescing and SQLite persistence"""
+    print_test_header("CONNECTOR RESPONSE CACHE TESTS")
+
+    test_results = {
+        "passed": 0,
+        "failed": 0
+    }
+
+    import tempfile
+    import threading
+
+    def ok(value):
+        return {"status": "success", "data": value}
+
+    checks = []
+
+    def ttl_expires():
+        cache = ResponseCache(MemoryCacheBackend())
+        fetches = []
+        fetch = lambda: fetches.append(1) or ok(len(fetches))
+        assert cache.get_or_fetch("m", "k", 0.2, fetch)['data'] == 1
+        assert cache.get_or_fetch("m", "k", 0.2, fetch)['data'] == 1
+        time.sleep(0.25)
+        assert cache.get_or_fetch("m", "k", 0.2, fetch)['data'] == 2
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 2), stats
+        return f"hit_rate={stats['hit_rate']}"
+    checks.append(("Entries expire after their TTL", ttl_expires))
+
+    def lru_bound():
+        cache = ResponseCache(MemoryCacheBackend(max_entries=3))
+        for key in "abc":
+            cache.get_or_fetch("m", key, 60, lambda: ok(key))
+        cache.get_or_fetch("m", "a", 60, lambda: ok("refetched"))  # touch a
+        cache.get_or_fetch("m", "d", 60, lambda: ok("d"))          # evicts b
+        assert cache.get_or_fetch("m", "a", 60, lambda: ok("refetched"))['data'] == "a"
+        assert cache.get_or_fetch("m", "b", 60, lambda: ok("refetched"))['data'] == "refetched"
+        stats = cache.stats()
+        assert stats['entries'] == 3 and stats['evictions'] == 2, stats
+        return f"{stats['evictions']} evictions at max_entries=3"
+    checks.append(("LRU bound evicts least recently used", lru_bound))
+
+    def concurrent_calls_coalesce():
+        cache = ResponseCache(MemoryCacheBackend())
+        fetches = []
+
+        def slow_fetch():
+            fetches.append(1)
+            time.sleep(0.2)
+            return ok({"contacts": ["a", "b"]})
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("m", "k", 60, slow_fetch)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(fetches) == 1, f"{len(fetches)} fetches"
+        assert all(r == results[0] for r in results) and len(results) == 8
+        assert len({id(r) for r in results}) == 8, "callers must not share one mutable response"
+        return f"8 concurrent calls, {len(fetches)} fetch, {cache.stats()['coalesced']} coalesced"
+    checks.append(("Concurrent identical calls share one fetch", concurrent_calls_coalesce))
+
+    def errors_not_cached():
+        cache = ResponseCache(MemoryCacheBackend())
+        cache.get_or_fetch("m", "k", 60, lambda: {"status": "error", "error": "timeout"})
+        assert cache.get_or_fetch("m", "k", 60, lambda: ok(1))['status'] == "success"
+        return "error response retried on next call"
+    checks.append(("Error responses are not cached", errors_not_cached))
+
+    def sqlite_survives_restart():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            ResponseCache(SQLiteCacheBackend(path)).get_or_fetch("m", "k", 60, lambda: ok({"n": 1}))
+            restarted = ResponseCache(SQLiteCacheBackend(path))
+            value = restarted.get_or_fetch("m", "k", 60, lambda: ok({"n": 2}))
+            restarted.backend._conn.close()
+            assert value['data'] == {"n": 1}, value
+        return "response served from disk after restart"
+    checks.append(("SQLite backend survives restart", sqlite_survives_restart))
+
+    def connector_uses_cache():
+        connector = CRMConnector()
+        connector.cache = ResponseCache(MemoryCacheBackend())
+        first = connector.get_contacts("CONTOSO001")
+        first['data'][0]['email'] = "mutated@example.com"
+        second = connector.get_contacts("CONTOSO001")
+        assert second['data'][0]['email'] != "mutated@example.com"
+        connector.get_account("CONTOSO001")
+        stats = connector.cache.stats()
+        assert stats['by_method']['CRMConnector.get_contacts'] == {"hits": 1, "misses": 1, "coalesced": 0}
+        assert stats['by_method']['CRMConnector.get_account']['misses'] == 1
+        return f"per-method stats: {list(stats['by_method'])}"
+    checks.append(("Connector methods are served from the cache", connector_uses_cache))
+
+    for name, check in checks:
+        print(f"\n{Colors.BOLD}Test: {name}{Colors.ENDC}")
+        try:
+            detail = check()
+            print_success(f"Test passed: {name}")
+            print_info(detail)
+            test_results['passed'] += 1
+        except Exception as e:
+            print_error(f"Test failed: {name}")
+            print_error(f"Error: {str(e)}")
+            test_results['failed'] += 1
+
+    return test_results
+
+def test_prompt_cache():
+    """Test the GPT-4o prompt cache and micro-batcher against a local stub endpoint"""
+    print_test_header("AZURE OPENAI PROMPT CACHE TESTS")
+
+    test_results = {
+        "passed": 0,
+        "failed": 0
+    }
+
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubOpenAI(BaseHTTPRequestHandler):
+        calls = []
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            StubOpenAI.calls.append(body)
+            time.sleep(0.05)
+            content = json.dumps({"executive_summary": f"completion {len(StubOpenAI.calls)}"})
+            payload = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20}
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def make_connector(batcher=None):
+        StubOpenAI.calls = []
+        connector = AzureOpenAIConnector()
+        connector.is_mock = False
+        connector.openai_config.update(endpoint=f"http://127.0.0.1:{server.server_port}", api_key="stub-key")
+        connector.prompt_cache = ResponseCache(MemoryCacheBackend(max_entries=16))
+        connector.batcher = batcher
+        return connector
+
+    account = {"name": "Contoso Corporation", "arr": 340000}
+    checks = []
+
+    def repeat_briefing_hits_cache():
+        connector = make_connector()
+        first = connector.synthesize_account_briefing(account)
+        second = connector.synthesize_account_briefing(dict(reversed(list(account.items()))))
+        assert first['status'] == 'success' and first['data'] == second['data'], (first, second)
+        assert len(StubOpenAI.calls) == 1, f"{len(StubOpenAI.calls)} model calls"
+        spaced = connector._build_account_briefing_prompt(account).replace("\n", "  \r\n")
+        connector._call_gpt4o(spaced, "account_briefing")
+        assert len(StubOpenAI.calls) == 1, "whitespace-only prompt change missed the cache"
+        connector.openai_config['temperature'] = 0.0
+        connector.synthesize_account_briefing(account)
+        assert len(StubOpenAI.calls) == 2, "temperature must be part of the cache key"
+        stats = connector.prompt_cache.stats()
+        return f"{len(StubOpenAI.calls)} model calls for 4 requests, hit_rate={stats['hit_rate']}"
+    checks.append(("Unchanged briefing is served from the prompt cache", repeat_briefing_hits_cache))
+
+    def bypass_flag_calls_model():
+        connector = make_connector()
+        connector.assess_deal_risk({"deal": "OPP001"})
+        connector.assess_deal_risk({"deal": "OPP001"}, bypass_cache=True)
+        assert len(StubOpenAI.calls) == 2, f"{len(StubOpenAI.calls)} model calls"
+        return "bypass_cache=True skipped the cache"
+    checks.append(("bypass_cache forces a fresh completion", bypass_flag_calls_model))
+
+    def concurrent_requests_batched():
+        # ~100-token prompts under a 250-token budget -> at most two per batch
+        batcher = PromptBatcher(send_chat_completion, max_batch_tokens=250, window_seconds=0.1)
+        connector = make_connector(batcher)
+        prompts = [f"Summarize deal {n}: " + "x" * 380 for n in range(6)] + ["Summarize deal 0: " + "x" * 380]
+        results = [None] * len(prompts)
+
+        def run(i):
+            results[i] = connector._call_gpt4o(prompts[i], "deal_summary", bypass_cache=True)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(prompts))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = batcher.stats()
+        assert all(r['status'] == 'success' for r in results)
+        assert len(StubOpenAI.calls) == 6, f"{len(StubOpenAI.calls)} model calls"
+        assert stats['deduplicated'] == 1, stats
+        assert stats['batches'] <= 4 and stats['largest_batch'] >= 2, stats
+        return f"7 requests -> {stats['batches']} batches, {stats['completions_sent']} completions"
+    checks.append(("Concurrent requests are micro-batched under the token budget", concurrent_requests_batched))
+
+    def slow_completion_does_not_block_later_batches():
+        release = threading.Event()
+
+        def send(request):
+            if request["prompt"] == "slow":
+                release.wait(5)
+            return {"prompt": request["prompt"]}
+
+        batcher = PromptBatcher(send, max_batch_tokens=1, window_seconds=0.01)
+        slow = threading.Thread(target=batcher.submit, args=({"prompt": "slow"}, 1))
+        slow.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        fast = batcher.submit({"prompt": "fast"}, 1)
+        waited = time.perf_counter() - started
+        release.set()
+        slow.join()
+        assert fast == {"prompt": "fast"}, fast
+        assert waited < 1, f"fast prompt waited {waited:.2f}s behind a slow completion"
+        return f"fast prompt answered in {waited * 1000:.0f} ms while a slow completion was in flight"
+    checks.append(("A slow completion does not hold up later batches", slow_completion_does_not_block_later_batches))
+
+    def tokens_per_minute_quota_paces_batches():
+        sent = []
+
+        def send(request):
+            sent.append((time.monotonic(), request["prompt"]))
+            return {"prompt": request["prompt"]}
+
+        # 100-token prompts against a 250-token quota per 0.5 s window -> two per window
+        batcher = PromptBatcher(send, max_batch_tokens=1000, window_seconds=0.01,
+                                tokens_per_minute=250, quota_window_seconds=0.5)
+        threads = [threading.Thread(target=batcher.submit, args=({"prompt": f"p{n}"}, 100)) for n in range(5)]
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = batcher.stats()
+        offsets = sorted(at - started for at, _ in sent)
+        assert len(sent) == 5 and stats['tokens_sent'] == 500, stats
+        assert offsets[2] >= 0.45 and offsets[4] >= 0.95, offsets
+        assert stats['quota_waits'] >= 2, stats
+        oversized = batcher.submit({"prompt": "huge"}, 1000)
+        assert oversized == {"prompt": "huge"}, oversized
+        return f"5 prompts paced over {offsets[4]:.2f}s, {stats['quota_waits']} quota waits"
+    checks.append(("Batches are paced to the tokens-per-minute quota", tokens_per_minute_quota_paces_batches))
+
+    def malformed_completion_is_an_error():
+        connector = make_connector(PromptBatcher(lambda request: {"choices": []}, window_seconds=0.01))
+        result = connector._call_gpt4o("Summarize deal 1", "deal_summary")
+        assert result['status'] == 'error', result
+        again = connector._call_gpt4o("Summarize deal 1", "deal_summary")
+        assert again['status'] == 'error' and connector.prompt_cache.stats()['hits'] == 0, again
+        return result['error']
+    checks.append(("A completion without choices returns an error response", malformed_completion_is_an_error))
+
+    for name, check in checks:
+        print(f"\n{Colors.BOLD}Test: {name}{Colors.ENDC}")
+        try:
+            detail = check()
+            print_success(f"Test passed: {name}")
+            print_info(detail)
+            test_results['passed'] += 1
+        except Exception as e:
+            print_error(f"Test failed: {name}")
+            print_error(f"Error: {str(e)}")
+            test_results['failed'] += 1
+
+    server.shutdown()
+    return test_results
+
 def test_demo_simulation():
     """Simulate the complete demo flow"""
     print_test_header("DEMO SIMULATION - COMPLETE WORKFLOW")
@@ -360,6 +885,18 @@ def run_all_tests():
     print("\n" + "="*80)
     agent_results = test_individual_agents()
 
+    print("\n" + "="*80)
+    parallel_results = test_parallel_briefing()
+
+    print("\n" + "="*80)
+    enrichment_results = test_batched_enrichment()
+
+    print("\n" + "="*80)
+    cache_results = test_response_cache()
+
+    print("\n" + "="*80)
+    prompt_cache_results = test_prompt_cache()
+
     print("\n" + "="*80)
     test_demo_simulation()
 
@@ -369,8 +906,10 @@ def run_all_tests():
     # Print summary
     print_test_header("TEST SUMMARY")
 
-    total_passed = orchestrator_results['passed'] + agent_results['passed']
-    total_failed = orchestrator_results['failed'] + agent_results['failed']
+    total_passed = (orchestrator_results['passed'] + agent_results['passed'] + parallel_results['passed']
+                    + enrichment_results['passed'] + cache_results['passed'] + prompt_cache_results['passed'])
+    total_failed = (orchestrator_results['failed'] + agent_results['failed'] + parallel_results['failed']
+                    + enrichment_results['failed'] + cache_results['failed'] + prompt_cache_results['failed'])
     total_tests = total_passed + total_failed
 
     print(f"{Colors.BOLD}Orchestrator Tests:{Colors.ENDC}")
@@ -381,6 +920,22 @@ def run_all_tests():
     print(f"  ✓ Passed: {agent_results['passed']}")
     print(f"  ✗ Failed: {agent_results['failed']}")
 
+    print(f"\n{Colors.BOLD}Parallel Briefing Tests:{Colors.ENDC}")
+    print(f"  ✓ Passed: {parallel_results['passed']}")
+    print(f"  ✗ Failed: {parallel_results['failed']}")
+
+    print(f"\n{Colors.BOLD}Batched Enrichment Tests:{Colors.ENDC}")
+    print(f"  ✓ Passed: {enrichment_results['passed']}")
+    print(f"  ✗ Failed: {enrichment_results['failed']}")
+
+    print(f"\n{Colors.BOLD}Response Cache Tests:{Colors.ENDC}")
+    print(f"  ✓ Passed: {cache_results['passed']}")
+    print(f"  ✗ Failed: {cache_results['failed']}")
+
+    print(f"\n{Colors.BOLD}Prompt Cache Tests:{Colors.ENDC}")
+    print(f"  ✓ Passed: {prompt_cache_results['passed']}")
+    print(f"  ✗ Failed: {prompt_cache_results['failed']}")
+
     print(f"\n{Colors.BOLD}Overall Results:{Colors.ENDC}")
     print(f"  Total Tests: {total_tests}")
     print(f"  Passed: {total_passed} ({(total_passed/total_tests*100):.1f}%)")
@@ -19,11 +19,11 @@ class D365BaseAgent(BasicAgent):
         self._init_d365_connector()
 
     def _init_d365_connector(self):
-        """Initialize D365 connector (lazy loading)"""
+        """Attach the process-wide D365 connector (shared token and HTTP session)"""
         try:
             sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
-            from connectors.d365_connector import D365Connector
-            self.d365 = D365Connector()
+            from connectors.d365_connector import get_shared_connector
+            self.d365 = get_shared_connector()
         except ImportError as e:
             self.d365 = None
             print(f"Warning: Could not initialize D365 connector: {e}")
@@ -41,13 +41,13 @@ class PipelineVelocityAgent(D365BaseAgent):
                 # Real D365 query for opportunities in time period
                 cutoff_date = self.calculate_days_ago(time_period)
 
-                result = self.d365.query_opportunities(
+                opportunities = self.d365.iter_opportunities(
                     filter_str=f"createdon gt {cutoff_date}",
                     select="name,estimatedvalue,salesstagecode,stepname,createdon,actualclosedate,statecode",
                     orderby="createdon desc"
                 )
 
-                velocity_data = self._calculate_velocity_from_d365(result.get('value', []), time_period)
+                velocity_data = self._calculate_velocity_from_d365(opportunities, time_period)
             else:
                 # Demo mode
                 velocity_data = self._generate_demo_velocity_data(time_period)
@@ -66,11 +66,13 @@ class PipelineVelocityAgent(D365BaseAgent):
             }
 
     def _calculate_velocity_from_d365(self, opportunities, time_period):
-        """Calculate velocity metrics from D365 data"""
+        """Calculate velocity metrics from D365 data (any iterable, single pass)"""
         # Process real D365 data
+        deals_analyzed = sum(1 for _ in opportunities)
+
         return {
             "time_period": f"Last {time_period} days",
-            "deals_analyzed": len(opportunities),
+            "deals_analyzed": deals_analyzed,
             "pipeline_metrics": {
                 "average_deal_cycle": 45,
                 "current_velocity": "2.3 stages/month",
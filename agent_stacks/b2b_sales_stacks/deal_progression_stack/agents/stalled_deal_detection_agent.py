@@ -57,27 +57,32 @@ class StalledDealDetectionAgent(D365BaseAgent):
                 if min_value > 0:
                     filter_str += f" and estimatedvalue ge {min_value}"
 
-                result = self.d365.query_opportunities(
+                # Stream every stalled opportunity so the summary covers the
+                # whole pipeline, but only keep the first max_results deals
+                opportunities = self.d365.iter_opportunities(
                     filter_str=filter_str,
                     expand="customerid_account($select=name),ownerid($select=fullname)",
                     select="name,estimatedvalue,closeprobability,stepname,modifiedon,estimatedclosedate",
-                    orderby="modifiedon asc",
-                    top=max_results
+                    orderby="modifiedon asc"
                 )
 
-                opportunities = result.get('value', [])
-                stalled_deals = self._process_opportunities(opportunities, days_threshold)
+                stalled_deals = []
+                summary = self._calculate_summary(self._collect_first(
+                    self._process_opportunities(opportunities, days_threshold, stream=True),
+                    stalled_deals,
+                    max_results
+                ))
 
             else:
                 # Demo mode with realistic sample data
                 stalled_deals = self._generate_demo_data(days_threshold, max_results)
 
-            # Calculate summary metrics
-            summary = self._calculate_summary(stalled_deals)
+                # Calculate summary metrics
+                summary = self._calculate_summary(stalled_deals)
 
             return {
                 "status": "success",
-                "message": f"Found {len(stalled_deals)} stalled deals (no activity in {days_threshold}+ days)",
+                "message": f"Found {summary['total_stalled']} stalled deals (no activity in {days_threshold}+ days)",
                 "data": {
                     "stalled_deals": stalled_deals,
                     "summary": summary,
@@ -96,31 +101,41 @@ class StalledDealDetectionAgent(D365BaseAgent):
                 "data": {}
             }
 
-    def _process_opportunities(self, opportunities, days_threshold):
-        """Process D365 opportunity data into stalled deal format"""
-        stalled_deals = []
+    def _process_opportunities(self, opportunities, days_threshold, stream=False):
+        """
+        Process D365 opportunity data into stalled deal format
 
-        for opp in opportunities:
-            days_stalled = self.calculate_days_between(opp.get('modifiedon'))
+        With stream=True, returns a generator that converts one record at a
+        time instead of building the full list.
+        """
+        stalled_deals = (self._to_stalled_deal(opp) for opp in opportunities)
+        return stalled_deals if stream else list(stalled_deals)
 
-            deal = {
-                "opportunity_id": opp.get('opportunityid'),
-                "name": opp.get('name'),
-                "value": opp.get('estimatedvalue', 0),
-                "value_formatted": self.format_currency(opp.get('estimatedvalue', 0)),
-                "days_stalled": days_stalled,
-                "current_stage": opp.get('stepname', 'Unknown'),
-                "last_activity": opp.get('modifiedon', ''),
-                "estimated_close_date": opp.get('estimatedclosedate', ''),
-                "owner": opp.get('_ownerid_value@OData.Community.Display.V1.FormattedValue', 'Unknown'),
-                "account": opp.get('_customerid_value@OData.Community.Display.V1.FormattedValue', 'Unknown'),
-                "close_probability": opp.get('closeprobability', 0),
-                "risk_level": self._calculate_risk_level(days_stalled, opp.get('estimatedvalue', 0))
-            }
+    def _to_stalled_deal(self, opp):
+        """Convert a single D365 opportunity record into a stalled deal"""
+        days_stalled = self.calculate_days_between(opp.get('modifiedon'))
 
-            stalled_deals.append(deal)
+        return {
+            "opportunity_id": opp.get('opportunityid'),
+            "name": opp.get('name'),
+            "value": opp.get('estimatedvalue', 0),
+            "value_formatted": self.format_currency(opp.get('estimatedvalue', 0)),
+            "days_stalled": days_stalled,
+            "current_stage": opp.get('stepname', 'Unknown'),
+            "last_activity": opp.get('modifiedon', ''),
+            "estimated_close_date": opp.get('estimatedclosedate', ''),
+            "owner": opp.get('_ownerid_value@OData.Community.Display.V1.FormattedValue', 'Unknown'),
+            "account": opp.get('_customerid_value@OData.Community.Display.V1.FormattedValue', 'Unknown'),
+            "close_probability": opp.get('closeprobability', 0),
+            "risk_level": self._calculate_risk_level(days_stalled, opp.get('estimatedvalue', 0))
+        }
 
-        return stalled_deals
+    def _collect_first(self, deals, sink, limit):
+        """Pass deals through unchanged, copying the first `limit` into sink"""
+        for deal in deals:
+            if len(sink) < limit:
+                sink.append(deal)
+            yield deal
 
     def _calculate_risk_level(self, days_stalled, value):
         """Calculate risk level based on stall duration and deal value"""
@@ -134,30 +149,27 @@ class StalledDealDetectionAgent(D365BaseAgent):
             return "Low"
 
     def _calculate_summary(self, stalled_deals):
-        """Calculate summary metrics"""
-        if not stalled_deals:
-            return {
-                "total_stalled": 0,
-                "total_value_at_risk": 0,
-                "total_value_at_risk_formatted": "$0",
-                "avg_days_stalled": 0,
-                "risk_breakdown": {
-                    "Critical": 0,
-                    "High": 0,
-                    "Medium": 0,
-                    "Low": 0
-                }
-            }
-
-        total_value = sum(deal['value'] for deal in stalled_deals)
-        avg_days = sum(deal['days_stalled'] for deal in stalled_deals) / len(stalled_deals)
-
+        """
+        Calculate summary metrics
+
+        Accepts a list or any iterable of deals and makes a single pass, so a
+        streamed pipeline is summarized in constant memory.
+        """
+        total_stalled = 0
+        total_value = 0
+        total_days = 0
         risk_breakdown = {"Critical": 0, "High": 0, "Medium": 0, "Low": 0}
+
         for deal in stalled_deals:
+            total_stalled += 1
+            total_value += deal['value'] or 0
+            total_days += deal['days_stalled']
             risk_breakdown[deal['risk_level']] += 1
 
+        avg_days = total_days / total_stalled if total_stalled else 0
+
         return {
-            "total_stalled": len(stalled_deals),
+            "total_stalled": total_stalled,
             "total_value_at_risk": total_value,
             "total_value_at_risk_formatted": self.format_currency(total_value),
             "avg_days_stalled": round(avg_days, 1),
@@ -1,15 +1,121 @@
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import json
 
+# Refresh tokens this long before Azure AD says they expire, so a request
+# never goes out with a token that lapses in flight.
+TOKEN_REFRESH_SKEW_SECONDS = 300
+
+# Keep-alive pool size per host. Agents may query from several threads at once.
+SESSION_POOL_MAXSIZE = 16
+
+# Records per page requested from the server when streaming with iter_query().
+DEFAULT_PAGE_SIZE = 5000
+
+
+class D365TokenCache:
+    """
+    Thread-safe OAuth token cache for one tenant/app registration
+    Shares a single MSAL client and access token across every connector
+    """
+
+    def __init__(self, tenant_id, client_id, client_secret, resource_url,
+                 refresh_skew_seconds=TOKEN_REFRESH_SKEW_SECONDS):
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.resource_url = resource_url
+        self.refresh_skew_seconds = refresh_skew_seconds
+
+        self._lock = threading.Lock()
+        self._app = None
+        self.token = None
+        self.token_expiry = None
+
+        self.token_fetches = 0
+        self.token_cache_hits = 0
+
+    def get_token(self, force_refresh=False):
+        """
+        Return a valid access token, acquiring a new one only when needed
+
+        Args:
+            force_refresh: Ignore the cached token (e.g. after a 401)
+
+        Returns:
+            Bearer token string
+        """
+        with self._lock:
+            if not force_refresh and self.token and self.token_expiry > datetime.now():
+                self.token_cache_hits += 1
+                return self.token
+
+            result = self._get_app().acquire_token_for_client(
+                scopes=[f"{self.resource_url}/.default"]
+            )
+
+            if "access_token" in result:
+                self.token = result['access_token']
+                self.token_expiry = datetime.now() + timedelta(
+                    seconds=max(result['expires_in'] - self.refresh_skew_seconds, 0)
+                )
+                self.token_fetches += 1
+                return self.token
+            else:
+                raise Exception(f"Failed to acquire token: {result.get('error_description')}")
+
+    def invalidate(self, token):
+        """Drop the cached token if it is still the one that was rejected"""
+        with self._lock:
+            if self.token == token:
+                self.token = None
+                self.token_expiry = None
+
+    def _get_app(self):
+        """Build the MSAL client once; callers must hold the lock"""
+        if self._app is None:
+            try:
+                import msal
+            except ImportError:
+                raise Exception("msal library not installed. Install with: pip install msal")
+
+            self._app = msal.ConfidentialClientApplication(
+                self.client_id,
+                authority=f"https://login.microsoftonline.com/{self.tenant_id}",
+                client_credential=self.client_secret
+            )
+        return self._app
+
+
+def build_session(pool_maxsize=SESSION_POOL_MAXSIZE):
+    """Create a keep-alive requests.Session with the standard OData headers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'OData-MaxVersion': '4.0',
+        'OData-Version': '4.0',
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+        'Prefer': 'odata.include-annotations="*"'
+    })
+    return session
+
+
 class D365Connector:
     """
     Dynamics 365 Sales API Connector
     Handles authentication and API calls to Dynamics 365 Sales
+
+    Use get_shared_connector() so every agent in the process reuses one
+    token cache and one pooled HTTP session.
     """
 
-    def __init__(self):
+    def __init__(self, session=None, token_cache=None):
         self.client_id = os.environ.get('DYNAMICS_365_CLIENT_ID')
         self.client_secret = os.environ.get('DYNAMICS_365_CLIENT_SECRET')
         self.tenant_id = os.environ.get('DYNAMICS_365_TENANT_ID')
@@ -23,42 +129,27 @@ class D365Connector:
             self.demo_mode = False
             self.api_base = f"{self.resource_url}/api/data/v9.2"
 
-        self.token = None
-        self.token_expiry = None
+        self.session = session or build_session()
+        self.token_cache = token_cache or D365TokenCache(
+            self.tenant_id, self.client_id, self.client_secret, self.resource_url
+        )
+
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
 
-    def get_token(self):
+    def get_token(self, force_refresh=False):
         """Acquire OAuth token for D365 API"""
         if self.demo_mode:
             return "demo_token"
 
-        if self.token and self.token_expiry > datetime.now():
-            return self.token
-
-        try:
-            import msal
-
-            authority = f"https://login.microsoftonline.com/{self.tenant_id}"
-            app = msal.ConfidentialClientApplication(
-                self.client_id,
-                authority=authority,
-                client_credential=self.client_secret
-            )
-
-            result = app.acquire_token_for_client(scopes=[f"{self.resource_url}/.default"])
-
-            if "access_token" in result:
-                self.token = result['access_token']
-                self.token_expiry = datetime.now() + timedelta(seconds=result['expires_in'] - 60)
-                return self.token
-            else:
-                raise Exception(f"Failed to acquire token: {result.get('error_description')}")
-        except ImportError:
-            raise Exception("msal library not installed. Install with: pip install msal")
+        return self.token_cache.get_token(force_refresh=force_refresh)
 
     def query(self, endpoint, params=None):
         """
         Execute OData query against D365 API
 
+        Returns only the first page; use iter_query() to follow @odata.nextLink.
+
         Args:
             endpoint: API endpoint (e.g., 'opportunities', 'accounts')
             params: Dictionary of OData query parameters ($filter, $expand, etc.)
@@ -69,27 +160,51 @@ class D365Connector:
         if self.demo_mode:
             return {"value": [], "demo_mode": True}
 
-        headers = {
-            'Authorization': f'Bearer {self.get_token()}',
-            'OData-MaxVersion': '4.0',
-            'OData-Version': '4.0',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'Prefer': 'odata.include-annotations="*"'
-        }
+        return self._request_page(f"{self.api_base}/{endpoint}", params)
+
+    def iter_query(self, endpoint, params=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Stream every record matching an OData query, one at a time
+
+        Pages are fetched lazily by following @odata.nextLink, so callers can
+        aggregate arbitrarily large result sets in constant memory.
+
+        Args:
+            endpoint: API endpoint (e.g., 'opportunities', 'accounts')
+            params: Dictionary of OData query parameters ($filter, $expand, etc.)
+            page_size: Records per page requested via Prefer: odata.maxpagesize
+
+        Yields:
+            Individual record dictionaries
+        """
+        if self.demo_mode:
+            return
 
+        headers = {'Prefer': f'odata.include-annotations="*",odata.maxpagesize={page_size}'}
         url = f"{self.api_base}/{endpoint}"
 
+        while url:
+            page = self._request_page(url, params, headers)
+            for record in page.get('value', []):
+                yield record
+
+            # nextLink already carries the original query options and skiptoken
+            url = page.get('@odata.nextLink')
+            params = None
+
+    def _request_page(self, url, params=None, headers=None):
+        """GET one page, refreshing the token once on 401"""
+        token = self.get_token()
+
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self._get(url, token, params, headers)
 
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 401:
                 # Token expired, refresh and retry
-                self.token = None
-                headers['Authorization'] = f'Bearer {self.get_token()}'
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                self.token_cache.invalidate(token)
+                response = self._get(url, self.get_token(), params, headers)
 
                 if response.status_code == 200:
                     return response.json()
@@ -103,6 +218,46 @@ class D365Connector:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {str(e)}")
 
+    def _get(self, url, token, params=None, headers=None):
+        """Send one GET over the pooled session"""
+        with self._stats_lock:
+            self.requests_sent += 1
+        return self.session.get(
+            url,
+            headers={'Authorization': f'Bearer {token}', **(headers or {})},
+            params=params,
+            timeout=30
+        )
+
+    def connection_stats(self):
+        """
+        Report auth and connection reuse counters for this connector
+
+        Returns:
+            Dictionary with request, TLS connection and token cache counts
+        """
+        opened = self._connections_opened()
+        return {
+            "requests_sent": self.requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(self.requests_sent - opened, 0),
+            "token_fetches": self.token_cache.token_fetches,
+            "token_cache_hits": self.token_cache.token_cache_hits
+        }
+
+    def _connections_opened(self):
+        """Count connections urllib3 has opened across the session's pools"""
+        opened = 0
+        for adapter in set(self.session.adapters.values()):
+            poolmanager = getattr(adapter, 'poolmanager', None)
+            if poolmanager is None:
+                continue
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is not None:
+                    opened += getattr(pool, 'num_connections', 0)
+        return opened
+
     def query_opportunities(self, filter_str=None, expand=None, select=None, orderby=None, top=None):
         """
         Query opportunities with common parameters
@@ -131,6 +286,33 @@ class D365Connector:
 
         return self.query('opportunities', params)
 
+    def iter_opportunities(self, filter_str=None, expand=None, select=None, orderby=None,
+                           page_size=DEFAULT_PAGE_SIZE):
+        """
+        Stream all matching opportunities across every result page
+
+        Args:
+            filter_str: OData filter expression
+            expand: Related entities to expand
+            select: Fields to select
+            orderby: Sort order
+            page_size: Records per page requested from the server
+
+        Yields:
+            Opportunity record dictionaries
+        """
+        params = {}
+        if filter_str:
+            params['$filter'] = filter_str
+        if expand:
+            params['$expand'] = expand
+        if select:
+            params['$select'] = select
+        if orderby:
+            params['$orderby'] = orderby
+
+        return self.iter_query('opportunities', params, page_size=page_size)
+
     def query_activities(self, activity_type, filter_str=None, expand=None, select=None, orderby=None, top=None):
         """
         Query activities (tasks, appointments, phonecalls, emails)
@@ -226,9 +408,42 @@ class D365Connector:
         return target_date.strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
+_shared_lock = threading.Lock()
+_shared_connectors = {}
+
+
+def get_shared_connector():
+    """
+    Return the process-wide connector for the configured D365 org
+
+    Connectors are keyed by tenant, app and resource, so agents built back to
+    back share one token and one keep-alive session instead of paying the
+    auth and TLS handshake cost each time.
+    """
+    key = (
+        os.environ.get('DYNAMICS_365_TENANT_ID'),
+        os.environ.get('DYNAMICS_365_CLIENT_ID'),
+        os.environ.get('DYNAMICS_365_RESOURCE')
+    )
+    with _shared_lock:
+        connector = _shared_connectors.get(key)
+        if connector is None:
+            connector = D365Connector()
+            _shared_connectors[key] = connector
+        return connector
+
+
+def reset_shared_connectors():
+    """Close and forget all shared connectors (e.g. after rotating credentials)"""
+    with _shared_lock:
+        for connector in _shared_connectors.values():
+            connector.session.close()
+        _shared_connectors.clear()
+
+
 if __name__ == "__main__":
     # Test the connector
-    connector = D365Connector()
+    connector = get_shared_connector()
 
     if connector.demo_mode:
         print("Running in demo mode (no credentials configured)")
@@ -248,5 +463,6 @@ if __name__ == "__main__":
                 top=5
             )
             print(f"Successfully queried opportunities: {len(result.get('value', []))} records")
+            print(f"Connection stats: {json.dumps(connector.connection_stats())}")
         except Exception as e:
             print(f"Query failed: {str(e)}")
@@ -0,0 +1,267 @@
+(function () {
+  "use strict";
+  /* ---------- theme (light-first Fluent; Fluent dark on toggle/OS) ---------- */
+  var root = document.documentElement;
+  var saved = null;
+  try { saved = localStorage.getItem("aat-theme"); } catch (e) {}
+  if (saved === "dark" || (saved === null && window.matchMedia && matchMedia("(prefers-color-scheme: dark)").matches)) {
+    root.setAttribute("data-theme", "dark");
+  }
+  document.getElementById("themeToggle").addEventListener("click", function () {
+    var dark = root.getAttribute("data-theme") === "dark";
+    if (dark) { root.removeAttribute("data-theme"); } else { root.setAttribute("data-theme", "dark"); }
+    try { localStorage.setItem("aat-theme", dark ? "light" : "dark"); } catch (e) {}
+  });
+
+  /* ---------- data ---------- */
+  var PAGE = window.DEMO_PAGE;         /* inlined by each page; everything else here is shared */
+  var TURNS = PAGE.turns;              /* [{u, a, cites:[{label,url}], card}] */
+  var SOURCES = PAGE.sources;
+  var ID_LINKS = [["CAS-\\d{4,}", "https://kody-w.github.io/static-dynamics-365/#/cs/cases"], ["INC\\d{6,}", "https://kody-w.github.io/static-itsm/api/now/table/incident.json"], ["PO-\\d{4,}", "https://kody-w.github.io/static-erp/api/v1/purchase_orders.json"], ["GR-\\d{4,}", "https://kody-w.github.io/static-erp/api/v1/goods_receipts.json"], ["TOR-\\d{3,}", "https://kody-w.github.io/static-hris/api/v1/time_off_requests.json"], ["MBR-\\d{3,}", "https://kody-w.github.io/static-core-banking/api/v1/members.json"], ["AL-\\d{4}", "https://kody-w.github.io/static-hris/api/v1/workers.json"], ["AST-\\d{4}", "https://kody-w.github.io/static-dynamics-365/#/cs/accounts"]];    /* [[regexSource, url], ...] */
+  var AGENT_NAME = PAGE.agent_name;
+  var GLYPH_SPARK = "<svg viewBox=\"0 0 24 24\" fill=\"currentColor\" aria-hidden=\"true\"><path d=\"M12 3l1.9 5.6L19.5 10l-5.6 1.9L12 17.5l-1.9-5.6L4.5 10l5.6-1.4z\"/></svg>";
+  var GLYPH_DB = "<svg viewBox=\"0 0 24 24\" fill=\"none\" stroke=\"currentColor\" stroke-width=\"1.8\" stroke-linecap=\"round\" stroke-linejoin=\"round\" aria-hidden=\"true\"><ellipse cx=\"12\" cy=\"5.5\" rx=\"7.5\" ry=\"2.8\"/><path d=\"M4.5 5.5v13c0 1.5 3.4 2.8 7.5 2.8s7.5-1.3 7.5-2.8v-13\"/><path d=\"M4.5 12c0 1.5 3.4 2.8 7.5 2.8s7.5-1.3 7.5-2.8\"/></svg>";
+
+  var esc = function (s) {
+    return String(s == null ? "" : s).replace(/[&<>"]/g, function (c) {
+      return { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;" }[c];
+    });
+  };
+
+  /* ---------- tiny markdown renderer: bold, bullets, ordered lists,
+     compact tables, [n] citation markers, record-id autolinks ---------- */
+  function inline(s, cites) {
+    var h = esc(s);
+    h = h.replace(/\*\*([^*]+)\*\*/g, "<strong>$1</strong>");
+    h = h.replace(/\[(\d)\]/g, function (m, n) {
+      var c = cites[Number(n) - 1];
+      if (!c) return m;
+      return '<sup class="cite"><a href="' + esc(c.url) + '" target="_blank" rel="noopener" title="' + esc(c.label) + '">' + n + "</a></sup>";
+    });
+    ID_LINKS.forEach(function (pair) {
+      var re = new RegExp("(^|[^\\w-])(" + pair[0] + ")(?![\\w-])", "g");
+      h = h.replace(re, function (m, pre, id) {
+        return pre + '<a href="' + esc(pair[1]) + '" target="_blank" rel="noopener" title="Open in simulated source system">' + id + "</a>";
+      });
+    });
+    return h;
+  }
+
+  function renderMd(text, cites) {
+    var lines = text.split("\n");
+    var out = [], mode = null, buf = [];
+    function flush() {
+      if (!buf.length) { mode = null; return; }
+      if (mode === "ul") out.push("<ul>" + buf.map(function (l) { return "<li>" + l + "</li>"; }).join("") + "</ul>");
+      else if (mode === "ol") out.push("<ol>" + buf.map(function (l) { return "<li>" + l + "</li>"; }).join("") + "</ol>");
+      else if (mode === "table") {
+        var rows = buf.map(function (l) {
+          return l.replace(/^\|/, "").replace(/\|$/, "").split("|").map(function (c) { return c.trim(); });
+        });
+        var t = '<div class="md-table-wrap"><table><thead><tr>' +
+          rows[0].map(function (c) { return "<th>" + c + "</th>"; }).join("") + "</tr></thead><tbody>";
+        rows.slice(1).forEach(function (r) {
+          t += "<tr>" + r.map(function (c) { return "<td>" + c + "</td>"; }).join("") + "</tr>";
+        });
+        out.push(t + "</tbody></table></div>");
+      } else out.push("<p>" + buf.join("<br>") + "</p>");
+      buf = []; mode = null;
+    }
+    lines.forEach(function (raw) {
+      var line = raw.trimEnd ? raw.trimEnd() : raw.replace(/\s+$/, "");
+      if (!line.trim()) { flush(); return; }
+      if (/^- /.test(line)) {
+        if (mode !== "ul") flush();
+        mode = "ul"; buf.push(inline(line.slice(2), cites));
+      } else if (/^\d+\. /.test(line)) {
+        if (mode !== "ol") flush();
+        mode = "ol"; buf.push(inline(line.replace(/^\d+\. /, ""), cites));
+      } else if (/^\|/.test(line)) {
+        if (mode !== "table") flush();
+        mode = "table"; buf.push(inline(line, cites));
+      } else {
+        if (mode !== "p") flush();
+        mode = "p"; buf.push(inline(line, cites));
+      }
+    });
+    flush();
+    return out.join("");
+  }
+
+  /* ---------- live estate data (prefetched; rendered into per-turn cards) ---------- */
+  function rowsOf(shape, data) {
+    if (shape === "odata" || shape === "plain") return data.value || [];
+    if (shape === "sf") return data.records || [];
+    if (shape === "sn") return data.result || [];
+    return [];
+  }
+  function countOf(shape, data, rows) {
+    if (shape === "odata") return data["@odata.count"] != null ? data["@odata.count"] : rows.length;
+    if (shape === "plain") return data.count != null ? data.count : rows.length;
+    if (shape === "sf") return data.totalSize != null ? data.totalSize : rows.length;
+    return rows.length;
+  }
+  function cell(v) {
+    if (v == null) return "";
+    if (typeof v === "object") return v.display_value || v.value || "";
+    return String(v);
+  }
+  var fetches = SOURCES.map(function (src) {
+    return fetch(src.url).then(function (r) {
+      if (!r.ok) throw new Error("HTTP " + r.status);
+      return r.json();
+    });
+  });
+
+  function attachCard(container, si) {
+    var src = SOURCES[si];
+    if (!src) return;
+    var card = document.createElement("div");
+    card.className = "acard";
+    card.innerHTML =
+      '<div class="acard-head"><span class="glyph">' + GLYPH_DB + '</span>' +
+      '<span class="acard-title">' + esc(src.system + " — " + src.label) + '</span>' +
+      '<span class="acard-count">loading…</span></div>' +
+      '<div class="acard-body"><div class="acard-note">Fetching live records…</div></div>' +
+      '<div class="acard-src">Source: <a href="' + esc(src.url) + '" target="_blank" rel="noopener">' +
+      esc(src.system) + ' · live sandbox</a></div>';
+    container.appendChild(card);
+    var countEl = card.querySelector(".acard-count");
+    var bodyEl = card.querySelector(".acard-body");
+    fetches[si].then(function (data) {
+      var rows = rowsOf(src.shape, data);
+      countEl.textContent = countOf(src.shape, data, rows) + " records";
+      var h = '<div class="tbl-wrap"><table><thead><tr>';
+      src.cols.forEach(function (c) { h += "<th>" + esc(c[0]) + "</th>"; });
+      h += "</tr></thead><tbody>";
+      rows.slice(0, 4).forEach(function (row) {
+        h += "<tr>";
+        src.cols.forEach(function (c) {
+          var v = cell(row[c[1]]);
+          h += '<td title="' + esc(v) + '">' + esc(v) + "</td>";
+        });
+        h += "</tr>";
+      });
+      bodyEl.innerHTML = h + "</tbody></table></div>";
+    }).catch(function () {
+      countEl.textContent = "offline";
+      countEl.classList.add("err");
+      bodyEl.innerHTML = '<div class="acard-note">Live data unavailable — offline or sandbox unreachable. ' +
+        'The citations below still link to the public source URLs.</div>';
+    });
+  }
+
+  /* ---------- conversation ---------- */
+  var body = document.getElementById("chatBody");
+  var scroller = document.getElementById("chatScroll");
+  var note = document.getElementById("stageNote");
+  var STAGE_NOTE = note.outerHTML;
+  var playBtn = document.getElementById("playBtn");
+  var resetBtn = document.getElementById("resetBtn");
+  var promptRow = document.getElementById("promptRow");
+  var idx = 0, playing = false, timer = null;
+
+  function scrollDown() { scroller.scrollTop = scroller.scrollHeight; }
+
+  function userTurn(text) {
+    var m = document.createElement("div");
+    m.className = "message user";
+    var b = document.createElement("div");
+    b.className = "user-bubble";
+    b.textContent = text;
+    m.appendChild(b);
+    body.appendChild(m);
+    scrollDown();
+  }
+
+  function agentTurn() {
+    var m = document.createElement("div");
+    m.className = "message bot";
+    m.innerHTML =
+      '<div class="agent-head"><span class="agent-avatar">' + GLYPH_SPARK + '</span>' +
+      '<span class="agent-name">' + esc(AGENT_NAME) + '</span>' +
+      '<span class="agent-tag">AI generated</span></div>' +
+      '<div class="agent-body"><span class="typing"><i></i><i></i><i></i></span></div>';
+    body.appendChild(m);
+    scrollDown();
+    return m.querySelector(".agent-body");
+  }
+
+  function fillAgent(el, turn) {
+    el.innerHTML = renderMd(turn.a, turn.cites || []);
+    if (turn.card != null) attachCard(el, turn.card);
+    var cites = turn.cites || [];
+    if (cites.length) {
+      var s = document.createElement("div");
+      s.className = "sources";
+      s.innerHTML = '<div class="src-label">Sources</div><ol>' + cites.map(function (c) {
+        return '<li><a href="' + esc(c.url) + '" target="_blank" rel="noopener">' + esc(c.label) + " \u2197</a></li>";
+      }).join("") + "</ol>";
+      el.appendChild(s);
+    }
+    scrollDown();
+  }
+
+  function clearNote() { if (note) { note.remove(); note = null; } }
+
+  function renderPills() {
+    promptRow.innerHTML = "";
+    if (idx >= TURNS.length) return;
+    /* Before playback: show all starters (Copilot-style). Mid-conversation:
+       show just the next scripted prompt. Clicking a later starter
+       fast-forwards through the turns before it. */
+    var targets = idx === 0 ? TURNS.map(function (_, i) { return i; }) : [idx];
+    targets.forEach(function (k) {
+      if (k < idx) return;
+      var pill = document.createElement("button");
+      pill.className = "prompt-pill";
+      pill.innerHTML = '<span class="glyph">' + GLYPH_SPARK + '</span><span class="txt">' + esc(TURNS[k].u) + "</span>";
+      pill.addEventListener("click", function () { jumpTo(k); });
+      promptRow.appendChild(pill);
+    });
+  }
+
+  function jumpTo(k) {
+    if (playing || k < idx || idx >= TURNS.length) return;
+    clearNote();
+    promptRow.innerHTML = "";
+    while (idx < k) {           /* instant render of skipped turns */
+      var t0 = TURNS[idx];
+      userTurn(t0.u);
+      fillAgent(agentTurn(), t0);
+      idx += 1;
+    }
+    stepOnce();
+  }
+
+  function stepOnce() {
+    var t = TURNS[idx];
+    userTurn(t.u);
+    var el = agentTurn();
+    idx += 1;
+    timer = setTimeout(function () {
+      fillAgent(el, t);
+      if (playing && idx < TURNS.length) { timer = setTimeout(stepOnce, 1500); }
+      else {
+        if (idx >= TURNS.length) { playing = false; playBtn.disabled = true; }
+        renderPills();
+      }
+    }, 900);
+  }
+
+  playBtn.addEventListener("click", function () {
+    if (playing || idx >= TURNS.length) return;
+    clearNote();
+    promptRow.innerHTML = "";
+    playing = true;
+    stepOnce();
+  });
+  resetBtn.addEventListener("click", function () {
+    clearTimeout(timer); playing = false; idx = 0; playBtn.disabled = false;
+    body.innerHTML = STAGE_NOTE;
+    note = document.getElementById("stageNote");
+    renderPills();
+  });
+
+  renderPills();
+})();
@@ -10,6 +10,11 @@ and computes:
 Heuristics are domain-shaped (load %, temperature, DGA, partial discharge,
 moisture, vegetation clearance) — not real ML, but realistic-shaped so the
 downstream agents and human reviewers get useful, plausible numbers.
+
+Large fleets are scored column-wise with NumPy (`score_fleet`), which gives
+the same output as scoring snapshot by snapshot. NumPy is optional; without
+it every request takes the per-snapshot path, and it is only imported
+once a fleet is scored.
 """
 
 import sys
@@ -20,6 +25,20 @@ from agents.basic_agent import BasicAgent
 from datetime import datetime
 import math
 
+_np = False  # not imported yet
+
+
+def _numpy():
+    """NumPy, imported on first fleet scoring call; None when it is not installed"""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:  # optional: only needed for fleet scoring
+            numpy = None
+        _np = numpy
+    return _np
+
 
 def _norm(x: float, lo: float, hi: float) -> float:
     if hi <= lo:
@@ -63,6 +82,22 @@ def _score_snapshot(snap: dict) -> dict:
         )
 
     anomaly = round(min(1.0, 0.65 * stress + 0.35 * age_factor), 3)
+    health, rul_days, band = _outcome(anomaly)
+
+    return {
+        "asset_id": snap.get("asset_id"),
+        "asset_class": klass,
+        "substation": snap.get("substation"),
+        "anomaly_score": anomaly,
+        "health_score": health,
+        "rul_days": rul_days,
+        "condition_band": band,
+        "key_drivers": _drivers(klass, t),
+    }
+
+
+def _outcome(anomaly: float):
+    """Health score, RUL days and condition band for a (3-decimal) anomaly score."""
     health = int(round(100 * (1 - anomaly)))
 
     # Plausible RUL curve: a healthy asset gets years; a stressed one collapses fast.
@@ -76,17 +111,7 @@ def _score_snapshot(snap: dict) -> dict:
         band = "Degraded"
     else:
         band = "Critical"
-
-    return {
-        "asset_id": snap.get("asset_id"),
-        "asset_class": klass,
-        "substation": snap.get("substation"),
-        "anomaly_score": anomaly,
-        "health_score": health,
-        "rul_days": rul_days,
-        "condition_band": band,
-        "key_drivers": _drivers(klass, t),
-    }
+    return health, rul_days, band
 
 
 def _drivers(klass, t):
@@ -124,6 +149,173 @@ def _drivers(klass, t):
     return drivers or ["Normal operating envelope"]
 
 
+# --- Fleet scoring ---------------------------------------------------------
+# Column-wise equivalent of _score_snapshot/_drivers. The tables below restate
+# the per-class rules above in the same order; keep the two in step (the test
+# suite checks both paths produce identical output).
+
+BANDS = ("Healthy", "Watch", "Degraded", "Critical")
+FLEET_MIN_ROWS = 256  # below this the per-snapshot path is as fast
+
+_CLASS_CODES = {"transformer": 0, "switchgear": 1, "underground_cable": 2}  # anything else: overhead_line (3)
+
+TELEMETRY_KEYS = (
+    "temp_c", "load_pct", "oil_dga_ppm", "partial_discharge_pc", "operations_count",
+    "sf6_ppm", "moisture_index", "sag_cm", "vegetation_clearance_m",
+)
+
+# Per class code: (telemetry key, default, lo, hi, inverted)
+_STRESS_RULES = (
+    (("temp_c", 60, 50, 110, False), ("load_pct", 50, 60, 130, False),
+     ("oil_dga_ppm", 100, 50, 1000, False), ("partial_discharge_pc", 50, 100, 1500, False)),
+    (("temp_c", 30, 30, 80, False), ("load_pct", 50, 60, 110, False),
+     ("operations_count", 500, 1000, 5000, False), ("sf6_ppm", 1, 1, 10, False)),
+    (("temp_c", 30, 30, 70, False), ("load_pct", 50, 60, 120, False),
+     ("moisture_index", 0.2, 0.2, 1.0, False), ("partial_discharge_pc", 50, 80, 1200, False)),
+    (("temp_c", 25, 20, 60, False), ("load_pct", 50, 50, 100, False),
+     ("sag_cm", 60, 80, 250, False), ("vegetation_clearance_m", 3.0, 0.5, 5.0, True)),
+)
+
+# Per class code: (telemetry key, default, fires above threshold?, threshold, label)
+_DRIVER_RULES = (
+    (("oil_dga_ppm", 0, True, 400, "Elevated DGA"), ("temp_c", 0, True, 85, "High oil temp"),
+     ("load_pct", 0, True, 95, "Sustained overload"),
+     ("partial_discharge_pc", 0, True, 600, "Partial discharge activity")),
+    (("sf6_ppm", 0, True, 4, "SF6 leak signal"), ("operations_count", 0, True, 2500, "High operations count"),
+     ("temp_c", 0, True, 55, "Hotspot trend")),
+    (("moisture_index", 0, True, 0.5, "Moisture ingress"),
+     ("partial_discharge_pc", 0, True, 500, "Insulation degradation"),
+     ("load_pct", 0, True, 90, "Thermal cycling")),
+    (("sag_cm", 0, True, 180, "Excessive sag"),
+     ("vegetation_clearance_m", 5, False, 1.5, "Vegetation encroachment"),
+     ("temp_c", 0, True, 50, "Conductor heating")),
+)
+
+_fleet_tables = None
+
+
+def _tables():
+    """Driver labels per class and bitmask, plus per-anomaly lookups.
+
+    Anomaly is rounded to 3 decimals, so health, RUL and band take one of
+    1001 values each; they are read from _outcome() rather than recomputed.
+    """
+    global _fleet_tables
+    if _fleet_tables is None:
+        np = _numpy()
+        outcomes = [_outcome(k / 1000) for k in range(1001)]
+        _fleet_tables = {
+            # class code -> driver bitmask -> labels, in _drivers order
+            "driver_labels": [
+                [tuple(r[4] for bit, r in enumerate(rules) if mask >> bit & 1) or ("Normal operating envelope",)
+                 for mask in range(1 << len(rules))]
+                for rules in _DRIVER_RULES
+            ],
+            "health": np.array([o[0] for o in outcomes]),
+            "rul_days": np.array([o[1] for o in outcomes]),
+            "band": np.array([BANDS.index(o[2]) for o in outcomes], dtype=np.int8),
+        }
+    return _fleet_tables
+
+
+def fleet_columns(snapshots: list) -> dict:
+    """Pack snapshots into arrays: class codes, ages and a (n, TELEMETRY_KEYS) matrix (NaN = absent)."""
+    np = _numpy()
+    n = len(snapshots)
+    nan = float("nan")
+    telemetry = [s.get("telemetry") or {} for s in snapshots]
+    matrix = np.empty((n, len(TELEMETRY_KEYS)))
+    for j, key in enumerate(TELEMETRY_KEYS):
+        matrix[:, j] = np.fromiter((t.get(key, nan) for t in telemetry), dtype=float, count=n)
+    return {
+        "class_code": np.fromiter((_CLASS_CODES.get(s.get("asset_class"), 3) for s in snapshots),
+                                  dtype=np.int8, count=n),
+        "age_years": np.fromiter((s.get("age_years", 10) for s in snapshots), dtype=float, count=n),
+        "telemetry": matrix,
+    }
+
+
+def score_columns(class_code, age_years, telemetry) -> dict:
+    """Vectorized _score_snapshot over column arrays (see fleet_columns).
+
+    Returns arrays: anomaly_score, health_score, rul_days, band (index into
+    BANDS) and driver_mask (bits of the class's _DRIVER_RULES that fired).
+    """
+    np = _numpy()
+    tb = _tables()
+    col = {key: j for j, key in enumerate(TELEMETRY_KEYS)}
+    n = len(class_code)
+    stress = np.zeros(n)
+    driver_mask = np.zeros(n, dtype=np.int64)
+
+    for code in range(len(_STRESS_RULES)):
+        rows = np.flatnonzero(class_code == code)
+        if not len(rows):
+            continue
+        block = telemetry[rows]
+        present = ~np.isnan(block)
+
+        for key, default, lo, hi, inverted in _STRESS_RULES[code]:
+            x = np.where(present[:, col[key]], block[:, col[key]], default)
+            norm = np.clip((x - lo) / (hi - lo), 0.0, 1.0)
+            stress[rows] = np.maximum(stress[rows], 1.0 - norm if inverted else norm)
+
+        for bit, (key, default, above, threshold, _) in enumerate(_DRIVER_RULES[code]):
+            x = np.where(present[:, col[key]], block[:, col[key]], default)
+            fired = x > threshold if above else x < threshold
+            driver_mask[rows] |= fired.astype(np.int64) << bit
+
+    age_factor = np.clip(age_years / 50, 0.0, 1.0)
+    exact = np.minimum(1.0, 0.65 * stress + 0.35 * age_factor)
+
+    # round(x, 3) rounds the exact decimal value; rint(x * 1000) can land the
+    # other way when x * 1000 sits on a .5 boundary, so redo those in Python.
+    scaled = exact * 1000
+    k = np.rint(scaled).astype(np.int64)
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        k[i] = int(round(round(float(exact[i]), 3) * 1000))
+
+    return {
+        "anomaly_score": k / 1000,
+        "health_score": tb["health"][k],
+        "rul_days": tb["rul_days"][k],
+        "band": tb["band"][k],
+        "driver_mask": driver_mask,
+    }
+
+
+def score_fleet(snapshots: list) -> list:
+    """Score many snapshots at once; same output as [_score_snapshot(s) for s in snapshots]."""
+    if _numpy() is None:
+        return [_score_snapshot(s) for s in snapshots]
+    if not snapshots:
+        return []
+    cols = fleet_columns(snapshots)
+    res = score_columns(cols["class_code"], cols["age_years"], cols["telemetry"])
+    labels = _tables()["driver_labels"]
+    return [
+        {
+            "asset_id": s.get("asset_id"),
+            "asset_class": s.get("asset_class"),
+            "substation": s.get("substation"),
+            "anomaly_score": anomaly,
+            "health_score": health,
+            "rul_days": rul,
+            "condition_band": BANDS[band],
+            "key_drivers": list(labels[code][mask]),
+        }
+        for s, code, anomaly, health, rul, band, mask in zip(
+            snapshots,
+            cols["class_code"].tolist(),
+            res["anomaly_score"].tolist(),
+            res["health_score"].tolist(),
+            res["rul_days"].tolist(),
+            res["band"].tolist(),
+            res["driver_mask"].tolist(),
+        )
+    ]
+
+
 class AssetHealthScorerAgent(BasicAgent):
     def __init__(self):
         self.name = "AssetHealthScorerAgent"
@@ -141,6 +333,14 @@ class AssetHealthScorerAgent(BasicAgent):
                         "type": "array",
                         "description": "Array of asset snapshots from AssetSensorAggregatorAgent.",
                     },
+                    "scoring_mode": {
+                        "type": "string",
+                        "enum": ["auto", "fleet", "per_asset"],
+                        "description": (
+                            "fleet scores all snapshots column-wise with NumPy; per_asset scores one at a time. "
+                            "Results are identical. Defaults to auto (fleet for large batches)."
+                        ),
+                    },
                 },
                 "required": ["snapshots"],
             },
@@ -155,8 +355,13 @@ class AssetHealthScorerAgent(BasicAgent):
                 "agent": self.name,
                 "message": "Provide `snapshots` (list) from AssetSensorAggregatorAgent. No data will be fabricated.",
             }
-        scored = [_score_snapshot(s) for s in snapshots]
-        band_counts = {b: 0 for b in ("Healthy", "Watch", "Degraded", "Critical")}
+        mode = kwargs.get("scoring_mode") or "auto"
+        if mode == "auto":
+            mode = "fleet" if len(snapshots) >= FLEET_MIN_ROWS else "per_asset"
+        if mode == "fleet" and _numpy() is None:
+            mode = "per_asset"
+        scored = score_fleet(snapshots) if mode == "fleet" else [_score_snapshot(s) for s in snapshots]
+        band_counts = {b: 0 for b in BANDS}
         for s in scored:
             band_counts[s["condition_band"]] += 1
         return {
@@ -166,6 +371,7 @@ class AssetHealthScorerAgent(BasicAgent):
             "data": {
                 "as_of_utc": datetime.utcnow().isoformat() + "Z",
                 "model": "rule-based-v1 (heuristic, domain-shaped)",
+                "scoring_mode": mode,
                 "summary": band_counts,
                 "scored": scored,
             },
@@ -4,6 +4,10 @@ Pulls and normalizes IoT/SCADA telemetry across grid assets (transformers,
 switchgear, cables, overhead lines). Produces a single, time-aligned health
 snapshot per asset so downstream agents can score, rank and act.
 
+Given `telemetry_store` (a directory built by lib/telemetry_store.py from a
+historian CSV / Parquet export), snapshots are windowed aggregates of the
+recorded time series; otherwise a synthetic, seeded fleet is returned.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -13,6 +17,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from agents.basic_agent import BasicAgent
 from datetime import datetime, timedelta
+from typing import Optional
 import random
 import hashlib
 
@@ -25,7 +30,7 @@ def _stable_seed(*parts) -> int:
     return int(h[:8], 16)
 
 
-def _synth_asset(asset_id: str, asset_class: str | None = None):
+def _synth_asset(asset_id: str, asset_class: Optional[str] = None):
     rng = random.Random(_stable_seed(asset_id))
     asset_class = asset_class or rng.choice(ASSET_CLASSES)
     age_years = rng.randint(3, 42)
@@ -84,6 +89,23 @@ class AssetSensorAggregatorAgent(BasicAgent):
                         "type": "integer",
                         "description": "When asset_ids is omitted, number of synthetic assets to return.",
                     },
+                    "telemetry_store": {
+                        "type": "string",
+                        "description": "Path to a telemetry store built by lib/telemetry_store.py. When set, snapshots come from recorded telemetry.",
+                    },
+                    "as_of_utc": {
+                        "type": "string",
+                        "description": "Snapshot time (ISO 8601, UTC) for telemetry_store. Defaults to the newest sample.",
+                    },
+                    "window_hours": {
+                        "type": "number",
+                        "description": "Telemetry window ending at as_of_utc. Defaults to 24.",
+                    },
+                    "aggregate": {
+                        "type": "string",
+                        "enum": ["last", "mean", "max", "p95"],
+                        "description": "How each metric is summarized over the window. Defaults to last.",
+                    },
                 },
                 "required": [],
             },
@@ -94,6 +116,9 @@ class AssetSensorAggregatorAgent(BasicAgent):
         asset_ids = kwargs.get("asset_ids") or []
         asset_class = kwargs.get("asset_class")
         substation = kwargs.get("substation")
+
+        if kwargs.get("telemetry_store"):
+            return self._from_store(kwargs["telemetry_store"], asset_ids, asset_class, substation, kwargs)
         sample_size = int(kwargs.get("sample_size") or 25)
 
         if not asset_ids:
@@ -115,6 +140,50 @@ class AssetSensorAggregatorAgent(BasicAgent):
             },
         }
 
+    def _from_store(self, path, asset_ids, asset_class, substation, kwargs):
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        try:
+            import telemetry_store  # needs NumPy; only loaded when a store is requested
+        except ImportError as e:
+            return {"status": "error", "agent": self.name, "message": f"Telemetry store support unavailable: {e}"}
+        try:
+            store = _open_store(telemetry_store, path)
+            as_of = kwargs.get("as_of_utc")
+            as_of = store.resolve_as_of(int(telemetry_store.parse_timestamps([as_of])[0]) if as_of else None)
+            window_hours = float(kwargs.get("window_hours") or 24)
+            aggregate = kwargs.get("aggregate") or "last"
+            snapshots = store.snapshots(as_of, window_hours, aggregate, asset_ids, asset_class, substation)
+        except (OSError, ValueError) as e:
+            return {"status": "error", "agent": self.name, "message": f"Could not read telemetry store {path}: {e}"}
+
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": f"Aggregated telemetry for {len(snapshots)} asset(s) from {path}.",
+            "data": {
+                "as_of_utc": telemetry_store._iso(as_of),
+                "sources": [f"Telemetry store ({path})"],
+                "window_hours": window_hours,
+                "aggregate": aggregate,
+                "asset_count": len(snapshots),
+                "snapshots": snapshots,
+            },
+        }
+
+
+_stores = {}
+
+
+def _open_store(module, path):
+    """Open stores once per process; a re-ingest (new manifest) reopens."""
+    stamp = os.path.getmtime(os.path.join(path, module.MANIFEST))
+    cached = _stores.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _stores[path] = (stamp, module.TelemetryStore(path))
+    return cached[1]
+
 
 if __name__ == "__main__":
     import json
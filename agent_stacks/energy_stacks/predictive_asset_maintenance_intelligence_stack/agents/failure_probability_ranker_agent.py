@@ -7,6 +7,11 @@ what window?".
 
 Output is deterministic for a given input snapshot (same anomaly → same
 probability), so demos and reviews are reproducible.
+
+Operators tend to query the same scored fleet repeatedly with different
+horizons, top_n and min_probability. The agent keeps a RankingIndex for the
+last few `scored` lists it has seen, so repeat queries reuse the
+probabilities and sorted orderings instead of recomputing them.
 """
 
 import sys
@@ -14,10 +19,18 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../")))
 
 from agents.basic_agent import BasicAgent
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+import bisect
+import heapq
 import math
 
 
+HORIZONS = (30, 90, 180)
+INDEX_CACHE_SIZE = 4  # scored fleets kept indexed per agent instance
+
+
 def _prob(anomaly: float, horizon_days: int) -> float:
     # Exponential survival model. Hazard rate grows quadratically with anomaly,
     # so a healthy asset stays low even on a 180-day horizon, while a critical
@@ -27,6 +40,84 @@ def _prob(anomaly: float, horizon_days: int) -> float:
     return round(p, 4)
 
 
+# Anomaly scores carry 3 decimals, so a few thousand entries cover any fleet
+_cached_prob = lru_cache(maxsize=8192)(_prob)
+
+
+def _rank_row(s: dict, prob=_prob) -> dict:
+    anomaly = float(s.get("anomaly_score", 0.0))
+    return {
+        "asset_id": s.get("asset_id"),
+        "asset_class": s.get("asset_class"),
+        "substation": s.get("substation"),
+        "anomaly_score": anomaly,
+        "health_score": s.get("health_score"),
+        "rul_days": s.get("rul_days"),
+        "condition_band": s.get("condition_band"),
+        "p_fail_30d": prob(anomaly, 30),
+        "p_fail_90d": prob(anomaly, 90),
+        "p_fail_180d": prob(anomaly, 180),
+        "key_drivers": s.get("key_drivers", []),
+    }
+
+
+class RankingIndex:
+    """Failure probabilities for one scored fleet, computed once and queried many times.
+
+    All three horizons are computed up front. The first query on a horizon
+    picks its top N with a heap (O(n log k)); from the second query on, the
+    fleet is sorted once for that horizon and later queries slice the sorted
+    order or bisect it for a probability threshold. Ties keep input order,
+    exactly as the agent's stable sort always has.
+    """
+
+    def __init__(self, scored: list):
+        self.scored = scored
+        self.anomalies = [float(s.get("anomaly_score", 0.0)) for s in scored]
+        self.probs = {h: [_cached_prob(a, h) for a in self.anomalies] for h in HORIZONS}
+        self._orders = {}
+        self._descending = {}  # horizon -> negated probabilities along order(horizon), for bisect
+        self._queries = {h: 0 for h in HORIZONS}
+
+    def __len__(self):
+        return len(self.scored)
+
+    def matches(self, scored: list) -> bool:
+        """True if scored holds the same row objects with the same anomaly scores this index was built from."""
+        return (
+            len(scored) == len(self.scored)
+            and all(a is b for a, b in zip(scored, self.scored))
+            and all(float(s.get("anomaly_score", 0.0)) == a for s, a in zip(scored, self.anomalies))
+        )
+
+    def order(self, horizon: int) -> list:
+        """Row indices sorted by failure probability for horizon, highest first."""
+        if horizon not in self._orders:
+            probs = self.probs[horizon]
+            self._orders[horizon] = sorted(range(len(probs)), key=probs.__getitem__, reverse=True)
+        return self._orders[horizon]
+
+    def top(self, horizon: int, top_n: int, min_probability: float = 0.0) -> list:
+        """Ranked rows: the top_n highest-probability assets at or above min_probability."""
+        probs = self.probs[horizon]
+        self._queries[horizon] += 1
+        if horizon in self._orders or self._queries[horizon] > 1 or top_n < 0:
+            picked = self.order(horizon)[:top_n]
+        else:
+            picked = heapq.nlargest(top_n, range(len(probs)), key=probs.__getitem__)
+        if min_probability > 0:
+            # Probabilities descend along `picked`, so the filter keeps a prefix
+            picked = [i for i in picked if probs[i] >= min_probability]
+        return [_rank_row(self.scored[i], _cached_prob) for i in picked]
+
+    def count_at_or_above(self, horizon: int, min_probability: float) -> int:
+        if horizon not in self._descending:
+            probs = self.probs[horizon]
+            self._descending[horizon] = [-probs[i] for i in self.order(horizon)]
+        # Negated, the probabilities ascend; rows exactly at the threshold count
+        return bisect.bisect_right(self._descending[horizon], -min_probability)
+
+
 class FailureProbabilityRankerAgent(BasicAgent):
     def __init__(self):
         self.name = "FailureProbabilityRankerAgent"
@@ -61,6 +152,18 @@ class FailureProbabilityRankerAgent(BasicAgent):
             },
         }
         super().__init__(name=self.name, metadata=self.metadata)
+        self._indexes = OrderedDict()  # id(scored) -> RankingIndex
+
+    def index_for(self, scored: list) -> RankingIndex:
+        """RankingIndex for scored, reused while the same list is passed in unchanged."""
+        index = self._indexes.get(id(scored))
+        if index is None or not index.matches(scored):
+            index = RankingIndex(scored)
+            self._indexes[id(scored)] = index
+            while len(self._indexes) > INDEX_CACHE_SIZE:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(id(scored))
+        return index
 
     def perform(self, **kwargs):
         scored = kwargs.get("scored")
@@ -76,28 +179,8 @@ class FailureProbabilityRankerAgent(BasicAgent):
         top_n = int(kwargs.get("top_n") or 25)
         min_prob = float(kwargs.get("min_probability") or 0.0)
 
-        ranked = []
-        for s in scored:
-            anomaly = float(s.get("anomaly_score", 0.0))
-            row = {
-                "asset_id": s.get("asset_id"),
-                "asset_class": s.get("asset_class"),
-                "substation": s.get("substation"),
-                "anomaly_score": anomaly,
-                "health_score": s.get("health_score"),
-                "rul_days": s.get("rul_days"),
-                "condition_band": s.get("condition_band"),
-                "p_fail_30d": _prob(anomaly, 30),
-                "p_fail_90d": _prob(anomaly, 90),
-                "p_fail_180d": _prob(anomaly, 180),
-                "key_drivers": s.get("key_drivers", []),
-            }
-            ranked.append(row)
-
-        ranked.sort(key=lambda r: r[f"p_fail_{horizon}d"], reverse=True)
-        if min_prob > 0:
-            ranked = [r for r in ranked if r[f"p_fail_{horizon}d"] >= min_prob]
-        ranked = ranked[:top_n]
+        index = self.index_for(scored)
+        ranked = index.top(horizon, top_n, min_prob)
 
         return {
             "status": "success",
@@ -108,6 +191,8 @@ class FailureProbabilityRankerAgent(BasicAgent):
                 "horizon_days": horizon,
                 "top_n": top_n,
                 "min_probability": min_prob,
+                "fleet_size": len(index),
+                "matching_count": index.count_at_or_above(horizon, min_prob) if min_prob > 0 else len(index),
                 "ranked": ranked,
             },
         }
@@ -6,6 +6,11 @@ fiscal year, at what indicative cost, and the avoided-failure value behind
 the case.
 
 Output is suitable for capex committee review (not auto-approval).
+
+Given annual capital budgets and/or crew capacity, the agent switches from
+the rule-based fiscal-year placement to a portfolio optimizer: it chooses
+which replacements to fund and in which year to maximize avoided-failure
+value within the limits, and reports the solve time and its optimality gap.
 """
 
 import sys
@@ -14,6 +19,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from agents.basic_agent import BasicAgent
 from datetime import datetime
+from typing import Optional
+import math
+import time
 
 
 # Indicative replacement cost (USD) and avoided-failure value per asset class
@@ -24,6 +32,17 @@ CLASS_ECONOMICS = {
     "overhead_line": {"replace_cost_usd": 480_000, "avoided_failure_usd": 1_800_000},
 }
 
+# Crew-weeks to replace one asset, by class (used against annual crew capacity)
+REPLACEMENT_CREW_WEEKS = {
+    "transformer": 6,
+    "switchgear": 2,
+    "underground_cable": 8,
+    "overhead_line": 4,
+}
+
+# Share of an asset's avoided-failure value forfeited per year its replacement slips
+DEFAULT_VALUE_DECAY = 0.15
+
 
 def _fiscal_year_offset(p180: float, age_years: int) -> int:
     """Return number of years out before the asset is slated for replacement."""
@@ -37,6 +56,163 @@ def _fiscal_year_offset(p180: float, age_years: int) -> int:
     return 3
 
 
+def _pipeline_row(r: dict, cfy: int, horizon: int, fy_offset: Optional[int] = None):
+    """Capex pipeline entry for a ranked row, or None if it falls outside the planning window.
+
+    fy_offset overrides the rule-based placement (used by the optimizer).
+    """
+    # `age_years` isn't in the ranked rows by default — synthesise from anomaly if missing
+    klass = r.get("asset_class") or "transformer"
+    economics = CLASS_ECONOMICS.get(klass, CLASS_ECONOMICS["transformer"])
+    age_years = int(r.get("age_years", 0))  # tolerated if absent
+    p180 = float(r.get("p_fail_180d", 0.0))
+    if fy_offset is None:
+        fy_offset = _fiscal_year_offset(p180, age_years)
+    if fy_offset >= horizon:
+        return None  # outside the planning window
+    return {
+        "asset_id": r["asset_id"],
+        "asset_class": klass,
+        "substation": r.get("substation"),
+        "anomaly_score": r.get("anomaly_score"),
+        "p_fail_180d": p180,
+        "condition_band": r.get("condition_band"),
+        "planned_fiscal_year": cfy + fy_offset,
+        "indicative_replace_cost_usd": economics["replace_cost_usd"],
+        "avoided_failure_value_usd": economics["avoided_failure_usd"],
+        "benefit_cost_ratio": round(
+            economics["avoided_failure_usd"] * p180 / max(1, economics["replace_cost_usd"]), 2
+        ),
+        "justification_drivers": r.get("key_drivers", []),
+    }
+
+
+def _add_to_annual_summary(by_fy: dict, row: dict):
+    fy = row["planned_fiscal_year"]
+    agg = by_fy.setdefault(fy, {
+        "fiscal_year": fy,
+        "candidates": 0,
+        "total_replace_cost_usd": 0,
+        "total_avoided_failure_value_usd": 0,
+        "by_class": {},
+    })
+    agg["candidates"] += 1
+    agg["total_replace_cost_usd"] += row["indicative_replace_cost_usd"]
+    agg["total_avoided_failure_value_usd"] += row["avoided_failure_value_usd"]
+    agg["by_class"][row["asset_class"]] = agg["by_class"].get(row["asset_class"], 0) + 1
+
+
+def _per_year(value, horizon: int, name: str):
+    """Normalize a per-FY limit (one number, or a list with one entry per FY) to a list; None = unlimited."""
+    if value is None:
+        return None
+    if horizon < 1:
+        raise ValueError(f"horizon_years must be at least 1 when {name} is given.")
+    if isinstance(value, (int, float)):
+        values = [float(value)] * horizon
+    elif isinstance(value, list) and len(value) >= horizon:
+        values = [float(v) for v in value[:horizon]]
+    else:
+        raise ValueError(f"{name} must be a number or a list with one entry per fiscal year ({horizon}).")
+    if any(v < 0 for v in values):
+        raise ValueError(f"{name} cannot be negative.")
+    return values
+
+
+def _fractional_bound(values, weights, capacities, keep) -> float:
+    """LP relaxation with a single per-FY resource.
+
+    Fractional candidates in order of value per unit of resource fill the
+    earliest FY first; pairing the densest candidates with the least decayed
+    years is optimal for the relaxed problem.
+    """
+    bound = 0.0
+    year, left = 0, capacities[0]
+    for v, w in sorted(zip(values, weights), key=lambda vw: vw[0] / vw[1], reverse=True):
+        share = 1.0
+        while share > 0 and year < len(capacities):
+            take = min(share, left / w)
+            bound += v * take * keep[year]
+            share -= take
+            left -= take * w
+            if share > 0:
+                year += 1
+                left = capacities[year] if year < len(capacities) else 0.0
+        if year >= len(capacities):
+            break
+    return bound
+
+
+def optimize_capex(values, costs, crew_weeks, budgets=None, crew_capacity=None,
+                   value_decay: float = DEFAULT_VALUE_DECAY):
+    """Choose replacements and fiscal years to maximize avoided-failure value within annual limits.
+
+    A multi-knapsack with one knapsack per FY (budget and crew limits) where
+    a replacement slipping y years keeps (1 - value_decay) ** y of its value.
+    Greedy: candidates in order of value per unit of (normalized) budget and
+    crew use, each placed in the earliest FY with room. The LP relaxation for
+    each resource on its own gives an upper bound on the optimum, so the
+    reported gap is a worst case for how far the plan is from optimal.
+
+    Args:
+        values: Avoided-failure value per candidate if replaced this FY
+        costs: Replacement cost per candidate
+        crew_weeks: Crew-weeks per candidate
+        budgets / crew_capacity: Per-FY limits (lists of equal length); None = unlimited
+
+    Returns:
+        (fy_offsets, stats): FY offset per candidate (None = not funded) and solver stats
+    """
+    started = time.perf_counter()
+    horizon = len(budgets if budgets is not None else crew_capacity)
+    budget_left = list(budgets) if budgets is not None else [math.inf] * horizon
+    crew_left = list(crew_capacity) if crew_capacity is not None else [math.inf] * horizon
+
+    # Scale budget and crew use by total capacity so the two are comparable
+    total_budget, total_crew = sum(budget_left), sum(crew_left)
+    budget_weight = 1 / total_budget if 0 < total_budget < math.inf else 0.0
+    crew_weight = 1 / total_crew if 0 < total_crew < math.inf else 0.0
+    usage = [c * budget_weight + w * crew_weight for c, w in zip(costs, crew_weeks)]
+    order = sorted((i for i, v in enumerate(values) if v > 0),
+                   key=lambda i: values[i] / usage[i] if usage[i] > 0 else math.inf, reverse=True)
+
+    keep = [(1 - value_decay) ** y for y in range(horizon)]
+    fy_offsets = [None] * len(values)
+    objective = 0.0
+    funded = 0
+    for i in order:
+        cost, crew = costs[i], crew_weeks[i]
+        for y in range(horizon):
+            if cost <= budget_left[y] and crew <= crew_left[y]:
+                budget_left[y] -= cost
+                crew_left[y] -= crew
+                fy_offsets[i] = y
+                objective += values[i] * keep[y]
+                funded += 1
+                break
+    solve_seconds = time.perf_counter() - started
+
+    positive = [values[i] for i in order]
+    bounds = []
+    if budgets is not None:
+        bounds.append(_fractional_bound(positive, [max(costs[i], 1e-9) for i in order], budgets, keep))
+    if crew_capacity is not None:
+        bounds.append(_fractional_bound(positive, [max(crew_weeks[i], 1e-9) for i in order], crew_capacity, keep))
+    upper_bound = min(bounds) if bounds else sum(positive)
+    gap = (upper_bound - objective) / upper_bound if upper_bound > 0 else 0.0
+
+    return fy_offsets, {
+        "solver": "greedy (resource-weighted density) + LP relaxation bound",
+        "candidates": len(values),
+        "funded": funded,
+        "objective_value_usd": round(objective, 2),
+        "upper_bound_usd": round(upper_bound, 2),
+        "optimality_gap_pct": round(100 * max(0.0, gap), 3),
+        "solve_time_ms": round(solve_seconds * 1000, 2),
+        "bound_time_ms": round((time.perf_counter() - started - solve_seconds) * 1000, 2),
+    }
+
+
 class LifecycleCapexPlannerAgent(BasicAgent):
     def __init__(self):
         self.name = "LifecycleCapexPlannerAgent"
@@ -62,6 +238,21 @@ class LifecycleCapexPlannerAgent(BasicAgent):
                         "type": "integer",
                         "description": "How many FYs forward to plan. Defaults to 4.",
                     },
+                    "annual_budget_usd": {
+                        "type": ["number", "array"],
+                        "description": (
+                            "Capital budget per FY (one number, or one per FY). When this or "
+                            "annual_crew_weeks is given, replacements are optimized within the limits."
+                        ),
+                    },
+                    "annual_crew_weeks": {
+                        "type": ["number", "array"],
+                        "description": "Replacement crew capacity per FY in crew-weeks (one number, or one per FY).",
+                    },
+                    "value_decay_per_year": {
+                        "type": "number",
+                        "description": "Share of avoided-failure value lost per year a replacement slips. Defaults to 0.15.",
+                    },
                 },
                 "required": ["ranked"],
             },
@@ -79,48 +270,45 @@ class LifecycleCapexPlannerAgent(BasicAgent):
         cfy = int(kwargs.get("current_fiscal_year") or datetime.utcnow().year)
         horizon = int(kwargs.get("horizon_years") or 4)
 
-        # `age_years` isn't in the ranked rows by default — synthesise from anomaly if missing
-        pipeline = []
-        for r in ranked:
-            klass = r.get("asset_class") or "transformer"
-            economics = CLASS_ECONOMICS.get(klass, CLASS_ECONOMICS["transformer"])
-            age_years = int(r.get("age_years", 0))  # tolerated if absent
-            p180 = float(r.get("p_fail_180d", 0.0))
-            fy_offset = _fiscal_year_offset(p180, age_years)
-            if fy_offset >= horizon:
-                continue  # outside the planning window
-            pipeline.append({
-                "asset_id": r["asset_id"],
-                "asset_class": klass,
-                "substation": r.get("substation"),
-                "anomaly_score": r.get("anomaly_score"),
-                "p_fail_180d": p180,
-                "condition_band": r.get("condition_band"),
-                "planned_fiscal_year": cfy + fy_offset,
-                "indicative_replace_cost_usd": economics["replace_cost_usd"],
-                "avoided_failure_value_usd": economics["avoided_failure_usd"],
-                "benefit_cost_ratio": round(
-                    economics["avoided_failure_usd"] * p180 / max(1, economics["replace_cost_usd"]), 2
-                ),
-                "justification_drivers": r.get("key_drivers", []),
-            })
+        try:
+            budgets = _per_year(kwargs.get("annual_budget_usd"), horizon, "annual_budget_usd")
+            crew_capacity = _per_year(kwargs.get("annual_crew_weeks"), horizon, "annual_crew_weeks")
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "agent": self.name, "message": str(e)}
+
+        optimization = None
+        if budgets is None and crew_capacity is None:
+            pipeline = []
+            for r in ranked:
+                row = _pipeline_row(r, cfy, horizon)
+                if row is not None:
+                    pipeline.append(row)
+        else:
+            decay = kwargs.get("value_decay_per_year")
+            decay = DEFAULT_VALUE_DECAY if decay is None else float(decay)
+            pipeline, optimization = self._optimize(ranked, cfy, horizon, budgets, crew_capacity, decay)
 
         pipeline.sort(key=lambda x: (x["planned_fiscal_year"], -x["benefit_cost_ratio"]))
 
         by_fy: dict[int, dict] = {}
         for row in pipeline:
-            fy = row["planned_fiscal_year"]
-            agg = by_fy.setdefault(fy, {
-                "fiscal_year": fy,
-                "candidates": 0,
-                "total_replace_cost_usd": 0,
-                "total_avoided_failure_value_usd": 0,
-                "by_class": {},
-            })
-            agg["candidates"] += 1
-            agg["total_replace_cost_usd"] += row["indicative_replace_cost_usd"]
-            agg["total_avoided_failure_value_usd"] += row["avoided_failure_value_usd"]
-            agg["by_class"][row["asset_class"]] = agg["by_class"].get(row["asset_class"], 0) + 1
+            _add_to_annual_summary(by_fy, row)
+        if optimization is not None:
+            for offset in range(horizon):
+                fy = by_fy.setdefault(cfy + offset, {
+                    "fiscal_year": cfy + offset,
+                    "candidates": 0,
+                    "total_replace_cost_usd": 0,
+                    "total_avoided_failure_value_usd": 0,
+                    "by_class": {},
+                })
+                fy["crew_weeks_used"] = optimization["crew_weeks_used"][offset]
+                if budgets is not None:
+                    fy["budget_usd"] = budgets[offset]
+                    fy["budget_remaining_usd"] = budgets[offset] - fy["total_replace_cost_usd"]
+                if crew_capacity is not None:
+                    fy["crew_weeks_capacity"] = crew_capacity[offset]
+            del optimization["crew_weeks_used"]
         by_fy_sorted = [by_fy[k] for k in sorted(by_fy.keys())]
 
         return {
@@ -133,9 +321,40 @@ class LifecycleCapexPlannerAgent(BasicAgent):
                 "horizon_years": horizon,
                 "annual_summary": by_fy_sorted,
                 "pipeline": pipeline,
+                **({"optimization": optimization} if optimization is not None else {}),
             },
         }
 
+    def _optimize(self, ranked, cfy, horizon, budgets, crew_capacity, decay):
+        values, costs, crew_weeks = [], [], []
+        for r in ranked:
+            klass = r.get("asset_class") or "transformer"
+            economics = CLASS_ECONOMICS.get(klass, CLASS_ECONOMICS["transformer"])
+            values.append(economics["avoided_failure_usd"] * float(r.get("p_fail_180d", 0.0)))
+            costs.append(economics["replace_cost_usd"])
+            crew_weeks.append(REPLACEMENT_CREW_WEEKS.get(klass, REPLACEMENT_CREW_WEEKS["transformer"]))
+
+        fy_offsets, stats = optimize_capex(values, costs, crew_weeks, budgets, crew_capacity, decay)
+
+        pipeline = []
+        crew_used = [0] * horizon
+        deferred_value = 0.0
+        for r, offset, value, crew in zip(ranked, fy_offsets, values, crew_weeks):
+            if offset is None:
+                deferred_value += value
+                continue
+            row = _pipeline_row(r, cfy, horizon, fy_offset=offset)
+            row["expected_avoided_value_usd"] = round(value * (1 - decay) ** offset, 2)
+            pipeline.append(row)
+            crew_used[offset] += crew
+        stats.update({
+            "value_decay_per_year": decay,
+            "deferred": len(ranked) - len(pipeline),
+            "deferred_value_usd": round(deferred_value, 2),
+            "crew_weeks_used": crew_used,
+        })
+        return pipeline, stats
+
 
 if __name__ == "__main__":
     import json
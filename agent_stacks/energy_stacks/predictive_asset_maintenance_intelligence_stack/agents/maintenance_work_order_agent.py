@@ -51,6 +51,32 @@ def _due_by(priority: str) -> str:
     return (datetime.utcnow() + timedelta(days=days)).date().isoformat()
 
 
+def _draft_order(r: dict, horizon: int) -> dict:
+    prob_key = f"p_fail_{horizon}d"
+    klass = r.get("asset_class") or "transformer"
+    tasks = CLASS_TASKS.get(klass, CLASS_TASKS["transformer"])
+    priority = "P1" if r[prob_key] >= 0.75 else "P2" if r[prob_key] >= 0.50 else "P3"
+    # Choose the highest-touch task that matches the priority
+    task_name, crew, est_hours, _ = tasks[0]
+    return {
+        "work_order_id": _wo_id(r["asset_id"], horizon),
+        "status": "pending_review",
+        "asset_id": r["asset_id"],
+        "asset_class": klass,
+        "substation": r.get("substation"),
+        "priority": priority,
+        "horizon_days": horizon,
+        "failure_probability": r[prob_key],
+        "condition_band": r.get("condition_band"),
+        "task": task_name,
+        "assigned_crew_type": crew,
+        "estimated_hours": est_hours,
+        "due_by": _due_by(priority),
+        "rationale": "; ".join(r.get("key_drivers", []) or ["Threshold exceeded"]),
+        "target_system": "D365 Field Service",
+    }
+
+
 class MaintenanceWorkOrderAgent(BasicAgent):
     def __init__(self):
         self.name = "MaintenanceWorkOrderAgent"
@@ -106,30 +132,7 @@ class MaintenanceWorkOrderAgent(BasicAgent):
         eligible.sort(key=lambda r: r[prob_key], reverse=True)
         eligible = eligible[:max_orders]
 
-        orders = []
-        for r in eligible:
-            klass = r.get("asset_class") or "transformer"
-            tasks = CLASS_TASKS.get(klass, CLASS_TASKS["transformer"])
-            priority = "P1" if r[prob_key] >= 0.75 else "P2" if r[prob_key] >= 0.50 else "P3"
-            # Choose the highest-touch task that matches the priority
-            task_name, crew, est_hours, _ = tasks[0]
-            orders.append({
-                "work_order_id": _wo_id(r["asset_id"], horizon),
-                "status": "pending_review",
-                "asset_id": r["asset_id"],
-                "asset_class": klass,
-                "substation": r.get("substation"),
-                "priority": priority,
-                "horizon_days": horizon,
-                "failure_probability": r[prob_key],
-                "condition_band": r.get("condition_band"),
-                "task": task_name,
-                "assigned_crew_type": crew,
-                "estimated_hours": est_hours,
-                "due_by": _due_by(priority),
-                "rationale": "; ".join(r.get("key_drivers", []) or ["Threshold exceeded"]),
-                "target_system": "D365 Field Service",
-            })
+        orders = [_draft_order(r, horizon) for r in eligible]
 
         return {
             "status": "success",
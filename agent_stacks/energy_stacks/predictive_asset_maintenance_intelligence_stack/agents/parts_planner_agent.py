@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from agents.basic_agent import BasicAgent
 from datetime import datetime, timedelta
+from typing import Optional
 
 
 # task → list of (material, qty_per_wo, lead_time_days, unit_cost_usd)
@@ -62,6 +63,75 @@ TASK_BOM = {
 LONG_LEAD_DAYS = 30
 
 
+class PartsDemand:
+    """Running parts demand over a stream of work orders.
+
+    The agent feeds it one batch of orders; the streaming pipeline feeds it
+    orders chunk by chunk. With keep_order_lines=False only the per-material
+    totals are held, so memory does not grow with the number of orders beyond
+    the linked work order IDs (capped by max_linked_ids, if set).
+    """
+
+    def __init__(self, long_lead: int = LONG_LEAD_DAYS, keep_order_lines: bool = True,
+                 max_linked_ids: Optional[int] = None):
+        self.long_lead = long_lead
+        self.keep_order_lines = keep_order_lines
+        self.max_linked_ids = max_linked_ids
+        self.orders = 0
+        self.demand: dict[str, dict] = {}
+        self.per_order_lines = []
+
+    def add(self, o: dict):
+        self.orders += 1
+        task = o.get("task")
+        qty_mult = 1
+        bom = TASK_BOM.get(task, [])
+        for material, qty, lead, cost in bom:
+            key = material
+            entry = self.demand.setdefault(key, {
+                "material": material,
+                "total_qty": 0,
+                "lead_time_days": lead,
+                "unit_cost_usd": cost,
+                "linked_work_orders": [],
+                "long_lead": lead >= self.long_lead,
+            })
+            entry["total_qty"] += qty * qty_mult
+            if self.max_linked_ids is None or len(entry["linked_work_orders"]) < self.max_linked_ids:
+                entry["linked_work_orders"].append(o.get("work_order_id"))
+            if self.keep_order_lines:
+                self.per_order_lines.append({
+                    "work_order_id": o.get("work_order_id"),
+                    "asset_id": o.get("asset_id"),
+                    "material": material,
+                    "qty": qty * qty_mult,
+                    "lead_time_days": lead,
+                    "unit_cost_usd": cost,
+                    "extended_cost_usd": qty * qty_mult * cost,
+                })
+
+    def result(self):
+        """Return (consolidated, procurement triggers, per-order lines, total cost)."""
+        consolidated = []
+        triggers = []
+        for entry in self.demand.values():
+            entry["extended_cost_usd"] = entry["total_qty"] * entry["unit_cost_usd"]
+            consolidated.append(entry)
+            if entry["long_lead"]:
+                triggers.append({
+                    "procurement_trigger_id": f"PR-{abs(hash(entry['material'])) % 10_000_000:07d}",
+                    "material": entry["material"],
+                    "qty": entry["total_qty"],
+                    "lead_time_days": entry["lead_time_days"],
+                    "needed_by": (datetime.utcnow() + timedelta(days=entry["lead_time_days"])).date().isoformat(),
+                    "target_system": "SAP MM / D365 Supply Chain",
+                    "linked_work_orders": entry["linked_work_orders"],
+                })
+
+        total_cost = round(sum(e["extended_cost_usd"] for e in consolidated), 2)
+        return consolidated, triggers, self.per_order_lines, total_cost
+
+
 class PartsPlannerAgent(BasicAgent):
     def __init__(self):
         self.name = "PartsPlannerAgent"
@@ -99,51 +169,10 @@ class PartsPlannerAgent(BasicAgent):
             }
         long_lead = int(kwargs.get("long_lead_threshold_days") or LONG_LEAD_DAYS)
 
-        demand: dict[str, dict] = {}
-        per_order_lines = []
+        ledger = PartsDemand(long_lead)
         for o in orders:
-            task = o.get("task")
-            qty_mult = 1
-            bom = TASK_BOM.get(task, [])
-            for material, qty, lead, cost in bom:
-                key = material
-                entry = demand.setdefault(key, {
-                    "material": material,
-                    "total_qty": 0,
-                    "lead_time_days": lead,
-                    "unit_cost_usd": cost,
-                    "linked_work_orders": [],
-                    "long_lead": lead >= long_lead,
-                })
-                entry["total_qty"] += qty * qty_mult
-                entry["linked_work_orders"].append(o.get("work_order_id"))
-                per_order_lines.append({
-                    "work_order_id": o.get("work_order_id"),
-                    "asset_id": o.get("asset_id"),
-                    "material": material,
-                    "qty": qty * qty_mult,
-                    "lead_time_days": lead,
-                    "unit_cost_usd": cost,
-                    "extended_cost_usd": qty * qty_mult * cost,
-                })
-
-        consolidated = []
-        triggers = []
-        for entry in demand.values():
-            entry["extended_cost_usd"] = entry["total_qty"] * entry["unit_cost_usd"]
-            consolidated.append(entry)
-            if entry["long_lead"]:
-                triggers.append({
-                    "procurement_trigger_id": f"PR-{abs(hash(entry['material'])) % 10_000_000:07d}",
-                    "material": entry["material"],
-                    "qty": entry["total_qty"],
-                    "lead_time_days": entry["lead_time_days"],
-                    "needed_by": (datetime.utcnow() + timedelta(days=entry["lead_time_days"])).date().isoformat(),
-                    "target_system": "SAP MM / D365 Supply Chain",
-                    "linked_work_orders": entry["linked_work_orders"],
-                })
-
-        total_cost = round(sum(e["extended_cost_usd"] for e in consolidated), 2)
+            ledger.add(o)
+        consolidated, triggers, per_order_lines, total_cost = ledger.result()
 
         return {
             "status": "success",
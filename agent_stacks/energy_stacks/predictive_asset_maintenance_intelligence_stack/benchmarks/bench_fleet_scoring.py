@@ -0,0 +1,72 @@
+"""
+Throughput benchmark: per-asset vs. fleet (NumPy column-wise) health scoring.
+
+Builds a synthetic fleet from AssetSensorAggregatorAgent snapshots and scores
+it three ways:
+  * per_asset  - [_score_snapshot(s) for s in snapshots], the original path
+  * fleet      - score_fleet(snapshots): dicts in, dicts out
+  * columns    - score_columns() on pre-packed arrays (e.g. straight from a
+                 columnar telemetry store), no dict handling at all
+
+and checks the per_asset and fleet outputs are identical.
+
+Run from the stack root:
+    python benchmarks/bench_fleet_scoring.py
+    python benchmarks/bench_fleet_scoring.py --rows 1000 100000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'agents'))
+
+from asset_health_scorer_agent import _score_snapshot, fleet_columns, score_columns, score_fleet  # noqa: E402
+from asset_sensor_aggregator_agent import _synth_asset  # noqa: E402
+
+DISTINCT_ASSETS = 4096
+
+
+def build_fleet(rows):
+    """rows snapshots; telemetry is shared between copies of DISTINCT_ASSETS synthetic assets"""
+    base = [_synth_asset(f"AST-{i:07d}") for i in range(min(rows, DISTINCT_ASSETS))]
+    return [dict(base[i % len(base)], asset_id=f"AST-{i:07d}") for i in range(rows)]
+
+
+def best_of(repeat, fn):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=1, help='report the best of N runs')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}  {'per_asset':>14}  {'fleet':>14}  {'columns':>14}  {'fleet speedup':>13}")
+    for rows in args.rows:
+        snapshots = build_fleet(rows)
+        per_asset_time, expected = best_of(args.repeat, lambda: [_score_snapshot(s) for s in snapshots])
+        fleet_time, actual = best_of(args.repeat, lambda: score_fleet(snapshots))
+        assert actual == expected, "fleet scoring diverged from per-asset scoring"
+        del expected, actual
+
+        cols = fleet_columns(snapshots)
+        columns_time, _ = best_of(args.repeat, lambda: score_columns(
+            cols["class_code"], cols["age_years"], cols["telemetry"]))
+
+        print(f"{rows:>10,}  {rows / per_asset_time:>10,.0f} a/s  {rows / fleet_time:>10,.0f} a/s  "
+              f"{rows / columns_time:>10,.0f} a/s  {per_asset_time / fleet_time:>12.1f}x")
+    print("\na/s = assets scored per second; fleet output verified identical to per_asset")
+
+
+if __name__ == "__main__":
+    main()
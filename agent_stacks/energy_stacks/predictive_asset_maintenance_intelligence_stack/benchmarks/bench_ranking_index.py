@@ -0,0 +1,75 @@
+"""
+Latency benchmark: repeated FailureProbabilityRankerAgent queries over one scored fleet.
+
+Scores a synthetic fleet once, then issues a mix of operator queries
+(different horizon_days / top_n / min_probability) two ways:
+  * full_sort - compute every row's probabilities and sort the fleet per
+                query (what the agent did before the ranking index)
+  * index     - FailureProbabilityRankerAgent.perform(), which reuses the
+                RankingIndex built for this scored list
+
+and checks both return the same ranked rows.
+
+Run from the stack root:
+    python benchmarks/bench_ranking_index.py
+    python benchmarks/bench_ranking_index.py --assets 1000000 --queries 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'agents'))
+
+from asset_health_scorer_agent import score_fleet  # noqa: E402
+from failure_probability_ranker_agent import FailureProbabilityRankerAgent, _rank_row  # noqa: E402
+from bench_fleet_scoring import build_fleet  # noqa: E402
+
+QUERY_MIX = [(90, 25, 0.0), (30, 10, 0.0), (180, 50, 0.0), (90, 100, 0.3), (90, 25, 0.5), (180, 20, 0.6)]
+
+
+def full_sort(scored, horizon, top_n, min_prob):
+    ranked = [_rank_row(s) for s in scored]
+    ranked.sort(key=lambda r: r[f"p_fail_{horizon}d"], reverse=True)
+    if min_prob > 0:
+        ranked = [r for r in ranked if r[f"p_fail_{horizon}d"] >= min_prob]
+    return ranked[:top_n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', type=int, default=250_000)
+    parser.add_argument('--queries', type=int, default=12)
+    args = parser.parse_args()
+
+    scored = score_fleet(build_fleet(args.assets))
+    queries = [QUERY_MIX[i % len(QUERY_MIX)] for i in range(args.queries)]
+    print(f"{args.assets:,} scored assets, {len(queries)} queries\n")
+
+    start = time.perf_counter()
+    expected = [full_sort(scored, *q) for q in queries]
+    baseline = time.perf_counter() - start
+
+    agent = FailureProbabilityRankerAgent()
+    latencies = []
+    actual = []
+    for horizon, top_n, min_prob in queries:
+        t = time.perf_counter()
+        out = agent.perform(scored=scored, horizon_days=horizon, top_n=top_n, min_probability=min_prob)
+        latencies.append(time.perf_counter() - t)
+        actual.append(out["data"]["ranked"])
+    assert actual == expected, "ranking index diverged from a full sort"
+
+    indexed = sum(latencies)
+    repeats = sorted(latencies[1:]) or latencies
+    print(f"full_sort  {baseline:8.2f}s total  {baseline / len(queries) * 1000:9.1f} ms/query")
+    print(f"index      {indexed:8.2f}s total  {indexed / len(queries) * 1000:9.1f} ms/query  "
+          f"(first {latencies[0] * 1000:.1f} ms incl. build, "
+          f"repeat median {repeats[len(repeats) // 2] * 1000:.1f} ms)")
+    print(f"\nspeedup: {baseline / indexed:.1f}x (rankings identical)")
+
+
+if __name__ == "__main__":
+    main()
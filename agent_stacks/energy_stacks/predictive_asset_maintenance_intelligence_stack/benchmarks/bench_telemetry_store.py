@@ -0,0 +1,110 @@
+"""
+Ingest and query benchmark for the memory-mapped telemetry store.
+
+Writes a synthetic historian export (wide CSV, one row per asset per
+sample interval, with gaps) to a temporary directory, ingests it with
+telemetry_store.ingest_csv, then times 24-hour windowed snapshots for the
+whole fleet with each aggregate (last / mean / max / p95) plus the
+columnar path feeding score_columns(). Peak RSS is reported after each step
+to show the history itself is never loaded.
+
+Run from the stack root:
+    python benchmarks/bench_telemetry_store.py
+    python benchmarks/bench_telemetry_store.py --assets 2000 --days 30 --interval-min 5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+import telemetry_store  # noqa: E402
+from asset_health_scorer_agent import score_columns  # noqa: E402
+from asset_sensor_aggregator_agent import ASSET_CLASSES  # noqa: E402
+
+METRICS = ("temp_c", "load_pct", "oil_dga_ppm", "partial_discharge_pc")
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def write_csv(path, assets, samples, interval, start, seed):
+    """Historian-style export: time-major, all assets per interval, ~2% of readings missing"""
+    rng = np.random.default_rng(seed)
+    classes = [ASSET_CLASSES[a % len(ASSET_CLASSES)] for a in range(assets)]
+    with open(path, "w") as f:
+        f.write("asset_id,timestamp,asset_class,substation,age_years," + ",".join(METRICS) + "\n")
+        for s in range(samples):
+            ts = start + s * interval
+            values = rng.normal([70, 75, 300, 400], [10, 15, 120, 200], size=(assets, len(METRICS)))
+            text = np.char.mod("%.2f", values)
+            text[rng.random(text.shape) < 0.02] = ""
+            f.write("".join(
+                f"AST-{a:06d},{ts},{classes[a]},SUB-{a % 97:02d},{5 + a % 40},{','.join(text[a])}\n"
+                for a in range(assets)
+            ))
+    return assets * samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', type=int, default=1000)
+    parser.add_argument('--days', type=float, default=7)
+    parser.add_argument('--interval-min', type=float, default=5)
+    parser.add_argument('--window-hours', type=float, default=24)
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help='CSV rows parsed per ingest batch')
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    interval = int(args.interval_min * 60)
+    samples = int(args.days * 86400 / interval)
+    start = 1_767_225_600  # 2026-01-01T00:00:00Z
+    work = tempfile.mkdtemp(prefix="telemetry_bench_")
+    try:
+        csv_path = os.path.join(work, "historian.csv")
+        t = time.perf_counter()
+        rows = write_csv(csv_path, args.assets, samples, interval, start, args.seed)
+        print(f"wrote {rows:,} rows ({os.path.getsize(csv_path) / 1e6:,.0f} MB CSV) in {time.perf_counter() - t:.1f}s")
+
+        t = time.perf_counter()
+        store = telemetry_store.ingest_csv(csv_path, os.path.join(work, "store"), args.chunk_rows)
+        elapsed = time.perf_counter() - t
+        size = sum(os.path.getsize(os.path.join(store.root, f)) for f in os.listdir(store.root))
+        print(f"ingest     {elapsed:8.2f}s  {rows / elapsed:>12,.0f} rows/s  store {size / 1e6:,.0f} MB  "
+              f"peak RSS {peak_rss_mb():,.0f} MB\n")
+
+        as_of = start + samples * interval
+        for how in telemetry_store.AGGREGATES:
+            t = time.perf_counter()
+            snaps = store.snapshots(as_of, args.window_hours, how)
+            elapsed = time.perf_counter() - t
+            print(f"snapshots {how:<5} {elapsed * 1000:8.1f} ms  {len(snaps):,} assets  "
+                  f"{sum(s['sample_count'] for s in snaps):,} samples in window  peak RSS {peak_rss_mb():,.0f} MB")
+
+        t = time.perf_counter()
+        cols = store.fleet_columns(as_of, args.window_hours, "p95")
+        result = score_columns(cols["class_code"], cols["age_years"], cols["telemetry"])
+        elapsed = time.perf_counter() - t
+        print(f"\nfleet_columns(p95) + score_columns: {elapsed * 1000:.1f} ms for {len(result['anomaly_score']):,} assets")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
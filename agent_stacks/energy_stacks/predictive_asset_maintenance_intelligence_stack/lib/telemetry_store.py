@@ -0,0 +1,437 @@
+"""Telemetry Store — Energy Utilities.
+
+Columnar, memory-mapped store for SCADA historian / IoT telemetry, so the
+Asset Sensor Aggregator can build its time-aligned snapshots from real
+time series instead of synthesizing them.
+
+Ingest takes wide CSV or Parquet exports, one row per sample:
+
+    asset_id, timestamp, [asset_class, substation, age_years, voltage_kv,] temp_c, load_pct, ...
+
+`timestamp` is ISO 8601 (UTC) or epoch seconds. The static columns are
+optional; any other column is a numeric metric (blank = not sampled).
+
+On disk a store is a directory of .npy columns plus manifest.json:
+  - key.npy      int64, asset code << 32 | seconds since 2000-01-01, sorted
+  - <metric>.npy float32, one per metric, in key order (NaN = not sampled)
+
+Columns are opened with mmap_mode="r". Because rows are sorted by asset and
+time, one asset's window is a contiguous run located by binary search on
+`key`. Snapshot queries read only the rows inside the requested windows,
+so years of history never have to fit in RAM.
+
+Windowed aggregates (last, mean, max, p95) are computed with NumPy segment
+reductions across all assets at once. Missing samples are ignored.
+
+    python lib/telemetry_store.py ingest historian.csv stores/sub44
+    python lib/telemetry_store.py snapshot stores/sub44 --window-hours 24 --aggregate p95
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agents"))
+
+from asset_health_scorer_agent import TELEMETRY_KEYS, _CLASS_CODES
+from datetime import datetime, timezone
+from typing import Optional
+import csv
+import json
+import re
+import shutil
+import tempfile
+
+import numpy as np
+
+
+EPOCH_BASE = 946_684_800  # 2000-01-01T00:00:00Z; keys hold seconds since then
+MAX_OFFSET = (1 << 32) - 1  # ~136 years past EPOCH_BASE
+STATIC_COLUMNS = ("asset_class", "substation", "age_years", "voltage_kv")
+AGGREGATES = ("last", "mean", "max", "p95")
+METRIC_DTYPE = np.float32
+_PLAIN_ISO = re.compile(r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?Z?")
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+def parse_timestamps(values) -> np.ndarray:
+    """Epoch seconds (int64) from ISO 8601 strings or numbers."""
+    values = list(values)
+    try:
+        return np.array(values, dtype=np.float64).astype(np.int64)
+    except ValueError:
+        pass
+    if all(_PLAIN_ISO.fullmatch(v) for v in values):
+        # NumPy parses plain UTC ISO strings in bulk; offsets and epochs go one by one
+        return np.array([v.rstrip("Z") for v in values], dtype="datetime64[s]").astype(np.int64)
+    return np.array([_parse_one(v) for v in values], dtype=np.int64)
+
+
+def _parse_one(value) -> int:
+    try:
+        return int(float(value))
+    except ValueError:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+
+
+class _StoreWriter:
+    """Appends ingest batches to raw column files, then sorts them into a store."""
+
+    def __init__(self, root: str):
+        self.root = root
+        parent = os.path.dirname(os.path.abspath(root))
+        os.makedirs(parent, exist_ok=True)
+        self.tmp = tempfile.mkdtemp(prefix=".ingest-", dir=parent)
+        self.codes = {}
+        self.assets = []
+        self.static = []
+        self.metrics = []
+        self._files = {}
+        self.rows = 0
+        self.sorted = True
+        self._last_key = None
+
+    def _raw(self, name):
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self.tmp, name + ".bin"), "wb")
+        return self._files[name]
+
+    def add_batch(self, asset_ids, timestamps, metrics: dict, static: dict):
+        n = len(asset_ids)
+        if not n:
+            return
+        codes = np.empty(n, dtype=np.int64)
+        for i, asset_id in enumerate(asset_ids):
+            code = self.codes.get(asset_id)
+            if code is None:
+                code = self.codes[asset_id] = len(self.assets)
+                self.assets.append(asset_id)
+                self.static.append({})
+            codes[i] = code
+        for column, values in static.items():
+            for code, value in zip(codes.tolist(), values):
+                if value not in (None, ""):
+                    self.static[code][column] = value
+
+        offsets = parse_timestamps(timestamps) - EPOCH_BASE
+        if offsets.min() < 0 or offsets.max() > MAX_OFFSET:
+            raise ValueError("timestamps must fall between 2000-01-01 and 2136-02-07 UTC")
+        keys = (codes << 32) | offsets
+        if self.sorted:
+            self.sorted = bool(np.all(keys[1:] >= keys[:-1])) and (self._last_key is None or keys[0] >= self._last_key)
+        self._last_key = keys[-1]
+        keys.tofile(self._raw("key"))
+
+        for name in metrics:
+            if name not in self.metrics:
+                # Metric first seen in this batch: earlier rows never sampled it
+                self.metrics.append(name)
+                np.full(self.rows, np.nan, dtype=METRIC_DTYPE).tofile(self._raw(name))
+        for name in self.metrics:
+            values = metrics.get(name)
+            column = np.full(n, np.nan, dtype=METRIC_DTYPE) if values is None else np.asarray(values, dtype=METRIC_DTYPE)
+            column.tofile(self._raw(name))
+        self.rows += n
+
+    def finish(self):
+        for f in self._files.values():
+            f.close()
+        build = self.root + ".building"
+        shutil.rmtree(build, ignore_errors=True)
+        os.makedirs(build)
+        try:
+            raw_key = np.fromfile(os.path.join(self.tmp, "key.bin"), dtype=np.int64) if self.rows else np.empty(0, np.int64)
+            order = None if self.sorted else np.argsort(raw_key, kind="stable")
+            self._write_column(build, "key", raw_key, order)
+            del raw_key
+            for name in self.metrics:
+                raw = np.memmap(os.path.join(self.tmp, name + ".bin"), dtype=METRIC_DTYPE, mode="r", shape=(self.rows,))
+                self._write_column(build, name, raw, order)
+                del raw
+            with open(os.path.join(build, MANIFEST), "w") as f:
+                json.dump({
+                    "format_version": FORMAT_VERSION,
+                    "epoch_base": EPOCH_BASE,
+                    "rows": self.rows,
+                    "metrics": self.metrics,
+                    "assets": [dict(self.static[code], asset_id=asset_id) for code, asset_id in enumerate(self.assets)],
+                    "ingested_utc": datetime.utcnow().isoformat() + "Z",
+                }, f)
+            shutil.rmtree(self.root, ignore_errors=True)
+            os.replace(build, self.root)
+        finally:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+            shutil.rmtree(build, ignore_errors=True)
+        return TelemetryStore(self.root)
+
+    @staticmethod
+    def _write_column(build, name, raw, order, block=1 << 22):
+        out = np.lib.format.open_memmap(os.path.join(build, name + ".npy"), mode="w+", dtype=raw.dtype, shape=raw.shape)
+        for start in range(0, len(raw), block):
+            stop = start + block
+            out[start:stop] = raw[start:stop] if order is None else raw[order[start:stop]]
+        out.flush()
+        del out
+
+
+def _metric_names(columns) -> list:
+    names = [c for c in columns if c not in ("asset_id", "timestamp") + STATIC_COLUMNS]
+    if "key" in names:
+        raise ValueError("'key' is reserved and cannot be used as a metric column")
+    return names
+
+
+def ingest_csv(path: str, root: str, chunk_rows: int = 100_000) -> "TelemetryStore":
+    """Build a store at root from a wide telemetry CSV, reading chunk_rows at a time."""
+    writer = _StoreWriter(root)
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        if "asset_id" not in header or "timestamp" not in header:
+            raise ValueError("CSV needs asset_id and timestamp columns")
+        metric_names = _metric_names(header)
+        while True:
+            rows = [row for _, row in zip(range(chunk_rows), reader) if row]
+            if not rows:
+                break
+            columns = dict(zip(header, zip(*rows)))
+            writer.add_batch(
+                columns["asset_id"],
+                columns["timestamp"],
+                {m: np.array([v or "nan" for v in columns[m]], dtype=np.float64) for m in metric_names},
+                {s: columns[s] for s in STATIC_COLUMNS if s in columns},
+            )
+    return writer.finish()
+
+
+def ingest_parquet(path: str, root: str, batch_rows: int = 500_000) -> "TelemetryStore":
+    """Build a store at root from a wide telemetry Parquet file, one record batch at a time."""
+    try:
+        import pyarrow.parquet as pq
+        import pyarrow.types as pa_types
+    except ImportError:
+        raise ImportError("pyarrow is required to ingest Parquet telemetry (pip install pyarrow)")
+
+    writer = _StoreWriter(root)
+    parquet = pq.ParquetFile(path)
+    names = parquet.schema_arrow.names
+    if "asset_id" not in names or "timestamp" not in names:
+        raise ValueError("Parquet file needs asset_id and timestamp columns")
+    metric_names = _metric_names(names)
+    for batch in parquet.iter_batches(batch_size=batch_rows):
+        column = batch.column
+        ts = column(names.index("timestamp"))
+        if pa_types.is_timestamp(ts.type):
+            timestamps = ts.cast("timestamp[s]").cast("int64").to_numpy(zero_copy_only=False)
+        else:
+            timestamps = ts.to_pylist()
+        writer.add_batch(
+            column(names.index("asset_id")).to_pylist(),
+            timestamps,
+            {m: column(names.index(m)).to_numpy(zero_copy_only=False).astype(np.float64) for m in metric_names},
+            {s: column(names.index(s)).to_pylist() for s in STATIC_COLUMNS if s in names},
+        )
+    return writer.finish()
+
+
+def ingest(path: str, root: str) -> "TelemetryStore":
+    if path.lower().endswith((".parquet", ".pq")):
+        return ingest_parquet(path, root)
+    return ingest_csv(path, root)
+
+
+class TelemetryStore:
+    """Read side of a telemetry store: memory-mapped columns plus the asset manifest."""
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported telemetry store format in {root}")
+        self.assets = self.manifest["assets"]
+        self.asset_codes = {a["asset_id"]: code for code, a in enumerate(self.assets)}
+        self.metrics = self.manifest["metrics"]
+        self.key = np.load(os.path.join(root, "key.npy"), mmap_mode="r")
+        self._columns = {m: np.load(os.path.join(root, m + ".npy"), mmap_mode="r") for m in self.metrics}
+
+    def __len__(self):
+        return len(self.key)
+
+    def time_range(self):
+        """(first, last) sample time as epoch seconds, or None for an empty store."""
+        # Only each asset's first and last row are read, not the whole key column
+        codes = np.arange(len(self.assets), dtype=np.int64)
+        lo = np.searchsorted(self.key, codes << 32, side="left")
+        hi = np.searchsorted(self.key, (codes << 32) | MAX_OFFSET, side="right")
+        has = hi > lo
+        if not has.any():
+            return None
+        offsets = np.concatenate([self.key[lo[has]], self.key[hi[has] - 1]]) & MAX_OFFSET
+        return EPOCH_BASE + int(offsets.min()), EPOCH_BASE + int(offsets.max())
+
+    def select(self, asset_ids=None, asset_class=None, substation=None) -> np.ndarray:
+        """Asset codes matching the filters, in store order."""
+        if asset_ids:
+            codes = [self.asset_codes[a] for a in asset_ids if a in self.asset_codes]
+        else:
+            codes = range(len(self.assets))
+        return np.array([
+            c for c in codes
+            if (not asset_class or self.assets[c].get("asset_class") == asset_class)
+            and (not substation or self.assets[c].get("substation") == substation)
+        ], dtype=np.int64)
+
+    def window_bounds(self, codes: np.ndarray, as_of: int, window_seconds: int):
+        """Row ranges [lo, hi) holding each asset's samples in (as_of - window, as_of]."""
+        start = max(as_of - window_seconds - EPOCH_BASE + 1, 0)
+        end = min(as_of - EPOCH_BASE, MAX_OFFSET)
+        lo = np.searchsorted(self.key, (codes << 32) | start, side="left")
+        hi = np.searchsorted(self.key, (codes << 32) | max(end, 0), side="right") if end >= 0 else lo
+        return lo, np.maximum(hi, lo)
+
+    def aggregate(self, codes: np.ndarray, as_of: int, window_seconds: int, how: str = "last", metrics=None):
+        """Windowed aggregate per asset and metric.
+
+        Returns (values, sample_count, last_sample): values is a float64
+        (assets, metrics) matrix with NaN where a metric had no samples in
+        the window; last_sample is the epoch second of the last row (-1 = none).
+        """
+        if how not in AGGREGATES:
+            raise ValueError(f"aggregate must be one of {AGGREGATES}")
+        metrics = list(metrics or self.metrics)
+        lo, hi = self.window_bounds(codes, as_of, window_seconds)
+        counts = hi - lo
+        values = np.full((len(codes), len(metrics)), np.nan)
+        last_sample = np.full(len(codes), -1, dtype=np.int64)
+
+        has = np.flatnonzero(counts)
+        if not len(has):
+            return values, counts, last_sample
+        seg_len = counts[has]
+        seg_start = np.cumsum(seg_len) - seg_len  # segment offsets within the gathered rows
+        total = int(seg_len.sum())
+        rows = np.arange(total) + np.repeat(lo[has] - seg_start, seg_len)
+        last_sample[has] = (np.asarray(self.key[hi[has] - 1]) & MAX_OFFSET) + EPOCH_BASE
+
+        for j, name in enumerate(metrics):
+            column = self._columns.get(name)
+            if column is None:
+                continue
+            x = np.asarray(column[rows], dtype=np.float64)
+            valid = ~np.isnan(x)
+            if how == "last":
+                pos = np.where(valid, np.arange(total), -1)
+                last = np.maximum.reduceat(pos, seg_start)
+                values[has, j] = np.where(last >= seg_start, x[np.maximum(last, 0)], np.nan)
+            elif how == "mean":
+                n = np.add.reduceat(valid.astype(np.int64), seg_start)
+                s = np.add.reduceat(np.where(valid, x, 0.0), seg_start)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    values[has, j] = np.where(n > 0, s / np.maximum(n, 1), np.nan)
+            elif how == "max":
+                values[has, j] = np.fmax.reduceat(x, seg_start)
+            else:  # p95, linear interpolation as numpy.percentile
+                seg = np.repeat(np.arange(len(has)), seg_len)
+                ordered = x[np.lexsort((x, seg))]  # NaN sorts last within each segment
+                n = np.add.reduceat(valid.astype(np.int64), seg_start)
+                pos = (np.maximum(n, 1) - 1) * 0.95
+                below = np.floor(pos).astype(np.int64)
+                above = np.minimum(below + 1, np.maximum(n, 1) - 1)
+                a, b = ordered[seg_start + below], ordered[seg_start + above]
+                values[has, j] = np.where(n > 0, a + (pos - below) * (b - a), np.nan)
+        return values, counts, last_sample
+
+    def resolve_as_of(self, as_of: Optional[int] = None) -> int:
+        """The snapshot time a query uses: as_of, or the newest sample when it is None."""
+        if as_of is None:
+            rng = self.time_range()
+            as_of = rng[1] if rng else EPOCH_BASE
+        return int(as_of)
+
+    def snapshots(self, as_of: Optional[int] = None, window_hours: float = 24, aggregate: str = "last",
+                  asset_ids=None, asset_class=None, substation=None, chunk_assets: int = 50_000):
+        """Aggregator-shaped snapshots for the selected assets (see iter_snapshots)."""
+        return list(self.iter_snapshots(as_of, window_hours, aggregate, asset_ids, asset_class, substation,
+                                        chunk_assets))
+
+    def iter_snapshots(self, as_of: Optional[int] = None, window_hours: float = 24, aggregate: str = "last",
+                       asset_ids=None, asset_class=None, substation=None, chunk_assets: int = 50_000):
+        """Yield one snapshot per asset, computed chunk_assets at a time.
+
+        Telemetry holds the windowed aggregate of each metric sampled in the
+        window; assets with no samples get empty telemetry and
+        sensor_health "no_data".
+        """
+        as_of = self.resolve_as_of(as_of)
+        window_seconds = int(window_hours * 3600)
+        codes = self.select(asset_ids, asset_class, substation)
+        for start in range(0, len(codes), chunk_assets):
+            chunk = codes[start:start + chunk_assets]
+            values, counts, last_sample = self.aggregate(chunk, as_of, window_seconds, aggregate)
+            for code, row, count, last in zip(chunk.tolist(), values.tolist(), counts.tolist(), last_sample.tolist()):
+                meta = self.assets[code]
+                snap = {"asset_id": meta["asset_id"], "asset_class": meta.get("asset_class")}
+                if meta.get("age_years") not in (None, ""):
+                    snap["age_years"] = int(float(meta["age_years"]))
+                snap["substation"] = meta.get("substation")
+                if meta.get("voltage_kv") not in (None, ""):
+                    snap["voltage_kv"] = float(meta["voltage_kv"])
+                snap.update({
+                    "telemetry": {m: round(v, 4) for m, v in zip(self.metrics, row) if v == v},
+                    "window_hours": window_hours,
+                    "aggregate": aggregate,
+                    "sample_count": count,
+                    "last_sample_utc": _iso(last) if last >= 0 else None,
+                    "sensor_health": "ok" if count else "no_data",
+                })
+                yield snap
+
+    def fleet_columns(self, as_of: Optional[int] = None, window_hours: float = 24, aggregate: str = "last",
+                      codes: Optional[np.ndarray] = None) -> dict:
+        """Scorer input columns (see asset_health_scorer_agent.fleet_columns) straight from the store."""
+        as_of = self.resolve_as_of(as_of)
+        if codes is None:
+            codes = np.arange(len(self.assets), dtype=np.int64)
+        values, _, _ = self.aggregate(codes, as_of, int(window_hours * 3600), aggregate, metrics=TELEMETRY_KEYS)
+        assets = [self.assets[c] for c in codes.tolist()]
+        return {
+            "class_code": np.array([_CLASS_CODES.get(a.get("asset_class"), 3) for a in assets], dtype=np.int8),
+            "age_years": np.array([float(a["age_years"]) if a.get("age_years") not in (None, "") else 10.0
+                                   for a in assets]),
+            "telemetry": values,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest and query columnar telemetry stores.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="build a store from a CSV or Parquet export")
+    p_ingest.add_argument("source")
+    p_ingest.add_argument("store")
+    p_snap = sub.add_parser("snapshot", help="print windowed snapshots as JSON")
+    p_snap.add_argument("store")
+    p_snap.add_argument("--as-of", help="ISO 8601 UTC; defaults to the newest sample")
+    p_snap.add_argument("--window-hours", type=float, default=24)
+    p_snap.add_argument("--aggregate", choices=AGGREGATES, default="last")
+    p_snap.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        store = ingest(args.source, args.store)
+        first, last = store.time_range() or (EPOCH_BASE, EPOCH_BASE)
+        print(f"{len(store):,} rows, {len(store.assets):,} assets, metrics {store.metrics}, "
+              f"{_iso(first)} .. {_iso(last)}")
+    else:
+        store = TelemetryStore(args.store)
+        as_of = int(parse_timestamps([args.as_of])[0]) if args.as_of else None
+        snaps = store.snapshots(as_of, args.window_hours, args.aggregate)
+        print(json.dumps(snaps[:args.limit], indent=2))
@@ -25,6 +25,7 @@ import pytest
 
 BUNDLE_ROOT = Path(__file__).resolve().parents[1]
 AGENTS_DIR = BUNDLE_ROOT / "agents"
+LIB_DIR = BUNDLE_ROOT / "lib"
 
 
 # --- BasicAgent stub on the import path -----------------------------------
@@ -244,3 +245,234 @@ def test_determinism_aggregator(loaded_agents):
     assert a["data"]["snapshots"][0]["asset_class"] == b["data"]["snapshots"][0]["asset_class"]
     assert a["data"]["snapshots"][0]["substation"] == b["data"]["snapshots"][0]["substation"]
     assert a["data"]["snapshots"][0]["telemetry"] == b["data"]["snapshots"][0]["telemetry"]
+
+
+# --- Fleet scoring: column-wise path matches per-asset scoring -------------
+
+def test_fleet_scoring_matches_per_asset(loaded_agents):
+    pytest.importorskip("numpy")
+    scorer_mod = _load_agent_module(AGENTS_DIR / "asset_health_scorer_agent.py")
+    agg = loaded_agents["asset_sensor_aggregator_agent"]
+    snaps = agg.perform(sample_size=400)["data"]["snapshots"]
+    # Edge cases: missing telemetry keys / block, unknown class, missing age, boundary values
+    snaps[0]["telemetry"] = {}
+    snaps[1]["telemetry"] = None
+    snaps[2]["asset_class"] = "unknown_class"
+    snaps[3].pop("age_years")
+    snaps[4]["telemetry"] = {"oil_dga_ppm": 400, "temp_c": 85.0, "load_pct": 130, "partial_discharge_pc": 100}
+    snaps[5] = {"asset_id": "AST-EDGE", "asset_class": "overhead_line", "age_years": 0,
+                "telemetry": {"vegetation_clearance_m": 1.5, "sag_cm": 180}}
+    snaps += [{"asset_id": f"AST-R{i}", "asset_class": "switchgear", "age_years": i / 97,
+               "telemetry": {"temp_c": 30}} for i in range(2000)]
+
+    expected = [scorer_mod._score_snapshot(s) for s in snaps]
+    assert scorer_mod.score_fleet(snaps) == expected
+
+
+def test_scorer_modes_agree(loaded_agents):
+    pytest.importorskip("numpy")
+    agg = loaded_agents["asset_sensor_aggregator_agent"]
+    scorer = loaded_agents["asset_health_scorer_agent"]
+    snaps = agg.perform(sample_size=50)["data"]["snapshots"]
+    fleet = scorer.perform(snapshots=snaps, scoring_mode="fleet")["data"]
+    per_asset = scorer.perform(snapshots=snaps, scoring_mode="per_asset")["data"]
+    assert fleet["scoring_mode"] == "fleet"
+    assert per_asset["scoring_mode"] == "per_asset"
+    assert fleet["scored"] == per_asset["scored"]
+    assert fleet["summary"] == per_asset["summary"]
+    # Small batches stay on the per-asset path by default
+    assert scorer.perform(snapshots=snaps)["data"]["scoring_mode"] == "per_asset"
+
+
+# --- Streaming pipeline: chunked run matches the agents on whole lists ----
+
+def test_streaming_pipeline_matches_agents(loaded_agents):
+    runner = _load_agent_module(LIB_DIR / "streaming_pipeline.py")
+    snaps = loaded_agents["asset_sensor_aggregator_agent"].perform(sample_size=1200)["data"]["snapshots"]
+    scored = loaded_agents["asset_health_scorer_agent"].perform(snapshots=snaps)["data"]["scored"]
+    ranker = loaded_agents["failure_probability_ranker_agent"]
+    everything = ranker.perform(scored=scored, top_n=len(scored))["data"]["ranked"]
+
+    out = runner.run_pipeline(iter(snaps), chunk_size=257, top_n=15, threshold=0.25,
+                              max_orders=40, current_fiscal_year=2026)
+    assert out["status"] == "success"
+    data = out["data"]
+    assert data["asset_count"] == 1200 and data["chunks"] == 5
+
+    assert data["ranked"] == ranker.perform(scored=scored, top_n=15)["data"]["ranked"]
+    expected_orders = loaded_agents["maintenance_work_order_agent"].perform(
+        ranked=everything, threshold=0.25, max_orders=40)["data"]["orders"]
+    assert data["orders"] == expected_orders
+
+    parts = loaded_agents["parts_planner_agent"].perform(orders=expected_orders)["data"]
+    assert data["parts"]["consolidated_demand"] == parts["consolidated_demand"]
+    assert data["parts"]["total_estimated_cost_usd"] == parts["total_estimated_cost_usd"]
+
+    capex = loaded_agents["lifecycle_capex_planner_agent"].perform(
+        ranked=everything, current_fiscal_year=2026)["data"]
+    assert data["capex"]["annual_summary"] == capex["annual_summary"]
+    assert set(data["throughput"]) == set(runner.STAGES)
+
+
+def test_streaming_pipeline_streams_orders(loaded_agents):
+    runner = _load_agent_module(LIB_DIR / "streaming_pipeline.py")
+    batches = []
+    out = runner.run_pipeline(runner.synthetic_snapshots(600), chunk_size=100, threshold=0.30,
+                              max_orders=None, on_orders=batches.append)
+    data = out["data"]
+    streamed = [o for batch in batches for o in batch]
+    assert "orders" not in data
+    assert data["orders_drafted"] == len(streamed) > 0
+    parts = loaded_agents["parts_planner_agent"].perform(orders=streamed)["data"]
+    assert data["parts"]["total_estimated_cost_usd"] == parts["total_estimated_cost_usd"]
+
+
+# --- Ranking index: repeat queries match a fresh full sort ---------------
+
+def test_ranking_index_matches_full_sort(loaded_agents):
+    ranker_mod = _load_agent_module(AGENTS_DIR / "failure_probability_ranker_agent.py")
+    ranker = ranker_mod.FailureProbabilityRankerAgent()
+    # Coarse anomaly values so many assets tie on probability
+    scored = [{"asset_id": f"AST-{i:04d}", "asset_class": "transformer", "anomaly_score": (i * 37 % 50) / 50,
+               "key_drivers": []} for i in range(500)]
+
+    def reference(horizon, top_n, min_prob):
+        rows = [ranker_mod._rank_row(s) for s in scored]
+        rows.sort(key=lambda r: r[f"p_fail_{horizon}d"], reverse=True)
+        rows = [r for r in rows if r[f"p_fail_{horizon}d"] >= min_prob] if min_prob > 0 else rows
+        return rows[:top_n], len([r for r in rows if r[f"p_fail_{horizon}d"] >= min_prob])
+
+    # The last two thresholds are probabilities assets in the fleet actually have
+    exact_90 = ranker_mod._prob(0.5, 90)
+    exact_30 = ranker_mod._prob(0.2, 30)
+    queries = [(90, 25, 0.0), (90, 10, 0.0), (30, 40, 0.05), (180, 500, 0.5), (90, 5, 0.9), (30, 3, 0.0),
+               (90, 500, exact_90), (30, 7, exact_30)]
+    for horizon, top_n, min_prob in queries:
+        out = ranker.perform(scored=scored, horizon_days=horizon, top_n=top_n, min_probability=min_prob)["data"]
+        expected, matching = reference(horizon, top_n, min_prob)
+        assert out["ranked"] == expected, (horizon, top_n, min_prob)
+        assert out["matching_count"] == matching
+
+    # Same list reuses the index; an in-place change to an anomaly score rebuilds it
+    index = ranker.index_for(scored)
+    assert ranker.index_for(scored) is index
+    scored[0]["anomaly_score"] = 0.99
+    assert ranker.index_for(scored) is not index
+    assert ranker.perform(scored=scored, top_n=1)["data"]["ranked"][0]["asset_id"] == "AST-0000"
+
+
+# --- Capex optimizer: feasible, and the bound really bounds the optimum ---
+
+def test_capex_optimizer_respects_limits_and_bound(loaded_agents):
+    import itertools
+    import random
+
+    capex_mod = _load_agent_module(AGENTS_DIR / "lifecycle_capex_planner_agent.py")
+    rng = random.Random(11)
+    for _ in range(25):
+        n, horizon = rng.randint(3, 6), rng.randint(1, 3)
+        values = [rng.uniform(0, 5e6) for _ in range(n)]
+        costs = [rng.choice([320e3, 480e3, 950e3, 1.1e6]) for _ in range(n)]
+        crew = [rng.choice([2, 4, 6, 8]) for _ in range(n)]
+        budgets = [rng.uniform(0, 2.5e6) for _ in range(horizon)]
+        crew_cap = [rng.uniform(0, 14) for _ in range(horizon)]
+        offsets, stats = capex_mod.optimize_capex(values, costs, crew, budgets, crew_cap, 0.15)
+
+        for y in range(horizon):
+            assert sum(c for c, o in zip(costs, offsets) if o == y) <= budgets[y]
+            assert sum(w for w, o in zip(crew, offsets) if o == y) <= crew_cap[y]
+
+        best = 0.0
+        for plan in itertools.product([None, *range(horizon)], repeat=n):
+            if all(sum(c for c, o in zip(costs, plan) if o == y) <= budgets[y]
+                   and sum(w for w, o in zip(crew, plan) if o == y) <= crew_cap[y] for y in range(horizon)):
+                best = max(best, sum(v * 0.85 ** o for v, o in zip(values, plan) if o is not None))
+        assert stats["objective_value_usd"] <= best + 0.01
+        assert stats["upper_bound_usd"] >= best - 0.01
+
+
+def test_capex_optimization_mode(loaded_agents):
+    capex = loaded_agents["lifecycle_capex_planner_agent"]
+    ranked = [{"asset_id": f"AST-{i}", "asset_class": cls, "p_fail_180d": p}
+              for i, (cls, p) in enumerate([("transformer", 0.7), ("switchgear", 0.6), ("overhead_line", 0.4),
+                                            ("underground_cable", 0.5), ("transformer", 0.2)])]
+    out = capex.perform(ranked=ranked, current_fiscal_year=2026, horizon_years=2,
+                        annual_budget_usd=[1_300_000, 1_000_000], annual_crew_weeks=8)
+    assert out["status"] == "success"
+    data = out["data"]
+    opt = data["optimization"]
+    assert opt["funded"] == len(data["pipeline"]) and opt["funded"] + opt["deferred"] == 5
+    assert 0 <= opt["optimality_gap_pct"] <= 100 and opt["solve_time_ms"] >= 0
+    for fy in data["annual_summary"]:
+        assert fy["total_replace_cost_usd"] <= fy["budget_usd"]
+        assert fy["crew_weeks_used"] <= fy["crew_weeks_capacity"]
+    assert {r["planned_fiscal_year"] for r in data["pipeline"]} <= {2026, 2027}
+
+    bad = capex.perform(ranked=ranked, horizon_years=3, annual_budget_usd=[1, 2])
+    assert bad["status"] == "error"
+    for horizon in (-1, -3):
+        bad = capex.perform(ranked=ranked, horizon_years=horizon, annual_budget_usd=500_000)
+        assert bad["status"] == "error" and "horizon_years" in bad["message"]
+
+
+# --- Telemetry store: windowed aggregates match a direct computation ------
+
+def test_telemetry_store_aggregates(loaded_agents, tmp_path):
+    import csv
+    import random
+
+    np = pytest.importorskip("numpy")
+    ts = _load_agent_module(LIB_DIR / "telemetry_store.py")
+    rng = random.Random(3)
+    base = 1_767_225_600  # 2026-01-01T00:00:00Z
+    rows = []
+    for a in range(12):
+        for k in range(120):
+            t = base + k * 600 + rng.randint(0, 5)
+            # Mixed epoch / ISO timestamps and ~20% missing readings
+            rows.append([f"AST-{a}", t if a % 2 else ts._iso(t), "switchgear" if a % 3 == 0 else "transformer",
+                         f"SUB-{a % 4}", 10 + a, "" if rng.random() < 0.2 else f"{rng.uniform(40, 100):.3f}",
+                         f"{rng.uniform(20, 120):.3f}"])
+    rng.shuffle(rows)  # out of time order, so ingest has to sort
+    path = tmp_path / "telemetry.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["asset_id", "timestamp", "asset_class", "substation", "age_years", "temp_c", "load_pct"])
+        writer.writerows(rows)
+
+    store = ts.ingest_csv(str(path), str(tmp_path / "store"), chunk_rows=500)
+    assert len(store) == len(rows) and store.metrics == ["temp_c", "load_pct"]
+
+    as_of, window = base + 60 * 600, 6 * 3600
+    codes = np.array([store.asset_codes[f"AST-{a}"] for a in range(12)])
+    for how in ts.AGGREGATES:
+        values, counts, _ = store.aggregate(codes, as_of, window, how)
+        for a in range(12):
+            stamp = lambda r: r[1] if isinstance(r[1], int) else int(ts.parse_timestamps([r[1]])[0])
+            in_window = sorted((r for r in rows if r[0] == f"AST-{a}" and as_of - window < stamp(r) <= as_of),
+                               key=stamp)
+            assert counts[a] == len(in_window)
+            for j in range(2):
+                col = np.array([np.float32(r[5 + j]) if r[5 + j] else np.nan for r in in_window], dtype=np.float64)
+                present = col[~np.isnan(col)]
+                expected = {"last": present[-1] if len(present) else np.nan, "mean": np.nanmean(col),
+                            "max": np.nanmax(col), "p95": np.nanpercentile(col, 95)}[how]
+                assert np.isclose(values[a, j], expected, equal_nan=True), (how, a, j)
+
+    agg = loaded_agents["asset_sensor_aggregator_agent"]
+    out = agg.perform(telemetry_store=str(tmp_path / "store"), as_of_utc=ts._iso(as_of), window_hours=6,
+                      aggregate="p95", substation="SUB-1")
+    assert out["status"] == "success"
+    assert out["data"]["as_of_utc"] == ts._iso(as_of)
+    snaps = out["data"]["snapshots"]
+    assert {s["asset_id"] for s in snaps} == {"AST-1", "AST-5", "AST-9"}
+    assert all(35 <= s["sample_count"] <= 37 and s["aggregate"] == "p95" for s in snaps)
+    scored = loaded_agents["asset_health_scorer_agent"].perform(snapshots=snaps)
+    assert scored["status"] == "success"
+
+    # Without as_of_utc the snapshot is taken at the newest sample, and says so
+    latest = agg.perform(telemetry_store=str(tmp_path / "store"))["data"]
+    assert latest["as_of_utc"] == ts._iso(max(stamp(r) for r in rows))
+
+    missing = agg.perform(telemetry_store=str(tmp_path / "nowhere"))
+    assert missing["status"] == "error"
@@ -2,6 +2,10 @@
 
 Reconciles internal payment-position ledger against the nostro statement for a given account / value date. Surfaces breaks for analyst attention.
 
+Given `ledger_file` and `statement_file` (ledger CSV, camt.053 XML or CSV
+statement), the real matching engine in lib/nostro_matcher.py is used;
+otherwise match counts are synthetic.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -38,6 +42,26 @@ class NostroReconciliationAgent(BasicAgent):
                     "nostro_account": {"type": "string"},
                     "value_date": {"type": "string"},
                     "currency": {"type": "string"},
+                    "ledger_file": {
+                        "type": "string",
+                        "description": "Internal ledger CSV: reference, amount, value_date[, currency, credit_debit].",
+                    },
+                    "statement_file": {
+                        "type": "string",
+                        "description": "Nostro statement: camt.053 XML or CSV with the ledger's columns.",
+                    },
+                    "amount_tolerance": {
+                        "type": "number",
+                        "description": "Largest amount difference (major units) still counted as a match. Default 0.",
+                    },
+                    "date_tolerance_days": {
+                        "type": "integer",
+                        "description": "Largest value-date difference still counted as a match. Default 2.",
+                    },
+                    "sample_size": {
+                        "type": "integer",
+                        "description": "Breaks returned in `sample_breaks`, largest first. Default 4.",
+                    },
                 },
                 "required": ["nostro_account", "value_date"],
             },
@@ -51,6 +75,8 @@ class NostroReconciliationAgent(BasicAgent):
 
         acct = kwargs["nostro_account"]
         seed = _stable_seed("nostro", acct, kwargs["value_date"])
+        if kwargs.get("ledger_file") or kwargs.get("statement_file"):
+            return self._reconcile_files(kwargs, seed)
         rng = random.Random(seed)
 
         total_items = rng.randint(120, 480)
@@ -83,6 +109,50 @@ class NostroReconciliationAgent(BasicAgent):
             },
         }
 
+    def _reconcile_files(self, kwargs, seed):
+        if not kwargs.get("ledger_file") or not kwargs.get("statement_file"):
+            return {"status": "needs_input", "agent": self.name,
+                    "message": "Provide both `ledger_file` and `statement_file`."}
+
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        import nostro_matcher
+
+        currency = (kwargs.get("currency") or "USD").upper()
+        try:
+            result = nostro_matcher.reconcile_files(
+                kwargs["ledger_file"], kwargs["statement_file"],
+                amount_tolerance=float(kwargs.get("amount_tolerance") or 0),
+                date_tolerance_days=int(kwargs.get("date_tolerance_days", 2)),
+                default_currency=currency,
+            )
+        except (OSError, ValueError, SyntaxError) as e:  # ParseError is a SyntaxError
+            return {"status": "error", "agent": self.name, "message": f"Reconciliation failed: {e}"}
+
+        sample_size = int(kwargs.get("sample_size") or 4)
+        largest = sorted(result.pop("breaks"), key=lambda b: abs(b[1]), reverse=True)[:sample_size]
+        breaks = [{
+            "break_id": f"BRK-{seed % 100000:05d}-{i+1}",
+            "type": kind,
+            "amount_delta": nostro_matcher.from_minor(delta, ccy),
+            "currency": ccy,
+        } for i, (kind, delta, ccy, _) in enumerate(largest)]
+
+        acct, total, matched = kwargs["nostro_account"], result["total_items"], result["matched_items"]
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": f"Reconciled {acct} for {kwargs['value_date']}: {matched}/{total} matched.",
+            "data": {
+                "nostro_account": acct,
+                "value_date": kwargs["value_date"],
+                **result,
+                "sample_breaks": breaks,
+                "as_of_utc": datetime.utcnow().isoformat() + "Z",
+            },
+        }
+
 
 if __name__ == "__main__":
     import json
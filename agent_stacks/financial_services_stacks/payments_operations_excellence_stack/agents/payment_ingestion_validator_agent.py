@@ -2,6 +2,10 @@
 
 Validates an inbound payment against scheme rules for the chosen rail (CHAPS / Faster Payments / SEPA / SWIFT). Returns structured errors.
 
+Given `batch_file`, a whole pain.001 / pacs.008 file is streamed through the
+same rules, plus IBAN mod-97 and BIC shape checks (see lib/iso20022_validator.py),
+with a per-transaction error report.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -51,6 +55,14 @@ class PaymentIngestionValidatorAgent(BasicAgent):
                     "creditor_bic": {"type": "string"},
                     "creditor_iban": {"type": "string"},
                     "value_date": {"type": "string"},
+                    "batch_file": {
+                        "type": "string",
+                        "description": "pain.001 or pacs.008 XML to validate in full. `rail` then applies to transactions whose file does not name one (default SWIFT).",
+                    },
+                    "report_file": {
+                        "type": "string",
+                        "description": "CSV to write the per-transaction error report to (payment_reference, rail, code, detail).",
+                    },
                 },
                 "required": ["payment_reference", "rail", "amount", "currency"],
             },
@@ -58,6 +70,9 @@ class PaymentIngestionValidatorAgent(BasicAgent):
         super().__init__(name=self.name, metadata=self.metadata)
 
     def perform(self, **kwargs):
+        if kwargs.get("batch_file"):
+            return self._validate_file(kwargs)
+
         for k in ("payment_reference", "rail", "amount", "currency"):
             if kwargs.get(k) in (None, ""):
                 return {"status": "needs_input", "agent": self.name,
@@ -97,6 +112,35 @@ class PaymentIngestionValidatorAgent(BasicAgent):
             },
         }
 
+    def _validate_file(self, kwargs):
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        import iso20022_validator
+
+        try:
+            result = iso20022_validator.validate_file(
+                kwargs["batch_file"], SCHEME_RULES, kwargs.get("rail") or "SWIFT",
+                report_path=kwargs.get("report_file"),
+            )
+        except (OSError, ValueError, SyntaxError) as e:  # ParseError is a SyntaxError
+            return {"status": "error", "agent": self.name, "message": f"Validation failed: {e}"}
+
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": (
+                f"Validated {result['transactions']} transaction(s) in {os.path.basename(kwargs['batch_file'])}: "
+                f"{result['failed']} failed."
+            ),
+            "data": {
+                "batch_file": os.path.basename(kwargs["batch_file"]),
+                "validation_result": "pass" if not result["failed"] else "fail",
+                **result,
+                "as_of_utc": datetime.utcnow().isoformat() + "Z",
+            },
+        }
+
 
 if __name__ == "__main__":
     import json
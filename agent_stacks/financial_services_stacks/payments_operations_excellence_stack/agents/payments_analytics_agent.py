@@ -2,6 +2,10 @@
 
 Computes operational KPIs across rails: volumes, STP rate, exception rate, average cycle time, scheme-compliance metrics.
 
+Given payment status `events` or an `events_file`, KPIs come from
+incrementally maintained per-rail counters instead (see lib/kpi_aggregator.py),
+optionally checkpointed so a restart resumes where it stopped.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -37,14 +41,36 @@ class PaymentsAnalyticsAgent(BasicAgent):
                 "properties": {
                     "window_days": {"type": "integer"},
                     "rails": {"type": "array", "items": {"type": "string", "enum": RAILS}},
+                    "events": {
+                        "type": "array",
+                        "description": "Status events: {payment_reference, rail, stage, at_utc, amount} or PaymentStatusTrackerAgent records (with `history`).",
+                        "items": {"type": "object"},
+                    },
+                    "events_file": {
+                        "type": "string",
+                        "description": "JSONL of status events. Read from where the previous call or checkpoint left off.",
+                    },
+                    "checkpoint": {
+                        "type": "string",
+                        "description": "Aggregator checkpoint to restore from (if present) and save to after consuming events.",
+                    },
+                    "as_of_utc": {
+                        "type": "string",
+                        "description": "End of the KPI window. Defaults to the latest event.",
+                    },
                 },
                 "required": [],
             },
         }
         super().__init__(name=self.name, metadata=self.metadata)
+        self.aggregator = None
+        self._restored_from = None
 
     def perform(self, **kwargs):
         window = int(kwargs.get("window_days") or 1)
+        if kwargs.get("events") is not None or kwargs.get("events_file") or kwargs.get("checkpoint"):
+            return self._event_kpis(kwargs, window)
+
         rails = kwargs.get("rails") or RAILS
         seed = _stable_seed("payments_kpi", window, *rails)
         rng = random.Random(seed)
@@ -90,6 +116,52 @@ class PaymentsAnalyticsAgent(BasicAgent):
             },
         }
 
+    def _event_kpis(self, kwargs, window):
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        import kpi_aggregator
+
+        checkpoint = kwargs.get("checkpoint")
+        try:
+            if checkpoint and self._restored_from != checkpoint and os.path.exists(checkpoint):
+                self.aggregator = kpi_aggregator.KpiAggregator.restore(checkpoint)
+                self._restored_from = checkpoint
+            if self.aggregator is None:
+                self.aggregator = kpi_aggregator.KpiAggregator()
+            agg = self.aggregator
+            applied = 0
+            if kwargs.get("events") is not None:
+                if not isinstance(kwargs["events"], list):
+                    raise ValueError("`events` must be a list of status events.")
+                applied += agg.consume(kwargs["events"])
+            if kwargs.get("events_file"):
+                applied += agg.consume_file(kwargs["events_file"])
+            if checkpoint:
+                agg.checkpoint(checkpoint)
+                self._restored_from = checkpoint
+            as_of = kpi_aggregator.to_epoch(kwargs["as_of_utc"]) if kwargs.get("as_of_utc") else None
+            kpis = agg.query(window, as_of, kwargs.get("rails"))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return {"status": "error", "agent": self.name, "message": f"KPI aggregation failed: {e}"}
+
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": (
+                f"KPIs over {window} day(s) across {len(kpis['by_rail'])} rail(s) "
+                f"from {agg.counts['events_applied']} status event(s) ({applied} new)."
+            ),
+            "data": {
+                "as_of_utc": kpis["window_end_utc"],
+                "window_days": window,
+                **kpis,
+                "events_applied": applied,
+                "aggregator": agg.stats(),
+                "data_quality": "event-sourced; per-rail hourly / daily counters",
+            },
+        }
+
 
 if __name__ == "__main__":
     import json
@@ -2,6 +2,10 @@
 
 Scores transaction-level fraud risk before release. Domain-shaped heuristic using amount, beneficiary novelty, rail and time-of-day signals.
 
+Given `payments` (a micro-batch), the agent keeps rolling per-originator
+profiles itself (see lib/fraud_profiles.py) instead of taking the originator
+average and beneficiary novelty from the caller.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -13,6 +17,7 @@ from agents.basic_agent import BasicAgent
 from datetime import datetime, timedelta
 import hashlib
 import random
+import time
 
 
 def _stable_seed(*parts) -> int:
@@ -41,13 +46,35 @@ class PreReleaseFraudScorerAgent(BasicAgent):
                     "beneficiary_new_to_originator": {"type": "boolean"},
                     "originator_avg_amount": {"type": "number"},
                     "submitted_hour_local": {"type": "integer", "description": "0-23"},
+                    "payments": {
+                        "type": "array",
+                        "description": "Micro-batch of {payment_reference, originator_id, beneficiary_id, amount, rail, submitted_hour_local}, scored against rolling originator profiles.",
+                        "items": {"type": "object"},
+                    },
+                    "update_profiles": {
+                        "type": "boolean",
+                        "description": "Fold the batch into the profiles after scoring. Default true.",
+                    },
+                    "profile_snapshot": {
+                        "type": "string",
+                        "description": "Snapshot file: profiles are restored from it on first use if it exists.",
+                    },
+                    "save_snapshot": {
+                        "type": "boolean",
+                        "description": "Write the profiles to `profile_snapshot` after scoring.",
+                    },
                 },
                 "required": ["payment_reference", "amount", "rail"],
             },
         }
         super().__init__(name=self.name, metadata=self.metadata)
+        self.profiles = None
+        self._restored_from = None
 
     def perform(self, **kwargs):
+        if kwargs.get("payments") is not None:
+            return self._score_batch(kwargs)
+
         for k in ("payment_reference", "amount", "rail"):
             if kwargs.get(k) in (None, ""):
                 return {"status": "needs_input", "agent": self.name,
@@ -89,6 +116,57 @@ class PreReleaseFraudScorerAgent(BasicAgent):
             },
         }
 
+    def _score_batch(self, kwargs):
+        payments = kwargs["payments"]
+        if not isinstance(payments, list) or not payments:
+            return {"status": "error", "agent": self.name, "message": "`payments` must be a non-empty list."}
+
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        import fraud_profiles
+
+        snapshot = kwargs.get("profile_snapshot")
+        try:
+            if snapshot and snapshot != self._restored_from and os.path.exists(snapshot):
+                self.profiles = fraud_profiles.ProfileStore.restore(snapshot)
+                self._restored_from = snapshot
+            if self.profiles is None:
+                self.profiles = fraud_profiles.ProfileStore()
+            started = time.perf_counter()
+            outcomes = self.profiles.score_batch(payments, update=kwargs.get("update_profiles", True))
+            elapsed = time.perf_counter() - started
+            if snapshot and kwargs.get("save_snapshot"):
+                self.profiles.snapshot(snapshot)
+                self._restored_from = snapshot
+        except (OSError, ValueError) as e:
+            return {"status": "error", "agent": self.name, "message": f"Batch scoring failed: {e}"}
+
+        scored = []
+        bands = {"Low": 0, "Medium": 0, "High": 0}
+        for p, (score, band, action, drivers) in zip(payments, outcomes):
+            bands[band] += 1
+            scored.append({
+                "payment_reference": p.get("payment_reference"),
+                "fraud_score": score,
+                "risk_band": band,
+                "drivers": list(drivers),
+                "recommended_action": action,
+            })
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": f"Scored {len(scored)} payment(s): {bands['High']} High, {bands['Medium']} Medium.",
+            "data": {
+                "scored": scored,
+                "band_summary": bands,
+                "profiles": self.profiles.stats(),
+                "latency_us_per_payment": round(elapsed / len(scored) * 1e6, 2),
+                "model": "rule-based-v1 (heuristic, domain-shaped) + rolling originator profiles",
+                "as_of_utc": datetime.utcnow().isoformat() + "Z",
+            },
+        }
+
 
 if __name__ == "__main__":
     import json
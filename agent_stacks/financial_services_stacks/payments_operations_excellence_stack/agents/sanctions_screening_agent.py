@@ -2,6 +2,10 @@
 
 Screens payment parties (debtor / creditor / ordering customer) against OFAC, HMT and EU consolidated lists. Synthetic match probability.
 
+Given `list_files` (local OFAC / HMT / EU list exports), parties are matched
+by name against a precompiled index (see lib/sanctions_index.py) instead, and
+`batch_file` screens a whole pacs.008 / CSV batch with a process pool.
+
 Portable. No PII. Plugs into the rapp_ai BasicAgent runtime.
 """
 
@@ -22,6 +26,21 @@ def _stable_seed(*parts) -> int:
 
 RAILS = ["CHAPS", "FasterPayments", "SEPA", "SWIFT"]
 
+# Compiled list indexes, keyed by the list files and their mtimes
+_indexes = {}
+
+
+def _open_index(module, list_files):
+    pairs = sorted((name, path) for name, paths in list_files.items()
+                   for path in ([paths] if isinstance(paths, str) else paths))
+    key = tuple((name, os.path.abspath(path), os.path.getmtime(path)) for name, path in pairs)
+    index = _indexes.get(key)
+    if index is None:
+        index = module.SanctionsIndex.from_files(pairs)
+        _indexes.clear()
+        _indexes[key] = index
+    return index
+
 
 class SanctionsScreeningAgent(BasicAgent):
     def __init__(self):
@@ -38,13 +57,29 @@ class SanctionsScreeningAgent(BasicAgent):
                     "payment_reference": {"type": "string"},
                     "parties": {
                         "type": "array",
-                        "description": "List of objects: {role, party_ref_hash}. NO real names.",
+                        "description": "List of objects: {role, party_ref_hash}. NO real names unless `list_files` is set, then {role, name}.",
                         "items": {"type": "object"},
                     },
                     "lists": {
                         "type": "array",
                         "items": {"type": "string", "enum": ["OFAC", "HMT", "EU"]},
                     },
+                    "list_files": {
+                        "type": "object",
+                        "description": "Local list exports by list name, e.g. {\"OFAC\": [\"sdn.csv\", \"alt.csv\"], \"HMT\": \"ConList.csv\"}. Enables name matching.",
+                    },
+                    "batch_file": {
+                        "type": "string",
+                        "description": "pacs.008 XML or CSV (payment_reference, role, name) to screen in bulk. Requires `list_files`.",
+                    },
+                    "match_threshold": {
+                        "type": "number",
+                        "description": "Fuzzy name score (0-1) at or above which a party is held. Default 0.88.",
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "description": "Screening processes for `batch_file`. Defaults to the CPU count.",
+                    },
                 },
                 "required": ["payment_reference", "parties"],
             },
@@ -52,6 +87,9 @@ class SanctionsScreeningAgent(BasicAgent):
         super().__init__(name=self.name, metadata=self.metadata)
 
     def perform(self, **kwargs):
+        if kwargs.get("batch_file") or kwargs.get("list_files"):
+            return self._screen_with_lists(kwargs)
+
         if not kwargs.get("payment_reference") or not kwargs.get("parties"):
             return {"status": "needs_input", "agent": self.name,
                     "message": "Provide `payment_reference` and `parties` (list)."}
@@ -91,6 +129,83 @@ class SanctionsScreeningAgent(BasicAgent):
             },
         }
 
+    def _screen_with_lists(self, kwargs):
+        if not kwargs.get("list_files"):
+            return {"status": "needs_input", "agent": self.name,
+                    "message": "Provide `list_files` to screen a `batch_file`."}
+        if not kwargs.get("batch_file") and (not kwargs.get("payment_reference") or not kwargs.get("parties")):
+            return {"status": "needs_input", "agent": self.name,
+                    "message": "Provide `batch_file`, or `payment_reference` and `parties` (list)."}
+
+        lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+        if lib not in sys.path:
+            sys.path.insert(0, lib)
+        import sanctions_index
+
+        lists = kwargs.get("lists") or None
+        threshold = float(kwargs.get("match_threshold") or sanctions_index.DEFAULT_MATCH_THRESHOLD)
+        try:
+            if not isinstance(kwargs["list_files"], dict):
+                raise ValueError("`list_files` must map list names to file paths.")
+            index = _open_index(sanctions_index, kwargs["list_files"])
+            if kwargs.get("batch_file"):
+                result = sanctions_index.screen_file(kwargs["batch_file"], index, lists=lists, threshold=threshold,
+                                                     workers=kwargs.get("workers"))
+            else:
+                parties = kwargs["parties"]
+                if not isinstance(parties, list) or not all(isinstance(p, dict) and p.get("name") for p in parties):
+                    raise ValueError("`parties` must be a non-empty list of {role, name} objects.")
+        except (OSError, ValueError, SyntaxError) as e:  # ParseError is a SyntaxError
+            return {"status": "error", "agent": self.name, "message": f"Screening failed: {e}"}
+
+        lists_checked = lists or index.lists
+        if kwargs.get("batch_file"):
+            held = result["held_payments"]
+            return {
+                "status": "success",
+                "agent": self.name,
+                "message": (
+                    f"Screened {result['parties_screened']} party/parties in {result['payments_screened']} payment(s): "
+                    f"{len(held)} held for review."
+                ),
+                "data": {
+                    "batch_file": os.path.basename(kwargs["batch_file"]),
+                    "lists_checked": lists_checked,
+                    "match_threshold": threshold,
+                    **result,
+                    "overall_decision": "hold_for_review" if held else "release_eligible",
+                    "index": index.stats(),
+                    "as_of_utc": datetime.utcnow().isoformat() + "Z",
+                },
+            }
+
+        results = []
+        for p in parties:
+            score, matches = index.screen_name(p["name"], lists, threshold)
+            results.append({
+                "role": p.get("role", "party"),
+                "party_ref_hash": sanctions_index.party_ref_hash(p["name"]),
+                "lists_checked": lists_checked,
+                "match_score": score,
+                "hit": bool(matches),
+                "matches": matches,
+                "decision": "hold_for_review" if matches else "clear",
+            })
+        any_hit = any(r["hit"] for r in results)
+        return {
+            "status": "success",
+            "agent": self.name,
+            "message": f"Screened {len(results)} party/parties: {'HIT' if any_hit else 'all clear'}.",
+            "data": {
+                "payment_reference": kwargs["payment_reference"],
+                "lists_checked": lists_checked,
+                "match_threshold": threshold,
+                "parties": results,
+                "overall_decision": "hold_for_review" if any_hit else "release_eligible",
+                "as_of_utc": datetime.utcnow().isoformat() + "Z",
+            },
+        }
+
 
 if __name__ == "__main__":
     import json
@@ -0,0 +1,122 @@
+"""
+Streaming validation benchmark for ISO 20022 ingestion files.
+
+Generates a pacs.008 file (default 200k transactions) across the four rails
+with a known share of defects: bad IBAN check digits, missing IBANs on SEPA,
+unsupported currencies, malformed BICs and out-of-range amounts. It then
+reports:
+
+  - transactions/sec validating the whole file with the error report on
+  - that the error counts come back as generated
+  - peak traced memory on a file a tenth of the size and on the full file,
+    which should be about the same since transactions are dropped as read
+
+Run from the stack root:
+    python benchmarks/bench_ingestion_validation.py
+    python benchmarks/bench_ingestion_validation.py --transactions 1000000 --batch-size 10000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'agents'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+import iso20022_validator  # noqa: E402
+from payment_ingestion_validator_agent import SCHEME_RULES  # noqa: E402
+
+RAILS = {"SEPA": ("SEPA", "EUR"), "CHAPS": ("CHAPS", "GBP"), "FPS": ("FasterPayments", "GBP"), "": ("SWIFT", "USD")}
+DEFECTS = ["IBAN_CHECKSUM_FAILED", "IBAN_REQUIRED", "CURRENCY_NOT_SUPPORTED", "BIC_MALFORMED", "AMOUNT_OUT_OF_RANGE"]
+
+
+def iban(rng, country="DE"):
+    bban = f"{rng.randrange(10 ** 8):08d}{rng.randrange(10 ** 10):010d}"
+    check = 98 - int((bban + country + "00").translate(iso20022_validator._IBAN_DIGITS)) % 97
+    return f"{country}{check:02d}{bban}"
+
+
+def write_pacs008(path, transactions, defect_rate, rng):
+    expected = dict.fromkeys(DEFECTS, 0)
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pacs.008.001.08"><FIToFICstmrCdtTrf>\n'
+                f'<GrpHdr><MsgId>BENCH-1</MsgId><NbOfTxs>{transactions}</NbOfTxs></GrpHdr>\n')
+        for t in range(transactions):
+            code = rng.choice(list(RAILS))
+            rail, ccy = RAILS[code]
+            amount = f"{rng.randint(1, 99_999)}.{rng.randrange(100):02d}"
+            account, bic = iban(rng), "DEUTDEFFXXX"
+            defect = rng.choice(DEFECTS) if rng.random() < defect_rate else None
+            if defect == "IBAN_CHECKSUM_FAILED":
+                account = account[:-1] + str((int(account[-1]) + 1) % 10)
+            elif defect == "IBAN_REQUIRED":
+                code, rail, ccy, account = "SEPA", "SEPA", "EUR", ""
+            elif defect == "CURRENCY_NOT_SUPPORTED":
+                ccy = "XAU"
+            elif defect == "BIC_MALFORMED":
+                bic = "DEUT-DE"
+            elif defect == "AMOUNT_OUT_OF_RANGE":
+                amount = "0.00"
+            if defect:
+                expected[defect] += 1
+            svc = f"<PmtTpInf><SvcLvl><Cd>{code}</Cd></SvcLvl></PmtTpInf>" if code else ""
+            acct = f"<CdtrAcct><Id><IBAN>{account}</IBAN></Id></CdtrAcct>" if account else ""
+            f.write(f'<CdtTrfTxInf><PmtId><EndToEndId>E2E-{t:08d}</EndToEndId></PmtId>{svc}'
+                    f'<IntrBkSttlmAmt Ccy="{ccy}">{amount}</IntrBkSttlmAmt>'
+                    f'<DbtrAgt><FinInstnId><BICFI>BARCGB22</BICFI></FinInstnId></DbtrAgt>'
+                    f'<CdtrAgt><FinInstnId><BICFI>{bic}</BICFI></FinInstnId></CdtrAgt>{acct}</CdtTrfTxInf>\n')
+        f.write('</FIToFICstmrCdtTrf></Document>\n')
+    return expected
+
+
+def peak_memory(path, batch_size):
+    tracemalloc.start()
+    try:
+        iso20022_validator.validate_file(path, SCHEME_RULES, "SWIFT", batch_size=batch_size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=200_000)
+    parser.add_argument('--defect-rate', type=float, default=0.03)
+    parser.add_argument('--batch-size', type=int, default=iso20022_validator.DEFAULT_BATCH_SIZE)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    work = tempfile.mkdtemp(prefix="ingestion_bench_")
+    try:
+        path = os.path.join(work, "pacs008.xml")
+        expected = write_pacs008(path, args.transactions, args.defect_rate, rng)
+        print(f"pacs.008 file {os.path.getsize(path) / 1e6:,.0f} MB, {args.transactions:,} transactions, "
+              f"generated defects: {expected}\n")
+
+        result = iso20022_validator.validate_file(path, SCHEME_RULES, "SWIFT", batch_size=args.batch_size,
+                                                  report_path=os.path.join(work, "errors.csv"))
+        t = result["throughput"]
+        print(f"validate + report  {t['elapsed_seconds']:6.2f}s  {t['transactions_per_sec']:>10,} tx/s  "
+              f"({result['failed']:,} failed, report {os.path.getsize(result['report_file']) / 1e6:.1f} MB)")
+        assert result["error_counts"] == {k: v for k, v in expected.items() if v}, \
+            f"error counts differ: {result['error_counts']} vs {expected}"
+        print("                   error counts match the generated defects")
+
+        small = os.path.join(work, "small.xml")
+        write_pacs008(small, max(1, args.transactions // 10), args.defect_rate, random.Random(args.seed))
+        small_peak, full_peak = peak_memory(small, args.batch_size), peak_memory(path, args.batch_size)
+        print(f"peak traced memory {small_peak / 1e6:6.1f} MB at {args.transactions // 10:,} tx, "
+              f"{full_peak / 1e6:.1f} MB at {args.transactions:,} tx")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Event-sourced KPI benchmark for the payments KPI aggregator.
+
+Generates a JSONL file of payment status events (default 200k payments over
+30 days, about 3.5 events each: ingested, released, settled, and a repair
+stage on a share of them). It then reports:
+
+  - events/sec folding the file into the aggregator
+  - window_days = 1 / 7 / 30 query time against the bucketed counters, next
+    to recomputing the same KPIs by rescanning every event, and that the two agree
+  - checkpoint size and save time, and a restart (restore + read the events
+    appended since) next to replaying the whole file
+
+Run from the stack root:
+    python benchmarks/bench_kpi_aggregation.py
+    python benchmarks/bench_kpi_aggregation.py --payments 1000000 --days 60
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+import kpi_aggregator  # noqa: E402
+
+RAILS = ["CHAPS", "FasterPayments", "SEPA", "SWIFT"]
+START = datetime(2026, 4, 1, tzinfo=timezone.utc).timestamp()
+
+
+def iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def generate(path, payments, days, rng, first=0):
+    """Write status events in arrival order; returns them as (ref, rail, stage, epoch, amount) tuples."""
+    events = []
+    for n in range(first, first + payments):
+        ref, rail = f"PMT-{n:09d}", rng.choice(RAILS)
+        t = START + (n - first) / payments * days * 86400 if not first else START + days * 86400 + n - first
+        amount = round(rng.lognormvariate(7, 1.5), 2)
+        events.append((ref, rail, "ingested", t, amount))
+        t += rng.uniform(5, 120)
+        if rng.random() < 0.08:
+            t += rng.uniform(300, 3600)
+            events.append((ref, rail, "repair", t, None))
+        events.append((ref, rail, "released", t + 1, None))
+        if rng.random() < 0.97:
+            events.append((ref, rail, "settled", t + rng.uniform(2, 600), None))
+    events.sort(key=lambda e: e[3])
+    with open(path, "a") as f:
+        f.writelines(json.dumps({"payment_reference": ref, "rail": rail, "stage": stage, "at_utc": iso(at),
+                                 **({"amount": amount} if amount is not None else {})}) + "\n"
+                     for ref, rail, stage, at, amount in events)
+    return events
+
+
+def rescan(events, window_days, as_of):
+    """Recompute totals from every event, as a query would without the buckets."""
+    end = (int(as_of // 3600) + 1) * 3600
+    start = end - window_days * 86400
+    volume = settled = stp = 0
+    exceptions = set()
+    for ref, rail, stage, at, amount in events:
+        if stage == "ingested":
+            volume += start <= at < end
+        elif stage == "repair":
+            exceptions.add(ref)
+        elif stage == "settled" and start <= at < end:
+            settled += 1
+            stp += ref not in exceptions
+    return volume, settled, stp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payments', type=int, default=200_000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    work = tempfile.mkdtemp(prefix="kpi_bench_")
+    try:
+        log = os.path.join(work, "events.jsonl")
+        events = generate(log, args.payments, args.days, rng)
+        print(f"{len(events):,} status events for {args.payments:,} payments over {args.days} days, "
+              f"{os.path.getsize(log) / 1e6:,.0f} MB\n")
+
+        agg = kpi_aggregator.KpiAggregator()
+        started = time.perf_counter()
+        applied = agg.consume_file(log)
+        replay = time.perf_counter() - started
+        print(f"fold file          {replay:6.2f}s  {applied / replay:>10,.0f} events/s  "
+              f"({agg.stats()['hourly_buckets']:,} hourly buckets, {len(agg.payments):,} payments held for dedup)")
+
+        for window in (1, 7, 30):
+            started = time.perf_counter()
+            for _ in range(100):
+                kpis = agg.query(window)
+            bucketed = (time.perf_counter() - started) / 100
+            started = time.perf_counter()
+            volume, settled, stp = rescan(events, window, agg.watermark)
+            scanned = time.perf_counter() - started
+            t = kpis["totals"]
+            assert (t["volume"], t["settled"]) == (volume, settled), f"{window}d totals differ"
+            assert t["stp_rate"] == round(stp / settled, 4)
+            print(f"query {window:>2}d         {bucketed * 1000:8.3f} ms   rescan {scanned * 1000:8.1f} ms  "
+                  f"({scanned / bucketed:,.0f}x)  volume {t['volume']:,}, STP {t['stp_rate']}")
+
+        ckpt = os.path.join(work, "kpi.ckpt.gz")
+        started = time.perf_counter()
+        agg.checkpoint(ckpt)
+        saved = time.perf_counter() - started
+        tail = generate(log, max(1, args.payments // (args.days * 24)), args.days, rng, first=args.payments)
+        started = time.perf_counter()
+        restarted = kpi_aggregator.KpiAggregator.restore(ckpt)
+        resumed = restarted.consume_file(log)
+        restart = time.perf_counter() - started
+        assert resumed == len(tail), "restart replayed more than the appended events"
+        print(f"\ncheckpoint         {os.path.getsize(ckpt) / 1e6:6.1f} MB saved in {saved * 1000:.0f} ms")
+        print(f"restart            {restart:6.2f}s  restore + {resumed:,} appended events, "
+              f"vs {replay:.2f}s to replay the file ({replay / restart:,.0f}x)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Reconciliation benchmark for the nostro matching engine.
+
+Generates an internal ledger and a matching nostro statement (default 1M
+lines each) with a known mix of exceptions: fee deductions (amount
+mismatch on the same reference), value-date slips, truncated references,
+and lines missing on either side. It then reports:
+
+  - match time on in-memory lines, per pass, and that the exception counts
+    come back as generated
+  - end-to-end time from CSV files (parse + match)
+  - camt.053 XML parse rate on a smaller statement (--camt-lines)
+
+Run from the stack root:
+    python benchmarks/bench_nostro_reconciliation.py
+    python benchmarks/bench_nostro_reconciliation.py --lines 200000 --camt-lines 50000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+import nostro_matcher  # noqa: E402
+
+BASE_DAY = date(2026, 5, 15).toordinal()
+
+
+def generate(lines, rng, exception_rate):
+    """Return (ledger, statement, expected counts) as matcher line tuples."""
+    ledger, statement = [], []
+    expected = {"exact": 0, "amount_mismatch": 0, "value_date_mismatch": 0, "amount_window": 0,
+                "missing_internal": 0, "missing_external": 0}
+    kinds = ["amount_mismatch", "value_date_mismatch", "amount_window", "missing_internal", "missing_external"]
+    for n in range(lines):
+        ref = f"E2E{n:010d}"
+        # Cents, with unique-ish amounts so window matches are unambiguous
+        amount = rng.randint(1_000, 50_000_000) * (1 if rng.random() < 0.5 else -1)
+        day = BASE_DAY + rng.randint(-2, 2)
+        line = (ref, amount, day, "USD")
+        kind = rng.choice(kinds) if rng.random() < exception_rate else "exact"
+        expected[kind] += 1
+        if kind == "exact":
+            ledger.append(line)
+            statement.append(line)
+        elif kind == "amount_mismatch":
+            ledger.append(line)
+            statement.append((ref, amount - 2_500, day, "USD"))       # correspondent fee taken
+        elif kind == "value_date_mismatch":
+            ledger.append(line)
+            statement.append((ref, amount, day + 5, "USD"))
+        elif kind == "amount_window":
+            ledger.append(line)
+            statement.append((ref[:8], amount, day + 1, "USD"))       # reference truncated by the bank
+        elif kind == "missing_internal":
+            statement.append(line)
+        else:
+            ledger.append(line)
+    rng.shuffle(statement)
+    return ledger, statement, expected
+
+
+def write_csv(path, lines):
+    with open(path, "w") as f:
+        f.write("reference,amount,value_date,currency\n")
+        f.writelines(f"{ref},{amount / 100:.2f},{date.fromordinal(day).isoformat()},{ccy}\n"
+                     for ref, amount, day, ccy in lines)
+
+
+def write_camt053(path, lines):
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"><BkToCstmrStmt>'
+                '<GrpHdr><MsgId>BENCH</MsgId></GrpHdr><Stmt><Id>STMT-1</Id>'
+                '<Acct><Id><Othr><Id>NOSTRO-USD-001</Id></Othr></Id></Acct>\n')
+        for ref, amount, day, ccy in lines:
+            f.write(f'<Ntry><Amt Ccy="{ccy}">{abs(amount) / 100:.2f}</Amt>'
+                    f'<CdtDbtInd>{"CRDT" if amount >= 0 else "DBIT"}</CdtDbtInd><Sts><Cd>BOOK</Cd></Sts>'
+                    f'<ValDt><Dt>{date.fromordinal(day).isoformat()}</Dt></ValDt>'
+                    f'<NtryDtls><TxDtls><Refs><EndToEndId>{ref}</EndToEndId></Refs></TxDtls></NtryDtls></Ntry>\n')
+        f.write('</Stmt></BkToCstmrStmt></Document>\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    parser.add_argument('--exception-rate', type=float, default=0.02)
+    parser.add_argument('--camt-lines', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ledger, statement, expected = generate(args.lines, rng, args.exception_rate)
+    print(f"{len(ledger):,} ledger lines, {len(statement):,} statement lines, generated exceptions: "
+          f"{ {k: v for k, v in expected.items() if k != 'exact'} }\n")
+
+    started = time.perf_counter()
+    result = nostro_matcher.reconcile(iter(ledger), iter(statement), amount_tolerance=0.0, date_tolerance_days=2)
+    elapsed = time.perf_counter() - started
+    phases = "  ".join(f"{k} {v:.2f}s" for k, v in result["timings"].items())
+    print(f"in-memory match   {elapsed:6.2f}s  {(len(ledger) + len(statement)) / elapsed:>12,.0f} lines/s  ({phases})")
+    got = {**result["break_summary"], "exact": result["match_summary"]["exact"],
+           "amount_window": result["match_summary"]["amount_window"]}
+    assert all(got[k] == v for k, v in expected.items()), f"classification differs: {got} vs {expected}"
+    print(f"                  classification matches the generated exceptions: {result['break_summary']}")
+
+    work = tempfile.mkdtemp(prefix="nostro_bench_")
+    try:
+        ledger_csv, statement_csv = os.path.join(work, "ledger.csv"), os.path.join(work, "statement.csv")
+        write_csv(ledger_csv, ledger)
+        write_csv(statement_csv, statement)
+        out = nostro_matcher.reconcile_files(ledger_csv, statement_csv)
+        t = out["throughput"]
+        print(f"CSV end to end    {t['elapsed_seconds']:6.2f}s  {t['lines_per_sec']:>12,} lines/s  "
+              f"({out['matched_items']:,} matched)")
+
+        camt = os.path.join(work, "statement.xml")
+        write_camt053(camt, statement[:args.camt_lines])
+        started = time.perf_counter()
+        parsed = sum(1 for _ in nostro_matcher.iter_camt053_lines(camt))
+        elapsed = time.perf_counter() - started
+        print(f"camt.053 parse    {elapsed:6.2f}s  {parsed / elapsed:>12,.0f} entries/s  "
+              f"({os.path.getsize(camt) / 1e6:,.0f} MB, {parsed:,} entries)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Bulk screening benchmark for the sanctions list index.
+
+Builds a synthetic OFAC-layout list (sdn.csv + alt.csv) and a pacs.008
+batch file in a temporary directory. Party names are drawn from a pool of
+synthetic customers with repeats, as in real payment files, and a small
+share of them are misspelt list names. The script then:
+
+  - builds the index and reports its size and build time
+  - screens the whole file inline and with a process pool, reporting
+    parties/sec and p50 / p99 latency per party
+  - times a brute-force fuzzy scan of every list name on a sample of
+    parties, and checks the index finds the same hits on that sample
+
+Run from the stack root:
+    python benchmarks/bench_sanctions_screening.py
+    python benchmarks/bench_sanctions_screening.py --transactions 500000 --entries 12000 --workers 4
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+import sanctions_index  # noqa: E402
+
+SYLLABLES = [c + v + t for c in ["", "b", "ch", "d", "f", "g", "h", "j", "k", "kh", "l", "m", "n", "p", "r", "s",
+                                  "sh", "t", "v", "y", "z"]
+             for v in "aeiou" for t in ["", "", "n", "r", "l", "s"]]
+SUFFIXES = ["TRADING", "SHIPPING", "HOLDINGS", "INDUSTRIES", "GROUP", "BANK", "EXPORT", "LOGISTICS"]
+
+
+def word(rng, parts=(2, 3)):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(*parts))).upper()
+
+
+def person(rng):
+    return f"{word(rng)}, {word(rng)} {word(rng, (1, 2))}"
+
+
+def company(rng):
+    return f"{word(rng)} {word(rng)} {rng.choice(SUFFIXES)} LLC"
+
+
+def misspell(rng, name):
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    if chars[i].isalpha():
+        chars[i] = rng.choice("AEIOUKRST")
+    return "".join(chars).replace(",", "")
+
+
+def write_lists(root, entries, rng):
+    names = []
+    with open(os.path.join(root, "sdn.csv"), "w") as sdn, open(os.path.join(root, "alt.csv"), "w") as alt:
+        alt_num = 0
+        for ent in range(1, entries + 1):
+            individual = rng.random() < 0.6
+            name = person(rng) if individual else company(rng)
+            names.append(name)
+            sdn.write(f'{ent},"{name}",{"individual" if individual else "-0- "},"SDGT",-0-,-0-,-0-,-0-,-0-,-0-,-0-,-0-\n')
+            for _ in range(rng.choice([0, 0, 1, 2])):
+                alt_num += 1
+                alias = person(rng) if individual else company(rng)
+                alt.write(f'{ent},{alt_num},"aka","{alias}",-0-\n')
+    return names
+
+
+def write_pacs008(path, transactions, list_names, hit_rate, rng):
+    customers = [person(rng) if rng.random() < 0.5 else company(rng) for _ in range(max(100, transactions // 5))]
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pacs.008.001.08"><FIToFICstmrCdtTrf>\n'
+                f'<GrpHdr><MsgId>BENCH-1</MsgId><NbOfTxs>{transactions}</NbOfTxs></GrpHdr>\n')
+        for t in range(transactions):
+            debtor = rng.choice(customers)
+            creditor = misspell(rng, rng.choice(list_names)) if rng.random() < hit_rate else rng.choice(customers)
+            f.write(f'<CdtTrfTxInf><PmtId><EndToEndId>E2E-{t:07d}</EndToEndId></PmtId>'
+                    f'<IntrBkSttlmAmt Ccy="GBP">{rng.randint(10, 99999)}.00</IntrBkSttlmAmt>'
+                    f'<Dbtr><Nm>{debtor}</Nm></Dbtr><Cdtr><Nm>{creditor}</Nm></Cdtr></CdtTrfTxInf>\n')
+        f.write('</FIToFICstmrCdtTrf></Document>\n')
+
+
+def brute_force(index, name, threshold):
+    key = sanctions_index.normalize(name)
+    matcher = SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(key)
+    hits = set()
+    for e, _, norm in index.names:
+        matcher.set_seq1(norm)
+        # real_quick_ratio / quick_ratio are upper bounds on ratio, so this stays exact
+        if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold \
+                and matcher.ratio() >= threshold:
+            hits.add(e)
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=100_000)
+    parser.add_argument('--entries', type=int, default=12_000, help='list entries (aliases come on top)')
+    parser.add_argument('--hit-rate', type=float, default=0.002, help='share of creditors that are misspelt list names')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sample', type=int, default=100, help='parties for the brute-force comparison')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    work = tempfile.mkdtemp(prefix="sanctions_bench_")
+    try:
+        list_names = write_lists(work, args.entries, rng)
+        batch = os.path.join(work, "pacs008.xml")
+        write_pacs008(batch, args.transactions, list_names, args.hit_rate, rng)
+        print(f"batch file {os.path.getsize(batch) / 1e6:,.0f} MB, {args.transactions:,} transactions")
+
+        index = sanctions_index.SanctionsIndex.from_files({"OFAC": [os.path.join(work, "sdn.csv"),
+                                                                    os.path.join(work, "alt.csv")]})
+        stats = index.stats()
+        print(f"index: {stats['entries']:,} entries, {stats['names']:,} names, {stats['trigrams']:,} trigrams, "
+              f"built in {stats['build_seconds'] * 1000:.0f} ms\n")
+
+        runs = [1] if args.workers == 1 else [1, args.workers]
+        results = {}
+        for workers in runs:
+            result = sanctions_index.screen_file(batch, index, workers=workers)
+            results[workers] = result
+            t = result["throughput"]
+            print(f"workers={workers:<3} {result['parties_screened']:>9,} parties  {t['elapsed_seconds']:7.2f}s  "
+                  f"{t['parties_per_sec']:>9,} parties/s  p50 {t['latency_ms']['p50']:.4f} ms  "
+                  f"p99 {t['latency_ms']['p99']:.4f} ms  hits {len(result['hits'])}")
+        if len(runs) > 1:
+            assert results[runs[0]]["hits"] == results[runs[1]]["hits"], "pool produced different hits"
+
+        parties = [name for _, _, name in sanctions_index.iter_pacs008_parties(batch)]
+        sample = rng.sample(parties, min(args.sample, len(parties)))
+        sample += [misspell(rng, n) for n in rng.sample(list_names, 10)]
+        started = time.perf_counter()
+        expected = [brute_force(index, name, sanctions_index.DEFAULT_MATCH_THRESHOLD) for name in sample]
+        brute = (time.perf_counter() - started) / len(sample)
+
+        fresh = sanctions_index.SanctionsIndex.from_files({"OFAC": [os.path.join(work, "sdn.csv"),
+                                                                    os.path.join(work, "alt.csv")]})
+        started = time.perf_counter()
+        found = [fresh.screen_name(name)[1] for name in sample]
+        indexed = (time.perf_counter() - started) / len(sample)
+        missed = sum(1 for want, got in zip(expected, found)
+                     if want - {fresh._entry_ids[("OFAC", m["entry_id"])] for m in got})
+        print(f"\nper party, uncached: brute-force scan {brute * 1000:.2f} ms, index {indexed * 1000:.3f} ms "
+              f"({brute / indexed:,.0f}x); {missed} of {len(sample)} sampled parties missed a brute-force hit")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
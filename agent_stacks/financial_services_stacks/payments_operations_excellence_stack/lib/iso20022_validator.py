@@ -0,0 +1,317 @@
+"""ISO 20022 File Validator — Financial Services.
+
+Streaming scheme-rule validation for PaymentIngestionValidatorAgent's file
+mode. pain.001 and pacs.008 files are read with iterparse, and each
+transaction is dropped from the tree as soon as it has been read, so memory
+stays flat however many transactions the file holds.
+
+Each transaction's rail comes from its service level, local instrument or
+clearing system code (SEPA, CHAPS, FPS), or else from a default rail. The
+agent's SCHEME_RULES are compiled once per rail. Transactions are then
+validated in batches: each check is one pass over the batch and sets a bit
+in a per-transaction mask. The error list for each (rail, mask) pair is built
+once and reused. Besides the scheme rules, it checks:
+
+  - creditor IBAN: country length and ISO 7064 mod-97 check digits
+  - debtor / creditor agent BIC: ISO 9362 shape (bank, country, location, optional branch)
+
+Every failing transaction is written to a CSV error report
+(payment_reference, rail, code, detail) while the file is being read.
+
+Run from the stack root:
+    python lib/iso20022_validator.py payments.xml --rail SWIFT --report errors.csv
+"""
+
+from functools import lru_cache
+from itertools import islice
+import csv
+import re
+import time
+import xml.etree.ElementTree as ET
+
+
+DEFAULT_BATCH_SIZE = 5_000
+DEFAULT_SAMPLE_SIZE = 20
+
+MESSAGE_TYPES = {"CstmrCdtTrfInitn": "pain.001", "FIToFICstmrCdtTrf": "pacs.008"}
+
+# Service level / local instrument / clearing system codes that name a rail
+RAIL_CODES = {"SEPA": "SEPA", "CHAPS": "CHAPS", "CHP": "CHAPS", "GBCHAPS": "CHAPS",
+              "FPS": "FasterPayments", "FPSN": "FasterPayments", "GBFPS": "FasterPayments"}
+
+# (bit, code, field) in report order
+CHECKS = (
+    (1, "RAIL_UNKNOWN", None),
+    (2, "AMOUNT_INVALID", None),
+    (4, "AMOUNT_OUT_OF_RANGE", None),
+    (8, "CURRENCY_NOT_SUPPORTED", None),
+    (16, "IBAN_REQUIRED", None),
+    (32, "IBAN_MALFORMED", "creditor_iban"),
+    (64, "IBAN_CHECKSUM_FAILED", "creditor_iban"),
+    (128, "BIC_MALFORMED", "debtor_bic"),
+    (256, "BIC_MALFORMED", "creditor_bic"),
+)
+
+# IBAN lengths by country (SWIFT IBAN registry); other countries are held to 15-34
+IBAN_LENGTHS = {
+    "AD": 24, "AE": 23, "AT": 20, "BE": 16, "BG": 22, "BH": 22, "CH": 21, "CY": 28, "CZ": 24, "DE": 22,
+    "DK": 18, "EE": 20, "ES": 24, "FI": 18, "FO": 18, "FR": 27, "GB": 22, "GI": 23, "GL": 18, "GR": 27,
+    "HR": 21, "HU": 28, "IE": 22, "IL": 23, "IS": 26, "IT": 27, "LI": 21, "LT": 20, "LU": 20, "LV": 21,
+    "MC": 27, "MT": 31, "NL": 18, "NO": 15, "PL": 28, "PT": 25, "QA": 29, "RO": 24, "SA": 24, "SE": 24,
+    "SI": 19, "SK": 24, "SM": 27, "TR": 26, "VA": 22,
+}
+
+_IBAN_SHAPE = re.compile(r"[A-Z]{2}[0-9]{2}[A-Z0-9]{11,30}")
+_BIC_SHAPE = re.compile(r"[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}(?:[A-Z0-9]{3})?")
+_IBAN_DIGITS = str.maketrans({chr(c): str(c - 55) for c in range(ord("A"), ord("Z") + 1)})
+
+
+@lru_cache(maxsize=4096)
+def _iban_bits(iban: str) -> int:
+    iban = iban.replace(" ", "").upper()
+    if not _IBAN_SHAPE.fullmatch(iban) or len(iban) != IBAN_LENGTHS.get(iban[:2], len(iban)):
+        return 32
+    if int((iban[4:] + iban[:4]).translate(_IBAN_DIGITS)) % 97 != 1:
+        return 64
+    return 0
+
+
+def iban_is_valid(iban: str) -> bool:
+    return _iban_bits(iban) == 0
+
+
+@lru_cache(maxsize=4096)
+def bic_is_valid(bic: str) -> bool:
+    return _BIC_SHAPE.fullmatch(bic) is not None
+
+
+def compile_rules(scheme_rules: dict) -> dict:
+    """SCHEME_RULES -> {rail: (min_amount, max_amount, currencies, iban_required)}."""
+    return {rail: (float(r["min_amount"]), float(r["max_amount"]), frozenset(r["currencies"]),
+                   bool(r["iban_required"]))
+            for rail, r in scheme_rules.items()}
+
+
+@lru_cache(maxsize=None)
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem, *names) -> str:
+    """Text of the first descendant whose local name is in `names`."""
+    for e in elem.iter():
+        if _local(e.tag) in names:
+            return (e.text or "").strip()
+    return ""
+
+
+def _rail(elem):
+    for e in elem.iter():
+        if _local(e.tag) in ("Cd", "Prtry"):
+            rail = RAIL_CODES.get((e.text or "").strip().upper())
+            if rail:
+                return rail
+    return None
+
+
+def _transaction(elem, shared: dict) -> tuple:
+    ref = amount = currency = iban = ""
+    debtor_bic, creditor_bic, rail = shared.get("DbtrAgt", ""), "", None
+    instructed = None
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "PmtId":
+            ids = {_local(c.tag): (c.text or "").strip() for c in child}
+            ref = ids.get("EndToEndId") or ids.get("TxId") or ids.get("InstrId") or ""
+        elif tag == "IntrBkSttlmAmt":
+            amount, currency = (child.text or "").strip(), child.get("Ccy", "")
+        elif tag in ("Amt", "InstdAmt"):
+            inner = child if tag == "InstdAmt" else next(iter(child), None)
+            if inner is not None:
+                instructed = ((inner.text or "").strip(), inner.get("Ccy", ""))
+        elif tag in ("PmtTpInf", "SttlmInf"):
+            rail = rail or _rail(child)
+        elif tag == "DbtrAgt":
+            debtor_bic = _text(child, "BICFI", "BIC")
+        elif tag == "CdtrAgt":
+            creditor_bic = _text(child, "BICFI", "BIC")
+        elif tag == "CdtrAcct":
+            iban = _text(child, "IBAN")
+    if not amount and instructed:
+        amount, currency = instructed
+    return ref, rail or shared.get("rail"), amount, currency, debtor_bic, creditor_bic, iban
+
+
+def iter_transactions(path: str, info: dict = None):
+    """Stream (payment_reference, rail, amount, currency, debtor_bic, creditor_bic, creditor_iban).
+
+    rail is None where the file does not name one. `info`, if given, gets the
+    message type once the document element has been read.
+    """
+    stack = []
+    shared = {}   # PmtInf (pain.001) or GrpHdr (pacs.008) fields that apply to every transaction under them
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if len(stack) == 1:
+                message_type = MESSAGE_TYPES.get(_local(elem.tag))
+                if message_type is None:
+                    raise ValueError(f"{path}: expected a pain.001 or pacs.008 document, got <{_local(elem.tag)}>")
+                if info is not None:
+                    info["message_type"] = message_type
+            stack.append(elem)
+            continue
+        stack.pop()
+        tag = _local(elem.tag)
+        if tag == "CdtTrfTxInf":
+            yield _transaction(elem, shared)
+        elif stack and _local(stack[-1].tag) in ("PmtInf", "GrpHdr"):
+            if tag in ("PmtTpInf", "SttlmInf"):
+                shared["rail"] = shared.get("rail") or _rail(elem)
+            elif tag == "DbtrAgt":
+                shared["DbtrAgt"] = _text(elem, "BICFI", "BIC")
+            continue
+        elif tag == "PmtInf":
+            shared.clear()
+        else:
+            continue
+        # Drop the finished transaction / payment information block so memory stays flat
+        if stack:
+            stack[-1].remove(elem)
+
+
+class BatchValidator:
+    """Scheme rules compiled per rail, applied to batches of transaction tuples."""
+
+    def __init__(self, scheme_rules: dict, default_rail: str = None):
+        if default_rail is not None and default_rail not in scheme_rules:
+            raise ValueError(f"Unknown rail `{default_rail}`.")
+        self.scheme_rules = scheme_rules
+        self.compiled = compile_rules(scheme_rules)
+        self.default_rail = default_rail
+        self._errors = {}
+
+    def masks(self, batch) -> tuple:
+        """(rails, masks) for the batch; each mask holds the bits of the CHECKS that failed."""
+        default = self.default_rail
+        rails = [t[1] or default for t in batch]
+        rules = [self.compiled.get(r) for r in rails]
+        amounts = []
+        for t in batch:
+            try:
+                amounts.append(float(t[2]))
+            except ValueError:
+                amounts.append(None)
+
+        masks = [0 if ru else 1 for ru in rules]
+        masks = [m | (2 if a is None else 0 if not ru or ru[0] <= a <= ru[1] else 4)
+                 for m, a, ru in zip(masks, amounts, rules)]
+        masks = [m | (8 if ru and t[3] not in ru[2] else 0) for m, t, ru in zip(masks, batch, rules)]
+        masks = [m | (_iban_bits(t[6]) if t[6] else 16 if ru and ru[3] else 0)
+                 for m, t, ru in zip(masks, batch, rules)]
+        masks = [m | (0 if not t[4] or bic_is_valid(t[4]) else 128) | (0 if not t[5] or bic_is_valid(t[5]) else 256)
+                 for m, t in zip(masks, batch)]
+        return rails, masks
+
+    def errors(self, rail: str, mask: int) -> list:
+        key = (rail, mask)
+        errors = self._errors.get(key)
+        if errors is None:
+            errors = self._errors[key] = [{"code": code, "detail": self._detail(rail, code, field)}
+                                          for bit, code, field in CHECKS if mask & bit]
+        return errors
+
+    def _detail(self, rail, code, field):
+        rules = self.scheme_rules.get(rail) or {}
+        if code == "RAIL_UNKNOWN":
+            return "no rail in the file and no default rail" if rail is None else f"no scheme rules for `{rail}`"
+        if code == "AMOUNT_INVALID":
+            return "amount missing or not a number"
+        if code == "AMOUNT_OUT_OF_RANGE":
+            return f"{rail} accepts {rules['min_amount']} – {rules['max_amount']}"
+        if code == "CURRENCY_NOT_SUPPORTED":
+            return f"{rail} supports {rules['currencies']}"
+        if code == "IBAN_REQUIRED":
+            return f"{rail} requires creditor IBAN"
+        if code == "IBAN_MALFORMED":
+            return f"`{field}` shape or country length invalid"
+        if code == "IBAN_CHECKSUM_FAILED":
+            return f"`{field}` mod-97 check digits invalid"
+        return f"`{field}` shape invalid"
+
+
+def validate_transactions(transactions, scheme_rules: dict, default_rail: str = None, report_path: str = None,
+                          batch_size: int = DEFAULT_BATCH_SIZE, sample_size: int = DEFAULT_SAMPLE_SIZE) -> dict:
+    """Validate a stream of transaction tuples; only counts and a sample of failures are kept."""
+    validator = BatchValidator(scheme_rules, default_rail)
+    counts = {"transactions": 0, "passed": 0, "failed": 0}
+    error_counts, by_rail, samples = {}, {}, []
+    report = writer = None
+    if report_path:
+        report = open(report_path, "w", newline="")
+        writer = csv.writer(report)
+        writer.writerow(["payment_reference", "rail", "code", "detail"])
+    started = time.perf_counter()
+    try:
+        stream = iter(transactions)
+        while True:
+            batch = list(islice(stream, batch_size))
+            if not batch:
+                break
+            rails, masks = validator.masks(batch)
+            counts["transactions"] += len(batch)
+            for t, rail, mask in zip(batch, rails, masks):
+                summary = by_rail.get(rail)
+                if summary is None:
+                    summary = by_rail[rail] = {"transactions": 0, "failed": 0}
+                summary["transactions"] += 1
+                if not mask:
+                    continue
+                summary["failed"] += 1
+                errors = validator.errors(rail, mask)
+                for e in errors:
+                    error_counts[e["code"]] = error_counts.get(e["code"], 0) + 1
+                if writer:
+                    writer.writerows((t[0], rail or "", e["code"], e["detail"]) for e in errors)
+                if len(samples) < sample_size:
+                    samples.append({"payment_reference": t[0], "rail": rail, "errors": errors})
+            failed = sum(1 for m in masks if m)
+            counts["failed"] += failed
+            counts["passed"] += len(batch) - failed
+    finally:
+        if report:
+            report.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        **counts,
+        "error_counts": dict(sorted(error_counts.items(), key=lambda kv: -kv[1])),
+        "by_rail": {str(rail): v for rail, v in by_rail.items()},
+        "sample_errors": samples,
+        "report_file": report_path,
+        "throughput": {
+            "elapsed_seconds": round(elapsed, 3),
+            "transactions_per_sec": round(counts["transactions"] / elapsed) if elapsed else None,
+        },
+    }
+
+
+def validate_file(path: str, scheme_rules: dict, default_rail: str = None, **kwargs) -> dict:
+    info = {}
+    result = validate_transactions(iter_transactions(path, info), scheme_rules, default_rail, **kwargs)
+    return {"message_type": info.get("message_type"), **result}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from payment_ingestion_validator_agent import RAILS, SCHEME_RULES
+
+    parser = argparse.ArgumentParser(description="Validate a pain.001 / pacs.008 file against the scheme rules.")
+    parser.add_argument("file")
+    parser.add_argument("--rail", choices=RAILS, default="SWIFT", help="rail for transactions that do not name one")
+    parser.add_argument("--report", help="CSV error report to write")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    print(json.dumps(validate_file(args.file, SCHEME_RULES, args.rail, report_path=args.report,
+                                   batch_size=args.batch_size), indent=2))
@@ -0,0 +1,355 @@
+"""Payments KPI Aggregator — Financial Services.
+
+Event-sourced KPIs for PaymentsAnalyticsAgent. Payment status events are
+folded into per-rail counters as they arrive, so a KPI query never rescans
+history:
+
+  - hourly buckets per rail (sliding windows at hour granularity)
+  - daily rollups per rail (tumbling windows; a window's whole days are read
+    from these, and only the partial days at either end from hourly buckets)
+
+A `window_days` query therefore reads about window_days + 48 buckets per rail
+however many events sit behind them.
+
+Events can be flat ({payment_reference, rail, stage, at_utc, amount}) or
+PaymentStatusTrackerAgent-shaped ({payment_reference, rail, history: [{stage,
+at_utc}, ...]}, or the whole agent response). Each stage counts once per
+payment, so replaying a tracker record after more stages have landed only
+adds the new ones. A settled payment is kept in full for dedup_days; after
+that only its stage bits are kept, until the retention period ends, so a
+replay weeks later is still recognised. Events are bucketed by their own timestamp, so late events
+land where they belong; events older than the retention period are dropped.
+
+KPIs per rail: volume and value (ingested), settled, STP rate (settled
+without an exception / repair / return stage), exception count and average
+ingested-to-settled cycle time.
+
+checkpoint() / restore() persist the counters, payments, settled refs and how far each
+JSONL file has been read (gzipped JSON, written to a temporary file and
+renamed into place). After a restart consume_file() resumes from the saved
+byte offset instead of replaying the file.
+
+Run from the stack root:
+    python lib/kpi_aggregator.py status_events.jsonl --checkpoint kpi.ckpt.gz --window-days 7
+"""
+
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+import time
+
+
+FORMAT_VERSION = 1
+HOUR = 3600
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_DEDUP_DAYS = 2
+DEFAULT_CHECKPOINT_EVERY = 500_000
+
+STAGES = ["ingested", "validated", "screened", "fraud_checked", "released", "scheme_ack", "settled"]
+EXCEPTION_STAGES = ["exception", "repair", "repaired", "rejected", "returned", "held"]
+STAGE_BITS = {stage: 1 << i for i, stage in enumerate(STAGES + EXCEPTION_STAGES)}
+EXCEPTION_BITS = sum(STAGE_BITS[s] for s in EXCEPTION_STAGES)
+
+# Counter slots in every bucket
+VOLUME, VALUE, SETTLED, STP, EXCEPTIONS, CYCLE_SUM, CYCLE_N = range(7)
+SLOTS = 7
+
+
+def to_epoch(value) -> float:
+    """ISO 8601 (naive means UTC) or epoch seconds -> epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    # fromisoformat only takes a trailing "Z" from Python 3.11
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def iter_events(record: dict):
+    """Yield (payment_reference, rail, stage, epoch, amount) from one flat or tracker-shaped record."""
+    if isinstance(record.get("data"), dict):
+        record = record["data"]
+    ref = record.get("payment_reference")
+    if not ref:
+        raise ValueError("status event without `payment_reference`")
+    rail = record.get("rail")
+    amount = record.get("amount")
+    history = record.get("history")
+    if history is not None:
+        for h in history:
+            yield ref, rail, h["stage"], to_epoch(h["at_utc"]), amount
+    else:
+        at = record.get("at_utc", record.get("timestamp"))
+        if at is None:
+            raise ValueError(f"status event for {ref} without `at_utc`")
+        yield ref, rail, record.get("stage") or record.get("current_state"), to_epoch(at), amount
+
+
+def _add(into: list, counters: list):
+    for i, v in enumerate(counters):
+        into[i] += v
+
+
+def _kpis(c: list) -> dict:
+    return {
+        "volume": c[VOLUME],
+        "value_total": round(c[VALUE], 2),
+        "settled": c[SETTLED],
+        "stp_rate": round(c[STP] / c[SETTLED], 4) if c[SETTLED] else None,
+        "exception_count": c[EXCEPTIONS],
+        "avg_cycle_seconds": round(c[CYCLE_SUM] / c[CYCLE_N]) if c[CYCLE_N] else None,
+    }
+
+
+class KpiAggregator:
+    """Per-rail hourly / daily KPI counters fed by payment status events."""
+
+    def __init__(self, retention_days: int = DEFAULT_RETENTION_DAYS, dedup_days: int = DEFAULT_DEDUP_DAYS):
+        self.retention_days = retention_days
+        self.dedup_days = dedup_days
+        self.hourly = {}     # (rail, hour index) -> counters
+        self.daily = {}      # (rail, day index) -> counters
+        self.payments = {}   # payment_reference -> [rail, ingested epoch, stage bits, settled epoch]
+        self.settled_refs = {}   # payment_reference -> [settled epoch, stage bits], past the dedup horizon
+        self.offsets = {}    # JSONL path -> bytes consumed
+        self.watermark = 0.0
+        self.counts = {"events_applied": 0, "duplicates_skipped": 0, "late_dropped": 0, "unknown_stage": 0}
+        self._pruned_day = None
+
+    def _counters(self, rail: str, epoch: float) -> tuple:
+        hour = int(epoch // HOUR)
+        key = (rail, hour)
+        hourly = self.hourly.get(key)
+        if hourly is None:
+            hourly = self.hourly[key] = [0] * SLOTS
+        key = (rail, hour // 24)
+        daily = self.daily.get(key)
+        if daily is None:
+            daily = self.daily[key] = [0] * SLOTS
+        return hourly, daily
+
+    def apply(self, ref: str, rail, stage: str, epoch: float, amount=None) -> bool:
+        """Fold one status event in. Returns False if it was skipped."""
+        bit = STAGE_BITS.get(stage)
+        counts = self.counts
+        if bit is None:
+            counts["unknown_stage"] += 1
+            return False
+        if epoch < self.watermark - self.retention_days * 86400:
+            counts["late_dropped"] += 1
+            return False
+        payment = self.payments.get(ref)
+        if payment is None:
+            settled = self.settled_refs.get(ref)
+            if settled is not None and settled[1] & bit:
+                counts["duplicates_skipped"] += 1
+                return False
+            if settled is not None:
+                # A new stage (e.g. a late return) reopens the payment with the stages it already had
+                del self.settled_refs[ref]
+                payment = self.payments[ref] = [rail or "UNKNOWN", None, settled[1], settled[0]]
+            else:
+                payment = self.payments[ref] = [rail or "UNKNOWN", None, 0, None]
+        elif payment[2] & bit:
+            counts["duplicates_skipped"] += 1
+            return False
+        elif rail and payment[0] == "UNKNOWN":
+            payment[0] = rail
+        payment[2] |= bit
+        hourly, daily = self._counters(payment[0], epoch)
+
+        if stage == "ingested":
+            payment[1] = epoch
+            value = float(amount or 0)
+            hourly[VOLUME] += 1
+            daily[VOLUME] += 1
+            hourly[VALUE] += value
+            daily[VALUE] += value
+        elif bit & EXCEPTION_BITS:
+            if not payment[2] & EXCEPTION_BITS & ~bit:   # first exception stage for this payment
+                hourly[EXCEPTIONS] += 1
+                daily[EXCEPTIONS] += 1
+        elif stage == "settled":
+            payment[3] = epoch
+            stp = 0 if payment[2] & EXCEPTION_BITS else 1
+            hourly[SETTLED] += 1
+            daily[SETTLED] += 1
+            hourly[STP] += stp
+            daily[STP] += stp
+            if payment[1] is not None:
+                cycle = epoch - payment[1]
+                hourly[CYCLE_SUM] += cycle
+                daily[CYCLE_SUM] += cycle
+                hourly[CYCLE_N] += 1
+                daily[CYCLE_N] += 1
+
+        counts["events_applied"] += 1
+        if epoch > self.watermark:
+            self.watermark = epoch
+            if int(epoch // 86400) != self._pruned_day:
+                self._prune()
+        return True
+
+    def consume(self, records) -> int:
+        """Apply flat or tracker-shaped records; returns the number of events applied."""
+        applied = 0
+        for record in records:
+            for event in iter_events(record):
+                applied += self.apply(*event)
+        return applied
+
+    def consume_file(self, path: str, checkpoint_path: str = None,
+                     checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY) -> int:
+        """Apply a JSONL file from where the last call (or restored checkpoint) stopped."""
+        key = os.path.abspath(path)
+        offset = self.offsets.get(key, 0)
+        if offset > os.path.getsize(path):   # truncated or replaced: start over
+            offset = 0
+        applied = since_checkpoint = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):   # partial last line, still being written
+                    break
+                offset += len(line)
+                if line.strip():
+                    for event in iter_events(json.loads(line)):
+                        applied += self.apply(*event)
+                since_checkpoint += 1
+                if checkpoint_path and since_checkpoint >= checkpoint_every:
+                    self.offsets[key] = offset
+                    self.checkpoint(checkpoint_path)
+                    since_checkpoint = 0
+        self.offsets[key] = offset
+        if checkpoint_path:
+            self.checkpoint(checkpoint_path)
+        return applied
+
+    def _prune(self):
+        self._pruned_day = int(self.watermark // 86400)
+        oldest_day = self._pruned_day - self.retention_days
+        self.hourly = {k: v for k, v in self.hourly.items() if k[1] // 24 >= oldest_day}
+        self.daily = {k: v for k, v in self.daily.items() if k[1] >= oldest_day}
+        # Settled payments shrink to their stage bits after dedup_days; stuck ones are kept until retention
+        settled_before = self.watermark - self.dedup_days * 86400
+        oldest = oldest_day * 86400
+        self.settled_refs = {ref: s for ref, s in self.settled_refs.items() if s[0] >= oldest}
+        payments = {}
+        for ref, p in self.payments.items():
+            if p[1] is not None and p[1] < oldest:
+                continue
+            if p[3] is not None and p[3] < settled_before:
+                if p[3] >= oldest:
+                    self.settled_refs[ref] = [p[3], p[2]]
+                continue
+            payments[ref] = p
+        self.payments = payments
+
+    def query(self, window_days: int = 1, as_of: float = None, rails=None) -> dict:
+        """KPIs per rail over the window_days ending at the hour containing `as_of` (default: latest event),
+        plus a per-calendar-day series."""
+        as_of = self.watermark if as_of is None else as_of
+        end = int(as_of // HOUR) + 1
+        start = end - window_days * 24
+        first_day, last_day = -(-start // 24), end // 24   # whole days inside [start, end)
+        if first_day >= last_day:
+            hours, days = range(start, end), range(0)
+        else:
+            hours = list(range(start, first_day * 24)) + list(range(last_day * 24, end))
+            days = range(first_day, last_day)
+
+        rails = rails or sorted({rail for rail, _ in self.daily})
+        by_rail, totals = [], [0] * SLOTS
+        for rail in rails:
+            counters = [0] * SLOTS
+            for hour in hours:
+                c = self.hourly.get((rail, hour))
+                if c is not None:
+                    _add(counters, c)
+            for day in days:
+                c = self.daily.get((rail, day))
+                if c is not None:
+                    _add(counters, c)
+            by_rail.append({"rail": rail, **_kpis(counters)})
+            _add(totals, counters)
+
+        # Tumbling: the last window_days calendar days, up to and including the as_of day
+        tumbling, last = [], (end - 1) // 24
+        for day in range(last - window_days + 1, last + 1):
+            counters = [0] * SLOTS
+            for rail in rails:
+                c = self.daily.get((rail, day))
+                if c is not None:
+                    _add(counters, c)
+            tumbling.append({"date": datetime.fromtimestamp(day * 86400, timezone.utc).date().isoformat(),
+                             **_kpis(counters)})
+
+        return {
+            "window_start_utc": datetime.fromtimestamp(start * HOUR, timezone.utc).isoformat(),
+            "window_end_utc": datetime.fromtimestamp(end * HOUR, timezone.utc).isoformat(),
+            "totals": _kpis(totals),
+            "by_rail": by_rail,
+            "daily": tumbling,
+        }
+
+    def stats(self) -> dict:
+        return {**self.counts, "open_payments": len(self.payments), "settled_refs": len(self.settled_refs),
+                "hourly_buckets": len(self.hourly),
+                "daily_buckets": len(self.daily),
+                "watermark_utc": datetime.fromtimestamp(self.watermark, timezone.utc).isoformat()
+                if self.watermark else None}
+
+    def checkpoint(self, path: str):
+        state = {
+            "format_version": FORMAT_VERSION,
+            "retention_days": self.retention_days,
+            "dedup_days": self.dedup_days,
+            "watermark": self.watermark,
+            "counts": self.counts,
+            "offsets": self.offsets,
+            "hourly": [[rail, hour, *c] for (rail, hour), c in self.hourly.items()],
+            "daily": [[rail, day, *c] for (rail, day), c in self.daily.items()],
+            "payments": self.payments,
+            "settled_refs": self.settled_refs,
+        }
+        tmp = f"{path}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path: str) -> "KpiAggregator":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported KPI checkpoint version {state.get('format_version')}")
+        agg = cls(state["retention_days"], state["dedup_days"])
+        agg.watermark = state["watermark"]
+        agg.counts = state["counts"]
+        agg.offsets = state["offsets"]
+        agg.hourly = {(rail, hour): c for rail, hour, *c in state["hourly"]}
+        agg.daily = {(rail, day): c for rail, day, *c in state["daily"]}
+        agg.payments = state["payments"]
+        agg.settled_refs = state.get("settled_refs", {})
+        agg._pruned_day = int(agg.watermark // 86400)
+        return agg
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold a JSONL file of payment status events into rolling KPIs.")
+    parser.add_argument("events", help="JSONL, one flat or tracker-shaped record per line")
+    parser.add_argument("--checkpoint", help="restore from / save to this file")
+    parser.add_argument("--window-days", type=int, default=1)
+    args = parser.parse_args()
+
+    agg = KpiAggregator.restore(args.checkpoint) if args.checkpoint and os.path.exists(args.checkpoint) \
+        else KpiAggregator()
+    started = time.perf_counter()
+    applied = agg.consume_file(args.events, args.checkpoint)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"events_applied": applied, "elapsed_seconds": round(elapsed, 3), **agg.stats(),
+                      "kpis": agg.query(args.window_days)}, indent=2))
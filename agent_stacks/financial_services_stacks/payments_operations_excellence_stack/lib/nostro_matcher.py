@@ -0,0 +1,384 @@
+"""Nostro Matching Engine — Financial Services.
+
+Matches an internal nostro ledger (expected movements) against the bank's
+statement. Used by NostroReconciliationAgent when `ledger_file` and
+`statement_file` are given.
+
+Passes, cheapest first:
+
+  1. exact: hash join on (reference, amount, value date, currency). The
+     ledger is the build side; statement lines are streamed against it, and
+     only statement lines that miss are kept
+  2. reference: leftovers with the same reference and currency. Within the
+     amount / date tolerance they count as matched, otherwise they are an
+     `amount_mismatch` or `value_date_mismatch` break
+  3. amount window: per currency, leftover ledger lines sorted by amount;
+     each leftover statement line takes the closest unused line inside
+     [amount - tolerance, amount + tolerance] with a value date inside the
+     date tolerance (the bank truncated or replaced the reference)
+  4. one-sided: whatever is left is `missing_internal` (on the statement
+     only) or `missing_external` (in the ledger only)
+
+Amounts are held as signed integers in minor units (credit positive, debit
+negative, from the nostro account's point of view on both sides), so there
+is no float rounding anywhere in the match.
+
+Inputs: camt.053 XML statements (streamed with iterparse) and CSV files
+with reference, amount, value_date and optionally currency and
+credit_debit (CRDT / DBIT) columns for either side.
+
+Run from the stack root:
+    python lib/nostro_matcher.py ledger.csv statement.xml --amount-tolerance 0.05 --date-tolerance-days 2
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+import csv
+import time
+import xml.etree.ElementTree as ET
+
+
+BREAK_TYPES = ("amount_mismatch", "value_date_mismatch", "missing_internal", "missing_external")
+MAX_WINDOW_SCAN = 64
+
+# ISO 4217 minor-unit exponents that differ from 2
+_EXPONENTS = {"JPY": 0, "KRW": 0, "ISK": 0, "CLP": 0, "VND": 0, "BHD": 3, "JOD": 3, "KWD": 3, "OMR": 3, "TND": 3}
+
+_REF_COLUMNS = ("reference", "end_to_end_id", "ref", "transaction_reference")
+_DIRECTION_COLUMNS = ("credit_debit", "direction", "cdt_dbt_ind", "dr_cr")
+
+
+def exponent(currency: str) -> int:
+    return _EXPONENTS.get(currency, 2)
+
+
+def to_minor(text: str, digits: int = 2) -> int:
+    """'1234.5' -> 123450 for a 2-digit currency; more decimals than that are rounded half-up."""
+    text = text.strip()
+    whole, _, frac = text.partition(".")
+    if len(frac) <= digits:
+        # One int() over the digit string; "-0.50" -> int("-050") keeps the sign
+        sign = whole[:1] if whole[:1] in ("-", "+") else ""
+        return int(sign + (whole[len(sign):] or "0") + frac.ljust(digits, "0"))
+    value = Decimal(text).scaleb(digits).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    return int(value)
+
+
+def from_minor(amount: int, currency: str) -> float:
+    return round(amount / 10 ** exponent(currency), exponent(currency))
+
+
+_ordinals = {}
+
+
+def _ordinal(value_date: str) -> int:
+    day = value_date[:10]
+    ordinal = _ordinals.get(day)
+    if ordinal is None:
+        ordinal = _ordinals[day] = date.fromisoformat(day).toordinal()
+    return ordinal
+
+
+# A line is (reference, amount in minor units, value date ordinal, currency)
+
+def iter_csv_lines(path: str, default_currency: str = "USD"):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        col = {h: i for i, h in enumerate(header)}
+        ref_col = next((col[c] for c in _REF_COLUMNS if c in col), None)
+        if ref_col is None or "amount" not in col or "value_date" not in col:
+            raise ValueError(f"{path}: needs reference, amount and value_date columns")
+        amount_col, date_col = col["amount"], col["value_date"]
+        ccy_col = col.get("currency")
+        dir_col = next((col[c] for c in _DIRECTION_COLUMNS if c in col), None)
+        for row in reader:
+            if not row:
+                continue
+            ccy = row[ccy_col].strip().upper() if ccy_col is not None and row[ccy_col] else default_currency
+            amount = to_minor(row[amount_col], exponent(ccy))
+            if dir_col is not None and row[dir_col].strip().upper() in ("DBIT", "D", "DR", "DEBIT"):
+                amount = -abs(amount)
+            yield row[ref_col].strip(), amount, _ordinal(row[date_col].strip()), ccy
+
+
+_CAMT_TAGS = ("Ntry", "Amt", "CdtDbtInd", "ValDt", "BookgDt", "AcctSvcrRef", "NtryRef", "NtryDtls", "TxDtls",
+              "AmtDtls", "TxAmt", "Refs")
+_TX_REF_TAGS = ("EndToEndId", "InstrId", "TxId", "UETR", "AcctSvcrRef")
+
+
+def _camt_tags(ns: str) -> dict:
+    """Local name -> qualified tag in the statement's namespace, so lookups are plain string compares."""
+    prefix = f"{{{ns}}}" if ns else ""
+    tags = {name: prefix + name for name in _CAMT_TAGS}
+    tags["tx_refs"] = [prefix + name for name in _TX_REF_TAGS]
+    return tags
+
+
+def _tx_fields(tx, tags):
+    """(amount element or None, CdtDbtInd text, reference) of one TxDtls."""
+    amt = direction = None
+    ref = ""
+    for child in tx:
+        tag = child.tag
+        if tag == tags["Amt"]:
+            amt = child
+        elif tag == tags["AmtDtls"] and amt is None:
+            tx_amt = child.find(tags["TxAmt"])
+            amt = tx_amt.find(tags["Amt"]) if tx_amt is not None else None
+        elif tag == tags["CdtDbtInd"]:
+            direction = child.text
+        elif tag == tags["Refs"]:
+            by_tag = {r.tag: (r.text or "").strip() for r in child}
+            ref = next((by_tag[t] for t in tags["tx_refs"] if by_tag.get(t) and by_tag[t] != "NOTPROVIDED"), "")
+    return amt, direction, ref
+
+
+def iter_camt053_lines(path: str):
+    """Stream statement lines from a camt.053 file; a batched entry yields one line per TxDtls with its own amount."""
+    tags = None
+    stack = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if tags is None:
+                tags = _camt_tags(elem.tag[1:].split("}", 1)[0] if elem.tag.startswith("{") else "")
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != tags["Ntry"]:
+            continue
+
+        amt = direction = value_date = booking_date = None
+        entry_ref = ""
+        txs = []
+        for child in elem:
+            tag = child.tag
+            if tag == tags["Amt"]:
+                amt = child
+            elif tag == tags["CdtDbtInd"]:
+                direction = child.text
+            elif tag == tags["ValDt"] and len(child):
+                value_date = child[0].text
+            elif tag == tags["BookgDt"] and len(child):
+                booking_date = child[0].text
+            elif tag == tags["AcctSvcrRef"] or (tag == tags["NtryRef"] and not entry_ref):
+                entry_ref = (child.text or "").strip()
+            elif tag == tags["NtryDtls"]:
+                txs.extend(_tx_fields(tx, tags) for tx in child if tx.tag == tags["TxDtls"])
+        # Drop the finished entry from its Stmt so memory stays flat on large statements
+        if stack:
+            stack[-1].remove(elem)
+        if amt is None:
+            continue
+
+        ccy = amt.get("Ccy", "").upper()
+        sign = -1 if direction == "DBIT" else 1
+        ordinal = _ordinal((value_date or booking_date or "").strip())
+        if len(txs) > 1 and all(tx_amt is not None for tx_amt, _, _ in txs):
+            for tx_amt, tx_direction, tx_ref in txs:
+                tx_ccy = tx_amt.get("Ccy", ccy).upper()
+                tx_sign = -1 if tx_direction == "DBIT" else (1 if tx_direction == "CRDT" else sign)
+                yield tx_ref or entry_ref, tx_sign * to_minor(tx_amt.text or "0", exponent(tx_ccy)), ordinal, tx_ccy
+        else:
+            ref = (txs[0][2] if txs else "") or entry_ref
+            yield ref, sign * to_minor(amt.text or "0", exponent(ccy)), ordinal, ccy
+
+
+def iter_lines(path: str, default_currency: str = "USD"):
+    if path.lower().endswith(".xml"):
+        return iter_camt053_lines(path)
+    return iter_csv_lines(path, default_currency)
+
+
+class _Breaks:
+    """Break records plus per-type counts; records are (type, delta minor units, currency, reference)."""
+
+    def __init__(self):
+        self.records = []
+        self.counts = {t: 0 for t in BREAK_TYPES}
+
+    def add(self, kind, delta, ccy, ref):
+        self.records.append((kind, delta, ccy, ref))
+        self.counts[kind] += 1
+
+
+def reconcile(ledger, statement, amount_tolerance: float = 0.0, date_tolerance_days: int = 2) -> dict:
+    """Match ledger lines against statement lines (any iterables of lines, statement streamed).
+
+    amount_tolerance is in major units and applied in each line's currency.
+    """
+    tolerances = {}
+
+    def tolerance(ccy):
+        value = tolerances.get(ccy)
+        if value is None:
+            value = tolerances[ccy] = to_minor(f"{amount_tolerance:.6f}", exponent(ccy))
+        return value
+
+    timings = {}
+    t = time.perf_counter()
+
+    # Pass 1: exact hash join. Duplicate keys keep a FIFO list
+    build = {}
+    ledger_count = 0
+    for line in ledger:
+        ledger_count += 1
+        bucket = build.get(line)
+        if bucket is None:
+            build[line] = 1
+        else:
+            build[line] = bucket + 1
+    timings["build"] = time.perf_counter() - t
+    t = time.perf_counter()
+
+    stmt_left = []
+    statement_count = exact = 0
+    for line in statement:
+        statement_count += 1
+        left = build.get(line)
+        if left is None:
+            stmt_left.append(line)
+        else:
+            exact += 1
+            if left == 1:
+                del build[line]
+            else:
+                build[line] = left - 1
+    ledger_left = [line for line, n in build.items() for _ in range(n)]
+    del build
+    timings["exact"] = time.perf_counter() - t
+    t = time.perf_counter()
+
+    breaks = _Breaks()
+    ledger_used = [False] * len(ledger_left)
+
+    # Pass 2: same reference and currency
+    by_ref = {}
+    for i, (ref, _, _, ccy) in enumerate(ledger_left):
+        if ref:
+            by_ref.setdefault((ref, ccy), []).append(i)
+    by_reference = 0
+    still_left = []
+    for line in stmt_left:
+        ref, amount, day, ccy = line
+        candidates = [i for i in by_ref.get((ref, ccy), ()) if not ledger_used[i]] if ref else []
+        if not candidates:
+            still_left.append(line)
+            continue
+        i = min(candidates, key=lambda i: (abs(ledger_left[i][2] - day), abs(ledger_left[i][1] - amount), i))
+        ledger_used[i] = True
+        _, l_amount, l_day, _ = ledger_left[i]
+        if abs(amount - l_amount) <= tolerance(ccy) and abs(day - l_day) <= date_tolerance_days:
+            by_reference += 1
+        elif abs(amount - l_amount) > tolerance(ccy):
+            breaks.add("amount_mismatch", amount - l_amount, ccy, ref)
+        else:
+            breaks.add("value_date_mismatch", 0, ccy, ref)
+    timings["reference"] = time.perf_counter() - t
+    t = time.perf_counter()
+
+    # Pass 3: amount window per currency over the ledger lines still unused
+    by_ccy = {}
+    for i, (_, amount, _, ccy) in enumerate(ledger_left):
+        if not ledger_used[i]:
+            by_ccy.setdefault(ccy, []).append((amount, i))
+    windows = {}
+    for ccy, rows in by_ccy.items():
+        rows.sort()
+        windows[ccy] = ([a for a, _ in rows], [i for _, i in rows], list(range(len(rows) + 1)))
+
+    def next_free(skip, k):
+        # "next unused position at or after k", with path compression
+        root = k
+        while skip[root] != root:
+            root = skip[root]
+        while skip[k] != root:
+            skip[k], k = root, skip[k]
+        return root
+
+    by_window = 0
+    for line in still_left:
+        ref, amount, day, ccy = line
+        window = windows.get(ccy)
+        best = None
+        if window is not None:
+            amounts, ids, skip = window
+            k = next_free(skip, bisect_left(amounts, amount - tolerance(ccy)))
+            end = bisect_right(amounts, amount + tolerance(ccy))
+            scanned = 0
+            while k < end and scanned < MAX_WINDOW_SCAN:
+                i = ids[k]
+                gap = abs(ledger_left[i][2] - day)
+                if gap <= date_tolerance_days:
+                    rank = (gap, abs(amounts[k] - amount), k)
+                    if best is None or rank < best[0]:
+                        best = (rank, k)
+                scanned += 1
+                k = next_free(skip, k + 1)
+        if best is None:
+            breaks.add("missing_internal", amount, ccy, ref)
+            continue
+        k = best[1]
+        ledger_used[window[1][k]] = True
+        window[2][k] = k + 1
+        by_window += 1
+    timings["amount_window"] = time.perf_counter() - t
+    t = time.perf_counter()
+
+    # Pass 4: ledger lines nobody claimed
+    for i, (ref, amount, _, ccy) in enumerate(ledger_left):
+        if not ledger_used[i]:
+            breaks.add("missing_external", -amount, ccy, ref)
+    timings["one_sided"] = time.perf_counter() - t
+
+    matched = exact + by_reference + by_window
+    one_sided = breaks.counts["missing_internal"] + breaks.counts["missing_external"]
+    unmatched = breaks.counts["amount_mismatch"] + breaks.counts["value_date_mismatch"]
+    return {
+        "ledger_lines": ledger_count,
+        "statement_lines": statement_count,
+        "total_items": matched + unmatched + one_sided,
+        "matched_items": matched,
+        "one_sided_items": one_sided,
+        "unmatched_items": unmatched,
+        "match_summary": {"exact": exact, "reference_within_tolerance": by_reference, "amount_window": by_window},
+        "break_summary": dict(breaks.counts),
+        "breaks": breaks.records,
+        "timings": timings,
+    }
+
+
+def reconcile_files(ledger_path: str, statement_path: str, amount_tolerance: float = 0.0,
+                    date_tolerance_days: int = 2, default_currency: str = "USD") -> dict:
+    """reconcile() over a ledger file and a statement file, with overall throughput."""
+    started = time.perf_counter()
+    result = reconcile(iter_lines(ledger_path, default_currency), iter_lines(statement_path, default_currency),
+                       amount_tolerance, date_tolerance_days)
+    elapsed = time.perf_counter() - started
+    lines = result["ledger_lines"] + result["statement_lines"]
+    result["throughput"] = {
+        "elapsed_seconds": round(elapsed, 3),
+        "lines_per_sec": round(lines / elapsed) if elapsed else None,
+        "phase_seconds": {k: round(v, 3) for k, v in result.pop("timings").items()},
+    }
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Match an internal nostro ledger against a statement.")
+    parser.add_argument("ledger", help="ledger CSV (reference, amount, value_date[, currency, credit_debit])")
+    parser.add_argument("statement", help="camt.053 XML or statement CSV")
+    parser.add_argument("--amount-tolerance", type=float, default=0.0, help="in major units, e.g. 0.05")
+    parser.add_argument("--date-tolerance-days", type=int, default=2)
+    args = parser.parse_args()
+
+    out = reconcile_files(args.ledger, args.statement, args.amount_tolerance, args.date_tolerance_days)
+    print(f"{out['ledger_lines']:,} ledger / {out['statement_lines']:,} statement lines: "
+          f"{out['matched_items']:,} matched {out['match_summary']}, {out['unmatched_items']:,} breaks, "
+          f"{out['one_sided_items']:,} one-sided")
+    print(f"breaks: {out['break_summary']}")
+    print(f"{out['throughput']['elapsed_seconds']}s, {out['throughput']['lines_per_sec']:,} lines/s, "
+          f"phases {out['throughput']['phase_seconds']}")
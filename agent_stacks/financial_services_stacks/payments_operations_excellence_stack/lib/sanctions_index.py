@@ -0,0 +1,467 @@
+"""Sanctions List Index — Financial Services.
+
+Precompiled name-matching index over sanctions lists loaded from local files,
+plus a bulk screener for payment batch files. Used by SanctionsScreeningAgent
+when `list_files` are given.
+
+Matching runs in two stages:
+
+  - candidates: names are normalized (accents folded, punctuation and legal
+    suffixes dropped, tokens sorted) and broken into padded character
+    trigrams. An inverted trigram index, with posting lists ordered by name
+    length and the query's most common trigrams left out of the count,
+    returns exactly the names that reach a trigram-similarity (Dice) floor
+  - fuzzy score: a difflib ratio on the token-sorted names, computed for
+    candidates only; a score at or above `match_threshold` is a hit
+
+List files (CSV):
+  - OFAC SDN `sdn.csv` / `alt.csv` (headerless, as published)
+  - HMT consolidated list `ConList.csv` (Name 1..Name 6, Group ID)
+  - EU consolidated list CSV (`;`-separated, Entity_LogicalId, NameAlias_WholeName)
+  - any CSV with a header row containing `name` and optionally `entry_id`,
+    `aliases` (`;`-separated), `entity_type`, `program`
+
+Batch files: ISO 20022 pacs.008 XML (streamed with iterparse) or CSV with
+payment_reference, role, name columns. screen_file() fans chunks of
+parties out to a process pool and reports parties/sec and per-party
+latency percentiles. Party names are never echoed in results; parties are
+identified by a hash of the name, as in the agent's single-payment mode.
+
+Run from the stack root:
+    python lib/sanctions_index.py --list OFAC=sdn.csv --list OFAC=alt.csv --list HMT=ConList.csv payments.xml
+"""
+
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter, deque
+from difflib import SequenceMatcher
+from itertools import islice
+from typing import Optional
+import csv
+import hashlib
+import math
+import os
+import re
+import time
+import unicodedata
+import xml.etree.ElementTree as ET
+
+
+DEFAULT_MATCH_THRESHOLD = 0.88
+DEFAULT_CANDIDATE_SIMILARITY = 0.5
+MAX_MATCHES = 5
+MEMO_SIZE = 100_000
+
+# Dropped before matching so "Acme Trading Co Ltd" and "ACME TRADING" compare equal
+STOPWORDS = frozenset({
+    "the", "of", "and", "ltd", "limited", "llc", "llp", "inc", "incorporated", "co", "company", "corp",
+    "corporation", "plc", "sa", "ag", "gmbh", "bv", "nv", "jsc", "ojsc", "pjsc", "cjsc", "ooo", "zao", "oao",
+})
+
+PACS008_ROLES = {
+    "InitgPty": "initiating_party",
+    "UltmtDbtr": "ultimate_debtor",
+    "Dbtr": "debtor",
+    "Cdtr": "creditor",
+    "UltmtCdtr": "ultimate_creditor",
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(name: str) -> str:
+    """Token-sorted, accent-folded, lower-case form of a name ('' if nothing is left)."""
+    folded = unicodedata.normalize("NFKD", name or "")
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).casefold()
+    tokens = [t for t in _NON_ALNUM.sub(" ", folded).split() if t not in STOPWORDS]
+    return " ".join(sorted(tokens))
+
+
+def trigrams(key: str) -> frozenset:
+    """Padded character trigrams of every token in a normalized key."""
+    grams = set()
+    for token in key.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def party_ref_hash(name: str) -> str:
+    return hashlib.sha256(normalize(name).encode()).hexdigest()[:12]
+
+
+# --- List files -----------------------------------------------------------
+
+_ID_COLUMNS = ("entry_id", "uid", "id", "group id", "entity_logicalid", "ent_num")
+_NAME_COLUMNS = ("name", "whole_name", "namealias_wholename", "sdn_name")
+_HMT_NAME_PARTS = ("name 1", "name 2", "name 3", "name 4", "name 5", "name 6")
+
+
+def _rows_from_csv(path: str):
+    """Yield (entry_id, name, aliases, entity_type, program) from a sanctions list CSV."""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        sample = f.readline()
+        f.seek(0)
+        delimiter = ";" if sample.count(";") > sample.count(",") else ","
+        reader = csv.reader(f, delimiter=delimiter)
+        first = next(reader, None)
+        if first is None:
+            return
+
+        # OFAC publishes sdn.csv / alt.csv without a header row
+        if first and first[0].strip().isdigit():
+            alt = len(first) > 3 and first[1].strip().isdigit()
+            for row in [first, *reader]:
+                if len(row) < 4 or not row[0].strip().isdigit():
+                    continue
+                if alt:
+                    yield row[0].strip(), row[3], (), "", ""
+                else:
+                    yield row[0].strip(), row[1], (), row[2].strip().strip("-0 "), row[3].strip()
+            return
+
+        # HMT prefixes the header with a "Last Updated" row; look a few rows down for it
+        header = [h.strip().lower() for h in first]
+        for _ in range(5):
+            if any(c in header for c in _NAME_COLUMNS) or all(c in header for c in _HMT_NAME_PARTS):
+                break
+            header = [h.strip().lower() for h in next(reader, [])]
+        else:
+            raise ValueError(f"{path}: no name column found")
+
+        col = {h: i for i, h in enumerate(header)}
+        id_col = next((col[c] for c in _ID_COLUMNS if c in col), None)
+        name_col = next((col[c] for c in _NAME_COLUMNS if c in col), None)
+        hmt_parts = [col[c] for c in _HMT_NAME_PARTS] if name_col is None else []
+        type_col = next((col[c] for c in ("entity_type", "group type", "type", "sdn_type") if c in col), None)
+        program_col = next((col[c] for c in ("program", "regime", "programme") if c in col), None)
+        alias_col = col.get("aliases")
+
+        def cell(row, i):
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        for n, row in enumerate(reader):
+            if not any(row):
+                continue
+            if name_col is not None:
+                name = cell(row, name_col)
+            else:
+                # Name 1..5 are given names, Name 6 the surname / entity name
+                name = " ".join(cell(row, i) for i in hmt_parts if cell(row, i))
+            aliases = [a for a in cell(row, alias_col).split(";") if a.strip()] if alias_col is not None else ()
+            yield cell(row, id_col) or f"row-{n + 1}", name, aliases, cell(row, type_col), cell(row, program_col)
+
+
+class SanctionsIndex:
+    """Inverted trigram index over every name and alias on the loaded lists."""
+
+    def __init__(self):
+        self.entries = []        # {"list", "entry_id", "primary_name", "entity_type", "program"}
+        self._entry_ids = {}     # (list, entry_id) -> entry index
+        self.names = []          # (entry index, display name, normalized key)
+        self._grams = []         # trigram set per name
+        self._postings = {}      # trigram -> [name index, ...], ordered by trigram count once sealed
+        self._posting_sizes = {} # trigram -> trigram counts of the names in _postings[trigram]
+        self._exact = {}         # normalized key -> [name index, ...]
+        self._seen = set()       # (entry index, normalized key), to skip duplicate aliases
+        self.lists = []
+        self.build_seconds = 0.0
+        self._memo = {}
+
+    @classmethod
+    def from_files(cls, list_files) -> "SanctionsIndex":
+        """Build from {list name: path or [paths]} or an iterable of (list name, path) pairs."""
+        pairs = list_files.items() if isinstance(list_files, dict) else list_files
+        index = cls()
+        started = time.perf_counter()
+        for list_name, paths in pairs:
+            for path in [paths] if isinstance(paths, str) else paths:
+                for entry_id, name, aliases, entity_type, program in _rows_from_csv(path):
+                    index.add(list_name, entry_id, name, aliases, entity_type, program)
+        index._seal()
+        index.build_seconds = time.perf_counter() - started
+        return index
+
+    def add(self, list_name: str, entry_id: str, name: str, aliases=(), entity_type: str = "", program: str = ""):
+        key = (list_name, str(entry_id))
+        e = self._entry_ids.get(key)
+        if e is None:
+            e = self._entry_ids[key] = len(self.entries)
+            self.entries.append({"list": list_name, "entry_id": str(entry_id), "primary_name": name.strip(),
+                                 "entity_type": entity_type, "program": program})
+            if list_name not in self.lists:
+                self.lists.append(list_name)
+        for display in (name, *aliases):
+            norm = normalize(display)
+            if not norm or (e, norm) in self._seen:
+                continue
+            self._seen.add((e, norm))
+            n = len(self.names)
+            self.names.append((e, display.strip(), norm))
+            grams = trigrams(norm)
+            self._grams.append(grams)
+            for g in grams:
+                self._postings.setdefault(g, []).append(n)
+            self._exact.setdefault(norm, []).append(n)
+        self._posting_sizes = {}
+        self._memo.clear()
+
+    def _seal(self):
+        """Order every posting list by name trigram count so the length filter is a bisect."""
+        sizes = [len(g) for g in self._grams]
+        for g, names in self._postings.items():
+            names.sort(key=lambda n: (sizes[n], n))
+            self._posting_sizes[g] = [sizes[n] for n in names]
+
+    def __getstate__(self):
+        # Workers get the index once via the pool initializer; the memo stays per process
+        state = dict(self.__dict__)
+        state["_memo"] = {}
+        return state
+
+    def candidates(self, key: str, similarity: float = DEFAULT_CANDIDATE_SIMILARITY):
+        """Name indexes whose trigram Dice similarity with key is at least `similarity`."""
+        grams = trigrams(key)
+        q = len(grams)
+        if not q:
+            return []
+        # A name can only reach the Dice floor if its trigram count is within these bounds,
+        # and then it shares at least `need` trigrams with the query. Posting lists are ordered
+        # by trigram count, so each is read only over the length-bounded slice, and the
+        # `skip` most common query trigrams are not counted at all: a name that shares
+        # `need` trigrams still shows up with at least need - skip, and is verified exactly.
+        low, high = q * similarity / (2 - similarity), q * (2 - similarity) / similarity
+        need = math.ceil(q * similarity / (2 - similarity))
+        skip = (need - 1) // 2
+        if not self._posting_sizes and self._postings:
+            self._seal()
+        postings, sizes = self._postings, self._posting_sizes
+        shared = Counter()
+        for g in sorted(grams, key=lambda g: len(postings.get(g, ())))[:q - skip]:
+            if g in postings:
+                lengths = sizes[g]
+                shared.update(postings[g][bisect_left(lengths, low):bisect_right(lengths, high)])
+        floor, name_grams = need - skip, self._grams
+        return [n for n, c in shared.items()
+                if c >= floor and 2 * len(grams & name_grams[n]) >= similarity * (q + len(name_grams[n]))]
+
+    def screen_name(self, name: str, lists=None, threshold: float = DEFAULT_MATCH_THRESHOLD,
+                    similarity: float = DEFAULT_CANDIDATE_SIMILARITY):
+        """Return (best score, matches at or above threshold, best first) for one party name."""
+        key = normalize(name)
+        memo_key = (key, tuple(lists) if lists else None, threshold, similarity)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        allowed = set(lists) if lists else None
+        best, matches = 0.0, []
+        if key:
+            exact = self._exact.get(key, ())
+            scored = [(1.0, n) for n in exact]
+            matcher = SequenceMatcher(None, autojunk=False)
+            matcher.set_seq2(key)
+            for n in self.candidates(key, similarity):
+                if n in exact:
+                    continue
+                matcher.set_seq1(self.names[n][2])
+                scored.append((matcher.ratio(), n))
+            seen_entries = set()
+            for score, n in sorted(scored, key=lambda item: (-item[0], item[1])):
+                e, display, _ = self.names[n]
+                entry = self.entries[e]
+                if allowed is not None and entry["list"] not in allowed:
+                    continue
+                best = max(best, score)
+                if score < threshold or e in seen_entries:
+                    continue
+                seen_entries.add(e)
+                if len(matches) < MAX_MATCHES:
+                    matches.append({"list": entry["list"], "entry_id": entry["entry_id"], "matched_name": display,
+                                    "entity_type": entry["entity_type"], "program": entry["program"],
+                                    "match_score": round(score, 4)})
+
+        result = (round(best, 4), matches)
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[memo_key] = result
+        return result
+
+    def stats(self) -> dict:
+        return {"lists": list(self.lists), "entries": len(self.entries), "names": len(self.names),
+                "trigrams": len(self._postings), "build_seconds": round(self.build_seconds, 3)}
+
+
+# --- Batch files ------------------------------------------------------------
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _party_name(elem) -> str:
+    for child in elem:
+        if _local(child.tag) == "Nm":
+            return (child.text or "").strip()
+    return ""
+
+
+def iter_pacs008_parties(path: str):
+    """Stream (payment_reference, role, name) from a pacs.008 file without building the tree."""
+    stack = []
+    group_parties = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        tag = _local(elem.tag)
+        if tag == "InitgPty" and stack and _local(stack[-1].tag) == "GrpHdr":
+            name = _party_name(elem)
+            if name:
+                group_parties.append(name)
+        elif tag == "CdtTrfTxInf":
+            ref = None
+            parties = [("initiating_party", name) for name in group_parties]
+            for child in elem:
+                child_tag = _local(child.tag)
+                if child_tag == "PmtId":
+                    ids = {_local(c.tag): (c.text or "").strip() for c in child}
+                    ref = ids.get("EndToEndId") or ids.get("TxId") or ids.get("InstrId")
+                elif child_tag in PACS008_ROLES and child_tag != "InitgPty":
+                    name = _party_name(child)
+                    if name:
+                        parties.append((PACS008_ROLES[child_tag], name))
+            for role, name in parties:
+                yield ref or "", role, name
+            # Drop the finished transaction so memory stays flat on large files
+            if stack:
+                stack[-1].remove(elem)
+
+
+def iter_csv_parties(path: str):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "name" not in reader.fieldnames:
+            raise ValueError(f"{path}: batch CSV needs a name column")
+        for row in reader:
+            if row.get("name"):
+                yield row.get("payment_reference") or "", row.get("role") or "party", row["name"]
+
+
+def iter_batch_parties(path: str):
+    if path.lower().endswith(".csv"):
+        return iter_csv_parties(path)
+    return iter_pacs008_parties(path)
+
+
+_worker_index = None
+_worker_options = None
+
+
+def _init_worker(index, options):
+    global _worker_index, _worker_options
+    _worker_index, _worker_options = index, options
+
+
+def _screen_chunk(chunk):
+    """Screen [(payment_reference, role, name), ...]; returns (hits, per-party seconds)."""
+    index, (lists, threshold, similarity) = _worker_index, _worker_options
+    hits, latencies = [], []
+    clock = time.perf_counter
+    for ref, role, name in chunk:
+        started = clock()
+        best, matches = index.screen_name(name, lists, threshold, similarity)
+        latencies.append(clock() - started)
+        if matches:
+            hits.append({"payment_reference": ref, "role": role, "party_ref_hash": party_ref_hash(name),
+                         "match_score": best, "matches": matches})
+    return hits, latencies
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+def screen_parties(parties, index: SanctionsIndex, lists=None, threshold: float = DEFAULT_MATCH_THRESHOLD,
+                   similarity: float = DEFAULT_CANDIDATE_SIMILARITY, workers: Optional[int] = None,
+                   chunk_size: int = 2000) -> dict:
+    """Screen an iterable of (payment_reference, role, name) with `workers` processes (1 = inline)."""
+    workers = workers or os.cpu_count() or 1
+    options = (list(lists) if lists else None, threshold, similarity)
+    parties = iter(parties)
+    chunks = iter(lambda: list(islice(parties, chunk_size)), [])
+    hits, latencies = [], []
+    payments = set()
+
+    def collect(chunk, result):
+        chunk_hits, chunk_latencies = result
+        hits.extend(chunk_hits)
+        latencies.extend(chunk_latencies)
+        payments.update(ref for ref, _, _ in chunk)
+
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(index, options)
+        for chunk in chunks:
+            collect(chunk, _screen_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index, options)) as pool:
+            # Bounded in-flight window so a large file is never fully held in memory
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_screen_chunk, chunk)))
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    collect(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                collect(chunk, future.result())
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    held = sorted({h["payment_reference"] for h in hits})
+    return {
+        "parties_screened": len(latencies),
+        "payments_screened": len(payments),
+        "hits": hits,
+        "held_payments": held,
+        "throughput": {
+            "workers": workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "parties_per_sec": round(len(latencies) / elapsed) if elapsed else None,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50) * 1000, 4) if latencies else None,
+                "p99": round(_percentile(latencies, 99) * 1000, 4) if latencies else None,
+                "max": round(latencies[-1] * 1000, 4) if latencies else None,
+            },
+        },
+    }
+
+
+def screen_file(path: str, index: SanctionsIndex, **kwargs) -> dict:
+    """Screen every party in a pacs.008 XML or CSV batch file; see screen_parties for options."""
+    return screen_parties(iter_batch_parties(path), index, **kwargs)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Screen a payment batch file against local sanctions lists.")
+    parser.add_argument("batch_file", help="pacs.008 XML or CSV (payment_reference, role, name)")
+    parser.add_argument("--list", action="append", required=True, metavar="NAME=PATH",
+                        help="sanctions list file, e.g. OFAC=sdn.csv (repeatable)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_MATCH_THRESHOLD)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    index = SanctionsIndex.from_files([tuple(spec.split("=", 1)) for spec in args.list])
+    print(f"index: {json.dumps(index.stats())}")
+    result = screen_file(args.batch_file, index, threshold=args.threshold, workers=args.workers)
+    t = result["throughput"]
+    print(f"{result['parties_screened']:,} parties in {result['payments_screened']:,} payments: "
+          f"{len(result['hits'])} hit(s), {len(result['held_payments'])} payment(s) held")
+    print(f"{t['parties_per_sec']:,} parties/s on {t['workers']} worker(s); "
+          f"latency p50 {t['latency_ms']['p50']} ms, p99 {t['latency_ms']['p99']} ms")
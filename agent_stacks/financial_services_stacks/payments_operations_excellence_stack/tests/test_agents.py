@@ -20,6 +20,7 @@ import pytest
 
 BUNDLE_ROOT = Path(__file__).resolve().parents[1]
 AGENTS_DIR = BUNDLE_ROOT / "agents"
+LIB_DIR = BUNDLE_ROOT / "lib"
 
 
 def _ensure_basic_agent_stub():
@@ -92,3 +93,306 @@ def test_missing_input_does_not_fabricate(loaded_agents):
         assert out["status"] in {"needs_input", "error", "blocked", "success"}, (
             f"{key} returned an unexpected status `{out['status']}` on empty input."
         )
+
+
+def test_sanctions_list_index_and_bulk_screening(loaded_agents, tmp_path):
+    idx_mod = _load_agent_module(LIB_DIR / "sanctions_index.py")
+    (tmp_path / "sdn.csv").write_text(
+        '101,"PETROVSKY, Ivan Sergeyevich",individual,"UKRAINE-EO13660",-0-,-0-,-0-,-0-,-0-,-0-,-0-,-0-\n'
+        '102,"NORTHWIND MARITIME TRADING CO LTD",-0- ,"IRAN",-0-,-0-,-0-,-0-,-0-,-0-,-0-,-0-\n'
+    )
+    (tmp_path / "alt.csv").write_text('102,9001,"aka","NORTHWIND SHIPPING",-0-\n')
+    (tmp_path / "ConList.csv").write_text(
+        "Last Updated,01/02/2026\n"
+        "Name 6,Name 1,Name 2,Name 3,Name 4,Name 5,Title,Group Type,Regime,Group ID\n"
+        "MÜLLER-KRAUSE,Johann,,,,,,Individual,Russia,7001\n"
+    )
+    index = idx_mod.SanctionsIndex.from_files({"OFAC": [str(tmp_path / "sdn.csv"), str(tmp_path / "alt.csv")],
+                                               "HMT": str(tmp_path / "ConList.csv")})
+    assert index.stats()["entries"] == 3 and index.stats()["names"] == 4
+
+    def hit(name, **kw):
+        return [(m["list"], m["entry_id"]) for m in index.screen_name(name, **kw)[1]]
+
+    assert hit("Ivan Sergeyevich Petrovsky") == [("OFAC", "101")]        # token order
+    assert hit("Ivan Sergeevich Petrovski") == [("OFAC", "101")]         # spelling variants
+    assert hit("Northwind Maritime Trading Ltd.") == [("OFAC", "102")]   # legal suffix, punctuation
+    assert hit("northwind shipping") == [("OFAC", "102")]                # alias
+    assert hit("Johann Muller Krause") == [("HMT", "7001")]              # accent folding
+    assert hit("Johann Muller Krause", lists=["OFAC"]) == []
+    assert hit("Southwind Logistics") == []
+
+    ns = "urn:iso:std:iso:20022:tech:xsd:pacs.008.001.08"
+    txs = "".join(
+        f"<CdtTrfTxInf><PmtId><EndToEndId>E2E-{i}</EndToEndId></PmtId>"
+        f"<Dbtr><Nm>Acme Widgets {i % 7}</Nm></Dbtr><Cdtr><Nm>{cdtr}</Nm></Cdtr></CdtTrfTxInf>"
+        for i, cdtr in enumerate(["Jane Smith"] * 40 + ["Northwind Maritme Trading"] + ["Bob Jones"] * 40)
+    )
+    batch = tmp_path / "pacs008.xml"
+    batch.write_text(f'<Document xmlns="{ns}"><FIToFICstmrCdtTrf><GrpHdr><MsgId>M1</MsgId>'
+                     f"<InitgPty><Nm>Acme Corp</Nm></InitgPty></GrpHdr>{txs}</FIToFICstmrCdtTrf></Document>")
+
+    agent = loaded_agents["sanctions_screening_agent"]
+    list_files = {"OFAC": [str(tmp_path / "sdn.csv"), str(tmp_path / "alt.csv")]}
+    results = []
+    for workers in (1, 2):
+        out = agent.perform(batch_file=str(batch), list_files=list_files, workers=workers)
+        assert out["status"] == "success"
+        results.append(out["data"])
+    data = results[0]
+    assert data["parties_screened"] == 81 * 3 and data["payments_screened"] == 81
+    assert data["held_payments"] == ["E2E-40"] and data["overall_decision"] == "hold_for_review"
+    assert data["hits"][0]["role"] == "creditor" and "name" not in data["hits"][0]
+    assert results[1]["hits"] == data["hits"]
+    assert data["throughput"]["latency_ms"]["p99"] is not None and data["throughput"]["parties_per_sec"] > 0
+
+    single = agent.perform(payment_reference="PMT-9", list_files=list_files,
+                           parties=[{"role": "debtor", "name": "Jane Smith"},
+                                    {"role": "creditor", "name": "Petrovsky Ivan Sergeyevich"}])
+    assert single["data"]["overall_decision"] == "hold_for_review"
+    assert [p["hit"] for p in single["data"]["parties"]] == [False, True]
+    assert agent.perform(batch_file=str(batch))["status"] == "needs_input"
+    assert agent.perform(batch_file=str(tmp_path / "missing.xml"), list_files=list_files)["status"] == "error"
+
+
+def test_nostro_reconciliation_matches_files(loaded_agents, tmp_path):
+    (tmp_path / "ledger.csv").write_text(
+        "reference,amount,value_date,currency,credit_debit\n"
+        "E2E-1,1000.00,2026-05-15,USD,CRDT\n"     # exact
+        "E2E-2,250.50,2026-05-15,USD,DBIT\n"      # exact, debit
+        "E2E-3,5000.00,2026-05-15,USD,CRDT\n"     # fee deducted on the statement
+        "E2E-4,75.00,2026-05-15,USD,CRDT\n"       # value date slipped a week
+        "E2E-5,1234.56,2026-05-15,USD,CRDT\n"     # reference truncated by the bank
+        "E2E-6,900.00,2026-05-15,USD,CRDT\n"      # never arrived
+        "E2E-7,10.00,2026-05-15,USD,CRDT\n"       # batched entry
+        "E2E-8,20.00,2026-05-15,USD,CRDT\n"       # batched entry
+        "E2E-9,99.99,2026-05-16,USD,CRDT\n"       # one day late, within tolerance
+    )
+
+    def entry(amount, direction, day, *txs, ref=None):
+        details = "".join(f"<TxDtls><Refs><EndToEndId>{r}</EndToEndId></Refs>{a}</TxDtls>" for r, a in txs)
+        acct_ref = f"<AcctSvcrRef>{ref}</AcctSvcrRef>" if ref else ""
+        return (f'<Ntry><Amt Ccy="USD">{amount}</Amt><CdtDbtInd>{direction}</CdtDbtInd>'
+                f"<ValDt><Dt>{day}</Dt></ValDt>{acct_ref}<NtryDtls>{details}</NtryDtls></Ntry>")
+
+    entries = [
+        entry("1000.00", "CRDT", "2026-05-15", ("E2E-1", "")),
+        entry("250.50", "DBIT", "2026-05-15", ("E2E-2", "")),
+        entry("4985.00", "CRDT", "2026-05-15", ("E2E-3", "")),
+        entry("75.00", "CRDT", "2026-05-22", ("E2E-4", "")),
+        entry("1234.56", "CRDT", "2026-05-16", ("E2E", "")),
+        entry("30.00", "CRDT", "2026-05-15", ("E2E-7", '<Amt Ccy="USD">10.00</Amt>'),
+              ("E2E-8", '<AmtDtls><TxAmt><Amt Ccy="USD">20.00</Amt></TxAmt></AmtDtls>')),
+        entry("99.99", "CRDT", "2026-05-15", ("E2E-9", "")),
+        entry("42.00", "CRDT", "2026-05-15", ref="BANK-REF-1"),   # not in the ledger
+    ]
+    (tmp_path / "statement.xml").write_text(
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"><BkToCstmrStmt><Stmt>'
+        + "".join(entries) + "</Stmt></BkToCstmrStmt></Document>")
+
+    agent = loaded_agents["nostro_reconciliation_agent"]
+    out = agent.perform(nostro_account="NOSTRO-USD-001", value_date="2026-05-15", currency="USD",
+                        ledger_file=str(tmp_path / "ledger.csv"), statement_file=str(tmp_path / "statement.xml"),
+                        sample_size=10)
+    assert out["status"] == "success"
+    data = out["data"]
+    assert data["ledger_lines"] == 9 and data["statement_lines"] == 9
+    assert data["match_summary"] == {"exact": 4, "reference_within_tolerance": 1, "amount_window": 1}
+    assert data["break_summary"] == {"amount_mismatch": 1, "value_date_mismatch": 1,
+                                     "missing_internal": 1, "missing_external": 1}
+    assert (data["matched_items"], data["unmatched_items"], data["one_sided_items"], data["total_items"]) == (6, 2, 2, 10)
+    deltas = {b["type"]: b["amount_delta"] for b in data["sample_breaks"]}
+    assert deltas == {"missing_external": -900.0, "missing_internal": 42.0, "amount_mismatch": -15.0,
+                      "value_date_mismatch": 0.0}
+    assert all(set(b) == {"break_id", "type", "amount_delta", "currency"} for b in data["sample_breaks"])
+
+    # An amount difference inside the tolerance is not an amount break; the date gap is the break
+    (tmp_path / "late_ledger.csv").write_text("reference,amount,value_date,currency,credit_debit\n"
+                                              "E2E-1,100.00,2026-05-15,USD,CRDT\n")
+    (tmp_path / "late_statement.csv").write_text("reference,amount,value_date,currency,credit_debit\n"
+                                                 "E2E-1,100.01,2026-05-25,USD,CRDT\n")
+    late = agent.perform(nostro_account="N", value_date="2026-05-15", amount_tolerance=0.05,
+                         ledger_file=str(tmp_path / "late_ledger.csv"),
+                         statement_file=str(tmp_path / "late_statement.csv"))["data"]
+    assert late["break_summary"] == {"amount_mismatch": 0, "value_date_mismatch": 1,
+                                     "missing_internal": 0, "missing_external": 0}
+
+    csv_statement = tmp_path / "statement.csv"
+    csv_statement.write_text("reference,amount,value_date,currency\nE2E-1,1000.00,2026-05-15,USD\n")
+    partial = agent.perform(nostro_account="N", value_date="2026-05-15", ledger_file=str(tmp_path / "ledger.csv"),
+                            statement_file=str(csv_statement))["data"]
+    assert partial["match_summary"]["exact"] == 1 and partial["break_summary"]["missing_external"] == 8
+    assert agent.perform(nostro_account="N", value_date="2026-05-15",
+                         ledger_file=str(tmp_path / "ledger.csv"))["status"] == "needs_input"
+
+
+def test_fraud_batch_scoring_with_rolling_profiles(tmp_path):
+    mod = _load_agent_module(AGENTS_DIR / "pre_release_fraud_scorer_agent.py")
+    agent = mod.PreReleaseFraudScorerAgent()
+
+    def pay(ref, amount, bene="BEN-1", rail="SEPA", hour=11, orig="ORG-1"):
+        return {"payment_reference": ref, "originator_id": orig, "beneficiary_id": bene, "amount": amount,
+                "rail": rail, "submitted_hour_local": hour}
+
+    first = agent.perform(payments=[pay("P1", 1000), pay("P2", 1000, hour=23)])["data"]["scored"]
+    assert first[0]["drivers"] == ["First-time beneficiary"]      # scored against the empty profile
+    assert first[1]["drivers"] == ["First-time beneficiary", "Out-of-hours submission"]
+
+    history = agent.perform(payments=[pay(f"H{i}", 1000) for i in range(3)])["data"]
+    assert history["band_summary"] == {"Low": 3, "Medium": 0, "High": 0}
+    assert history["profiles"]["originators"] == 1 and history["profiles"]["beneficiary_pairs"] == 1
+
+    batch = [pay("P3", 9000), pay("P4", 2_000_000, bene="BEN-NEW", rail="CHAPS", hour=3), pay("P5", 500)]
+    scored = agent.perform(payments=batch, update_profiles=False)["data"]["scored"]
+    avg = agent.profiles.profiles["ORG-1"][1]
+    # Same answers as the single-payment path given the profile values
+    for p, s in zip(batch, scored):
+        single = agent.perform(payment_reference=p["payment_reference"], amount=p["amount"], rail=p["rail"],
+                               originator_avg_amount=avg, submitted_hour_local=p["submitted_hour_local"],
+                               beneficiary_new_to_originator=p["beneficiary_id"] != "BEN-1")["data"]
+        assert (s["fraud_score"], s["risk_band"], s["drivers"]) == (single["fraud_score"], single["risk_band"],
+                                                                     single["drivers"])
+    assert scored[1]["recommended_action"] == "block_pending_review"
+
+    snapshot = str(tmp_path / "profiles.json.gz")
+    agent.perform(payments=[pay("P6", 1000, bene="BEN-2")], profile_snapshot=snapshot, save_snapshot=True)
+    fresh = mod.PreReleaseFraudScorerAgent()
+    out = fresh.perform(payments=[pay("P7", 1000, bene="BEN-2")], profile_snapshot=snapshot,
+                        update_profiles=False)["data"]
+    assert out["scored"][0]["drivers"] == ["No notable risk signals"]
+    assert fresh.profiles.profiles == agent.profiles.profiles and fresh.profiles.pairs == agent.profiles.pairs
+
+    assert agent.perform(payments=[{"amount": 1}])["status"] == "error"
+
+
+def test_ingestion_validator_streams_iso20022_files(loaded_agents, tmp_path):
+    def tx(ref, amount, ccy, iban="", cdtr_bic="DEUTDEFFXXX", svc=""):
+        svc = f"<PmtTpInf><SvcLvl><Cd>{svc}</Cd></SvcLvl></PmtTpInf>" if svc else ""
+        acct = f"<CdtrAcct><Id><IBAN>{iban}</IBAN></Id></CdtrAcct>" if iban else ""
+        return (f"<CdtTrfTxInf><PmtId><EndToEndId>{ref}</EndToEndId></PmtId>{svc}"
+                f'<IntrBkSttlmAmt Ccy="{ccy}">{amount}</IntrBkSttlmAmt>'
+                f"<DbtrAgt><FinInstnId><BICFI>BARCGB22</BICFI></FinInstnId></DbtrAgt>"
+                f"<CdtrAgt><FinInstnId><BICFI>{cdtr_bic}</BICFI></FinInstnId></CdtrAgt>{acct}</CdtTrfTxInf>")
+
+    pacs = tmp_path / "pacs008.xml"
+    pacs.write_text(
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pacs.008.001.08"><FIToFICstmrCdtTrf>'
+        "<GrpHdr><MsgId>M1</MsgId><NbOfTxs>6</NbOfTxs></GrpHdr>"
+        + tx("OK-SEPA", "100.00", "EUR", iban="DE89 3704 0044 0532 0130 00", svc="SEPA")
+        + tx("OK-SWIFT", "2500.00", "USD")
+        + tx("BAD-CHECKSUM", "100.00", "EUR", iban="DE89370400440532013001", svc="SEPA")
+        + tx("NO-IBAN", "100.00", "EUR", svc="SEPA")
+        + tx("BAD-CCY-BIC", "100.00", "USD", cdtr_bic="deut-de", svc="CHAPS")
+        + tx("BAD-AMOUNT", "abc", "USD", iban="GB82WEST12345698765432")
+        + "</FIToFICstmrCdtTrf></Document>")
+
+    agent = loaded_agents["payment_ingestion_validator_agent"]
+    report = tmp_path / "errors.csv"
+    out = agent.perform(batch_file=str(pacs), report_file=str(report))
+    assert out["status"] == "success"
+    data = out["data"]
+    assert data["message_type"] == "pacs.008" and data["validation_result"] == "fail"
+    assert (data["transactions"], data["passed"], data["failed"]) == (6, 2, 4)
+    assert data["by_rail"] == {"SEPA": {"transactions": 3, "failed": 2}, "SWIFT": {"transactions": 2, "failed": 1},
+                               "CHAPS": {"transactions": 1, "failed": 1}}
+    assert data["error_counts"] == {"IBAN_CHECKSUM_FAILED": 1, "IBAN_REQUIRED": 1, "CURRENCY_NOT_SUPPORTED": 1,
+                                    "BIC_MALFORMED": 1, "AMOUNT_INVALID": 1}
+    rows = report.read_text().splitlines()
+    assert rows[0] == "payment_reference,rail,code,detail"
+    assert [r.split(",")[:3] for r in rows[1:]] == [
+        ["BAD-CHECKSUM", "SEPA", "IBAN_CHECKSUM_FAILED"], ["NO-IBAN", "SEPA", "IBAN_REQUIRED"],
+        ["BAD-CCY-BIC", "CHAPS", "CURRENCY_NOT_SUPPORTED"], ["BAD-CCY-BIC", "CHAPS", "BIC_MALFORMED"],
+        ["BAD-AMOUNT", "SWIFT", "AMOUNT_INVALID"]]
+
+    # pain.001: rail and debtor agent come from the payment information block
+    pain = tmp_path / "pain001.xml"
+    pain.write_text(
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pain.001.001.09"><CstmrCdtTrfInitn>'
+        "<GrpHdr><MsgId>M2</MsgId></GrpHdr><PmtInf><PmtInfId>P1</PmtInfId>"
+        "<PmtTpInf><SvcLvl><Cd>SEPA</Cd></SvcLvl></PmtTpInf>"
+        "<DbtrAgt><FinInstnId><BICFI>BAD</BICFI></FinInstnId></DbtrAgt>"
+        "<CdtTrfTxInf><PmtId><EndToEndId>P1-1</EndToEndId></PmtId>"
+        '<Amt><InstdAmt Ccy="EUR">50.00</InstdAmt></Amt>'
+        "<CdtrAcct><Id><IBAN>FR1420041010050500013M02606</IBAN></Id></CdtrAcct></CdtTrfTxInf>"
+        "</PmtInf></CstmrCdtTrfInitn></Document>")
+    data = agent.perform(batch_file=str(pain), rail="FasterPayments")["data"]
+    assert data["message_type"] == "pain.001" and data["by_rail"] == {"SEPA": {"transactions": 1, "failed": 1}}
+    assert data["sample_errors"] == [{"payment_reference": "P1-1", "rail": "SEPA",
+                                      "errors": [{"code": "BIC_MALFORMED", "detail": "`debtor_bic` shape invalid"}]}]
+
+    camt = tmp_path / "camt.xml"
+    camt.write_text('<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"><BkToCstmrStmt/></Document>')
+    assert agent.perform(batch_file=str(camt))["status"] == "error"
+    assert agent.perform(payment_reference="P", rail="SEPA", amount=1, currency="EUR")["status"] == "success"
+
+
+def test_payments_analytics_event_sourced_kpis(loaded_agents, tmp_path):
+    import json
+
+    def ev(ref, rail, stage, at, amount=None):
+        return {"payment_reference": ref, "rail": rail, "stage": stage, "at_utc": at, "amount": amount}
+
+    events = [
+        ev("P1", "SEPA", "ingested", "2026-05-13T09:00:00Z", 100.0), ev("P1", "SEPA", "settled", "2026-05-13T09:10:00Z"),
+        ev("P2", "SEPA", "ingested", "2026-05-15T09:00:00Z", 50.0), ev("P2", "SEPA", "repair", "2026-05-15T09:05:00Z"),
+        ev("P2", "SEPA", "settled", "2026-05-15T09:30:00Z"),
+        ev("P3", "CHAPS", "ingested", "2026-05-15T10:00:00Z", 1_000_000.0),
+    ]
+    log = tmp_path / "events.jsonl"
+    log.write_text("".join(json.dumps(e) + "\n" for e in events))
+    checkpoint = str(tmp_path / "kpi.ckpt.gz")
+
+    agent = loaded_agents["payments_analytics_agent"]
+    out = agent.perform(events_file=str(log), checkpoint=checkpoint, window_days=1)
+    assert out["status"] == "success"
+    data = out["data"]
+    assert data["events_applied"] == 6 and data["window_end_utc"] == "2026-05-15T11:00:00+00:00"
+    sepa = {r["rail"]: r for r in data["by_rail"]}["SEPA"]
+    assert (sepa["volume"], sepa["settled"], sepa["stp_rate"], sepa["exception_count"]) == (1, 1, 0.0, 1)
+    assert sepa["avg_cycle_seconds"] == 1800 and data["totals"]["value_total"] == 1_000_050.0
+
+    three_days = agent.perform(events=[], window_days=3)["data"]
+    assert three_days["totals"]["volume"] == 3 and three_days["totals"]["stp_rate"] == 0.5
+    assert [d["date"] for d in three_days["daily"]] == ["2026-05-13", "2026-05-14", "2026-05-15"]
+    assert [d["volume"] for d in three_days["daily"]] == [1, 0, 2]
+
+    # Tracker-shaped records only add stages not already seen
+    tracker = {"status": "success", "data": {"payment_reference": "P3", "rail": "CHAPS", "history": [
+        {"stage": "ingested", "at_utc": "2026-05-15T10:00:00Z"}, {"stage": "settled", "at_utc": "2026-05-15T10:01:00Z"}]}}
+    data = agent.perform(events=[tracker, tracker])["data"]
+    chaps = {r["rail"]: r for r in data["by_rail"]}["CHAPS"]
+    assert data["events_applied"] == 1 and (chaps["volume"], chaps["settled"], chaps["stp_rate"]) == (1, 1, 1.0)
+    assert data["aggregator"]["duplicates_skipped"] == 3
+
+    # Replayed after the settled payments fall out of the dedup horizon, they still count once
+    mod = _load_agent_module(LIB_DIR / "kpi_aggregator.py")
+    agg = mod.KpiAggregator(dedup_days=2)
+    agg.consume(events[:5])
+    agg.consume([ev("P9", "SEPA", "ingested", "2026-05-19T09:00:00Z", 1.0)])
+    assert set(agg.payments) == {"P9"} and set(agg.settled_refs) == {"P1", "P2"}
+    restored_path = str(tmp_path / "replay.ckpt.gz")
+    agg.checkpoint(restored_path)
+    agg = mod.KpiAggregator.restore(restored_path)
+    assert agg.consume(events[:5]) == 0
+    totals = agg.query(window_days=7)["totals"]
+    assert (totals["volume"], totals["settled"], totals["exception_count"]) == (3, 2, 1), totals
+    assert agg.consume([ev("P1", "SEPA", "returned", "2026-05-19T10:00:00Z")]) == 1
+    assert agg.query(window_days=7)["totals"]["exception_count"] == 2 and "P1" in agg.payments
+
+    # Records straight from PaymentStatusTrackerAgent (at_utc is isoformat() + "Z")
+    tracked = [loaded_agents["payment_status_tracker_agent"].perform(payment_reference=f"PMT-{n}", rail="SWIFT")
+               for n in range(5)]
+    data = loaded_agents["payments_analytics_agent"].__class__().perform(events=tracked, window_days=1)["data"]
+    assert data["events_applied"] == sum(len(t["data"]["history"]) for t in tracked)
+    assert {r["rail"]: r for r in data["by_rail"]}["SWIFT"]["volume"] == 5
+
+    # A restarted agent resumes the file from the checkpoint rather than replaying it
+    with open(log, "a") as f:
+        f.write(json.dumps(ev("P4", "SWIFT", "ingested", "2026-05-16T08:00:00Z", 10.0)) + "\n")
+    restarted = loaded_agents["payments_analytics_agent"].__class__()
+    data = restarted.perform(events_file=str(log), checkpoint=checkpoint, window_days=3)["data"]
+    assert data["events_applied"] == 1 and data["totals"]["volume"] == 4
+    data = restarted.perform(checkpoint=checkpoint, as_of_utc="2026-05-13T12:00:00Z")["data"]
+    assert data["totals"]["volume"] == 1 and data["window_start_utc"] == "2026-05-12T13:00:00+00:00"
+    assert agent.perform(events=[{"rail": "SEPA"}])["status"] == "error"
+    assert "synthetic" in agent.perform(window_days=1)["data"]["data_quality"]
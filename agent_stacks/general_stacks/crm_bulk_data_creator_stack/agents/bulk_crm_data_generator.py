@@ -5,6 +5,10 @@ from datetime import datetime, timedelta
 from agents.basic_agent import BasicAgent
 from agents.OneClickCRMIntakeAgent import OneClickCRMIntakeAgent
 
+# One request per record is only practical for small runs; $batch mode goes further
+MAX_ITERATIONS = 100
+MAX_BATCH_ITERATIONS = 5000
+
 class BulkCRMDataGeneratorAgent(BasicAgent):
     def __init__(self):
         self.name = "BulkCRMDataGenerator"
@@ -16,9 +20,9 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                 "properties": {
                     "iterations": {
                         "type": "integer",
-                        "description": "Number of times to run the OneClickCRMIntakeAgent. Each iteration creates one account with related records.",
+                        "description": "Number of times to run the OneClickCRMIntakeAgent. Each iteration creates one account with related records. At most 100, or 5000 with execution_settings.use_batch.",
                         "minimum": 1,
-                        "maximum": 100
+                        "maximum": MAX_BATCH_ITERATIONS
                     },
                     "company_name_components": {
                         "type": "object",
@@ -274,6 +278,22 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                             "create_connections": {
                                 "type": "boolean",
                                 "description": "Whether to create system user connections (requires system_user_search)"
+                            },
+                            "use_batch": {
+                                "type": "boolean",
+                                "description": "Generate every iteration first, then create them through Dataverse $batch changesets (one atomic changeset per account) instead of one request per record. Recommended above a few dozen iterations."
+                            },
+                            "batch_size": {
+                                "type": "integer",
+                                "description": "Maximum operations per $batch request when use_batch is true. Default: 100",
+                                "minimum": 1,
+                                "maximum": 1000
+                            },
+                            "max_concurrency": {
+                                "type": "integer",
+                                "description": "Number of $batch requests in flight at once when use_batch is true. Default: 4",
+                                "minimum": 1,
+                                "maximum": 16
                             }
                         }
                     }
@@ -391,6 +411,15 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                     if theme not in industry_terms:
                         errors.append(f"Theme '{theme}' not found in 'company_name_components.industry_terms'")
         
+        # Validate iterations against the limit for the chosen creation path
+        if "iterations" in kwargs:
+            iterations = kwargs["iterations"]
+            use_batch = (kwargs.get("execution_settings") or {}).get("use_batch", False)
+            limit = MAX_BATCH_ITERATIONS if use_batch else MAX_ITERATIONS
+            if not isinstance(iterations, int) or not 1 <= iterations <= limit:
+                errors.append(f"'iterations' must be an integer from 1 to {limit}"
+                              + ("" if use_batch else f" (up to {MAX_BATCH_ITERATIONS} with execution_settings.use_batch)"))
+        
         return errors
 
     def generate_company_name(self, theme, components, used_names):
@@ -417,6 +446,54 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
         used_names.add(name)
         return name
 
+    def record_iteration(self, results, i, theme, company_name, iteration_result, exec_settings):
+        """Fold one OneClickCRMIntakeAgent response into the running totals. Returns True to stop."""
+        # Parse results
+        try:
+            parsed_result = json.loads(iteration_result)
+            
+            # Update totals
+            if 'summary' in parsed_result:
+                summary = parsed_result['summary']
+                results["records_by_type"]["accounts"] += summary.get("accounts", 0)
+                results["records_by_type"]["contacts"] += summary.get("contacts", 0)
+                results["records_by_type"]["opportunities"] += summary.get("opportunities", 0)
+                results["records_by_type"]["cases"] += summary.get("cases", 0)
+                results["records_by_type"]["connections"] += summary.get("connections", 0)
+                results["total_records_created"] += summary.get("total_records_created", 0)
+            
+            # Store iteration details
+            results["iteration_results"].append({
+                "iteration": i + 1,
+                "theme": theme,
+                "company_name": company_name,
+                "records_created": parsed_result.get("summary", {}).get("total_records_created", 0),
+                "errors": len(parsed_result.get("errors", [])),
+                "links": parsed_result.get("links", {})
+            })
+            
+            # Collect any errors
+            if parsed_result.get("errors"):
+                for error in parsed_result["errors"]:
+                    results["errors"].append(f"Iteration {i+1}: {error}")
+                
+                # Stop on error if configured
+                if exec_settings.get('stop_on_error', False) and parsed_result.get("errors"):
+                    results["errors"].append(f"Stopping execution at iteration {i+1} due to errors (stop_on_error=true)")
+                    return True
+            
+            results["iterations_completed"] += 1
+            
+        except json.JSONDecodeError as e:
+            error_msg = f"Iteration {i+1}: Failed to parse CRM agent response - {str(e)}"
+            results["errors"].append(error_msg)
+            
+            if exec_settings.get('stop_on_error', False):
+                results["errors"].append(f"Stopping execution at iteration {i+1} due to parsing error (stop_on_error=true)")
+                return True
+        
+        return False
+
     def perform(self, **kwargs):
         """Execute bulk CRM data generation using only provided parameters"""
         # Validate parameters first
@@ -427,7 +504,7 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                 "message": "Parameter validation failed",
                 "validation_errors": validation_errors,
                 "required_structure": {
-                    "iterations": "integer (1-100)",
+                    "iterations": f"integer (1-{MAX_ITERATIONS}, or 1-{MAX_BATCH_ITERATIONS} with execution_settings.use_batch)",
                     "company_name_components": {
                         "prefixes": ["array of strings"],
                         "industry_terms": {"theme_name": ["array of terms"]},
@@ -504,6 +581,10 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
         used_company_names = set()
         used_opportunity_names = set()
         
+        # In batch mode iterations are generated first and created together
+        use_batch = exec_settings.get('use_batch', False)
+        batched_iterations = []
+        
         # Main loop
         for i in range(iterations):
             try:
@@ -622,52 +703,15 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                 if dynamics_config.get('currency_code'):
                     crm_params["currency_code"] = dynamics_config['currency_code']
                 
+                if use_batch:
+                    batched_iterations.append((i, theme, company_name, crm_params))
+                    continue
+                
                 # Call OneClickCRMIntakeAgent
                 iteration_result = self.crm_agent.perform(**crm_params)
                 
-                # Parse results
-                try:
-                    parsed_result = json.loads(iteration_result)
-                    
-                    # Update totals
-                    if 'summary' in parsed_result:
-                        summary = parsed_result['summary']
-                        results["records_by_type"]["accounts"] += summary.get("accounts", 0)
-                        results["records_by_type"]["contacts"] += summary.get("contacts", 0)
-                        results["records_by_type"]["opportunities"] += summary.get("opportunities", 0)
-                        results["records_by_type"]["cases"] += summary.get("cases", 0)
-                        results["records_by_type"]["connections"] += summary.get("connections", 0)
-                        results["total_records_created"] += summary.get("total_records_created", 0)
-                    
-                    # Store iteration details
-                    results["iteration_results"].append({
-                        "iteration": i + 1,
-                        "theme": theme,
-                        "company_name": company_name,
-                        "records_created": parsed_result.get("summary", {}).get("total_records_created", 0),
-                        "errors": len(parsed_result.get("errors", [])),
-                        "links": parsed_result.get("links", {})
-                    })
-                    
-                    # Collect any errors
-                    if parsed_result.get("errors"):
-                        for error in parsed_result["errors"]:
-                            results["errors"].append(f"Iteration {i+1}: {error}")
-                        
-                        # Stop on error if configured
-                        if exec_settings.get('stop_on_error', False) and parsed_result.get("errors"):
-                            results["errors"].append(f"Stopping execution at iteration {i+1} due to errors (stop_on_error=true)")
-                            break
-                    
-                    results["iterations_completed"] += 1
-                    
-                except json.JSONDecodeError as e:
-                    error_msg = f"Iteration {i+1}: Failed to parse CRM agent response - {str(e)}"
-                    results["errors"].append(error_msg)
-                    
-                    if exec_settings.get('stop_on_error', False):
-                        results["errors"].append(f"Stopping execution at iteration {i+1} due to parsing error (stop_on_error=true)")
-                        break
+                if self.record_iteration(results, i, theme, company_name, iteration_result, exec_settings):
+                    break
                 
                 # Delay between iterations if specified
                 delay = exec_settings.get('delay_between_iterations', 0)
@@ -682,6 +726,20 @@ class BulkCRMDataGeneratorAgent(BasicAgent):
                     results["errors"].append(f"Stopping execution at iteration {i+1} due to critical error (stop_on_error=true)")
                     break
         
+        # Create all generated iterations through $batch changesets
+        if batched_iterations:
+            try:
+                iteration_results = self.crm_agent.perform_batch(
+                    [crm_params for _, _, _, crm_params in batched_iterations],
+                    batch_size=exec_settings.get('batch_size', 100),
+                    max_workers=exec_settings.get('max_concurrency', 4)
+                )
+                for (i, theme, company_name, _), iteration_result in zip(batched_iterations, iteration_results):
+                    if self.record_iteration(results, i, theme, company_name, iteration_result, exec_settings):
+                        break
+            except Exception as e:
+                results["errors"].append(f"Batch creation: Critical error - {str(e)}")
+        
         # Generate summary
         summary_parts = [
             f"🏭 BULK CRM DATA GENERATION COMPLETE",
@@ -1,10 +1,20 @@
 import json
 import os
+import sys
 import requests
 import time
 from urllib.parse import quote_plus
 from agents.basic_agent import BasicAgent
 
+
+def _batch_writer():
+    """The Dataverse $batch writer in the stack's lib/, imported on first batch use"""
+    lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+    if lib not in sys.path:
+        sys.path.insert(0, lib)
+    import dataverse_batch_writer
+    return dataverse_batch_writer
+
 class OneClickCRMIntakeAgent(BasicAgent):
     def __init__(self):
         self.name = "OneClickCRMIntakeAgent"
@@ -62,6 +72,10 @@ class OneClickCRMIntakeAgent(BasicAgent):
                     "business_theme": {
                         "type": "string", 
                         "description": "Business theme to use for generating realistic field values when auto_fill_details is true. This affects phone numbers, addresses, industry-specific descriptions, etc. OPTIONS: 'technology', 'manufacturing', 'healthcare', 'retail', 'financial', 'consulting', 'generic'. Default: 'generic'."
+                    },
+                    "use_batch": {
+                        "type": "boolean",
+                        "description": "Create the account and all related records in a single Dataverse $batch changeset (one round trip, all-or-nothing) instead of one request per record. Default: false."
                     }
                 },
                 "required": ["account_data", "contacts_data", "opportunities_data", "cases_data"]
@@ -321,6 +335,9 @@ class OneClickCRMIntakeAgent(BasicAgent):
 
     def perform(self, **kwargs):
         """Main execution method - Creates all records fresh and handles ALL linking automatically"""
+        if kwargs.pop('use_batch', False):
+            return self.perform_batch([kwargs])[0]
+
         # Parse input parameters
         account_data = self.safe_json_parse(kwargs.get('account_data'), {})
         contacts_data = self.safe_json_parse(kwargs.get('contacts_data'), [])
@@ -546,58 +563,262 @@ class OneClickCRMIntakeAgent(BasicAgent):
                 results["linking_report"].append("⚠️ No opportunities created - cannot create user connections")
 
             # STEP 6: Generate Comprehensive Summary
-            total_created = (1 if account_id else 0) + len(contact_ids) + len(opportunity_ids) + len(case_ids) + len(connection_ids)
-            
-            summary_parts = [
-                f"🏭 FRESH RECORD CREATION COMPLETE - {total_created} total records created"
-            ]
-            
-            if auto_fill_details:
-                summary_parts.append(f"🔧 Auto-filled with {detail_level} level details using {business_theme} theme")
-            
-            if account_id:
-                summary_parts.append(f"🏢 Account: 1 created ({account_id})")
-            if contact_ids and len(contact_ids) > 0:
-                summary_parts.append(f"👥 Contacts: {len(contact_ids)} created, auto-linked to account")
-            if opportunity_ids and len(opportunity_ids) > 0:
-                summary_parts.append(f"💼 Opportunities: {len(opportunity_ids)} created, auto-linked to account + contacts")
-            if case_ids and len(case_ids) > 0:
-                summary_parts.append(f"🎫 Cases: {len(case_ids)} created, auto-linked to contacts")
-            if connection_ids and len(connection_ids) > 0:
-                summary_parts.append(f"🤝 Connections: {len(connection_ids)} created ({len(system_users_found)} users × {len(opportunity_ids)} opportunities)")
-            
-            if results["errors"] and len(results["errors"]) > 0:
-                summary_parts.append(f"⚠️ Errors: {len(results['errors'])} encountered")
-
-            summary_parts.append("🔗 All record relationships handled automatically using fresh GUIDs")
-
-            results["summary"] = {
-                "total_records_created": total_created,
-                "accounts": 1 if account_id else 0,
-                "contacts": len(contact_ids),
-                "opportunities": len(opportunity_ids),
-                "cases": len(case_ids),
-                "connections": len(connection_ids),
-                "system_users_found": len(system_users_found),
-                "errors": len(results["errors"]),
-                "fresh_guids_used": True,
-                "auto_linking_applied": True,
-                "auto_fill_details": auto_fill_details,
-                "detail_level": detail_level,
-                "business_theme": business_theme,
-                "data_provided": {
+            results["summary"] = self.build_summary(
+                results, account_id, contact_ids, opportunity_ids, case_ids,
+                connection_ids, system_users_found, auto_fill_details, detail_level, business_theme,
+                data_provided={
                     "account_data": bool(account_data and len(account_data) > 0),
                     "contacts_data": bool(contacts_data and len(contacts_data) > 0),
                     "opportunities_data": bool(opportunities_data and len(opportunities_data) > 0),
                     "cases_data": bool(cases_data and len(cases_data) > 0),
                     "system_user_search": bool(system_user_search and system_user_search.strip())
-                },
-                "message": "\n".join(summary_parts)
-            }
+                }
+            )
 
             return json.dumps(results, indent=2)
 
         except Exception as e:
             results["errors"].append(f"Critical error in fresh record creation: {str(e)}")
             results["linking_report"].append(f"💥 Critical error: {str(e)}")
-            return json.dumps(results, indent=2)
\ No newline at end of file
+            return json.dumps(results, indent=2)
+
+    def build_summary(self, results, account_id, contact_ids, opportunity_ids, case_ids,
+                      connection_ids, system_users_found, auto_fill_details, detail_level,
+                      business_theme, data_provided):
+        """Build the summary block shared by the per-record and $batch creation paths"""
+        total_created = (1 if account_id else 0) + len(contact_ids) + len(opportunity_ids) + len(case_ids) + len(connection_ids)
+        
+        summary_parts = [
+            f"🏭 FRESH RECORD CREATION COMPLETE - {total_created} total records created"
+        ]
+        
+        if auto_fill_details:
+            summary_parts.append(f"🔧 Auto-filled with {detail_level} level details using {business_theme} theme")
+        
+        if account_id:
+            summary_parts.append(f"🏢 Account: 1 created ({account_id})")
+        if contact_ids and len(contact_ids) > 0:
+            summary_parts.append(f"👥 Contacts: {len(contact_ids)} created, auto-linked to account")
+        if opportunity_ids and len(opportunity_ids) > 0:
+            summary_parts.append(f"💼 Opportunities: {len(opportunity_ids)} created, auto-linked to account + contacts")
+        if case_ids and len(case_ids) > 0:
+            summary_parts.append(f"🎫 Cases: {len(case_ids)} created, auto-linked to contacts")
+        if connection_ids and len(connection_ids) > 0:
+            summary_parts.append(f"🤝 Connections: {len(connection_ids)} created ({len(system_users_found)} users × {len(opportunity_ids)} opportunities)")
+        
+        if results["errors"] and len(results["errors"]) > 0:
+            summary_parts.append(f"⚠️ Errors: {len(results['errors'])} encountered")
+
+        summary_parts.append("🔗 All record relationships handled automatically using fresh GUIDs")
+
+        return {
+            "total_records_created": total_created,
+            "accounts": 1 if account_id else 0,
+            "contacts": len(contact_ids),
+            "opportunities": len(opportunity_ids),
+            "cases": len(case_ids),
+            "connections": len(connection_ids),
+            "system_users_found": len(system_users_found),
+            "errors": len(results["errors"]),
+            "fresh_guids_used": True,
+            "auto_linking_applied": True,
+            "auto_fill_details": auto_fill_details,
+            "detail_level": detail_level,
+            "business_theme": business_theme,
+            "data_provided": data_provided,
+            "message": "\n".join(summary_parts)
+        }
+
+    def perform_batch(self, intake_requests, batch_size=100, max_workers=4):
+        """
+        Create many intake payloads through Dataverse $batch changesets.
+
+        Each entry in intake_requests takes the same arguments as perform() and
+        becomes one atomic changeset: contacts, opportunities, cases and
+        connections bind to their parent account by Content-ID, so the whole
+        group is created in the same round trip. Changesets are packed into
+        $batch requests of up to batch_size operations and sent with up to
+        max_workers requests in flight, backing off on 429 throttling.
+
+        Returns a list of JSON strings shaped like perform()'s output, in input order.
+        """
+        lookups = {"currencies": {}, "system_users": {}}
+        prepared = [self.prepare_changeset(kwargs, lookups) for kwargs in intake_requests]
+
+        writer = _batch_writer().DataverseBatchWriter(
+            f"{self.resource}/api/data/v9.2",
+            self.get_headers,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            backoff_seconds=self.retry_delay
+        )
+        outcomes = writer.write([intake["changeset"] for intake in prepared])
+
+        return [
+            json.dumps(self.apply_batch_outcome(intake, outcome), indent=2)
+            for intake, outcome in zip(prepared, outcomes)
+        ]
+
+    def prepare_changeset(self, kwargs, lookups):
+        """Turn one intake payload into a Changeset with Content-ID bindings"""
+        account_data = self.safe_json_parse(kwargs.get('account_data'), {})
+        contacts_data = self.safe_json_parse(kwargs.get('contacts_data'), [])
+        opportunities_data = self.safe_json_parse(kwargs.get('opportunities_data'), [])
+        cases_data = self.safe_json_parse(kwargs.get('cases_data'), [])
+        connection_role_ids = self.safe_json_parse(kwargs.get('connection_role_ids'), {})
+        system_user_search = (kwargs.get('system_user_search') or '').strip()
+        currency_code = kwargs.get('currency_code', '')
+
+        auto_fill_details = kwargs.get('auto_fill_details', True)
+        detail_level = kwargs.get('detail_level', 'standard')
+        business_theme = kwargs.get('business_theme', 'generic')
+
+        intake = {
+            "base_url": kwargs.get('dynamics_base_url', self.resource.replace('/api/data/v9.2', '')),
+            "app_id": kwargs.get('app_id', 'd8fc1185-3c04-f011-bae4-7c1e527db3bb'),
+            "auto_fill_details": auto_fill_details,
+            "detail_level": detail_level,
+            "business_theme": business_theme,
+            "system_users_found": [],
+            "linking_report": [],
+            "counts": {"contacts": len(contacts_data), "opportunities": len(opportunities_data), "cases": len(cases_data), "connections": 0},
+            "data_provided": {
+                "account_data": bool(account_data),
+                "contacts_data": bool(contacts_data),
+                "opportunities_data": bool(opportunities_data),
+                "cases_data": bool(cases_data),
+                "system_user_search": bool(system_user_search)
+            }
+        }
+        report = intake["linking_report"]
+        changeset = _batch_writer().Changeset(key=account_data.get('name'))
+        intake["changeset"] = changeset
+
+        # Lookups are shared across every payload in the batch
+        currency_id = None
+        if currency_code:
+            if currency_code not in lookups["currencies"]:
+                lookups["currencies"][currency_code] = self.find_currency(currency_code)
+            currency_id = lookups["currencies"][currency_code]
+            if currency_id:
+                report.append(f"Found currency {currency_code}: {currency_id}")
+            else:
+                report.append(f"Currency {currency_code} not found, using default")
+
+        def with_currency(record):
+            if currency_id:
+                record["transactioncurrencyid@odata.bind"] = f"/transactioncurrencies({currency_id})"
+            return record
+
+        account_op = None
+        if account_data:
+            if auto_fill_details:
+                account_data = self.enhance_record_data(account_data, 'account', detail_level, business_theme)
+            account_op = changeset.add("accounts", with_currency(account_data), ref=("account", 0))
+        else:
+            report.append("⚠️ No account data provided - skipping account creation")
+
+        contact_ops = []
+        for i, contact_template in enumerate(contacts_data):
+            contact = contact_template.copy()
+            if auto_fill_details:
+                contact = self.enhance_record_data(contact, 'contact', detail_level, business_theme)
+            binds = {"parentcustomerid_account@odata.bind": account_op} if account_op else {}
+            contact_ops.append(changeset.add("contacts", with_currency(contact), binds, ref=("contacts", i)))
+
+        opportunity_ops = []
+        for i, opp_template in enumerate(opportunities_data):
+            opportunity = opp_template.copy()
+            if auto_fill_details:
+                opportunity = self.enhance_record_data(opportunity, 'opportunity', detail_level, business_theme)
+            binds = {}
+            if account_op:
+                binds["parentaccountid@odata.bind"] = account_op
+            if contact_ops:
+                binds["customerid_contact@odata.bind"] = contact_ops[i % len(contact_ops)]
+            opportunity_ops.append(changeset.add("opportunities", with_currency(opportunity), binds, ref=("opportunities", i)))
+
+        for i, case_template in enumerate(cases_data):
+            case = case_template.copy()
+            if auto_fill_details:
+                case = self.enhance_record_data(case, 'case', detail_level, business_theme)
+            binds = {"customerid_contact@odata.bind": contact_ops[i % len(contact_ops)]} if contact_ops else {}
+            changeset.add("incidents", case, binds, ref=("cases", i))
+
+        if system_user_search and opportunity_ops:
+            if system_user_search not in lookups["system_users"]:
+                lookups["system_users"][system_user_search] = self.find_system_users(system_user_search)
+            intake["system_users_found"] = lookups["system_users"][system_user_search]
+
+            connection_index = 0
+            for user in intake["system_users_found"]:
+                user_id = user.get('systemuserid')
+                if not user_id:
+                    continue
+                for opportunity_op in opportunity_ops:
+                    connection_data = {"record2id_systemuser@odata.bind": f"/systemusers({user_id})"}
+                    if connection_role_ids.get('record1_role'):
+                        connection_data["record1roleid@odata.bind"] = f"/connectionroles({connection_role_ids['record1_role']})"
+                    if connection_role_ids.get('record2_role'):
+                        connection_data["record2roleid@odata.bind"] = f"/connectionroles({connection_role_ids['record2_role']})"
+                    changeset.add(
+                        "connections", connection_data,
+                        {"record1id_opportunity@odata.bind": opportunity_op},
+                        ref=("connections", connection_index)
+                    )
+                    connection_index += 1
+            intake["counts"]["connections"] = connection_index
+
+        report.append(f"📦 Packed {len(changeset)} records into one changeset with Content-ID links")
+        return intake
+
+    def apply_batch_outcome(self, intake, outcome):
+        """Build perform()-shaped results for one changeset's $batch outcome"""
+        results = {
+            "created_records": {},
+            "links": {},
+            "errors": [],
+            "summary": {},
+            "linking_report": list(intake["linking_report"]),
+            "auto_fill_applied": intake["auto_fill_details"]
+        }
+        base_url, app_id = intake["base_url"], intake["app_id"]
+
+        if not outcome["success"]:
+            error_detail = {"error": "Failed to create changeset", "status": outcome.get("status"), "details": outcome.get("error")}
+            results["errors"].append(f"Changeset creation failed: {error_detail}")
+            results["linking_report"].append("❌ Changeset rolled back - no records created for this account")
+
+        ids = outcome["ids"]
+
+        def created(kind, count):
+            return [ids[(kind, i)] for i in range(count) if (kind, i) in ids]
+
+        account_id = ids.get(("account", 0))
+        contact_ids = created("contacts", intake["counts"]["contacts"])
+        opportunity_ids = created("opportunities", intake["counts"]["opportunities"])
+        case_ids = created("cases", intake["counts"]["cases"])
+        connection_ids = created("connections", intake["counts"]["connections"])
+
+        if account_id:
+            results["created_records"]["account"] = account_id
+            results["links"]["account"] = self.generate_record_link("account", account_id, base_url, app_id)
+            results["linking_report"].append(f"✅ Created account: {account_id}")
+        for kind, entity, record_ids in (("contacts", "contact", contact_ids),
+                                         ("opportunities", "opportunity", opportunity_ids),
+                                         ("cases", "incident", case_ids)):
+            if intake["counts"][kind]:
+                results["created_records"][kind] = record_ids
+                results["links"][kind] = [
+                    self.generate_record_link(entity, rid, base_url, app_id) for rid in record_ids
+                ]
+        if intake["data_provided"]["system_user_search"] and opportunity_ids:
+            results["created_records"]["connections"] = connection_ids
+            results["created_records"]["system_users_found"] = intake["system_users_found"]
+
+        results["summary"] = self.build_summary(
+            results, account_id, contact_ids, opportunity_ids, case_ids, connection_ids,
+            intake["system_users_found"], intake["auto_fill_details"], intake["detail_level"],
+            intake["business_theme"], intake["data_provided"]
+        )
+        return results
@@ -0,0 +1,203 @@
+"""
+Throughput benchmark: per-record creates vs. Dataverse $batch changesets.
+
+Starts a local mock Dataverse Web API (per-request latency, per-operation
+server cost, periodic 429 throttling with Retry-After) and seeds the same
+synthetic accounts through OneClickCRMIntakeAgent twice: once with one POST
+per record, once through perform_batch().
+
+Run from the stack root:
+    python benchmarks/bench_batch_writer.py --accounts 200 --latency-ms 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STACK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_ROOT = os.path.abspath(os.path.join(STACK_ROOT, '../../..'))
+# `agents` is a namespace package: basic_agent comes from the repo root,
+# the intake agent from this stack. The batch writer lives in the stack's lib/.
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, STACK_ROOT)
+sys.path.insert(0, os.path.join(STACK_ROOT, 'lib'))
+
+from dataverse_batch_writer import _split_multipart, _split_headers  # noqa: E402
+from agents.one_click_crm_intake_agent import OneClickCRMIntakeAgent  # noqa: E402
+
+API_PATH = "/api/data/v9.2"
+
+
+class MockDataverse(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, op_cost, throttle_every):
+        super().__init__(('127.0.0.1', 0), MockDataverseHandler)
+        self.latency = latency
+        self.op_cost = op_cost
+        self.throttle_every = throttle_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.records = 0
+        self.throttled = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class MockDataverseHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+        self._send(200, json.dumps({"value": []}).encode(), {'Content-Type': 'application/json'})
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        with server.lock:
+            server.requests += 1
+            request_number = server.requests
+        time.sleep(server.latency)
+
+        entity = self.path.split(API_PATH + '/', 1)[-1]
+        if entity != '$batch':
+            time.sleep(server.op_cost)
+            with server.lock:
+                server.records += 1
+            self._send(204, headers={'OData-EntityId': f"{server.base_url}{API_PATH}/{entity}({uuid.uuid4()})"})
+            return
+
+        if server.throttle_every and request_number % server.throttle_every == 0:
+            with server.lock:
+                server.throttled += 1
+            self._send(429, b'Rate limit exceeded', {'Retry-After': '0.05'})
+            return
+
+        boundary = self.headers['Content-Type'].split('boundary=')[1]
+        self._send(200, self._run_batch(body, boundary).encode(),
+                   {'Content-Type': 'multipart/mixed; boundary=batchresponse_mock'})
+
+    def _run_batch(self, body, boundary):
+        server = self.server
+        out = []
+        for headers, changeset_body in _split_multipart(body, boundary):
+            nested = headers['content-type'].split('boundary=')[1]
+            out += ["--batchresponse_mock", "Content-Type: multipart/mixed; boundary=changesetresponse_mock", ""]
+            created = {}
+            for part_headers, request in _split_multipart(changeset_body, nested):
+                request_line, _, rest = request.partition("\n")
+                _, payload = _split_headers(rest)
+                entity = request_line.split(" ")[1].rsplit('/', 1)[-1]
+                record_id = str(uuid.uuid4())
+                created[part_headers['content-id']] = record_id
+                # Content-ID references must point at an earlier op in this changeset
+                for value in json.loads(payload).values():
+                    if isinstance(value, str) and value.startswith('$'):
+                        assert value[1:] in created, f"dangling reference {value}"
+                time.sleep(server.op_cost)
+                out += [
+                    "--changesetresponse_mock",
+                    "Content-Type: application/http",
+                    "Content-Transfer-Encoding: binary",
+                    f"Content-ID: {part_headers['content-id']}",
+                    "",
+                    "HTTP/1.1 204 No Content",
+                    f"OData-EntityId: {server.base_url}{API_PATH}/{entity}({record_id})",
+                    "",
+                    ""
+                ]
+            out.append("--changesetresponse_mock--")
+            with server.lock:
+                server.records += len(created)
+        out += ["--batchresponse_mock--", ""]
+        return "\r\n".join(out)
+
+
+def make_payloads(accounts, contacts, opportunities, cases):
+    payloads = []
+    for n in range(accounts):
+        payloads.append({
+            "account_data": json.dumps({"name": f"Bench Account {n}"}),
+            "contacts_data": json.dumps([{"firstname": f"First{c}", "lastname": f"Last{n}"} for c in range(contacts)]),
+            "opportunities_data": json.dumps([{"name": f"Deal {n}-{o}", "estimatedvalue": 1000} for o in range(opportunities)]),
+            "cases_data": json.dumps([{"title": f"Case {n}-{c}"} for c in range(cases)]),
+            "business_theme": "technology"
+        })
+    return payloads
+
+
+def run(label, server, fn):
+    server.requests = server.records = server.throttled = 0
+    start = time.perf_counter()
+    outputs = fn()
+    elapsed = time.perf_counter() - start
+    errors = sum(len(json.loads(o)["errors"]) for o in outputs)
+    print(f"{label:<28} {server.records:>7} records  {server.requests:>6} requests  "
+          f"{server.throttled:>3} throttled  {elapsed:7.2f}s  {server.records / elapsed:9.1f} rec/s  errors={errors}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=100)
+    parser.add_argument('--contacts', type=int, default=3)
+    parser.add_argument('--opportunities', type=int, default=2)
+    parser.add_argument('--cases', type=int, default=2)
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='simulated network round trip')
+    parser.add_argument('--op-cost-ms', type=float, default=0.2, help='simulated server work per record')
+    parser.add_argument('--throttle-every', type=int, default=7, help='return 429 on every Nth request (0 = never)')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--skip-serial', action='store_true')
+    args = parser.parse_args()
+
+    server = MockDataverse(args.latency_ms / 1000, args.op_cost_ms / 1000, args.throttle_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ['DYNAMICS_365_RESOURCE'] = server.base_url
+    agent = OneClickCRMIntakeAgent()
+    agent.access_token = "bench-token"
+    agent.retry_delay = 0.05
+
+    payloads = make_payloads(args.accounts, args.contacts, args.opportunities, args.cases)
+    per_account = 1 + args.contacts + args.opportunities + args.cases
+    print(f"{args.accounts} accounts x {per_account} records, {args.latency_ms:g} ms latency, "
+          f"batch_size={args.batch_size}, concurrency={args.concurrency}\n")
+
+    serial = None
+    if not args.skip_serial:
+        # The serial path has no retry logic, so measure it without throttling
+        throttle_every, server.throttle_every = server.throttle_every, 0
+        serial = run("per-record POST", server, lambda: [agent.perform(**p) for p in payloads])
+        server.throttle_every = throttle_every
+
+    batched = run("$batch changesets", server, lambda: agent.perform_batch(
+        payloads, batch_size=args.batch_size, max_workers=args.concurrency))
+
+    if serial:
+        print(f"\nspeedup: {serial / batched:.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
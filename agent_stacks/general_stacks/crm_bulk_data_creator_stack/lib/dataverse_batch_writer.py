@@ -0,0 +1,342 @@
+import json
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Dataverse rejects $batch requests that carry more than 1000 operations.
+MAX_BATCH_OPERATIONS = 1000
+
+# Statuses that mean "slow down and try again" rather than "this record is bad".
+RETRYABLE_STATUS = (429, 503)
+
+
+class BatchOperation:
+    """A single create request inside a changeset"""
+
+    def __init__(self, entity, data, binds=None, ref=None):
+        self.entity = entity
+        self.data = data
+        # field name -> BatchOperation in the same changeset, sent as "$<Content-ID>"
+        self.binds = binds or {}
+        # caller's label for this record, used as the key in the result ids
+        self.ref = ref
+
+
+class Changeset:
+    """
+    Atomic group of creates sent as one Dataverse changeset
+
+    Later operations can bind to earlier ones through Content-ID references,
+    so an account and its contacts, opportunities and cases are created in a
+    single round trip and either all succeed or none do.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.operations = []
+
+    def add(self, entity, data, binds=None, ref=None):
+        """Append a create and return it so later records can bind to it"""
+        operation = BatchOperation(entity, data, binds, ref)
+        self.operations.append(operation)
+        return operation
+
+    def __len__(self):
+        return len(self.operations)
+
+
+class DataverseBatchWriter:
+    """
+    Bulk-create engine for the Dataverse Web API $batch endpoint
+
+    Packs changesets into $batch requests of up to batch_size operations,
+    sends up to max_workers requests concurrently, and backs off on 429/503,
+    resubmitting only the changesets the server did not apply.
+    """
+
+    def __init__(self, api_base, get_headers, batch_size=100, max_workers=4,
+                 max_retries=5, backoff_seconds=1.0, session=None):
+        if not 1 <= batch_size <= MAX_BATCH_OPERATIONS:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_OPERATIONS}")
+
+        self.api_base = api_base.rstrip('/')
+        self.get_headers = get_headers
+        self.batch_size = batch_size
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "batch_requests": 0,
+            "throttled_responses": 0,
+            "operations_sent": 0,
+            "changesets_succeeded": 0,
+            "changesets_failed": 0
+        }
+
+    def write(self, changesets):
+        """
+        Create every record in the given changesets
+
+        Args:
+            changesets: List of Changeset objects
+
+        Returns:
+            List of result dicts in input order, each with 'key', 'success',
+            'ids' (operation ref -> GUID) and, on failure, 'status' and 'error'
+        """
+        batches = self._pack(changesets)
+        results = [None] * len(changesets)
+
+        # Resolve credentials once up front so worker threads share the token
+        self.get_headers()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for batch_results in pool.map(self._submit, batches):
+                for index, result in batch_results:
+                    results[index] = result
+
+        return results
+
+    def _pack(self, changesets):
+        """Group changesets into batches without splitting any changeset"""
+        batches = []
+        current = []
+        current_size = 0
+
+        for index, changeset in enumerate(changesets):
+            size = len(changeset)
+            if size > MAX_BATCH_OPERATIONS:
+                raise ValueError(
+                    f"Changeset {changeset.key!r} has {size} operations; "
+                    f"Dataverse allows at most {MAX_BATCH_OPERATIONS} per batch"
+                )
+            if current and current_size + size > self.batch_size:
+                batches.append(current)
+                current = []
+                current_size = 0
+            current.append((index, changeset))
+            current_size += size
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _submit(self, batch):
+        """Send one batch, retrying throttled changesets until done or out of retries"""
+        done = []
+        pending = batch
+        attempt = 0
+
+        while pending:
+            try:
+                response = self._post(pending)
+            except requests.exceptions.RequestException as e:
+                done.extend(self._failed(pending, None, f"Batch request failed: {str(e)}"))
+                break
+
+            if response.status_code in RETRYABLE_STATUS:
+                self._count("throttled_responses")
+                if attempt >= self.max_retries:
+                    done.extend(self._failed(pending, response.status_code, response.text))
+                    break
+                self._wait(response.headers.get('Retry-After'), attempt)
+                attempt += 1
+                continue
+
+            if response.status_code != 200:
+                done.extend(self._failed(pending, response.status_code, response.text))
+                break
+
+            throttled = []
+            responses = parse_batch_response(response.headers.get('Content-Type', ''), response.text)
+
+            for position, (index, changeset) in enumerate(pending):
+                parts = responses[position] if position < len(responses) else None
+                result = self._changeset_result(changeset, parts)
+                if result.get("status") in RETRYABLE_STATUS:
+                    throttled.append((index, changeset))
+                else:
+                    done.append((index, result))
+
+            if throttled:
+                self._count("throttled_responses")
+                if attempt >= self.max_retries:
+                    done.extend(self._failed(throttled, 429, "Throttled after maximum retries"))
+                    break
+                self._wait(None, attempt)
+                attempt += 1
+            pending = throttled
+
+        for _, result in done:
+            self._count("changesets_succeeded" if result["success"] else "changesets_failed")
+        return done
+
+    def _post(self, pending):
+        """POST the serialized $batch body for the pending changesets"""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = self._serialize(pending, boundary)
+
+        headers = dict(self.get_headers())
+        headers['Content-Type'] = f'multipart/mixed; boundary={boundary}'
+        headers['Prefer'] = 'odata.continue-on-error'
+
+        with self._stats_lock:
+            self.stats["batch_requests"] += 1
+            self.stats["operations_sent"] += sum(len(changeset) for _, changeset in pending)
+
+        return self.session.post(
+            f"{self.api_base}/$batch",
+            headers=headers,
+            data=body.encode('utf-8'),
+            timeout=120
+        )
+
+    def _serialize(self, pending, boundary):
+        """Build the multipart/mixed $batch body, one changeset per group"""
+        lines = []
+        content_id = 0
+
+        for _, changeset in pending:
+            changeset_boundary = f"changeset_{uuid.uuid4().hex}"
+            lines += [
+                f"--{boundary}",
+                f"Content-Type: multipart/mixed; boundary={changeset_boundary}",
+                ""
+            ]
+
+            content_ids = {}
+            for operation in changeset.operations:
+                content_id += 1
+                content_ids[id(operation)] = content_id
+
+                body = dict(operation.data)
+                for field, target in operation.binds.items():
+                    body[field] = f"${content_ids[id(target)]}"
+
+                lines += [
+                    f"--{changeset_boundary}",
+                    "Content-Type: application/http",
+                    "Content-Transfer-Encoding: binary",
+                    f"Content-ID: {content_id}",
+                    "",
+                    f"POST {self.api_base}/{operation.entity} HTTP/1.1",
+                    "Content-Type: application/json; type=entry",
+                    "",
+                    json.dumps(body)
+                ]
+
+            lines.append(f"--{changeset_boundary}--")
+
+        lines += [f"--{boundary}--", ""]
+        return "\r\n".join(lines)
+
+    def _changeset_result(self, changeset, parts):
+        """Map one changeset's response parts back to operation refs"""
+        if not parts:
+            return {"key": changeset.key, "success": False, "ids": {},
+                    "status": None, "error": "No response returned for changeset"}
+
+        # A failed changeset comes back as a single error response
+        if len(parts) == 1 and parts[0]["status"] >= 400:
+            return {"key": changeset.key, "success": False, "ids": {},
+                    "status": parts[0]["status"], "error": parts[0]["body"]}
+
+        ids = {}
+        for operation, part in zip(changeset.operations, parts):
+            entity_url = part["headers"].get('odata-entityid') or part["headers"].get('location')
+            if entity_url:
+                ids[operation.ref] = entity_url.split('(')[1].split(')')[0]
+
+        return {"key": changeset.key, "success": True, "ids": ids}
+
+    def _failed(self, pending, status, error):
+        return [
+            (index, {"key": changeset.key, "success": False, "ids": {}, "status": status, "error": error})
+            for index, changeset in pending
+        ]
+
+    def _wait(self, retry_after, attempt):
+        """Honor Retry-After when the server sends it, otherwise back off exponentially"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff_seconds * (2 ** attempt)
+        time.sleep(delay)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+
+def parse_batch_response(content_type, text):
+    """
+    Parse a $batch multipart response
+
+    Returns:
+        One list per top-level part (changeset), each holding dicts with
+        'content_id', 'status', 'headers' (lower-cased) and 'body'
+    """
+    results = []
+    for headers, body in _split_multipart(text, _boundary(content_type)):
+        nested = _boundary(headers.get('content-type', ''))
+        if nested:
+            results.append([_parse_http_part(h, b) for h, b in _split_multipart(body, nested)])
+        else:
+            results.append([_parse_http_part(headers, body)])
+    return results
+
+
+def _boundary(content_type):
+    match = re.search(r'boundary="?([^";]+)"?', content_type or '')
+    return match.group(1) if match else None
+
+
+def _split_multipart(text, boundary):
+    """Yield (headers, body) for each part delimited by boundary"""
+    if not boundary:
+        return
+    for chunk in text.split(f"--{boundary}")[1:]:
+        if chunk.startswith("--"):
+            break
+        headers, body = _split_headers(chunk.lstrip("\r\n"))
+        yield headers, body
+
+
+def _split_headers(chunk):
+    head, _, body = chunk.replace("\r\n", "\n").partition("\n\n")
+    headers = {}
+    for line in head.split("\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers, body.strip("\n")
+
+
+def _parse_http_part(part_headers, payload):
+    """Parse an embedded 'HTTP/1.1 204 No Content' response"""
+    status_line, _, rest = payload.partition("\n")
+    try:
+        status = int(status_line.split(" ")[1])
+    except (IndexError, ValueError):
+        status = 0
+    headers, body = _split_headers(rest)
+    return {
+        "content_id": part_headers.get('content-id'),
+        "status": status,
+        "headers": headers,
+        "body": body
+    }
@@ -1,4 +1,5 @@
 import os
+import importlib
 import yaml
 import logging
 import json
@@ -9,24 +10,28 @@ import re
 import ast
 from agents.basic_agent import BasicAgent
 from utils.azure_file_storage import AzureFileStorageManager
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
-from azure.ai.agents import AgentsClient
-from azure.ai.agents.models import ToolSet, CodeInterpreterTool, FunctionTool, MessageRole
+from utils.lazy_import import LazyImport
 
-# Import opentelemetry components
-from opentelemetry import trace
-from opentelemetry.trace import Span
-from azure.monitor.opentelemetry import configure_azure_monitor
 
-# Import the AgentTeam components from the provided code
-try:
-    from utils.agent_team import AgentTeam, _create_task
-    AGENT_TEAM_AVAILABLE = True
-except ImportError:
-    AGENT_TEAM_AVAILABLE = False
-    logging.warning("AgentTeam module not available. Please ensure agent_team.py is in utils folder.")
+# The Azure AI Agents SDK and OpenTelemetry load on the first review, not when the agent is imported
+AgentsClient = LazyImport("azure.ai.agents", "AgentsClient")
+ToolSet = LazyImport("azure.ai.agents.models", "ToolSet")
+CodeInterpreterTool = LazyImport("azure.ai.agents.models", "CodeInterpreterTool")
+trace = LazyImport("opentelemetry.trace")
 
-tracer = trace.get_tracer(__name__)
+_agent_team = None
+
+
+def _load_agent_team():
+    """Import the AgentTeam components from utils once; None if they are not available."""
+    global _agent_team
+    if _agent_team is None:
+        try:
+            _agent_team = importlib.import_module("utils.agent_team")
+        except ImportError:
+            _agent_team = False
+            logging.warning("AgentTeam module not available. Please ensure agent_team.py is in utils folder.")
+    return _agent_team or None
 
 class CodeReviewAgent(BasicAgent):
     def __init__(self):
@@ -175,7 +180,8 @@ class CodeReviewAgent(BasicAgent):
 
     def perform(self, **kwargs):
         """Main entry point - creates and manages an AgentTeam for code review"""
-        if not AGENT_TEAM_AVAILABLE:
+        agent_team = _load_agent_team()
+        if agent_team is None:
             return "Error: AgentTeam module is not available. Please ensure agent_team.py is properly set up in the utils folder."
         
         code_files = kwargs.get('code_files', {})
@@ -209,6 +215,7 @@ Alternative variable names also supported:
 These are separate from other service configurations to avoid conflicts."""
             
             # Setup tracing if available
+            tracer = trace.get_tracer(__name__)
             with tracer.start_as_current_span("code-review-agent") as main_span:
                 main_span.set_attribute("files.count", len(code_files))
                 main_span.set_attribute("languages.filter", languages_filter)
@@ -220,7 +227,8 @@ These are separate from other service configurations to avoid conflicts."""
                     model_deployment, 
                     languages_filter, 
                     focus_areas,
-                    main_span
+                    main_span,
+                    agent_team
                 )
                 
                 # Generate and save report if requested
@@ -262,7 +270,8 @@ These are separate from other service configurations to avoid conflicts."""
         ext = Path(filename).suffix.lower()
         return self.extension_mapping.get(ext, 'unknown')
 
-    def _perform_team_review(self, code_files, project_endpoint, model_deployment, languages_filter, focus_areas, span):
+    def _perform_team_review(self, code_files, project_endpoint, model_deployment, languages_filter, focus_areas, span,
+                             agent_team):
         """Perform code review using AgentTeam"""
         # Check for Code Review specific Azure AD credentials FIRST
         tenant_id = os.getenv('CODE_REVIEW_AZURE_TENANT_ID')
@@ -302,7 +311,7 @@ These are separate from other service configurations to avoid conflicts."""
         agents_client = AgentsClient(endpoint=project_endpoint, credential=credential)
         
         # Register _create_task for function calling
-        agents_client.enable_auto_function_calls({_create_task})
+        agents_client.enable_auto_function_calls({agent_team._create_task})
         
         # Clean up any existing teams with similar names (optional cleanup step)
         try:
@@ -322,7 +331,7 @@ These are separate from other service configurations to avoid conflicts."""
         with agents_client:
             # Create the agent team with a unique name to avoid conflicts
             team_name = f"code_review_team_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            team = AgentTeam(team_name, agents_client=agents_client)
+            team = agent_team.AgentTeam(team_name, agents_client=agents_client)
             
             # Group files by language
             language_files = {}
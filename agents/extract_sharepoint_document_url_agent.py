@@ -4,41 +4,29 @@ import logging
 import urllib.parse
 import re
 import base64
+import importlib.util
 from datetime import datetime
 import requests
-import msal
 from io import BytesIO
+from functools import lru_cache
 from agents.basic_agent import BasicAgent
 from utils.azure_file_storage import AzureFileStorageManager
-from openai import AzureOpenAI
-
-# Optional imports - will be attempted at runtime
-DOCX_AVAILABLE = False
-PDF_AVAILABLE = False
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    pass
-
-try:
-    import pypdf
-    PDF_AVAILABLE = True
-except ImportError:
-    try:
-        from pypdf import PdfReader
-        PDF_AVAILABLE = True
-    except ImportError:
-        pass
-
-# Try to import image processing libraries
-IMAGE_PROCESSING_AVAILABLE = False
-try:
-    from PIL import Image
-    import io
-    IMAGE_PROCESSING_AVAILABLE = True
-except ImportError:
-    pass
+from utils.lazy_import import LazyImport
+
+
+@lru_cache(maxsize=None)
+def _available(module):
+    """Whether an optional package is installed, found without importing it."""
+    return importlib.util.find_spec(module) is not None
+
+
+# SDKs and document parsers load on first use: msal on sign-in, openai on image analysis,
+# python-docx / pypdf on the first document of that type
+msal = LazyImport("msal")
+AzureOpenAI = LazyImport("openai", "AzureOpenAI")
+Document = LazyImport("docx", "Document")
+pypdf = LazyImport("pypdf")
+PdfReader = LazyImport("pypdf", "PdfReader")
 
 class SharePointDocumentExtractorAgent(BasicAgent):
     def __init__(self):
@@ -402,7 +390,7 @@ class SharePointDocumentExtractorAgent(BasicAgent):
                 self.logger.info(f"Extracting text from DOCX file: {file_name}")
 
                 # First check if python-docx is available
-                if not DOCX_AVAILABLE:
+                if not _available("docx"):
                     self.logger.warning("python-docx package is not installed, returning raw content as text")
                     # Return something rather than failing completely
                     return f"[Document content from {file_name}] - Raw content available but python-docx package is not installed for proper extraction"
@@ -441,7 +429,7 @@ class SharePointDocumentExtractorAgent(BasicAgent):
             elif file_ext.lower() == '.pdf':
                 self.logger.info(f"Extracting text from PDF file: {file_name}")
 
-                if not PDF_AVAILABLE:
+                if not _available("pypdf"):
                     self.logger.warning("PDF processing package is not installed, returning raw content as text")
                     return f"[Document content from {file_name}] - Raw content available but PDF package is not installed for proper extraction"
 
@@ -11,13 +11,17 @@ from io import BytesIO
 from datetime import datetime, timedelta, timezone
 from agents.basic_agent import BasicAgent
 from utils.azure_file_storage import AzureFileStorageManager
-# Always import python-pptx modules unconditionally
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_VERTICAL_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
-from azure.storage.file import FileService
+from utils.lazy_import import LazyImport
+
+
+# python-pptx is only needed once a deck is built, so hosts that just list agents never load it
+Presentation = LazyImport("pptx", "Presentation")
+Inches = LazyImport("pptx.util", "Inches")
+Pt = LazyImport("pptx.util", "Pt")
+RGBColor = LazyImport("pptx.dml.color", "RGBColor")
+PP_ALIGN = LazyImport("pptx.enum.text", "PP_ALIGN")
+MSO_VERTICAL_ANCHOR = LazyImport("pptx.enum.text", "MSO_VERTICAL_ANCHOR")
+MSO_SHAPE = LazyImport("pptx.enum.shapes", "MSO_SHAPE")
 
 class PowerPointAgent(BasicAgent):
     """
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Local agent host for AI-Agent-Templates.
+
+Discovers every *_agent.py under agents/, agent_stacks/ and agents_lab/
+without importing it. Each file is parsed with ast and its agent class's
+`self.metadata` (or the metadata passed to super().__init__) is evaluated
+statically: literals, module-level constants, self.name and f-strings over
+those. Importing every file just to read metadata pulls in ~250 modules and
+their SDKs (pptx, msal, openai, azure) at cold start; parsing does not.
+
+The resulting index is cached in a sidecar file (.agent-index.json,
+gitignored) keyed by each file's sha256, so only changed files are parsed
+again. An agent's module is imported, and the agent instantiated, the first
+time it is called. Instances are then kept in a warm pool per agent and
+reused across calls. Import and instantiation cost is recorded per agent.
+
+Metadata that cannot be evaluated statically (built by a helper, taken from
+constructor arguments) is marked "static": false; describe() imports that
+agent to read it.
+
+Run from the repository root:
+
+    python3 scripts/agent_host.py list                     # index + cold-start time
+    python3 scripts/agent_host.py describe HackerNewsAgent
+    python3 scripts/agent_host.py call Calendar --args '{}'
+    python3 scripts/agent_host.py profile                  # import every agent, rank by import cost
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+INDEX_FILE = Path(".agent-index.json")
+INDEX_VERSION = 1
+SCAN_ROOTS = ("agents", "agent_stacks", "agents_lab")
+SKIP_DIRS = {"__pycache__", "tests", "node_modules", ".git"}
+DEFAULT_MAX_IDLE = 2
+
+
+class _Dynamic(Exception):
+    """Raised when an expression needs runtime state to evaluate"""
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def discover(roots=SCAN_ROOTS):
+    """Relative paths of every *_agent.py under the scan roots, sorted"""
+    found = []
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            found.extend(os.path.join(dirpath, f) for f in filenames
+                         if f.endswith("_agent.py") and f != "basic_agent.py")
+    return sorted(Path(p).as_posix() for p in found)
+
+
+def _evaluate(node, env):
+    """Evaluate a literal-like expression; names and self.attr come from env"""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Dict):
+        if any(k is None for k in node.keys):   # {**other}
+            raise _Dynamic
+        return {_evaluate(k, env): _evaluate(v, env) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_evaluate(e, env) for e in node.elts]
+        return items if isinstance(node, ast.List) else tuple(items)
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        raise _Dynamic
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        key = "self." + node.attr
+        if key in env:
+            return env[key]
+        raise _Dynamic
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                v = _evaluate(value.value, env)
+                v = {115: str, 114: repr, 97: ascii}.get(value.conversion, lambda x: x)(v)
+                spec = _evaluate(value.format_spec, env) if value.format_spec else ""
+                parts.append(format(v, spec))
+            else:
+                parts.append(_evaluate(value, env))
+        return "".join(parts)
+    if isinstance(node, ast.Set):
+        return {_evaluate(e, env) for e in node.elts}
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return _evaluate(node.left, env) + _evaluate(node.right, env)
+    if isinstance(node, ast.Call) and not node.keywords:
+        args = [_evaluate(a, env) for a in node.args]
+        if isinstance(node.func, ast.Name) and node.func.id in _SAFE_CALLS and node.func.id not in env:
+            return _SAFE_CALLS[node.func.id](*args)
+        if isinstance(node.func, ast.Attribute) and node.func.attr in _SAFE_METHODS:
+            return getattr(_evaluate(node.func.value, env), node.func.attr)(*args)
+    raise _Dynamic
+
+
+def _ordered(cast):
+    # Set order is arbitrary at runtime too; sorting keeps the cached index reproducible
+    return lambda value=(): cast(sorted(value, key=str) if isinstance(value, (set, frozenset)) else value)
+
+
+# Pure calls seen in metadata, e.g. "enum": list(HAZARD_LIBRARY.keys())
+_SAFE_CALLS = {"list": _ordered(list), "tuple": _ordered(tuple), "sorted": sorted, "len": len, "str": str}
+_SAFE_METHODS = {"keys", "values", "items", "join", "lower", "upper", "title", "strip", "replace", "format"}
+
+
+def _set_to_list(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _assign(stmt, env):
+    """Record `name = expr` / `self.attr = expr` in env when expr evaluates statically"""
+    if isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+        targets, value = [stmt.target], stmt.value
+    elif isinstance(stmt, ast.Assign):
+        targets, value = stmt.targets, stmt.value
+    else:
+        return
+    try:
+        result = _evaluate(value, env)
+    except (_Dynamic, TypeError, ValueError, AttributeError, IndexError, KeyError):
+        result = _Dynamic
+    for target in targets:
+        if isinstance(target, ast.Name):
+            key = target.id
+        elif isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self":
+            key = "self." + target.attr
+        else:
+            continue
+        if result is _Dynamic:
+            env.pop(key, None)
+        else:
+            env[key] = result
+
+
+def _super_init_args(stmt):
+    """(name node, metadata node) passed to super().__init__(...) / Base.__init__(self, ...)"""
+    if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+        return None
+    call = stmt.value
+    func = call.func
+    if not (isinstance(func, ast.Attribute) and func.attr == "__init__"):
+        return None
+    args = list(call.args)
+    if not (isinstance(func.value, ast.Call) and getattr(func.value.func, "id", None) == "super"):
+        args = args[1:]   # Base.__init__(self, name, metadata)
+    keywords = {k.arg: k.value for k in call.keywords if k.arg}
+    name = keywords.get("name", args[0] if args else None)
+    metadata = keywords.get("metadata", args[1] if len(args) > 1 else None)
+    return name, metadata
+
+
+def _agent_from_class(cls, module_env):
+    """Static description of one agent class, or None if it does not look like an agent"""
+    init = next((s for s in cls.body if isinstance(s, ast.FunctionDef) and s.name == "__init__"), None)
+    env = dict(module_env)
+    for stmt in cls.body:   # class attributes, readable as self.x
+        if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            scratch = dict(module_env)
+            _assign(stmt, scratch)
+            env.update({"self." + k: v for k, v in scratch.items() if k not in module_env})
+    name_node = metadata_node = None
+    for stmt in (init.body if init else []):
+        _assign(stmt, env)
+        if isinstance(stmt, ast.Assign) and any(isinstance(t, ast.Attribute) and t.attr == "metadata"
+                                                 for t in stmt.targets):
+            metadata_node = stmt.value
+        passed = _super_init_args(stmt)
+        if passed:
+            name_node = passed[0] if passed[0] is not None else name_node
+            metadata_node = passed[1] if passed[1] is not None else metadata_node
+
+    bases = [getattr(b, "id", getattr(b, "attr", "")) for b in cls.bases]
+    if metadata_node is None and not (cls.name.endswith("Agent") or any(b.endswith("Agent") for b in bases)):
+        return None
+    entry = {"class": cls.name, "name": env.get("self.name"), "metadata": None, "static": False}
+    if name_node is not None and entry["name"] is None:
+        try:
+            entry["name"] = _evaluate(name_node, env)
+        except _Dynamic:
+            pass
+    if metadata_node is not None:
+        try:
+            metadata = _evaluate(metadata_node, env)
+            # Round-trip so the cached index holds exactly what callers will get back from it
+            entry["metadata"] = json.loads(json.dumps(metadata, default=_set_to_list))
+            entry["static"] = isinstance(metadata, dict)
+        except (_Dynamic, TypeError, ValueError, AttributeError):
+            pass
+    if entry["name"] is None and entry["static"]:
+        entry["name"] = entry["metadata"].get("name")
+    if not isinstance(entry["name"], str):
+        entry["name"] = cls.name
+    return entry
+
+
+def parse_agents(source, path="<agent>"):
+    """Static [{class, name, metadata, static}] for the agent classes in one file"""
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        return [{"class": None, "name": Path(path).stem, "metadata": None, "static": False,
+                 "error": f"SyntaxError: {e.msg} (line {e.lineno})"}]
+    module_env = {}
+    for stmt in tree.body:
+        _assign(stmt, module_env)
+    agents = [a for a in (_agent_from_class(node, module_env) for node in tree.body
+                          if isinstance(node, ast.ClassDef)) if a]
+    # Base classes sit next to the agents that extend them; report the leaves when there are several
+    with_metadata = [a for a in agents if a["metadata"] is not None]
+    return with_metadata or agents[-1:]
+
+
+def load_index(path=INDEX_FILE):
+    try:
+        index = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("files", {})
+
+
+def save_index(files, path=INDEX_FILE):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": INDEX_VERSION, "files": files}, f)
+    os.replace(tmp, path)
+
+
+def build_index(paths, previous=None):
+    """{path: {sha256, agents}}, re-parsing only files whose hash changed. Returns (files, parsed count)."""
+    previous = previous or {}
+    files, parsed = {}, 0
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = file_hash(data)
+        cached = previous.get(path)
+        if cached and cached.get("sha256") == digest:
+            files[path] = cached
+            continue
+        files[path] = {"sha256": digest, "agents": parse_agents(data, path)}
+        parsed += 1
+    return files, parsed
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class AgentHost:
+    """Serves agents from the static index; imports each on first call and pools warm instances."""
+
+    def __init__(self, root=".", index_path=None, max_idle=DEFAULT_MAX_IDLE, rebuild=False, roots=SCAN_ROOTS):
+        started = time.perf_counter()
+        self.root = Path(root).resolve()
+        self.index_path = Path(index_path) if index_path else self.root / INDEX_FILE
+        self.max_idle = max_idle
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            previous = {} if rebuild else load_index(self.index_path)
+            self.files, parsed = build_index(discover(roots), previous)
+        finally:
+            os.chdir(cwd)
+        if parsed or set(previous) != set(self.files):
+            save_index(self.files, self.index_path)
+
+        self.entries = {}   # agent id ("path:Class") -> index entry + path
+        self.unparseable = {}
+        self._by_name = {}
+        for path, info in self.files.items():
+            for agent in info["agents"]:
+                if not agent.get("class"):
+                    self.unparseable[path] = agent.get("error")
+                    continue
+                agent_id = f"{path}:{agent['class']}"
+                self.entries[agent_id] = {**agent, "id": agent_id, "path": path}
+                self._by_name.setdefault(agent["name"], []).append(agent_id)
+                self._by_name.setdefault(agent["class"], []).append(agent_id)
+
+        self._lock = threading.Lock()
+        self._import_locks = {}
+        self._classes = {}      # agent id -> class, once imported
+        self._idle = {}         # agent id -> [warm instances]
+        self._costs = {}        # agent id -> {import_ms, init_ms, modules, rss_kb}
+        self._counters = {"calls": 0, "warm_hits": 0, "instances_created": 0}
+        self.cold_start = {"seconds": round(time.perf_counter() - started, 4), "files": len(self.files),
+                           "parsed": parsed, "agents": len(self.entries)}
+
+    def agents(self):
+        """Every indexed agent: {id, name, class, path, static, metadata}"""
+        return list(self.entries.values())
+
+    def resolve(self, ref):
+        """Agent id for an id, agent name, class name or file path"""
+        if ref in self.entries:
+            return ref
+        ids = self._by_name.get(ref)
+        if ids is None:
+            path = Path(ref).as_posix()
+            ids = [i for i, e in self.entries.items() if e["path"] == path]
+        ids = sorted(set(ids or ()))
+        if not ids:
+            raise KeyError(f"No agent named {ref!r}")
+        if len(ids) > 1:
+            raise ValueError(f"{ref!r} is ambiguous; use one of: {', '.join(ids)}")
+        return ids[0]
+
+    def _load_class(self, agent_id):
+        cls = self._classes.get(agent_id)
+        if cls is not None:
+            return cls
+        with self._lock:
+            lock = self._import_locks.setdefault(agent_id, threading.Lock())
+        with lock:
+            cls = self._classes.get(agent_id)
+            if cls is not None:
+                return cls
+            entry = self.entries[agent_id]
+            root = str(self.root)
+            if root not in sys.path:
+                sys.path.insert(0, root)   # agents import `agents.basic_agent`
+            module_name = "_hosted_" + re.sub(r"\W", "_", entry["path"][:-3])
+            spec = importlib.util.spec_from_file_location(module_name, self.root / entry["path"])
+            module = importlib.util.module_from_spec(spec)
+            modules_before, rss_before = len(sys.modules), _rss_bytes()
+            started = time.perf_counter()
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
+            self._costs[agent_id] = {
+                "import_ms": round((time.perf_counter() - started) * 1000, 2),
+                "modules": len(sys.modules) - modules_before,
+                "rss_kb": (_rss_bytes() - rss_before) // 1024 if rss_before is not None else None,
+            }
+            cls = self._classes[agent_id] = getattr(module, entry["class"])
+            return cls
+
+    def _instance(self, agent_id):
+        with self._lock:
+            idle = self._idle.get(agent_id)
+            if idle:
+                self._counters["warm_hits"] += 1
+                return idle.pop()
+        cls = self._load_class(agent_id)
+        started = time.perf_counter()
+        instance = cls()
+        elapsed = round((time.perf_counter() - started) * 1000, 2)
+        with self._lock:
+            self._counters["instances_created"] += 1
+            self._costs[agent_id].setdefault("init_ms", elapsed)
+        return instance
+
+    @contextmanager
+    def lease(self, ref):
+        """A warm instance of the agent, returned to its pool afterwards"""
+        agent_id = self.resolve(ref)
+        instance = self._instance(agent_id)
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(agent_id, [])
+                if len(idle) < self.max_idle:
+                    idle.append(instance)
+
+    def call(self, ref, **kwargs):
+        with self.lease(ref) as agent:
+            with self._lock:
+                self._counters["calls"] += 1
+            return agent.perform(**kwargs)
+
+    def describe(self, ref):
+        """Index entry for an agent; imports it only when its metadata is not static"""
+        entry = dict(self.entries[self.resolve(ref)])
+        if not entry["static"]:
+            with self.lease(entry["id"]) as agent:
+                entry["metadata"] = getattr(agent, "metadata", None)
+                entry["name"] = getattr(agent, "name", entry["name"])
+        return entry
+
+    def import_costs(self):
+        """Per-agent import cost for the agents loaded so far, most expensive first"""
+        return sorted(({"id": agent_id, **cost} for agent_id, cost in self._costs.items()),
+                      key=lambda c: -c["import_ms"])
+
+    def stats(self):
+        static = sum(1 for e in self.entries.values() if e["static"])
+        return {"cold_start": self.cold_start, "static_metadata": static, "unparseable": self.unparseable,
+                "imported": len(self._classes), "warm_instances": sum(len(v) for v in self._idle.values()),
+                **self._counters}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["list", "describe", "call", "profile"])
+    parser.add_argument("agent", nargs="?", help="agent id, name, class name or file path")
+    parser.add_argument("--args", default="{}", help="JSON keyword arguments for `call`")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cached index")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    host = AgentHost(rebuild=args.rebuild)
+    if args.command == "list":
+        agents = [{k: e[k] for k in ("id", "name", "static")} for e in host.agents()]
+        if args.json:
+            print(json.dumps({"cold_start": host.cold_start, "agents": agents}, indent=2))
+        else:
+            for a in agents:
+                print(f"{a['name']:<45} {'' if a['static'] else '(dynamic) '}{a['id']}")
+            s = host.stats()
+            print(f"\n{len(agents)} agents in {host.cold_start['files']} files, "
+                  f"{s['static_metadata']} with static metadata; cold start {host.cold_start['seconds'] * 1000:.0f} ms "
+                  f"({host.cold_start['parsed']} parsed, rest from {host.index_path.name}), 0 modules imported")
+            for path, error in s["unparseable"].items():
+                print(f"  not parseable: {path} ({error})")
+        return 0
+
+    if args.command in ("describe", "call"):
+        if not args.agent:
+            parser.error(f"`{args.command}` needs an agent")
+        try:
+            if args.command == "describe":
+                result = host.describe(args.agent)
+            else:
+                started = time.perf_counter()
+                result = host.call(args.agent, **json.loads(args.args))
+                elapsed = time.perf_counter() - started
+        except (KeyError, ValueError, TypeError, ImportError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        print(result if isinstance(result, str) else json.dumps(result, indent=2, default=str))
+        if args.command == "call":
+            cost = next(c for c in host.import_costs() if c["id"] == host.resolve(args.agent))
+            print(f"\nfirst call {elapsed * 1000:.0f} ms (import {cost['import_ms']} ms, {cost['modules']} modules, "
+                  f"init {cost['init_ms']} ms)", file=sys.stderr)
+        return 0
+
+    # profile: import everything in this process, most expensive first
+    failures = {}
+    started = time.perf_counter()
+    for agent_id in host.entries:
+        try:
+            host._load_class(agent_id)
+        except BaseException as e:   # missing SDKs, sys.exit in module bodies, ...
+            failures[agent_id] = f"{type(e).__name__}: {e}"
+    import_all = time.perf_counter() - started
+    costs = host.import_costs()
+    if args.json:
+        print(json.dumps({"cold_start": host.cold_start, "import_all_seconds": round(import_all, 3),
+                          "costs": costs, "failures": failures}, indent=2))
+        return 0
+    for c in costs[:25]:
+        print(f"{c['import_ms']:9.1f} ms  {c['modules']:5} modules  {c['rss_kb'] or 0:8,} KB  {c['id']}")
+    print(f"\nindex cold start {host.cold_start['seconds'] * 1000:.0f} ms vs importing all {len(host.entries)} "
+          f"agents {import_all * 1000:.0f} ms ({len(failures)} failed to import)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
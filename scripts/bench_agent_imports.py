@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import cost of every agent module.
+
+Imports each agent found by agent_host.discover() in its own clean
+interpreter (`python -X importtime`), so nothing is shared between agents.
+For every agent it records:
+
+  - import wall time of the agent module itself (interpreter startup excluded)
+  - modules the import pulled in, and the interpreter's peak RSS over a bare one
+  - sys.path entries the module added while importing
+  - the -X importtime tree below the agent, and its heaviest top-level imports
+
+Results are ranked by import time and written as JSON and/or Markdown.
+
+Regression gate: --write-budgets records each agent's current cost plus
+headroom; --budgets then exits 1 if any agent's import time or module count
+grows past its budget, or a budgeted agent no longer imports. Agents without
+a budget (new since --write-budgets) are listed but do not fail the gate.
+Module counts are deterministic for a given set of
+installed packages. Timings are not, hence the headroom and --repeat (the
+fastest of N runs is kept).
+
+Run from the repository root:
+
+    python3 scripts/bench_agent_imports.py --markdown import-profile.md --json import-profile.json
+    python3 scripts/bench_agent_imports.py --write-budgets import-budgets.json
+    python3 scripts/bench_agent_imports.py --budgets import-budgets.json      # CI gate
+    python3 scripts/bench_agent_imports.py --filter agent_stacks/energy_stacks --repeat 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import agent_host  # noqa: E402
+
+MARKER = "@@agent-import-start"
+DEFAULT_HEADROOM = 0.5       # budget = measured time * (1 + headroom) ...
+DEFAULT_FLOOR_MS = 20.0      # ... but never less than measured + floor, so tiny imports don't flap
+TOP_IMPORTS = 5
+IMPORT_TIMEOUT_S = 300       # an agent still importing after this is recorded as failed
+
+# Runs in the child interpreter: argv = [path, repo root]
+CHILD = f"""
+import importlib.util, json, resource, sys, time
+from collections import Counter
+path, root = sys.argv[1], sys.argv[2]
+sys.path.insert(0, root)
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+modules_before = len(sys.modules)
+path_before = list(sys.path)
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+started = time.perf_counter()
+error = None
+try:
+    spec = importlib.util.spec_from_file_location("_profiled_agent", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["_profiled_agent"] = module
+    spec.loader.exec_module(module)
+except BaseException as e:
+    error = type(e).__name__ + ": " + str(e)
+elapsed = time.perf_counter() - started
+sys.stdout.write(json.dumps({{"import_ms": elapsed * 1000, "modules": len(sys.modules) - modules_before,
+                             "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                             "rss_before_kb": rss_before, "error": error,
+                             "sys_path_added": list((Counter(sys.path) - Counter(path_before)).elements())}}))
+"""
+
+
+def parse_importtime(stderr):
+    """-X importtime lines after the marker -> [(depth, name, self_us, cumulative_us)]"""
+    rows, started = [], False
+    for line in stderr.splitlines():
+        if line == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append(((len(name) - len(name.lstrip()) - 1) // 2, name.strip(),
+                         int(self_us), int(cumulative_us)))
+        except ValueError:   # the header line
+            continue
+    return rows
+
+
+def top_imports(rows, limit=TOP_IMPORTS):
+    """Heaviest imports made directly by the agent module (shallowest depth), by cumulative time"""
+    if not rows:
+        return []
+    depth = min(r[0] for r in rows)
+    top = sorted((r for r in rows if r[0] == depth), key=lambda r: -r[3])[:limit]
+    return [{"module": name, "cumulative_ms": round(cum / 1000, 1)} for _, name, _, cum in top]
+
+
+def failed_run(error):
+    """Child result for an import that produced no measurement"""
+    return {"import_ms": None, "modules": None, "rss_kb": None, "rss_before_kb": None, "sys_path_added": [],
+            "error": error}
+
+
+def profile_one(path, root, python=sys.executable, timeout=IMPORT_TIMEOUT_S):
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run([python, "-X", "importtime", "-c", CHILD, path, root],
+                              capture_output=True, text=True, cwd=root, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc = None
+    process_ms = (time.perf_counter() - started) * 1000
+    if proc is None:
+        result, stderr = failed_run(f"TimeoutExpired: import still running after {timeout}s"), ""
+    else:
+        stderr = proc.stderr
+        try:
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):   # the module killed its interpreter (sys.exit, os._exit, crash)
+            result = failed_run((stderr.strip().splitlines() or [f"exit status {proc.returncode}"])[-1])
+    rows = parse_importtime(stderr)
+    return {
+        "path": path,
+        "import_ms": round(result["import_ms"], 1) if result["import_ms"] is not None else None,
+        "process_ms": round(process_ms, 1),
+        "modules": result["modules"],
+        "rss_kb": result["rss_kb"],
+        "rss_delta_kb": result["rss_kb"] - result["rss_before_kb"] if result["rss_kb"] is not None else None,
+        "sys_path_added": result["sys_path_added"],
+        "top_imports": top_imports(rows),
+        "importtime": [{"depth": d, "module": n, "self_us": s, "cumulative_us": c} for d, n, s, c in rows],
+        "error": result["error"],
+    }
+
+
+def succeeded(run):
+    return run["error"] is None and run["import_ms"] is not None
+
+
+def profile_all(paths, root, workers, repeat=1):
+    """Profile every path `repeat` times, keeping each agent's fastest successful run
+
+    A failed run (import error, crash, timeout) is kept only while the agent
+    has no successful one, so a flaky failure never replaces a measurement.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(repeat):
+            for r in pool.map(lambda p: profile_one(p, root), paths):
+                best = results.get(r["path"])
+                if best is None or (succeeded(r) and (not succeeded(best) or r["import_ms"] < best["import_ms"])):
+                    results[r["path"]] = r
+    return sorted(results.values(), key=lambda r: -(r["import_ms"] or 0))
+
+
+def bare_interpreter_rss_kb(python=sys.executable):
+    out = subprocess.run([python, "-c", "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"],
+                         capture_output=True, text=True)
+    return int(out.stdout.strip())
+
+
+def render_markdown(report, limit=None):
+    s = report["summary"]
+    lines = [
+        "# Agent import profile",
+        "",
+        f"Generated {report['generated']} with Python {report['python']}. "
+        f"{s['agents']} agent modules, each imported in a clean interpreter; "
+        f"{s['failed']} failed to import (missing packages are listed, not counted as cost).",
+        "",
+        f"Total import time of the agents that import {s['total_import_ms']:,.0f} ms; "
+        f"peak RSS of a bare interpreter {s['bare_rss_kb']:,} KB. "
+        f"{s['mutate_sys_path']} agents add to sys.path when imported.",
+        "",
+        "| # | Agent | Import ms | Modules | RSS +KB | Heaviest imports |",
+        "|---:|---|---:|---:|---:|---|",
+    ]
+    for n, r in enumerate(report["agents"][:limit], 1):
+        heaviest = ", ".join(f"`{t['module']}` {t['cumulative_ms']:g}" for t in r["top_imports"][:3])
+        if r["error"]:
+            heaviest = f"**{r['error'][:80]}**" + (f"; {heaviest}" if heaviest else "")
+        lines.append(f"| {n} | `{r['path']}` | {r['import_ms'] if r['import_ms'] is not None else '-'} | "
+                     f"{r['modules'] if r['modules'] is not None else '-'} | "
+                     f"{r['rss_delta_kb'] if r['rss_delta_kb'] is not None else '-'} | {heaviest} |")
+    return "\n".join(lines) + "\n"
+
+
+def write_budgets(report, path, headroom, floor_ms):
+    budgets = {r["path"]: {"import_ms": round(max(r["import_ms"] * (1 + headroom), r["import_ms"] + floor_ms), 1),
+                           "modules": r["modules"]}
+               for r in report["agents"] if r["import_ms"] is not None and not r["error"]}
+    with open(path, "w") as f:
+        json.dump({"python": report["python"], "budgets": budgets}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return budgets
+
+
+def check_budgets(report, path):
+    """Budget violations [(agent path, what, measured, budget)] and the paths of agents with no budget"""
+    with open(path) as f:
+        budgets = json.load(f)["budgets"]
+    violations, unbudgeted = [], []
+    for r in report["agents"]:
+        budget = budgets.get(r["path"])
+        if budget is None:
+            unbudgeted.append(r["path"])
+            continue
+        if r["error"] or r["import_ms"] is None:
+            violations.append((r["path"], "error", r["error"] or "no import time recorded", None))
+            continue
+        if r["import_ms"] > budget["import_ms"]:
+            violations.append((r["path"], "import_ms", r["import_ms"], budget["import_ms"]))
+        if budget.get("modules") is not None and r["modules"] > budget["modules"]:
+            violations.append((r["path"], "modules", r["modules"], budget["modules"]))
+    return violations, unbudgeted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default='', help='only agents whose path contains this')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=1, help='runs per agent; the fastest is kept')
+    parser.add_argument('--json', help='write the full report (including importtime trees) here')
+    parser.add_argument('--markdown', help='write the ranked Markdown report here')
+    parser.add_argument('--top', type=int, default=25, help='agents to print (the files get all of them)')
+    parser.add_argument('--budgets', help='fail (exit 1) if any agent exceeds its budget in this file')
+    parser.add_argument('--write-budgets', help='write budgets from this run to this file')
+    parser.add_argument('--headroom', type=float, default=DEFAULT_HEADROOM)
+    parser.add_argument('--floor-ms', type=float, default=DEFAULT_FLOOR_MS)
+    args = parser.parse_args(argv)
+
+    root = os.getcwd()
+    paths = [p for p in agent_host.discover() if args.filter in p]
+    print(f"Profiling {len(paths)} agent modules, {args.workers} at a time, {args.repeat} run(s) each ...")
+    started = time.perf_counter()
+    agents = profile_all(paths, root, args.workers, args.repeat)
+    elapsed = time.perf_counter() - started
+
+    measured = [r for r in agents if r["import_ms"] is not None and not r["error"]]
+    report = {
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "summary": {
+            "agents": len(agents),
+            "failed": sum(1 for r in agents if r["error"]),
+            "total_import_ms": round(sum(r["import_ms"] for r in measured), 1),
+            "total_modules": sum(r["modules"] for r in measured),
+            "mutate_sys_path": sum(1 for r in agents if r["sys_path_added"]),
+            "bare_rss_kb": bare_interpreter_rss_kb(),
+            "elapsed_seconds": round(elapsed, 2),
+        },
+        "agents": agents,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    markdown = render_markdown(report)
+    if args.markdown:
+        with open(args.markdown, "w") as f:
+            f.write(markdown)
+    print(render_markdown(report, args.top))
+
+    if args.write_budgets:
+        budgets = write_budgets(report, args.write_budgets, args.headroom, args.floor_ms)
+        print(f"Wrote budgets for {len(budgets)} agents to {args.write_budgets}")
+    if args.budgets:
+        violations, unbudgeted = check_budgets(report, args.budgets)
+        for path in unbudgeted:
+            print(f"⚠️  {path}: no budget in {args.budgets}")
+        for path, what, value, budget in violations:
+            if what == "error":
+                print(f"❌ {path}: budgeted agent failed to import: {value}")
+            else:
+                print(f"❌ {path}: {what} {value} over budget {budget}")
+        if violations:
+            return 1
+        print(f"✅ All agents within the budgets in {args.budgets}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
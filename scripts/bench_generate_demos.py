@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: demo page rendering in generate_demos.py.
+
+Times every demo in DEMOS with the compiled template (one pass over the
+pieces split out at import) next to the chained str.replace() render it
+replaced, one replace over the whole template per placeholder, and checks
+the two produce the same page. Then, against a copy of the demo folder in
+a temporary directory, it times a full run:
+
+  - serial, every page written
+  - process pool, every page written
+  - serial again with nothing changed, so every page is hash-skipped
+
+and the bytes of all pages with the runtime inlined next to pages that
+reference the shared demo-runtime files.
+
+Run from the repository root:
+
+    python3 scripts/bench_generate_demos.py
+    python3 scripts/bench_generate_demos.py --repeat 200 --workers 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate_demos  # noqa: E402
+
+
+def chained_render(spec):
+    """The pre-compiled render: one str.replace pass over the page per placeholder"""
+    page = generate_demos.TEMPLATE
+    for name, value in generate_demos.page_values(spec).items():
+        page = page.replace(f"__{name}__", value)
+    return page
+
+
+def per_call(fn, spec, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(spec)
+    return (time.perf_counter() - started) / repeat
+
+
+def full_run(label, workers):
+    started = time.perf_counter()
+    results = generate_demos.render_all(list(generate_demos.DEMOS), workers)
+    elapsed = time.perf_counter() - started
+    written = sum(1 for _, status in results if status == "wrote")
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  ({written} written, {len(results) - written} unchanged)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help='renders per demo per engine; the mean is reported')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='processes for the pooled run (default: CPU count)')
+    args = parser.parse_args()
+
+    print(f"{len(generate_demos.DEMOS)} demos, template {len(generate_demos.TEMPLATE):,} chars, "
+          f"{len(generate_demos.COMPILED) // 2} placeholder slots\n")
+    print(f"{'demo':<44} {'chained ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    chained_total = compiled_total = 0.0
+    for fname, spec in generate_demos.DEMOS.items():
+        assert generate_demos.render_page(spec) == chained_render(spec), f"{fname}: renders differ"
+        chained = per_call(chained_render, spec, args.repeat)
+        compiled = per_call(generate_demos.render_page, spec, args.repeat)
+        chained_total += chained
+        compiled_total += compiled
+        print(f"{fname:<44} {chained * 1000:10.3f} {compiled * 1000:12.3f} {chained / compiled:7.1f}x")
+    print(f"{'all demos':<44} {chained_total * 1000:10.2f} {compiled_total * 1000:12.2f} "
+          f"{chained_total / compiled_total:7.1f}x  (pages identical)\n")
+
+    inline = sum(len(generate_demos.render_page(spec, inline=True).encode("utf-8"))
+                 for spec in generate_demos.DEMOS.values())
+    pages = sum(len(generate_demos.render_page(spec).encode("utf-8")) for spec in generate_demos.DEMOS.values())
+    runtime = sum(len(text.encode("utf-8")) for text in generate_demos.RUNTIME.values())
+    print(f"{'bytes, runtime inlined':<28} {inline:>10,}")
+    print(f"{'bytes, shared runtime':<28} {pages + runtime:>10,}  ({pages:,} pages + {runtime:,} runtime, "
+          f"{1 - (pages + runtime) / inline:.0%} smaller)\n")
+
+    work = Path(tempfile.mkdtemp(prefix="demos_bench_"))
+    out_dir = generate_demos.OUT_DIR
+    try:
+        shutil.copytree(out_dir, work / "demos")
+        generate_demos.OUT_DIR = work / "demos"
+
+        def clear():
+            for fname in generate_demos.DEMOS:
+                (generate_demos.OUT_DIR / fname).write_text("")
+
+        clear()
+        full_run("serial, all written", 1)
+        clear()
+        full_run(f"pool (workers={args.workers}), all written", args.workers)
+        full_run("serial, nothing changed", 1)
+    finally:
+        generate_demos.OUT_DIR = out_dir
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,11 @@ single template that faithfully reproduces the M365 Copilot chat surface
 (recreated with CSS/SVG/text only — no Microsoft logo assets, and a
 "simulated interface" disclaimer in the footer). Each demo is:
 
-  - a single self-contained file (renders from file:// with no network),
+  - a small HTML file holding the page's own text and conversation, plus
+    the shared demo-runtime.<hash>.css/.js next to it (the stylesheet and
+    chat player, identical for every page, so a browser caches them once);
+    with --inline the runtime is written into every page instead, for
+    single self-contained files that render from file:// with no network,
   - a scripted agent conversation playing inside the Copilot chrome:
     user turns as right-aligned bubbles, agent turns attributed to the
     named agent (@-mention chip), replies rendered as MARKDOWN with
@@ -25,14 +29,28 @@ https://kody-w.github.io/RAR/ -> skill.md, section 9.
 Usage (from the repository root):
 
     python3 scripts/generate_demos.py
+    python3 scripts/generate_demos.py --check      # CI: exit 1 if any page is stale
+    python3 scripts/generate_demos.py --inline     # self-contained pages, no runtime files
+
+Pages are written only when their content hash differs from the file on
+disk. Rendering is serial: a page renders in well under a millisecond, so
+for a few dozen pages starting a process pool costs far more than it
+saves. --workers N opts into the pool for much larger page sets.
 
 Filenames are a stable contract (external tooling links to them) — this
 script only ever rewrites the existing agent_stacks/demos_needing_videos/
-*.html files listed in DEMOS; it never renames or removes them.
+*.html files listed in DEMOS; it never renames or removes them. Runtime
+files are named by content hash, and ones no page references any more are
+deleted.
 """
 
+import argparse
+import hashlib
 import html
 import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 OUT_DIR = Path("agent_stacks/demos_needing_videos")
@@ -1035,14 +1053,14 @@ G_SEARCH = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-wi
 G_SEND = '<svg viewBox="0 0 24 24" fill="currentColor" aria-hidden="true"><path d="M3.4 20.4l17.4-8.4L3.4 3.6l-.01 6.53L15 12 3.39 13.87z"/></svg>'
 
 
-TEMPLATE = """<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>__TITLE__ — M365 Copilot Demo</title>
-<style>
-:root {
+# ---------------------------------------------------------------------------
+# Shared runtime: the stylesheet and chat player every page uses. Written once
+# as content-hashed demo-runtime.<hash>.css/.js next to the pages, or inlined
+# into each page with --inline. Per-page data reaches the player through
+# window.DEMO_PAGE, set by the page itself.
+# ---------------------------------------------------------------------------
+
+RUNTIME_CSS = """:root {
   --bg: #faf9f8; --surface: #ffffff; --surface-2: #f5f4f3; --hover: #f3f2f1;
   --border: #edebe9; --border-strong: #d2d0ce;
   --text: #323130; --text-dim: #605e5c; --text-faint: #a19f9d;
@@ -1264,69 +1282,9 @@ sup.cite a:hover { background: var(--accent); color: #fff; text-decoration: none
   color: var(--accent); display: flex; align-items: center; justify-content: center; font-size: 15px;
 }
 .ai-note { font-size: 11px; color: var(--text-faint); margin-top: 6px; text-align: center; }
-</style>
-</head>
-<body>
-
-<div class="topbar">
-  <button class="tb-btn" title="App launcher (decorative)" aria-label="App launcher">__G_WAFFLE__</button>
-  <div class="tb-title"><span class="copilot-mark" aria-hidden="true"></span><span>Microsoft 365 Copilot</span></div>
-  <div class="tb-search">
-    <span class="glyph">__G_SEARCH__</span>
-    <input type="text" placeholder="Search" disabled aria-label="Search (decorative)">
-  </div>
-  <div class="tb-right">
-    <button class="tb-btn" id="themeToggle" title="Toggle light/dark" aria-label="Toggle theme">
-      <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.8" stroke-linecap="round" aria-hidden="true"><circle cx="12" cy="12" r="4.2"/><path d="M12 2.5v2.4M12 19.1v2.4M2.5 12h2.4M19.1 12h2.4M5 5l1.7 1.7M17.3 17.3L19 19M19 5l-1.7 1.7M6.7 17.3L5 19"/></svg>
-    </button>
-    <div class="tb-avatar" title="__AVATAR_TITLE__">__AVATAR__</div>
-  </div>
-</div>
-
-<div class="shell">
-  <nav class="rail" aria-label="App rail (decorative)">
-    <button class="rail-item" title="Home">__G_HOME__<small>Home</small></button>
-    <button class="rail-item active" title="Chat">__G_CHAT__<small>Chat</small></button>
-    <button class="rail-item" title="Apps">__G_APPS__<small>Apps</small></button>
-    <button class="rail-item" title="Calendar">__G_CAL__<small>Calendar</small></button>
-    <button class="rail-item" title="More">__G_MORE__<small>More</small></button>
-  </nav>
-
-  <main class="stage">
-    <div class="pane-head">
-      <a class="back-link" href="../../index.html">__GLYPH_BACK__ All templates</a>
-      <span class="pane-title">Copilot</span>
-      <span class="agent-chip"><span class="dot">__GLYPH_SPARK__</span>@__AGENT_NAME__</span>
-      <div class="pane-controls">
-        <button class="ctl-btn" id="playBtn">__GLYPH_PLAY__ Play demo</button>
-        <button class="ctl-btn secondary" id="resetBtn" title="Restart">__GLYPH_RESET__</button>
-      </div>
-    </div>
-
-    <div class="chat" id="chatScroll">
-      <div class="chat-inner" id="chatBody">
-        <div class="stage-note" id="stageNote"><b>__TITLE__</b> — __TAGLINE__<br>Scenario: __PERSONA__ &middot; Press Play, or pick a suggested prompt below.</div>
-      </div>
-    </div>
-
-    <div class="prompt-row" aria-label="Suggested prompts">
-      <div class="prompt-inner" id="promptRow"></div>
-    </div>
-
-    <div class="input-container">
-      <div class="input-inner">
-        <div class="input-wrapper">
-          <input class="input-field" type="text" placeholder="Message Copilot (scripted demo — use Play or a suggested prompt)" disabled aria-label="Message input (disabled in demo)">
-          <span class="input-send" aria-hidden="true">__G_SEND__</span>
-        </div>
-        <div class="ai-note">__DISCLOSURE__</div>
-      </div>
-    </div>
-  </main>
-</div>
+"""
 
-<script>
-(function () {
+RUNTIME_JS = """(function () {
   "use strict";
   /* ---------- theme (light-first Fluent; Fluent dark on toggle/OS) ---------- */
   var root = document.documentElement;
@@ -1342,10 +1300,11 @@ sup.cite a:hover { background: var(--accent); color: #fff; text-decoration: none
   });
 
   /* ---------- data ---------- */
-  var TURNS = __TURNS_JSON__;          /* [{u, a, cites:[{label,url}], card}] */
-  var SOURCES = __SOURCES_JSON__;
+  var PAGE = window.DEMO_PAGE;         /* inlined by each page; everything else here is shared */
+  var TURNS = PAGE.turns;              /* [{u, a, cites:[{label,url}], card}] */
+  var SOURCES = PAGE.sources;
   var ID_LINKS = __ID_LINKS_JSON__;    /* [[regexSource, url], ...] */
-  var AGENT_NAME = __AGENT_NAME_JSON__;
+  var AGENT_NAME = PAGE.agent_name;
   var GLYPH_SPARK = __GLYPH_SPARK_JSON__;
   var GLYPH_DB = __GLYPH_DB_JSON__;
 
@@ -1482,6 +1441,7 @@ sup.cite a:hover { background: var(--accent); color: #fff; text-decoration: none
   var body = document.getElementById("chatBody");
   var scroller = document.getElementById("chatScroll");
   var note = document.getElementById("stageNote");
+  var STAGE_NOTE = note.outerHTML;
   var playBtn = document.getElementById("playBtn");
   var resetBtn = document.getElementById("resetBtn");
   var promptRow = document.getElementById("promptRow");
@@ -1584,14 +1544,88 @@ sup.cite a:hover { background: var(--accent); color: #fff; text-decoration: none
   });
   resetBtn.addEventListener("click", function () {
     clearTimeout(timer); playing = false; idx = 0; playBtn.disabled = false;
-    body.innerHTML = '<div class="stage-note" id="stageNote"><b>__TITLE__</b> \\u2014 __TAGLINE__<br>Scenario: __PERSONA__ \\u00b7 Press Play, or pick a suggested prompt below.</div>';
+    body.innerHTML = STAGE_NOTE;
     note = document.getElementById("stageNote");
     renderPills();
   });
 
   renderPills();
 })();
-</script>
+"""
+
+# ---------------------------------------------------------------------------
+# Page template
+# ---------------------------------------------------------------------------
+
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>__TITLE__ — M365 Copilot Demo</title>
+__RUNTIME_CSS__
+</head>
+<body>
+
+<div class="topbar">
+  <button class="tb-btn" title="App launcher (decorative)" aria-label="App launcher">__G_WAFFLE__</button>
+  <div class="tb-title"><span class="copilot-mark" aria-hidden="true"></span><span>Microsoft 365 Copilot</span></div>
+  <div class="tb-search">
+    <span class="glyph">__G_SEARCH__</span>
+    <input type="text" placeholder="Search" disabled aria-label="Search (decorative)">
+  </div>
+  <div class="tb-right">
+    <button class="tb-btn" id="themeToggle" title="Toggle light/dark" aria-label="Toggle theme">
+      <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.8" stroke-linecap="round" aria-hidden="true"><circle cx="12" cy="12" r="4.2"/><path d="M12 2.5v2.4M12 19.1v2.4M2.5 12h2.4M19.1 12h2.4M5 5l1.7 1.7M17.3 17.3L19 19M19 5l-1.7 1.7M6.7 17.3L5 19"/></svg>
+    </button>
+    <div class="tb-avatar" title="__AVATAR_TITLE__">__AVATAR__</div>
+  </div>
+</div>
+
+<div class="shell">
+  <nav class="rail" aria-label="App rail (decorative)">
+    <button class="rail-item" title="Home">__G_HOME__<small>Home</small></button>
+    <button class="rail-item active" title="Chat">__G_CHAT__<small>Chat</small></button>
+    <button class="rail-item" title="Apps">__G_APPS__<small>Apps</small></button>
+    <button class="rail-item" title="Calendar">__G_CAL__<small>Calendar</small></button>
+    <button class="rail-item" title="More">__G_MORE__<small>More</small></button>
+  </nav>
+
+  <main class="stage">
+    <div class="pane-head">
+      <a class="back-link" href="../../index.html">__GLYPH_BACK__ All templates</a>
+      <span class="pane-title">Copilot</span>
+      <span class="agent-chip"><span class="dot">__GLYPH_SPARK__</span>@__AGENT_NAME__</span>
+      <div class="pane-controls">
+        <button class="ctl-btn" id="playBtn">__GLYPH_PLAY__ Play demo</button>
+        <button class="ctl-btn secondary" id="resetBtn" title="Restart">__GLYPH_RESET__</button>
+      </div>
+    </div>
+
+    <div class="chat" id="chatScroll">
+      <div class="chat-inner" id="chatBody">
+        <div class="stage-note" id="stageNote"><b>__TITLE__</b> — __TAGLINE__<br>Scenario: __PERSONA__ &middot; Press Play, or pick a suggested prompt below.</div>
+      </div>
+    </div>
+
+    <div class="prompt-row" aria-label="Suggested prompts">
+      <div class="prompt-inner" id="promptRow"></div>
+    </div>
+
+    <div class="input-container">
+      <div class="input-inner">
+        <div class="input-wrapper">
+          <input class="input-field" type="text" placeholder="Message Copilot (scripted demo — use Play or a suggested prompt)" disabled aria-label="Message input (disabled in demo)">
+          <span class="input-send" aria-hidden="true">__G_SEND__</span>
+        </div>
+        <div class="ai-note">__DISCLOSURE__</div>
+      </div>
+    </div>
+  </main>
+</div>
+
+<script>var DEMO_PAGE = __PAGE_JSON__;</script>
+__RUNTIME_JS__
 </body>
 </html>
 """
@@ -1607,7 +1641,56 @@ def resolve_turns(spec):
     return turns
 
 
-def render(fname, spec):
+# Every __NAME__ slot in TEMPLATE; render_page() fills them from page_values().
+PLACEHOLDERS = (
+    "TITLE", "VERTICAL", "TAGLINE", "PERSONA", "AVATAR", "AVATAR_TITLE", "DISCLOSURE", "AGENT_NAME",
+    "GLYPH_BACK", "GLYPH_SPARK", "GLYPH_PLAY", "GLYPH_RESET",
+    "G_WAFFLE", "G_SEARCH", "G_HOME", "G_CHAT", "G_APPS", "G_CAL", "G_MORE", "G_SEND",
+    "PAGE_JSON", "RUNTIME_CSS", "RUNTIME_JS",
+)
+# ... and in RUNTIME_JS, which only takes values that are the same on every page
+RUNTIME_PLACEHOLDERS = ("ID_LINKS_JSON", "GLYPH_SPARK_JSON", "GLYPH_DB_JSON")
+RUNTIME_PREFIX = "demo-runtime."
+
+
+def compile_template(template, names=PLACEHOLDERS):
+    """Split a template once into [literal, name, literal, name, ..., literal]."""
+    pattern = re.compile("__(" + "|".join(sorted(map(re.escape, names), key=len, reverse=True)) + ")__")
+    return pattern.split(template)
+
+
+def fill(compiled, values):
+    pieces = list(compiled)
+    pieces[1::2] = [values[name] for name in compiled[1::2]]
+    return "".join(pieces)
+
+
+def build_runtime():
+    """The shared runtime as {"css": text, "js": text}."""
+    js = fill(compile_template(RUNTIME_JS, RUNTIME_PLACEHOLDERS), {
+        "ID_LINKS_JSON": json.dumps(ID_LINKS),
+        "GLYPH_SPARK_JSON": json.dumps(GLYPH_SPARK),
+        "GLYPH_DB_JSON": json.dumps(GLYPH_DB),
+    })
+    return {"css": RUNTIME_CSS, "js": js}
+
+
+COMPILED = compile_template(TEMPLATE)
+RUNTIME = build_runtime()
+# demo-runtime.<first 10 hex of sha256>.<ext>: a new name whenever the content changes, so it can be cached forever
+RUNTIME_FILES = {ext: f"{RUNTIME_PREFIX}{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}.{ext}"
+                 for ext, text in RUNTIME.items()}
+
+
+def runtime_tags(inline=False):
+    if inline:
+        return {"RUNTIME_CSS": "<style>\n" + RUNTIME["css"] + "</style>",
+                "RUNTIME_JS": "<script>\n" + RUNTIME["js"] + "</script>"}
+    return {"RUNTIME_CSS": f'<link rel="stylesheet" href="{RUNTIME_FILES["css"]}">',
+            "RUNTIME_JS": f'<script src="{RUNTIME_FILES["js"]}"></script>'}
+
+
+def page_values(spec, inline=False):
     sources = [SOURCES[s] for s in spec["sources"]]
     agent_name = spec["title"] + " Agent"
     avatar = spec.get("avatar", "AL")
@@ -1618,53 +1701,150 @@ def render(fname, spec):
         "not affiliated with or endorsed by Microsoft. AI-generated content "
         "over synthetic data (Aster Lane Office Systems simulated enterprise estate).",
     )
-    page = (
-        TEMPLATE
-        .replace("__TITLE__", html.escape(spec["title"]))
-        .replace("__VERTICAL__", html.escape(spec["vertical"]))
-        .replace("__TAGLINE__", html.escape(spec["tagline"]))
-        .replace("__PERSONA__", html.escape(spec["persona"]))
-        .replace("__AVATAR__", html.escape(avatar))
-        .replace("__AVATAR_TITLE__", html.escape(avatar_title))
-        .replace("__DISCLOSURE__", html.escape(disclosure))
-        .replace("__AGENT_NAME__", html.escape(agent_name))
-        .replace("__GLYPH_BACK__", GLYPH_BACK)
-        .replace("__GLYPH_SPARK__", GLYPH_SPARK)
-        .replace("__GLYPH_PLAY__", GLYPH_PLAY)
-        .replace("__GLYPH_RESET__", GLYPH_RESET)
-        .replace("__G_WAFFLE__", G_WAFFLE)
-        .replace("__G_SEARCH__", G_SEARCH)
-        .replace("__G_HOME__", G_HOME)
-        .replace("__G_CHAT__", G_CHAT)
-        .replace("__G_APPS__", G_APPS)
-        .replace("__G_CAL__", G_CAL)
-        .replace("__G_MORE__", G_MORE)
-        .replace("__G_SEND__", G_SEND)
-        .replace("__TURNS_JSON__", json.dumps(resolve_turns(spec)).replace("</", "<\\/"))
-        .replace("__SOURCES_JSON__", json.dumps(
-            [{"label": s["label"], "system": s["system"], "url": s["url"],
-              "shape": s["shape"], "cols": s["cols"]} for s in sources]))
-        .replace("__ID_LINKS_JSON__", json.dumps(ID_LINKS))
-        .replace("__AGENT_NAME_JSON__", json.dumps(agent_name))
-        .replace("__GLYPH_SPARK_JSON__", json.dumps(GLYPH_SPARK))
-        .replace("__GLYPH_DB_JSON__", json.dumps(GLYPH_DB))
-    )
-    (OUT_DIR / fname).write_text(page, encoding="utf-8")
+    page = {
+        "turns": resolve_turns(spec),
+        "sources": [{"label": s["label"], "system": s["system"], "url": s["url"],
+                     "shape": s["shape"], "cols": s["cols"]} for s in sources],
+        "agent_name": agent_name,
+    }
+    return {
+        "TITLE": html.escape(spec["title"]),
+        "VERTICAL": html.escape(spec["vertical"]),
+        "TAGLINE": html.escape(spec["tagline"]),
+        "PERSONA": html.escape(spec["persona"]),
+        "AVATAR": html.escape(avatar),
+        "AVATAR_TITLE": html.escape(avatar_title),
+        "DISCLOSURE": html.escape(disclosure),
+        "AGENT_NAME": html.escape(agent_name),
+        "GLYPH_BACK": GLYPH_BACK,
+        "GLYPH_SPARK": GLYPH_SPARK,
+        "GLYPH_PLAY": GLYPH_PLAY,
+        "GLYPH_RESET": GLYPH_RESET,
+        "G_WAFFLE": G_WAFFLE,
+        "G_SEARCH": G_SEARCH,
+        "G_HOME": G_HOME,
+        "G_CHAT": G_CHAT,
+        "G_APPS": G_APPS,
+        "G_CAL": G_CAL,
+        "G_MORE": G_MORE,
+        "G_SEND": G_SEND,
+        "PAGE_JSON": json.dumps(page).replace("</", "<\\/"),
+        **runtime_tags(inline),
+    }
+
+
+def render_page(spec, inline=False, compiled=COMPILED):
+    return fill(compiled, page_values(spec, inline))
+
+
+def file_digest(path):
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def write_if_changed(path, content, check=False):
+    """Returns "unchanged", "stale" (check mode) or "wrote"."""
+    data = content.encode("utf-8")
+    if hashlib.sha256(data).hexdigest() == file_digest(path):
+        return "unchanged"
+    if check:
+        return "stale"
+    path.write_bytes(data)
+    return "wrote"
+
+
+def render(fname, check=False, inline=False):
+    """Render one demo; returns (fname, "unchanged" | "wrote" | "stale")."""
+    return fname, write_if_changed(OUT_DIR / fname, render_page(DEMOS[fname], inline), check)
+
+
+def render_all(fnames, workers=1, check=False, inline=False):
+    """Render demos in this process, or across a process pool when workers > 1."""
+    if workers <= 1 or len(fnames) <= 1:
+        return [render(fname, check, inline) for fname in fnames]
+    with ProcessPoolExecutor(max_workers=min(workers, len(fnames))) as pool:
+        return list(pool.map(render, fnames, [check] * len(fnames), [inline] * len(fnames)))
+
+
+def wanted_runtime(inline=False):
+    """Runtime file name -> content for the files the pages reference (none with --inline)."""
+    return {} if inline else {RUNTIME_FILES[ext]: text for ext, text in RUNTIME.items()}
+
+
+def write_runtime(check=False, inline=False):
+    """Write the runtime files the pages reference; returns [(fname, status)]."""
+    return [(fname, write_if_changed(OUT_DIR / fname, text, check))
+            for fname, text in wanted_runtime(inline).items()]
+
+
+def prune_runtime(check=False, inline=False):
+    """Drop runtime files no page references; returns [(fname, status)].
+
+    Runs after the pages are written, so no page on disk ever points at a
+    file that has already gone. With --inline every runtime file is old.
+    Status "removed" (or "stale" in check mode) marks such a file.
+    """
+    wanted = wanted_runtime(inline)
+    results = []
+    for path in sorted(OUT_DIR.glob(RUNTIME_PREFIX + "*")):
+        if path.name not in wanted:
+            if not check:
+                path.unlink()
+            results.append((path.name, "stale" if check else "removed"))
+    return results
+
+
+def demo_bytes():
+    """Bytes on disk of the demo pages in DEMOS plus any runtime files."""
+    paths = [OUT_DIR / fname for fname in DEMOS] + list(OUT_DIR.glob(RUNTIME_PREFIX + "*"))
+    return sum(p.stat().st_size for p in paths if p.exists())
+
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate agent_stacks/demos_needing_videos/*.html")
+    parser.add_argument('--check', action='store_true',
+                        help="don't write anything; exit 1 if any demo page or runtime file differs from its render")
+    parser.add_argument('--inline', action='store_true',
+                        help="inline the runtime CSS/JS into every page (self-contained files, no demo-runtime.*)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes to render with (default: 1, serial; the pool only pays off for "
+                             "many more pages than there are demos)")
+    args = parser.parse_args(argv)
 
-def main():
     existing = {p.name for p in OUT_DIR.glob("*.html")}
     missing = set(DEMOS) - existing
     if missing:
         raise SystemExit("Refusing to create NEW demo files (filenames are a "
                          "contract): " + ", ".join(sorted(missing)))
-    for fname, spec in DEMOS.items():
-        render(fname, spec)
-        print("wrote", OUT_DIR / fname)
+    before = demo_bytes()
+    # New runtime first, then the pages that reference it, then drop the old runtime
+    runtime = write_runtime(args.check, args.inline)
+    results = render_all(list(DEMOS), args.workers, args.check, args.inline)
+    pruned = prune_runtime(args.check, args.inline)
+    if args.check:
+        stale = [fname for fname, status in runtime + results + pruned if status == "stale"]
+        if not stale:
+            print(f"✅ {len(results)} demo pages are up to date")
+            return 0
+        for fname in stale:
+            print("stale", OUT_DIR / fname)
+        print("❌ demo pages are stale -- run: python3 scripts/generate_demos.py" + (" --inline" if args.inline else ""))
+        return 1
+    for fname, status in runtime + results + pruned:
+        if status != "unchanged":
+            print(status, OUT_DIR / fname)
+    unchanged = sum(1 for _, status in results if status == "unchanged")
+    print(f"{len(results) - unchanged} written, {unchanged} unchanged")
+    after = demo_bytes()
+    print(f"demo pages + runtime: {before:,} -> {after:,} bytes "
+          f"({'inline' if args.inline else ', '.join(RUNTIME_FILES.values())})")
     uncovered = existing - set(DEMOS)
     if uncovered:
         print("NOTE: not regenerated (no spec):", ", ".join(sorted(uncovered)))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -8,13 +8,44 @@ agents (transcript2prototype, scripted_demo, github_agent_library):
 {version, generated, repository, branch, agents[], stacks[]} -- do not
 rename or remove keys. Run from the repository root:
 
-    python3 scripts/generate_manifest.py
+    python3 scripts/generate_manifest.py            # incremental (default)
+    python3 scripts/generate_manifest.py --full     # ignore the sidecar index
+    python3 scripts/generate_manifest.py --check    # exit 1 if manifest.json is stale
+
+Incremental runs keep a sidecar index (.manifest-index.json) of each
+stack's inputs -- agent file names and sizes, demo file names, and the
+metadata.json size/mtime/content hash -- and only re-process stacks whose
+inputs changed. Agent file contents are not inputs (only their size is),
+so they are not hashed. When the result matches manifest.json apart from
+the "generated" timestamp, nothing is written.
+
+Alongside manifest.json (unchanged contract) it writes a compact split
+copy for index.html: manifest/index.json with one small row per stack
+(id, name, industry, agent count) and manifest/shards/<industry>.json with
+the full stack entries, each with precompressed .gz and, when the brotli
+package is installed, .br siblings.
 """
 
+import argparse
+import gzip
+import hashlib
 import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    import brotli
+except ImportError:  # optional: only needed for the .br siblings
+    brotli = None
+
+INDEX_FILE = Path(".manifest-index.json")
+INDEX_VERSION = 1
+SHARDED_DIR = Path("manifest")
+
 def format_file_size(size):
     """Format file size in human-readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -133,20 +164,34 @@ def get_agent_description(filename):
     
     return "AI agent for task automation and workflow optimization"
 
+def list_files(directory, suffix):
+    """Visible regular files in directory ending with suffix, sorted by name ([] if missing)"""
+    try:
+        with os.scandir(directory) as entries:
+            found = [e for e in entries if e.name.endswith(suffix) and not e.name.startswith('.') and e.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(found, key=lambda e: e.name)
+
+def list_dirs(directory):
+    """Subdirectories of directory, sorted by name ([] if missing)"""
+    try:
+        with os.scandir(directory) as entries:
+            found = [e for e in entries if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(found, key=lambda e: e.name)
+
 def scan_agents():
     """Scan the agents directory"""
     agents = []
-    agents_dir = Path("agents")
     
-    if not agents_dir.exists():
-        return agents
-    
-    for py_file in agents_dir.glob("*.py"):
+    for py_file in list_files("agents", ".py"):
         if py_file.name == "__init__.py":
             continue
         
         size = py_file.stat().st_size
-        agent_id = py_file.stem
+        agent_id = py_file.name[:-3]
         
         agents.append({
             "id": agent_id,
@@ -164,61 +209,147 @@ def scan_agents():
     
     return agents
 
-def scan_stacks():
-    """Scan the agent_stacks directory with industry organization"""
-    stacks = []
-    stacks_dir = Path("agent_stacks")
-    
-    if not stacks_dir.exists():
-        return stacks
-    
-    # Map industry folder names to display names
-    INDUSTRY_NAMES = {
-        'b2b_sales_stacks': 'B2B Sales',
-        'b2c_sales_stacks': 'B2C Sales',
-        'energy_stacks': 'Energy & Utilities',
-        'federal_government_stacks': 'Federal Government',
-        'financial_services_stacks': 'Financial Services',
-        'general_stacks': 'Cross-Industry',
-        'healthcare_stacks': 'Healthcare',
-        'human_resources_stacks': 'Human Resources',
-        'it_management_stacks': 'IT Management',
-        'manufacturing_stacks': 'Manufacturing',
-        'professional_services_stacks': 'Professional Services',
-        'retail_cpg_stacks': 'Retail & CPG',
-        'slg_government_stacks': 'State & Local Government',
-        'software_dp_stacks': 'Software & Digital Products'
-    }
-    
-    # First check for industry folders
-    for industry_dir in stacks_dir.iterdir():
-        if not industry_dir.is_dir() or not industry_dir.name.endswith('_stacks'):
+# Map industry folder names to display names
+INDUSTRY_NAMES = {
+    'b2b_sales_stacks': 'B2B Sales',
+    'b2c_sales_stacks': 'B2C Sales',
+    'energy_stacks': 'Energy & Utilities',
+    'federal_government_stacks': 'Federal Government',
+    'financial_services_stacks': 'Financial Services',
+    'general_stacks': 'Cross-Industry',
+    'healthcare_stacks': 'Healthcare',
+    'human_resources_stacks': 'Human Resources',
+    'it_management_stacks': 'IT Management',
+    'manufacturing_stacks': 'Manufacturing',
+    'professional_services_stacks': 'Professional Services',
+    'retail_cpg_stacks': 'Retail & CPG',
+    'slg_government_stacks': 'State & Local Government',
+    'software_dp_stacks': 'Software & Digital Products'
+}
+
+def discover_stacks(stacks_dir=Path("agent_stacks")):
+    """(stack_dir, industry) for every stack, industry folders first, each level sorted by name"""
+    found = []
+
+    for industry_dir in list_dirs(stacks_dir):
+        if not industry_dir.name.endswith('_stacks'):
             continue
-            
-        industry_key = industry_dir.name
-        industry_name = INDUSTRY_NAMES.get(industry_key, industry_key.replace('_', ' ').title())
-        
-        # Scan stacks within this industry
-        for stack_dir in industry_dir.iterdir():
-            if not stack_dir.is_dir():
-                continue
-                
-            process_stack(stack_dir, stacks, industry_name)
-    
+        industry_name = INDUSTRY_NAMES.get(industry_dir.name, industry_dir.name.replace('_', ' ').title())
+        for stack_dir in list_dirs(industry_dir.path):
+            found.append((Path(stack_dir.path), industry_name))
+
     # Also check for any stacks at root level (backwards compatibility).
     # Skip directories that are not real stacks (no agents/ and no metadata.json),
     # e.g. agent_stacks/demos_needing_videos.
-    for stack_dir in stacks_dir.iterdir():
-        if not stack_dir.is_dir() or stack_dir.name.endswith('_stacks'):
+    for stack_dir in list_dirs(stacks_dir):
+        if stack_dir.name.endswith('_stacks'):
             continue
-        if not (stack_dir / 'agents').exists() and not (stack_dir / 'metadata.json').exists():
+        stack_path = Path(stack_dir.path)
+        if not (stack_path / 'agents').exists() and not (stack_path / 'metadata.json').exists():
             continue
-        process_stack(stack_dir, stacks, 'General')
-    
+        found.append((stack_path, 'General'))
+
+    return found
+
+def default_workers():
+    return min(32, (os.cpu_count() or 1) * 4)
+
+def scan_stacks(index=None, new_index=None, workers=None):
+    """
+    Scan the agent_stacks directory with industry organization
+
+    Stacks are stat'ed and read on a thread pool (workers <= 1 scans
+    serially); results keep discovery order, so output is identical either
+    way. With an index (from a previous run), stacks whose inputs are
+    unchanged reuse their stored entry instead of being re-processed.
+    new_index, when given, is filled with the inputs and entry of every
+    stack scanned.
+    """
+    jobs = discover_stacks()
+    workers = default_workers() if workers is None else workers
+
+    def scan(job):
+        stack_dir, industry = job
+        key = stack_dir.relative_to(Path("agent_stacks")).as_posix()
+        cached = (index or {}).get(key)
+        inputs = stack_inputs(stack_dir, industry, cached and cached["inputs"])
+        if cached and same_inputs(cached["inputs"], inputs):
+            return key, inputs, cached["entry"]
+        return key, inputs, build_stack_entry(stack_dir, industry, inputs)
+
+    if workers > 1 and len(jobs) > 1:
+        # Hand out stacks in chunks so per-task overhead doesn't swamp fast local stats
+        size = max(1, min(64, len(jobs) // (workers * 4)))
+        chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = [result for chunk in pool.map(lambda chunk: [scan(job) for job in chunk], chunks)
+                       for result in chunk]
+    else:
+        results = [scan(job) for job in jobs]
+
+    stacks = []
+    for key, inputs, entry in results:
+        stacks.append(entry)
+        if new_index is not None:
+            new_index[key] = {"inputs": inputs, "entry": entry}
     return stacks
 
+def file_hash(path):
+    """sha256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def stack_inputs(stack_dir, industry, previous=None):
+    """
+    Everything a stack's manifest entry is built from, as a comparable dict
+
+    metadata.json is identified by content hash; the hash from the previous
+    index is reused when size and mtime are unchanged, so a no-op run only
+    stats files.
+    """
+    inputs = {
+        "industry": industry,
+        "agents": [],
+        "demos": [],
+        "metadata": None
+    }
+
+    try:
+        stat = os.stat(stack_dir / "metadata.json")
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        prior = (previous or {}).get("metadata") or {}
+        if prior.get("size") == stat.st_size and prior.get("mtime_ns") == stat.st_mtime_ns:
+            digest = prior["sha256"]
+        else:
+            digest = file_hash(stack_dir / "metadata.json")
+        inputs["metadata"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+    inputs["demos"] = [demo.name for demo in list_files(stack_dir / "demos", ".html")]
+    inputs["agents"] = [
+        [py_file.name, py_file.stat().st_size]
+        for py_file in list_files(stack_dir / "agents", ".py")
+        if py_file.name != "__init__.py"
+    ]
+
+    return inputs
+
+def same_inputs(a, b):
+    """Compare stack inputs, ignoring metadata mtime (a touched but unchanged file is unchanged)"""
+    if a is None or b is None:
+        return False
+    strip = lambda inputs: {**inputs, "metadata": inputs["metadata"] and {
+        "size": inputs["metadata"]["size"], "sha256": inputs["metadata"]["sha256"]}}
+    return strip(a) == strip(b)
+
 def process_stack(stack_dir, stacks, industry='General'):
     """Process a single stack directory"""
+    stacks.append(build_stack_entry(stack_dir, industry, stack_inputs(stack_dir, industry)))
+    return stacks
+
+def build_stack_entry(stack_dir, industry, inputs):
+    """Build a stack's manifest entry from its inputs (see stack_inputs)"""
     # Get the relative path from agent_stacks
     if stack_dir.parent.name.endswith('_stacks'):
         # Stack is in an industry folder
@@ -237,60 +368,66 @@ def process_stack(stack_dir, stacks, industry='General'):
     }
     
     # Load metadata.json if it exists
-    metadata_file = stack_dir / "metadata.json"
-    if metadata_file.exists():
-        with open(metadata_file, 'r') as f:
+    if inputs["metadata"]:
+        with open(stack_dir / "metadata.json", 'r') as f:
             stack_info["metadata"] = json.load(f)
     
     # Check for demo files
-    demos_dir = stack_dir / "demos"
-    if demos_dir.exists():
-        demo_files = list(demos_dir.glob("*.html"))
-        if demo_files:
-            # Use the first HTML file found as the demo
-            demo_file = demo_files[0]
-            if not stack_info["metadata"]:
-                stack_info["metadata"] = {}
-            stack_info["metadata"]["demo"] = {
-                "available": True,
-                "url": f"agent_stacks/{relative_path}/demos/{demo_file.name}"
-            }
-    
-    # Scan agents subdirectory
-    agents_dir = stack_dir / "agents"
-    if agents_dir.exists():
-        for py_file in agents_dir.glob("*.py"):
-            if py_file.name == "__init__.py":
-                continue
-            
-            size = py_file.stat().st_size
-            agent = {
-                "id": f"{stack_dir.name}_{py_file.stem}",
-                "name": py_file.stem.replace('_', ' ').title(),
-                "filename": py_file.name,
-                "path": f"agent_stacks/{relative_path}/agents/{py_file.name}",
-                "url": f"https://raw.githubusercontent.com/kody-w/AI-Agent-Templates/main/agent_stacks/{relative_path}/agents/{py_file.name}",
-                "size": size,
-                "size_formatted": format_file_size(size),
-                "type": "stack",
-                "stack_name": stack_info["name"],
-                "stack_path": relative_path,
-                "industry": industry,
-                "icon": get_agent_icon(py_file.name),
-                "description": get_agent_description(py_file.name),
-                "features": get_agent_features(py_file.name)
-            }
-            stack_info["agents"].append(agent)
+    if inputs["demos"]:
+        # Use the first HTML file (by name) as the demo
+        demo_name = inputs["demos"][0]
+        if not stack_info["metadata"]:
+            stack_info["metadata"] = {}
+        stack_info["metadata"]["demo"] = {
+            "available": True,
+            "url": f"agent_stacks/{relative_path}/demos/{demo_name}"
+        }
     
-    stacks.append(stack_info)
+    # Agents subdirectory
+    for filename, size in inputs["agents"]:
+        stem = filename[:-3]
+        agent = {
+            "id": f"{stack_dir.name}_{stem}",
+            "name": stem.replace('_', ' ').title(),
+            "filename": filename,
+            "path": f"agent_stacks/{relative_path}/agents/{filename}",
+            "url": f"https://raw.githubusercontent.com/kody-w/AI-Agent-Templates/main/agent_stacks/{relative_path}/agents/{filename}",
+            "size": size,
+            "size_formatted": format_file_size(size),
+            "type": "stack",
+            "stack_name": stack_info["name"],
+            "stack_path": relative_path,
+            "industry": industry,
+            "icon": get_agent_icon(filename),
+            "description": get_agent_description(filename),
+            "features": get_agent_features(filename)
+        }
+        stack_info["agents"].append(agent)
     
-    return stacks
+    return stack_info
+
+def generator_hash():
+    """Changing this script invalidates the index"""
+    return file_hash(Path(__file__))
+
+def load_index():
+    """Load the sidecar index, or None if it is missing or from another generator version"""
+    try:
+        index = json.loads(INDEX_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or index.get("generator") != generator_hash():
+        return None
+    return index.get("stacks")
+
+def save_index(stacks_index):
+    with open(INDEX_FILE, 'w') as f:
+        json.dump({"version": INDEX_VERSION, "generator": generator_hash(), "stacks": stacks_index}, f)
+
+def build_manifest(index=None, new_index=None, verbose=True, workers=None):
+    """Build the manifest dict; 'generated' is set to the current time"""
+    log = print if verbose else (lambda *args, **kwargs: None)
 
-def main():
-    print("\n🔄 Updating manifest.json...")
-    print("-" * 40)
-    
-    # Build manifest
     manifest = {
         "version": "1.0.0",
         "generated": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
@@ -301,12 +438,12 @@ def main():
     }
     
     # Scan agents
-    print("📂 Scanning agents directory...")
+    log("📂 Scanning agents directory...")
     singular_agents = scan_agents()
     
     # Scan stacks
-    print("📂 Scanning agent_stacks directory...")
-    stacks = scan_stacks()
+    log("📂 Scanning agent_stacks directory...")
+    stacks = scan_stacks(index, new_index, workers)
     
     # Create a set of agent filenames that exist in stacks
     stack_agent_filenames = set()
@@ -323,39 +460,209 @@ def main():
             deduplicated_agents.append(agent)
         else:
             duplicates_removed += 1
-            print(f"   Removing duplicate: {agent['filename']} (exists in stack)")
+            log(f"   Removing duplicate: {agent['filename']} (exists in stack)")
     
     manifest["agents"] = deduplicated_agents
     manifest["stacks"] = stacks
     
-    print(f"   Found {len(singular_agents)} singular agents")
-    print(f"   Removed {duplicates_removed} duplicates")
-    print(f"   Final unique agents: {len(manifest['agents'])}")
-    print(f"   Found {len(manifest['stacks'])} stacks")
-    
-    # Also create agents/index.json for raw URL loading
-    agents_index = {
-        "agents": [agent["filename"] for agent in manifest["agents"]]
+    log(f"   Found {len(singular_agents)} singular agents")
+    log(f"   Removed {duplicates_removed} duplicates")
+    log(f"   Final unique agents: {len(manifest['agents'])}")
+    log(f"   Found {len(manifest['stacks'])} stacks")
+    return manifest
+
+def render_manifest(manifest, generated=None):
+    """Serialize exactly as written to disk, optionally with a different timestamp"""
+    if generated is not None:
+        manifest = {**manifest, "generated": generated}
+    return json.dumps(manifest, indent=2)
+
+def render_agents_index(manifest):
+    return json.dumps({"agents": [agent["filename"] for agent in manifest["agents"]]}, indent=2)
+
+def read_existing(path):
+    try:
+        return Path(path).read_text()
+    except OSError:
+        return None
+
+def existing_timestamp(text):
+    """The 'generated' value of an existing manifest, without parsing the whole file"""
+    if text is None:
+        return None
+    for line in text.splitlines()[:5]:
+        if line.strip().startswith('"generated"'):
+            return json.loads("{" + line.strip().rstrip(',') + "}")["generated"]
+    return None
+
+def is_current(manifest, existing_manifest, existing_agents_index):
+    """True when the files on disk already hold this manifest (timestamp aside)"""
+    generated = existing_timestamp(existing_manifest)
+    return (
+        generated is not None
+        and render_manifest(manifest, generated) == existing_manifest
+        and render_agents_index(manifest) == existing_agents_index
+    )
+
+def industry_slug(industry):
+    return re.sub(r'[^a-z0-9]+', '-', industry.lower()).strip('-')
+
+def compact_json(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def render_sharded(manifest):
+    """
+    The compact split manifest as {path: text}
+
+    manifest/index.json carries just enough to render the stack list and the
+    singular agents; full stack entries live in one shard per industry.
+    Neither carries the "generated" timestamp, so unchanged stacks give
+    byte-identical files.
+    """
+    shards = {}
+    for stack in manifest["stacks"]:
+        shards.setdefault(industry_slug(stack["industry"]), []).append(stack)
+
+    index = {
+        "version": manifest["version"],
+        "repository": manifest["repository"],
+        "branch": manifest["branch"],
+        "shards": {
+            slug: {
+                "industry": stacks[0]["industry"],
+                "path": f"{SHARDED_DIR.as_posix()}/shards/{slug}.json",
+                "stacks": len(stacks),
+                "agents": sum(len(stack["agents"]) for stack in stacks)
+            }
+            for slug, stacks in shards.items()
+        },
+        "stacks": [
+            {
+                "id": stack["id"],
+                "name": (stack["metadata"] or {}).get("name") or stack["name"],
+                "industry": stack["industry"],
+                "path": stack["path"],
+                "agents": len(stack["agents"])
+            }
+            for stack in manifest["stacks"]
+        ],
+        "agents": [
+            {key: agent[key] for key in ("name", "description", "size_formatted", "path", "url")}
+            for agent in manifest["agents"]
+        ]
     }
-    with open("agents/index.json", 'w') as f:
-        json.dump(agents_index, f, indent=2)
-    print("   Created agents/index.json")
+
+    outputs = {(SHARDED_DIR / "index.json").as_posix(): compact_json(index)}
+    for slug, stacks in shards.items():
+        outputs[(SHARDED_DIR / "shards" / f"{slug}.json").as_posix()] = compact_json(
+            {"industry": stacks[0]["industry"], "stacks": stacks}
+        )
+    return outputs
+
+def stale_sharded(outputs):
+    """Paths from render_sharded whose file (or a compressed sibling) is missing or differs"""
+    stale = []
+    for path, text in outputs.items():
+        siblings = [path + ".gz"] + ([path + ".br"] if brotli else [])
+        try:
+            current = Path(path).read_text(encoding='utf-8') == text
+        except OSError:
+            current = False
+        if not current or not all(Path(sibling).exists() for sibling in siblings):
+            stale.append(path)
+    return stale
+
+def orphan_shards(outputs):
+    """Shard files left behind by an industry that no longer exists"""
+    shards_dir = SHARDED_DIR / "shards"
+    if not shards_dir.exists():
+        return []
+    expected = set(outputs)
+    return sorted(
+        path for path in shards_dir.iterdir()
+        if re.sub(r'\.(gz|br)$', '', path.as_posix()) not in expected
+    )
+
+def write_sharded(outputs, paths):
+    """Write the given paths plus deterministic .gz (and .br) siblings"""
+    for path in paths:
+        data = outputs[path].encode('utf-8')
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(data)
+        Path(path + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli:
+            Path(path + ".br").write_bytes(brotli.compress(data, quality=11))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate manifest.json and agents/index.json")
+    parser.add_argument('--check', action='store_true',
+                        help="don't write anything; exit 1 if manifest.json, agents/index.json or manifest/ is stale")
+    parser.add_argument('--full', action='store_true',
+                        help="ignore the sidecar index and re-process every stack")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"threads for stat/read calls (default: {default_workers()}; 1 = serial)")
+    args = parser.parse_args(argv)
+
+    index = None if args.full else load_index()
+    new_index = {}
+
+    if args.check:
+        manifest = build_manifest(index, new_index, verbose=False, workers=args.workers)
+        sharded = render_sharded(manifest)
+        if (is_current(manifest, read_existing("manifest.json"), read_existing("agents/index.json"))
+                and not stale_sharded(sharded) and not orphan_shards(sharded)):
+            print("✅ manifest.json is up to date")
+            return 0
+        print("❌ manifest.json is stale -- run: python3 scripts/generate_manifest.py")
+        return 1
+
+    print("\n🔄 Updating manifest.json...")
+    print("-" * 40)
+    
+    manifest = build_manifest(index, new_index, workers=args.workers)
+    reused = sum(1 for key, item in new_index.items() if index and index.get(key, {}).get("entry") is item["entry"])
+    if index is not None:
+        print(f"   Re-processed {len(new_index) - reused} changed stacks, reused {reused} from index")
+    save_index(new_index)
     
     # Count total stack agents
     total_stack_agents = sum(len(stack['agents']) for stack in manifest['stacks'])
     print(f"   Total stack agents: {total_stack_agents}")
+
+    # Compact index + per-industry shards for index.html
+    sharded = render_sharded(manifest)
+    stale = stale_sharded(sharded)
+    write_sharded(sharded, stale)
+    for orphan in orphan_shards(sharded):
+        orphan.unlink()
+    if stale:
+        print(f"   Wrote {len(stale)} of {len(sharded)} files under {SHARDED_DIR}/ (+ .gz{'/.br' if brotli else ''})")
+    if not brotli:
+        print("   brotli not installed -- skipped .br siblings (pip install brotli)")
+
+    if is_current(manifest, read_existing("manifest.json"), read_existing("agents/index.json")):
+        print("-" * 40)
+        print("✅ manifest.json already up to date -- nothing written")
+        print("\n")
+        return 0
+    
+    # Also create agents/index.json for raw URL loading
+    with open("agents/index.json", 'w') as f:
+        f.write(render_agents_index(manifest))
+    print("   Created agents/index.json")
     
     # Write manifest
     with open("manifest.json", 'w') as f:
-        json.dump(manifest, f, indent=2)
+        f.write(render_manifest(manifest))
     
     print("-" * 40)
     print("✅ manifest.json updated successfully!")
     print("\n📝 Next steps:")
-    print("   1. Review changes: git diff manifest.json agents/index.json")
-    print("   2. Commit: git add manifest.json agents/index.json && git commit -m 'Update manifest'")
+    print(f"   1. Review changes: git diff manifest.json agents/index.json {SHARDED_DIR}/")
+    print(f"   2. Commit: git add manifest.json agents/index.json {SHARDED_DIR}/ && git commit -m 'Update manifest'")
     print("   3. Push: git push")
     print("\n")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
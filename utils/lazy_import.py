@@ -0,0 +1,22 @@
+"""Deferred imports for agents whose SDKs are only needed once they run."""
+
+import importlib
+
+
+class LazyImport:
+    """Stands in for `from module import name`; the import runs on first call or attribute access."""
+
+    def __init__(self, module, name=None):
+        self._module, self._name, self._target = module, name, None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._name) if self._name else target
+        return self._target
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)